@@ -14,6 +14,10 @@ jwt = JWTManager()
 def create_app(config_name=None):
     app = Flask(__name__)
     
+    # Serialização JSON com orjson
+    from app.utils.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+    
     # Configuração
     if config_name is None:
         config_name = os.getenv('FLASK_ENV', 'development')
@@ -28,6 +32,17 @@ def create_app(config_name=None):
     # Inicialização das extensões com o app
     db.init_app(app)
     migrate.init_app(app, db)
+    
+    from app.utils.engine import configure_engine
+    configure_engine(app)
+    
+    from app.utils.instrumentation import init_instrumentation
+    init_instrumentation(app)
+    
+    if app.config.get('METRICAS', True):
+        from app.utils.metrics import init_metrics
+        init_metrics(app)
+    
     jwt.init_app(app)
     CORS(app)
     
@@ -41,7 +56,11 @@ def create_app(config_name=None):
     from app.routes.peca_routes import peca_bp
     from app.routes.certificado_routes import certificado_bp
     from app.routes.relatorio_routes import relatorio_bp
+    from app.routes.dashboard_routes import dashboard_bp
+    from app.routes.notificacao_routes import notificacao_bp
     from app.routes.auth_routes import auth_bp
+    from app.routes.admin_routes import admin_bp
+    from app.routes.metricas_routes import metricas_bp
     
     app.register_blueprint(equipamento_bp, url_prefix='/api/equipamentos')
     app.register_blueprint(manutencao_bp, url_prefix='/api/manutencoes')
@@ -52,7 +71,15 @@ def create_app(config_name=None):
     app.register_blueprint(peca_bp, url_prefix='/api/pecas')
     app.register_blueprint(certificado_bp, url_prefix='/api/certificados')
     app.register_blueprint(relatorio_bp, url_prefix='/api/relatorios')
+    app.register_blueprint(dashboard_bp, url_prefix='/api/dashboards')
+    app.register_blueprint(notificacao_bp, url_prefix='/api/notificacoes')
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(admin_bp, url_prefix='/api/admin')
+    app.register_blueprint(metricas_bp, url_prefix='/api/metrics')
+    
+    # Comandos de linha de comando
+    from app.cli import register_commands
+    register_commands(app)
     
     # Configuração de tratamento de erros
     @app.errorhandler(404)
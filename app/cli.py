@@ -0,0 +1,101 @@
+import time
+import click
+
+def register_commands(app):
+    """Registra os comandos de linha de comando (flask <comando>) da aplicação."""
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index_command():
+        """Recria o índice de busca textual de equipamentos."""
+        from app.utils.search import rebuild_search_index
+
+        total = rebuild_search_index()
+        click.echo(f'{total} equipamentos indexados')
+
+    @app.cli.command('regenerate-qrcodes')
+    @click.option('--batch-size', default=500, show_default=True, help='Equipamentos por lote')
+    @click.option('--processes', default=None, type=int, help='Processos (padrão: número de CPUs)')
+    def regenerate_qrcodes_command(batch_size, processes):
+        """Regenera os QR Codes de todos os equipamentos em paralelo."""
+        from app.utils.qrcode_jobs import RegeneracaoEmAndamento, regenerate_all_qrcodes_locked
+
+        try:
+            total = regenerate_all_qrcodes_locked(batch_size=batch_size, processes=processes)
+        except RegeneracaoEmAndamento:
+            raise click.ClickException('Já existe uma regeneração dos QR Codes em andamento')
+        click.echo(f'{total} QR Codes gerados')
+
+    @app.cli.command('recover-qrcodes')
+    @click.option('--minutos', default=None, type=int, help='Idade mínima dos pendentes (padrão: QRCODE_PENDENTE_MINUTOS)')
+    @click.option('--batch-size', default=500, show_default=True, help='Equipamentos por lote')
+    @click.option('--processes', default=None, type=int, help='Processos (padrão: número de CPUs)')
+    def recover_qrcodes_command(minutos, batch_size, processes):
+        """Gera novamente os QR Codes pendentes há muito tempo ou com erro."""
+        from app.utils.qrcode_jobs import recover_stale_qrcodes
+
+        resultado = recover_stale_qrcodes(minutos=minutos, batch_size=batch_size, processes=processes)
+        click.echo(f"{resultado['gerados']} QR Codes gerados de {resultado['equipamentos']} pendentes ou com erro")
+
+    @app.cli.command('rebuild-report-aggregates')
+    @click.option('--batch-size', default=5000, show_default=True, help='Linhas lidas por lote')
+    def rebuild_report_aggregates_command(batch_size):
+        """Recria as tabelas de resumo usadas pelos relatórios."""
+        from app.utils.aggregates import rebuild_summaries
+
+        manutencoes, ordens_servico = rebuild_summaries(batch_size=batch_size)
+        click.echo(f'{manutencoes} resumos de manutenções e {ordens_servico} resumos de ordens de serviço gerados')
+
+    @app.cli.command('schedule-preventive-maintenance')
+    @click.option('--horizonte', default=None, type=int, help='Dias à frente (padrão: PREVENTIVA_HORIZONTE_DIAS)')
+    @click.option('--batch-size', default=1000, show_default=True, help='Programas por lote')
+    def schedule_preventive_maintenance_command(horizonte, batch_size):
+        """Gera as manutenções preventivas dos programas ativos."""
+        from app.utils.preventive import schedule_preventive_maintenance
+
+        resultado = schedule_preventive_maintenance(horizonte_dias=horizonte, batch_size=batch_size)
+        click.echo(f"{resultado['manutencoes_geradas']} manutenções geradas para {resultado['programas']} programas")
+
+    @app.cli.command('scan-certificate-expiry')
+    @click.option('--dias-aviso', default=None, type=int, help='Antecedência do aviso (padrão: CERTIFICADO_DIAS_AVISO)')
+    @click.option('--batch-size', default=5000, show_default=True, help='Certificados por lote')
+    def scan_certificate_expiry_command(dias_aviso, batch_size):
+        """Marca os certificados vencidos e avisa os responsáveis."""
+        from app.utils.certificate_expiry import scan_certificate_expiry
+
+        resultado = scan_certificate_expiry(dias_aviso=dias_aviso, batch_size=batch_size)
+        click.echo(f"{resultado['vencidos']} certificados vencidos, {resultado['a_vencer']} a vencer, "
+                   f"{resultado['notificacoes']} notificações criadas")
+
+    @app.cli.command('run-scheduler')
+    @click.option('--once', is_flag=True, help='Executa cada tarefa uma única vez')
+    def run_scheduler_command(once):
+        """Executa as tarefas periódicas (manutenções preventivas, vencimento de certificados, QR Codes pendentes)."""
+        from app.utils.scheduler import run_scheduler
+
+        run_scheduler(app, once=once)
+
+    @app.cli.command('seed-synthetic')
+    @click.option('--equipamentos', default=1000, show_default=True, help='Equipamentos gerados')
+    @click.option('--manutencoes', default=None, type=int, help='Manutenções (padrão: 20 por equipamento)')
+    @click.option('--ordens', default=None, type=int, help='Ordens de serviço (padrão: 5 por equipamento)')
+    @click.option('--anos', default=3, show_default=True, help='Anos de histórico')
+    @click.option('--semente', default=42, show_default=True, help='Semente da geração aleatória')
+    @click.option('--batch-size', default=10000, show_default=True, help='Linhas por INSERT')
+    @click.option('--senha', default='senha123', show_default=True, help='Senha de todos os usuários gerados')
+    def seed_synthetic_command(equipamentos, manutencoes, ordens, anos, semente, batch_size, senha):
+        """Popula um banco vazio com dados sintéticos consistentes para benchmarks."""
+        from app.utils.synthetic import SyntheticDataGenerator, EMAIL_ADMIN
+
+        gerador = SyntheticDataGenerator(
+            equipamentos=equipamentos, manutencoes=manutencoes, ordens_servico=ordens, anos=anos,
+            semente=semente, batch_size=batch_size, senha=senha
+        )
+        inicio = time.perf_counter()
+        try:
+            totais = gerador.generate()
+        except ValueError as e:
+            raise click.ClickException(str(e))
+
+        for tabela, total in totais.items():
+            click.echo(f'{tabela}: {total}')
+        click.echo(f'Concluído em {time.perf_counter() - inicio:.1f}s. Administrador: {EMAIL_ADMIN} / {senha}')
@@ -1,9 +1,43 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Carregar variáveis de ambiente do arquivo .env se existir
 load_dotenv()
 
+def database_url(variavel, padrao):
+    """Lê a URL do banco, aceitando o esquema postgres:// fornecido por alguns provedores."""
+    url = os.getenv(variavel, padrao)
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+def engine_options(database_uri):
+    """
+    Retorna as opções do engine do SQLAlchemy (SQLALCHEMY_ENGINE_OPTIONS) para o banco da URL.
+
+    PostgreSQL: pool de conexões dimensionado por worker, com verificação da conexão
+    antes do uso e reciclagem periódica. SQLite: tempo de espera pelo lock de escrita;
+    os pragmas (SQLITE_PRAGMAS) são aplicados a cada nova conexão por configure_engine.
+
+    Args:
+        database_uri (str): URL do banco
+
+    Returns:
+        dict: Opções do engine
+    """
+    if database_uri.startswith('postgresql'):
+        return {
+            'pool_size': int(os.getenv('DB_POOL_SIZE', 5)),
+            'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 10)),
+            'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+            'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+            'pool_pre_ping': True,
+        }
+    if database_uri.startswith('sqlite'):
+        return {'connect_args': {'timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)) / 1000}}
+    return {}
+
 class Config:
     """Configuração base para a aplicação."""
     SECRET_KEY = os.getenv('SECRET_KEY', 'chave-secreta-padrao-deve-ser-alterada')
@@ -13,24 +47,85 @@ class Config:
     JWT_REFRESH_TOKEN_EXPIRES = 2592000  # 30 dias
     UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB
+    QRCODE_WORKERS = int(os.getenv('QRCODE_WORKERS', 2))  # threads para geração de QR Codes
+    QRCODE_CACHE_MEMORIA = int(os.getenv('QRCODE_CACHE_MEMORIA', 8 * 1024 * 1024))  # 8 MB
+    QRCODE_CACHE_DISCO = int(os.getenv('QRCODE_CACHE_DISCO', 256 * 1024 * 1024))  # 256 MB
+    QRCODE_DIR = os.getenv('QRCODE_DIR')  # padrão: UPLOAD_FOLDER/qrcodes
+    QRCODE_CACHE_DIR = os.getenv('QRCODE_CACHE_DIR')  # padrão: QRCODE_DIR/cache
+    QRCODE_LOCK_PATH = os.getenv('QRCODE_LOCK_PATH')  # padrão: instance/qrcodes.lock
+    QRCODE_PENDENTE_MINUTOS = int(os.getenv('QRCODE_PENDENTE_MINUTOS', 15))  # pendentes refeitos pelo agendador
+    QRCODE_INTERVALO = int(os.getenv('QRCODE_INTERVALO', 600))  # segundos entre verificações dos pendentes
+    SEQUENCIA_BLOCO = int(os.getenv('SEQUENCIA_BLOCO', 20))  # códigos reservados por vez (SQLite)
+    DASHBOARD_CACHE_PATH = os.getenv('DASHBOARD_CACHE_PATH')  # padrão: instance/dashboard_cache.db
+    DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', 300))  # segundos
+    PREVENTIVA_HORIZONTE_DIAS = int(os.getenv('PREVENTIVA_HORIZONTE_DIAS', 90))  # dias agendados à frente
+    PREVENTIVA_INTERVALO = int(os.getenv('PREVENTIVA_INTERVALO', 3600))  # segundos entre execuções do agendador
+    CERTIFICADO_DIAS_AVISO = int(os.getenv('CERTIFICADO_DIAS_AVISO', 30))  # antecedência do aviso de vencimento
+    CERTIFICADO_INTERVALO = int(os.getenv('CERTIFICADO_INTERVALO', 3600))  # segundos entre verificações de vencimento
+    NOTIFICACOES_CONTADOR_PATH = os.getenv('NOTIFICACOES_CONTADOR_PATH')  # padrão: instance/notificacoes.db
+    NOTIFICACOES_CONTADOR_TTL = int(os.getenv('NOTIFICACOES_CONTADOR_TTL', 300))  # segundos
+    NOTIFICACOES_SSE_INTERVALO = float(os.getenv('NOTIFICACOES_SSE_INTERVALO', 1))  # segundos entre verificações
+    NOTIFICACOES_SSE_DURACAO = int(os.getenv('NOTIFICACOES_SSE_DURACAO', 300))  # segundos por conexão
+    NOTIFICACOES_SSE_HEARTBEAT = int(os.getenv('NOTIFICACOES_SSE_HEARTBEAT', 15))  # segundos
+    NOTIFICACOES_SSE_MAXIMO = int(os.getenv('NOTIFICACOES_SSE_MAXIMO', 4))  # conexões simultâneas por worker
+    SENHA_HASH_METODO = os.getenv('SENHA_HASH_METODO', 'pbkdf2:sha256:600000')  # método e custo dos novos hashes
+    LOGIN_HASH_PROCESSOS = int(os.getenv('LOGIN_HASH_PROCESSOS', 2))  # processos por worker (0: no próprio processo)
+    LOGIN_HASH_FILA = int(os.getenv('LOGIN_HASH_FILA', 16))  # verificações pendentes por worker
+    LOGIN_HASH_TIMEOUT = float(os.getenv('LOGIN_HASH_TIMEOUT', 5))  # segundos
+    LOGIN_LIMITE_PATH = os.getenv('LOGIN_LIMITE_PATH')  # padrão: instance/login_limites.db
+    LOGIN_LIMITE_EMAIL = int(os.getenv('LOGIN_LIMITE_EMAIL', 5))  # tentativas seguidas por email
+    LOGIN_LIMITE_EMAIL_POR_MINUTO = float(os.getenv('LOGIN_LIMITE_EMAIL_POR_MINUTO', 2))
+    LOGIN_LIMITE_IP = int(os.getenv('LOGIN_LIMITE_IP', 100))  # tentativas seguidas por IP
+    LOGIN_LIMITE_IP_POR_MINUTO = float(os.getenv('LOGIN_LIMITE_IP_POR_MINUTO', 300))
+    ULTIMO_ACESSO_INTERVALO = float(os.getenv('ULTIMO_ACESSO_INTERVALO', 10))  # segundos até gravar os acessos pendentes
+    ULTIMO_ACESSO_LOTE = int(os.getenv('ULTIMO_ACESSO_LOTE', 500))  # acessos pendentes que disparam a gravação
+    INSTRUMENTACAO = os.getenv('INSTRUMENTACAO', 'true').lower() in ('1', 'true')  # medição das requisições
+    INSTRUMENTACAO_SERVER_TIMING = os.getenv('INSTRUMENTACAO_SERVER_TIMING', 'true').lower() in ('1', 'true')
+    INSTRUMENTACAO_LOG = os.getenv('INSTRUMENTACAO_LOG', 'true').lower() in ('1', 'true')  # linha JSON por requisição
+    INSTRUMENTACAO_AMOSTRAS = int(os.getenv('INSTRUMENTACAO_AMOSTRAS', 1000))  # requisições recentes por rota
+    METRICAS = os.getenv('METRICAS', 'true').lower() in ('1', 'true')  # GET /api/metrics (requer INSTRUMENTACAO)
+    METRICAS_TOKEN = os.getenv('METRICAS_TOKEN')  # se definido, exigido em Authorization: Bearer
+    METRICAS_IPS = os.getenv('METRICAS_IPS', '127.0.0.1,::1')  # endereços aceitos sem token (separados por vírgula)
+    METRICAS_RECALCULO = float(os.getenv('METRICAS_RECALCULO', 60))  # segundos entre recálculos dos indicadores do domínio
+    # Pragmas aplicados a cada conexão SQLite: leitores não bloqueiam o escritor (WAL)
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),  # milissegundos
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),  # bytes
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64 * 1024)),  # negativo: KiB
+        'temp_store': 'MEMORY',
+    }
+
+# Arquivos locais dos testes (caches, contadores): fora do repositório, novos a cada execução e
+# removidos ao final dela (run_tests.py e tests/conftest.py)
+DIRETORIO_TESTES = os.path.join(tempfile.gettempdir(), f'api-manutencao-testes-{os.getpid()}')
 
 class DevelopmentConfig(Config):
     """Configuração para ambiente de desenvolvimento."""
     DEBUG = True
-    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///dev.db')
+    SQLALCHEMY_DATABASE_URI = database_url('DATABASE_URL', 'sqlite:///dev.db')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     JWT_ACCESS_TOKEN_EXPIRES = 86400  # 24 horas em desenvolvimento
 
 class TestingConfig(Config):
     """Configuração para ambiente de testes."""
     TESTING = True
-    SQLALCHEMY_DATABASE_URI = os.getenv('TEST_DATABASE_URL', 'sqlite:///test.db')
+    SQLALCHEMY_DATABASE_URI = database_url('TEST_DATABASE_URL', 'sqlite:///test.db')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     JWT_ACCESS_TOKEN_EXPIRES = 300  # 5 minutos em testes
+    DASHBOARD_CACHE_PATH = os.path.join(DIRETORIO_TESTES, 'dashboard_cache.db')
+    NOTIFICACOES_CONTADOR_PATH = os.path.join(DIRETORIO_TESTES, 'notificacoes.db')
+    LOGIN_LIMITE_PATH = os.path.join(DIRETORIO_TESTES, 'login_limites.db')
+    QRCODE_DIR = os.path.join(DIRETORIO_TESTES, 'qrcodes')
+    QRCODE_CACHE_DIR = os.path.join(DIRETORIO_TESTES, 'qrcodes', 'cache')
 
 class ProductionConfig(Config):
     """Configuração para ambiente de produção."""
     DEBUG = False
     # Usar SQLite para o plano gratuito do Render, mas pode ser alterado para PostgreSQL
-    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///prod.db')
+    SQLALCHEMY_DATABASE_URI = database_url('DATABASE_URL', 'sqlite:///prod.db')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     # Em produção, certifique-se de definir SECRET_KEY e JWT_SECRET_KEY como variáveis de ambiente
     # Configurações específicas para o Render
     PORT = int(os.getenv('PORT', 8080))
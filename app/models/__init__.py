@@ -1,18 +1,25 @@
 from datetime import datetime
-import uuid
 from app import db
+from app.models.types import UUIDType, uuid7
 
 class BaseModel(db.Model):
     """Modelo base com campos comuns para todos os modelos."""
     __abstract__ = True
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDType, primary_key=True, default=uuid7)
     criado_em = db.Column(db.DateTime, default=datetime.utcnow)
     atualizado_em = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class Equipamento(BaseModel):
     """Modelo para equipamentos médicos e clínicos."""
     __tablename__ = 'equipamentos'
+    __table_args__ = (
+        db.Index('ix_equipamentos_criado_em_id', 'criado_em', 'id'),
+        # Listagem por departamento e contagem por status no dashboard filtrado
+        db.Index('ix_equipamentos_departamento_status', 'departamento_id', 'status'),
+        # Versão da listagem (ETag): max(atualizado_em)
+        db.Index('ix_equipamentos_atualizado_em', 'atualizado_em'),
+    )
     
     codigo = db.Column(db.String(50), unique=True, nullable=False)
     nome = db.Column(db.String(100), nullable=False)
@@ -22,10 +29,10 @@ class Equipamento(BaseModel):
     data_aquisicao = db.Column(db.Date, nullable=False)
     data_garantia = db.Column(db.Date)
     valor_aquisicao = db.Column(db.Numeric(10, 2))
-    departamento_id = db.Column(db.String(36), db.ForeignKey('departamentos.id'), nullable=False)
+    departamento_id = db.Column(UUIDType, db.ForeignKey('departamentos.id'), nullable=False)
     localizacao = db.Column(db.String(200))
-    status = db.Column(db.String(20), nullable=False, default='ATIVO')
-    criticidade = db.Column(db.String(20), nullable=False, default='MEDIA')
+    status = db.Column(db.String(20), nullable=False, default='ATIVO', index=True)
+    criticidade = db.Column(db.String(20), nullable=False, default='MEDIA', index=True)
     ultima_manutencao = db.Column(db.Date)
     proxima_manutencao_planejada = db.Column(db.Date)
     especificacoes_tecnicas = db.Column(db.JSON)
@@ -49,11 +56,12 @@ class Departamento(BaseModel):
     
     nome = db.Column(db.String(100), nullable=False)
     descricao = db.Column(db.String(255))
-    responsavel_id = db.Column(db.String(36), db.ForeignKey('usuarios.id'))
+    responsavel_id = db.Column(UUIDType, db.ForeignKey('usuarios.id'))
     localizacao = db.Column(db.String(200))
     
     # Relacionamentos
-    responsavel = db.relationship('Usuario', backref=db.backref('departamentos_responsavel', lazy=True))
+    responsavel = db.relationship('Usuario', backref=db.backref('departamentos_responsavel', lazy=True),
+                                  foreign_keys=[responsavel_id])
     
     def __repr__(self):
         return f'<Departamento {self.nome}>'
@@ -61,18 +69,30 @@ class Departamento(BaseModel):
 class Manutencao(BaseModel):
     """Modelo para registros de manutenção de equipamentos."""
     __tablename__ = 'manutencoes'
-    
-    equipamento_id = db.Column(db.String(36), db.ForeignKey('equipamentos.id'), nullable=False)
+    __table_args__ = (
+        db.Index('ix_manutencoes_criado_em_id', 'criado_em', 'id'),
+        # Impede que o agendador gere a mesma manutenção preventiva duas vezes
+        db.Index('uq_manutencoes_programa_data', 'programa_id', 'data_agendamento', unique=True),
+        # Histórico do equipamento em ordem cronológica
+        db.Index('ix_manutencoes_equipamento_data', 'equipamento_id', 'data_agendamento'),
+        # Contagem por status e preventivas pendentes (status, tipo) ordenadas por data
+        db.Index('ix_manutencoes_status_tipo_data', 'status', 'tipo_manutencao', 'data_agendamento'),
+        # Versão da listagem (ETag): max(atualizado_em)
+        db.Index('ix_manutencoes_atualizado_em', 'atualizado_em'),
+    )
+    
+    equipamento_id = db.Column(UUIDType, db.ForeignKey('equipamentos.id'), nullable=False)
     tipo_manutencao = db.Column(db.String(20), nullable=False)
     status = db.Column(db.String(20), nullable=False, default='AGENDADA')
     prioridade = db.Column(db.String(20), nullable=False, default='NORMAL')
     descricao = db.Column(db.Text, nullable=False)
-    data_agendamento = db.Column(db.DateTime, nullable=False)
+    data_agendamento = db.Column(db.DateTime, nullable=False, index=True)
     data_inicio = db.Column(db.DateTime)
     data_fim = db.Column(db.DateTime)
-    tecnico_id = db.Column(db.String(36), db.ForeignKey('tecnicos.id'))
-    tecnico_externo_id = db.Column(db.String(36), db.ForeignKey('tecnicos_externos.id'))
-    empresa_externa_id = db.Column(db.String(36), db.ForeignKey('empresas_externas.id'))
+    tecnico_id = db.Column(UUIDType, db.ForeignKey('tecnicos.id'), index=True)
+    tecnico_externo_id = db.Column(UUIDType, db.ForeignKey('tecnicos_externos.id'))
+    programa_id = db.Column(UUIDType, db.ForeignKey('programas_manutencao.id'))  # gerada pelo agendador de preventivas
+    empresa_externa_id = db.Column(UUIDType, db.ForeignKey('empresas_externas.id'))
     custo_mao_de_obra = db.Column(db.Numeric(10, 2), default=0)
     custo_pecas = db.Column(db.Numeric(10, 2), default=0)
     custo_total = db.Column(db.Numeric(10, 2), default=0)
@@ -103,7 +123,7 @@ class Tecnico(BaseModel):
     certificacoes = db.Column(db.JSON)
     interno = db.Column(db.Boolean, default=True)
     disponivel = db.Column(db.Boolean, default=True)
-    usuario_id = db.Column(db.String(36), db.ForeignKey('usuarios.id'))
+    usuario_id = db.Column(UUIDType, db.ForeignKey('usuarios.id'))
     
     # Relacionamentos
     usuario = db.relationship('Usuario', backref=db.backref('tecnico', uselist=False), lazy=True)
@@ -139,7 +159,7 @@ class TecnicoExterno(BaseModel):
     nome = db.Column(db.String(100), nullable=False)
     email = db.Column(db.String(100))
     telefone = db.Column(db.String(20))
-    empresa_id = db.Column(db.String(36), db.ForeignKey('empresas_externas.id'), nullable=False)
+    empresa_id = db.Column(UUIDType, db.ForeignKey('empresas_externas.id'), nullable=False)
     especialidades = db.Column(db.JSON)
     certificacoes = db.Column(db.JSON)
     
@@ -158,7 +178,7 @@ class Peca(BaseModel):
     quantidade_estoque = db.Column(db.Integer, default=0)
     localizacao_estoque = db.Column(db.String(100))
     preco_unitario = db.Column(db.Numeric(10, 2))
-    fornecedor_id = db.Column(db.String(36), db.ForeignKey('fornecedores.id'))
+    fornecedor_id = db.Column(UUIDType, db.ForeignKey('fornecedores.id'))
     ponto_reposicao = db.Column(db.Integer, default=5)
     
     # Relacionamentos
@@ -185,20 +205,27 @@ class Fornecedor(BaseModel):
 class OrdemServico(BaseModel):
     """Modelo para ordens de serviço de manutenção."""
     __tablename__ = 'ordens_servico'
+    __table_args__ = (
+        db.Index('ix_ordens_servico_criado_em_id', 'criado_em', 'id'),
+        # Listagem por departamento e contagem por status no dashboard filtrado
+        db.Index('ix_ordens_servico_departamento_status', 'departamento_id', 'status'),
+        # Versão da listagem (ETag): max(atualizado_em)
+        db.Index('ix_ordens_servico_atualizado_em', 'atualizado_em'),
+    )
     
     codigo = db.Column(db.String(50), unique=True, nullable=False)
-    equipamento_id = db.Column(db.String(36), db.ForeignKey('equipamentos.id'), nullable=False)
-    departamento_id = db.Column(db.String(36), db.ForeignKey('departamentos.id'), nullable=False)
-    solicitante_id = db.Column(db.String(36), db.ForeignKey('usuarios.id'), nullable=False)
+    equipamento_id = db.Column(UUIDType, db.ForeignKey('equipamentos.id'), nullable=False, index=True)
+    departamento_id = db.Column(UUIDType, db.ForeignKey('departamentos.id'), nullable=False)
+    solicitante_id = db.Column(UUIDType, db.ForeignKey('usuarios.id'), nullable=False, index=True)
     tipo_servico = db.Column(db.String(30), nullable=False)
     descricao_problema = db.Column(db.Text, nullable=False)
     prioridade = db.Column(db.String(20), nullable=False, default='NORMAL')
-    status = db.Column(db.String(20), nullable=False, default='ABERTA')
+    status = db.Column(db.String(20), nullable=False, default='ABERTA', index=True)
     data_abertura = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     data_atribuicao = db.Column(db.DateTime)
     data_inicio = db.Column(db.DateTime)
     data_fim = db.Column(db.DateTime)
-    manutencao_id = db.Column(db.String(36), db.ForeignKey('manutencoes.id'))
+    manutencao_id = db.Column(UUIDType, db.ForeignKey('manutencoes.id'))
     anexos_url = db.Column(db.JSON)
     observacoes = db.Column(db.Text)
     avaliacao_satisfacao = db.Column(db.Integer)
@@ -211,6 +238,19 @@ class OrdemServico(BaseModel):
     def __repr__(self):
         return f'<OrdemServico {self.codigo}>'
 
+# Sequência nativa usada no PostgreSQL para os códigos das ordens de serviço
+ordem_servico_codigo_seq = db.Sequence('ordens_servico_codigo_seq', metadata=db.metadata)
+
+class Sequencia(db.Model):
+    """Contador para bancos sem sequências nativas (SQLite), reservado em blocos."""
+    __tablename__ = 'sequencias'
+    
+    nome = db.Column(db.String(50), primary_key=True)
+    valor = db.Column(db.BigInteger, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<Sequencia {self.nome}={self.valor}>'
+
 class Usuario(BaseModel):
     """Modelo para usuários do sistema."""
     __tablename__ = 'usuarios'
@@ -219,7 +259,7 @@ class Usuario(BaseModel):
     email = db.Column(db.String(100), unique=True, nullable=False)
     senha_hash = db.Column(db.String(255), nullable=False)
     cargo = db.Column(db.String(100))
-    departamento_id = db.Column(db.String(36), db.ForeignKey('departamentos.id'))
+    departamento_id = db.Column(UUIDType, db.ForeignKey('departamentos.id'))
     telefone = db.Column(db.String(20))
     perfil = db.Column(db.String(20), nullable=False, default='SOLICITANTE')
     ativo = db.Column(db.Boolean, default=True)
@@ -238,12 +278,12 @@ class ProgramaManutencao(BaseModel):
     
     nome = db.Column(db.String(100), nullable=False)
     descricao = db.Column(db.Text)
-    equipamento_id = db.Column(db.String(36), db.ForeignKey('equipamentos.id'))
+    equipamento_id = db.Column(UUIDType, db.ForeignKey('equipamentos.id'), index=True)
     tipo_equipamento = db.Column(db.String(100))
     frequencia = db.Column(db.String(20), nullable=False)
     checklist = db.Column(db.JSON)
     duracao_estimada = db.Column(db.Integer)  # em minutos
-    responsavel_id = db.Column(db.String(36), db.ForeignKey('usuarios.id'))
+    responsavel_id = db.Column(UUIDType, db.ForeignKey('usuarios.id'))
     ativo = db.Column(db.Boolean, default=True)
     
     # Relacionamentos
@@ -255,16 +295,19 @@ class ProgramaManutencao(BaseModel):
 class Certificado(BaseModel):
     """Modelo para certificados e documentos regulatórios."""
     __tablename__ = 'certificados'
+    # Consultas de vencimento: status = 'VALIDO' e faixa de data_validade
+    __table_args__ = (db.Index('ix_certificados_status_validade', 'status', 'data_validade'),)
     
-    equipamento_id = db.Column(db.String(36), db.ForeignKey('equipamentos.id'), nullable=False)
+    equipamento_id = db.Column(UUIDType, db.ForeignKey('equipamentos.id'), nullable=False, index=True)
     tipo = db.Column(db.String(30), nullable=False)
     numero = db.Column(db.String(100))
     data_emissao = db.Column(db.Date, nullable=False)
-    data_validade = db.Column(db.Date, nullable=False)
+    data_validade = db.Column(db.Date, nullable=False, index=True)
     emissor = db.Column(db.String(100), nullable=False)
     documento_url = db.Column(db.String(255))
     observacoes = db.Column(db.Text)
     status = db.Column(db.String(20), nullable=False, default='VALIDO')
+    aviso_vencimento = db.Column(db.Date)  # data de validade já avisada aos responsáveis
     
     def __repr__(self):
         return f'<Certificado {self.tipo} - {self.numero}>'
@@ -272,8 +315,12 @@ class Certificado(BaseModel):
 class Notificacao(BaseModel):
     """Modelo para notificações do sistema."""
     __tablename__ = 'notificacoes'
+    __table_args__ = (
+        db.Index('ix_notificacoes_usuario_lida', 'usuario_id', 'lida'),
+        db.Index('ix_notificacoes_usuario_criado_em_id', 'usuario_id', 'criado_em', 'id'),
+    )
     
-    usuario_id = db.Column(db.String(36), db.ForeignKey('usuarios.id'), nullable=False)
+    usuario_id = db.Column(UUIDType, db.ForeignKey('usuarios.id'), nullable=False)
     titulo = db.Column(db.String(100), nullable=False)
     mensagem = db.Column(db.Text, nullable=False)
     tipo = db.Column(db.String(20), nullable=False)
@@ -285,3 +332,46 @@ class Notificacao(BaseModel):
     
     def __repr__(self):
         return f'<Notificacao {self.titulo}>'
+
+class ResumoManutencao(db.Model):
+    """Resumo mensal de manutenções por equipamento, mantido incrementalmente para os relatórios."""
+    __tablename__ = 'resumo_manutencoes'
+    __table_args__ = (db.Index('ix_resumo_manutencoes_equipamento_mes', 'equipamento_id', 'mes'),)
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    mes = db.Column(db.Date, nullable=False, index=True)  # primeiro dia do mês de data_agendamento
+    equipamento_id = db.Column(UUIDType, nullable=False)
+    tecnico_id = db.Column(UUIDType)
+    tipo_manutencao = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+    custo_mao_de_obra = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    custo_pecas = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    custo_total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    tempo_parada = db.Column(db.Integer, nullable=False, default=0)  # em minutos
+    duracao = db.Column(db.Integer, nullable=False, default=0)  # soma de data_fim - data_inicio, em minutos
+    
+    def __repr__(self):
+        return f'<ResumoManutencao {self.mes} {self.equipamento_id} {self.status}>'
+
+class ResumoOrdemServico(db.Model):
+    """Resumo mensal de ordens de serviço por equipamento e departamento, mantido incrementalmente."""
+    __tablename__ = 'resumo_ordens_servico'
+    __table_args__ = (db.Index('ix_resumo_ordens_servico_equipamento_mes', 'equipamento_id', 'mes'),)
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    mes = db.Column(db.Date, nullable=False, index=True)  # primeiro dia do mês de data_abertura
+    equipamento_id = db.Column(UUIDType, nullable=False)
+    departamento_id = db.Column(UUIDType, nullable=False)
+    prioridade = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+    atendidas = db.Column(db.Integer, nullable=False, default=0)
+    tempo_atendimento = db.Column(db.Integer, nullable=False, default=0)  # abertura até início, em minutos
+    resolvidas = db.Column(db.Integer, nullable=False, default=0)
+    tempo_resolucao = db.Column(db.Integer, nullable=False, default=0)  # abertura até fim, em minutos
+    avaliacoes = db.Column(db.Integer, nullable=False, default=0)
+    soma_avaliacoes = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<ResumoOrdemServico {self.mes} {self.equipamento_id} {self.status}>'
@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+import uuid
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+_lock = threading.Lock()
+_ultimo = 0  # (milissegundos << 12) | contador do último UUID gerado no processo
+
+def uuid7():
+    """
+    Gera um UUID versão 7 (RFC 9562): 48 bits de timestamp em milissegundos seguidos de bits aleatórios.
+
+    IDs gerados em sequência ficam em ordem crescente, de modo que as inserções
+    acrescentam entradas ao final dos índices de chave primária em vez de
+    espalhá-las por páginas aleatórias, como acontece com o UUID versão 4. Dentro
+    do mesmo milissegundo os 12 bits seguintes ao timestamp funcionam como contador,
+    mantendo a ordem no processo.
+
+    Returns:
+        str: UUID no formato canônico (36 caracteres)
+    """
+    global _ultimo
+
+    agora = time.time_ns() // 1_000_000
+    with _lock:
+        _ultimo = max(agora << 12, _ultimo + 1)
+        valor = _ultimo
+
+    aleatorio = int.from_bytes(os.urandom(8), 'big') & ((1 << 62) - 1)
+    numero = ((valor >> 12) << 80) | (0x7 << 76) | ((valor & 0xFFF) << 64) | (0b10 << 62) | aleatorio
+    return uuid_str(numero.to_bytes(16, 'big'))
+
+def uuid_bytes(value):
+    """
+    Converte um UUID (str, uuid.UUID ou bytes) para os 16 bytes da representação binária.
+
+    Returns:
+        bytes: 16 bytes ou None se o valor não for um UUID válido
+    """
+    if isinstance(value, str) and len(value) == 36 and value[8] == value[13] == value[18] == value[23] == '-':
+        # Formato canônico (caso comum): conversão direta, sem criar um uuid.UUID
+        try:
+            valor = bytes.fromhex(value.replace('-', ''))
+        except ValueError:
+            return None
+        return valor if len(valor) == 16 else None
+    if isinstance(value, uuid.UUID):
+        return value.bytes
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value)
+        if len(value) == 16:
+            return value
+        value = value.decode('ascii', 'ignore')
+    try:
+        return uuid.UUID(str(value)).bytes
+    except ValueError:
+        return None
+
+def uuid_str(value):
+    """Converte 16 bytes em UUID no formato canônico."""
+    h = bytes(value).hex()
+    return f'{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}'
+
+class UUIDType(TypeDecorator):
+    """
+    Identificador UUID armazenado de forma compacta.
+
+    Usa o tipo nativo UUID no PostgreSQL e BLOB de 16 bytes nos demais bancos, em
+    vez de texto de 36 caracteres, reduzindo as chaves primárias, as chaves
+    estrangeiras e seus índices. No código da aplicação os valores continuam sendo
+    strings no formato canônico. Valores que não são UUID (ex.: um ID inválido na
+    URL) não correspondem a nenhum registro.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(LargeBinary(16))
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        valor = uuid_bytes(value)
+        if valor is None:
+            return None
+        return uuid_str(valor) if dialect.name == 'postgresql' else valor
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        if dialect.name == 'postgresql':
+            return str(value)
+        return uuid_str(value)
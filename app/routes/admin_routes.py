@@ -0,0 +1,51 @@
+import os
+from functools import wraps
+from flask import Blueprint, current_app, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.models import Usuario
+from app import db
+from app.utils.instrumentation import get_route_stats
+
+admin_bp = Blueprint('admin', __name__)
+
+def admin_required(fn):
+    """Restringe a rota aos usuários com perfil ADMIN (requer jwt_required antes)."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        perfil = db.session.query(Usuario.perfil).filter(Usuario.id == get_jwt_identity()).scalar()
+        if perfil != 'ADMIN':
+            return jsonify({'error': 'Acesso restrito a administradores'}), 403
+        return fn(*args, **kwargs)
+
+    return wrapper
+
+@admin_bp.route('/desempenho', methods=['GET'])
+@jwt_required()
+@admin_required
+def get_desempenho():
+    """Retorna os percentis de tempo, SQL e serialização de cada rota (requisições recentes do worker)."""
+    try:
+        if 'desempenho' not in current_app.extensions:
+            return jsonify({'error': 'Instrumentação desativada'}), 404
+
+        rotas = get_route_stats(current_app).summary()
+
+        return jsonify({
+            'worker': os.getpid(),
+            'rotas': dict(sorted(rotas.items(), key=lambda item: item[1]['duracao_ms']['p99'], reverse=True))
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/desempenho', methods=['DELETE'])
+@jwt_required()
+@admin_required
+def reset_desempenho():
+    """Descarta as amostras acumuladas pelo worker."""
+    try:
+        if 'desempenho' in current_app.extensions:
+            get_route_stats(current_app).reset()
+
+        return jsonify({'message': 'Estatísticas de desempenho reiniciadas'}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
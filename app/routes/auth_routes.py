@@ -2,8 +2,10 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token, create_refresh_token
 from app.models import Usuario
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
-import datetime
+from app.utils.password_hashing import verify_password, HashingUnavailable
+from app.utils.rate_limit import get_login_limiter, login_buckets
+from app.utils.last_access import record_last_access
+import math
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -16,17 +18,41 @@ def login():
         if not data or not data.get('email') or not data.get('senha'):
             return jsonify({'error': 'Email e senha são obrigatórios'}), 400
         
+        if not isinstance(data.get('email'), str) or not isinstance(data.get('senha'), str):
+            return jsonify({'error': 'Email e senha devem ser texto'}), 400
+        
+        # Limite de tentativas por email e por IP, verificado antes de qualquer cálculo de hash
+        espera = get_login_limiter().acquire(login_buckets(data.get('email'), request.remote_addr))
+        if espera:
+            response = jsonify({'error': 'Muitas tentativas de login. Tente novamente mais tarde.'})
+            response.headers['Retry-After'] = str(math.ceil(espera))
+            return response, 429
+        
         usuario = Usuario.query.filter_by(email=data.get('email')).first()
         
-        if not usuario or not check_password_hash(usuario.senha_hash, data.get('senha')):
+        if not usuario:
+            return jsonify({'error': 'Credenciais inválidas'}), 401
+        
+        try:
+            valida, novo_hash = verify_password(usuario.senha_hash, data.get('senha'))
+        except HashingUnavailable:
+            response = jsonify({'error': 'Serviço de autenticação sobrecarregado. Tente novamente.'})
+            response.headers['Retry-After'] = '1'
+            return response, 503
+        
+        if not valida:
             return jsonify({'error': 'Credenciais inválidas'}), 401
         
         if not usuario.ativo:
             return jsonify({'error': 'Usuário inativo. Contate o administrador.'}), 403
         
-        # Atualizar último acesso
-        usuario.ultimo_acesso = datetime.datetime.utcnow()
-        db.session.commit()
+        # Hash gerado com método ou custo antigo: substituir pelo configurado
+        if novo_hash:
+            usuario.senha_hash = novo_hash
+            db.session.commit()
+        
+        # Último acesso gravado em lote, fora da transação do login
+        record_last_access(usuario.id)
         
         # Gerar tokens
         access_token = create_access_token(identity=usuario.id)
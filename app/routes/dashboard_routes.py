@@ -0,0 +1,183 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from sqlalchemy import func, extract
+from app.models import Equipamento, Manutencao, OrdemServico, ResumoManutencao
+from app import db
+from app.utils.dashboard_cache import get_dashboard_cache
+from datetime import datetime, MINYEAR, MAXYEAR
+
+dashboard_bp = Blueprint('dashboard', __name__)
+
+# Os dashboards são consultados continuamente pelos painéis dos departamentos; os
+# resultados ficam no cache compartilhado entre workers até que um commit altere
+# uma das tabelas das quais dependem.
+
+MANUTENCAO_PENDENTE = ['AGENDADA', 'EM_ANDAMENTO']
+ORDEM_SERVICO_ENCERRADA = ['CONCLUIDA', 'CANCELADA']
+
+def _responder(nome, parametros, tabelas, calcular):
+    """Retorna o dashboard do cache (ou calculado), indicando a origem no cabeçalho X-Cache."""
+    resultado, acerto = get_dashboard_cache().get_or_compute(nome, parametros, tabelas, calcular)
+    response = jsonify(resultado)
+    response.headers['X-Cache'] = 'HIT' if acerto else 'MISS'
+    return response, 200
+
+def _contagem_por(coluna, query):
+    return {valor: quantidade for valor, quantidade in query.with_entities(coluna, func.count()).group_by(coluna).all()}
+
+def _manutencoes_query(departamento_id):
+    query = db.session.query(Manutencao)
+    if departamento_id:
+        query = query.join(Equipamento, Equipamento.id == Manutencao.equipamento_id).filter(
+            Equipamento.departamento_id == departamento_id
+        )
+    return query
+
+def _equipamentos_query(departamento_id):
+    query = db.session.query(Equipamento)
+    if departamento_id:
+        query = query.filter(Equipamento.departamento_id == departamento_id)
+    return query
+
+def _ordens_servico_query(departamento_id):
+    query = db.session.query(OrdemServico)
+    if departamento_id:
+        query = query.filter(OrdemServico.departamento_id == departamento_id)
+    return query
+
+# Contagens usadas também pelos indicadores de GET /api/metrics
+
+def manutencoes_por_status(departamento_id=None):
+    """Quantidade de manutenções por status."""
+    return _contagem_por(Manutencao.status, _manutencoes_query(departamento_id))
+
+def equipamentos_por_status(departamento_id=None):
+    """Quantidade de equipamentos por status."""
+    return _contagem_por(Equipamento.status, _equipamentos_query(departamento_id))
+
+def ordens_servico_abertas_por_prioridade(departamento_id=None):
+    """Quantidade de ordens de serviço em aberto (nem concluídas nem canceladas) por prioridade."""
+    return _contagem_por(
+        OrdemServico.prioridade,
+        _ordens_servico_query(departamento_id).filter(OrdemServico.status.notin_(ORDEM_SERVICO_ENCERRADA))
+    )
+
+@dashboard_bp.route('/visao-geral', methods=['GET'])
+@jwt_required()
+def get_visao_geral():
+    """Retorna os principais indicadores de equipamentos, manutenções e ordens de serviço."""
+    try:
+        departamento_id = request.args.get('departamento_id')
+
+        def calcular():
+            equipamentos = _contagem_por(Equipamento.status, _equipamentos_query(departamento_id))
+            manutencoes = _contagem_por(Manutencao.status, _manutencoes_query(departamento_id))
+            ordens_servico = _contagem_por(OrdemServico.status, _ordens_servico_query(departamento_id))
+
+            return {
+                'equipamentos': {
+                    'total': sum(equipamentos.values()),
+                    'ativos': equipamentos.get('ATIVO', 0),
+                    'em_manutencao': equipamentos.get('EM_MANUTENCAO', 0)
+                },
+                'manutencoes': {
+                    'total': sum(manutencoes.values()),
+                    'pendentes': sum(manutencoes.get(s, 0) for s in MANUTENCAO_PENDENTE)
+                },
+                'ordens_servico': {
+                    'total': sum(ordens_servico.values()),
+                    'abertas': sum(q for s, q in ordens_servico.items() if s not in ORDEM_SERVICO_ENCERRADA)
+                }
+            }
+
+        return _responder('visao-geral', (departamento_id,), ['equipamentos', 'manutencoes', 'ordens_servico'], calcular)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@dashboard_bp.route('/manutencoes-por-status', methods=['GET'])
+@jwt_required()
+def get_manutencoes_por_status():
+    """Retorna a quantidade de manutenções por status."""
+    try:
+        departamento_id = request.args.get('departamento_id')
+        tabelas = ['manutencoes', 'equipamentos'] if departamento_id else ['manutencoes']
+
+        return _responder(
+            'manutencoes-por-status', (departamento_id,), tabelas,
+            lambda: manutencoes_por_status(departamento_id)
+        )
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@dashboard_bp.route('/equipamentos-por-status', methods=['GET'])
+@jwt_required()
+def get_equipamentos_por_status():
+    """Retorna a quantidade de equipamentos por status."""
+    try:
+        departamento_id = request.args.get('departamento_id')
+
+        return _responder(
+            'equipamentos-por-status', (departamento_id,), ['equipamentos'],
+            lambda: equipamentos_por_status(departamento_id)
+        )
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@dashboard_bp.route('/ordens-servico-por-prioridade', methods=['GET'])
+@jwt_required()
+def get_ordens_servico_por_prioridade():
+    """Retorna a quantidade de ordens de serviço em aberto por prioridade."""
+    try:
+        departamento_id = request.args.get('departamento_id')
+
+        return _responder(
+            'ordens-servico-por-prioridade', (departamento_id,), ['ordens_servico'],
+            lambda: ordens_servico_abertas_por_prioridade(departamento_id)
+        )
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@dashboard_bp.route('/custos-mensais', methods=['GET'])
+@jwt_required()
+def get_custos_mensais():
+    """Retorna os custos de manutenção de cada mês do ano informado."""
+    try:
+        ano = request.args.get('ano', datetime.utcnow().year, type=int)
+        if not MINYEAR <= ano <= MAXYEAR:
+            return jsonify({'error': f'Ano deve estar entre {MINYEAR} e {MAXYEAR}'}), 400
+
+        def calcular():
+            # Calculado a partir do resumo mensal mantido pelos relatórios
+            rows = db.session.query(
+                extract('month', ResumoManutencao.mes),
+                func.sum(ResumoManutencao.custo_mao_de_obra),
+                func.sum(ResumoManutencao.custo_pecas),
+                func.sum(ResumoManutencao.custo_total)
+            ).filter(
+                ResumoManutencao.mes.between(datetime(ano, 1, 1).date(), datetime(ano, 12, 1).date()),
+                ResumoManutencao.status != 'CANCELADA'
+            ).group_by(extract('month', ResumoManutencao.mes)).all()
+
+            custos = {int(row[0]): row[1:] for row in rows}
+            return {
+                'ano': ano,
+                'meses': [{
+                    'mes': mes,
+                    'custo_mao_de_obra': float(custos.get(mes, (0, 0, 0))[0] or 0),
+                    'custo_pecas': float(custos.get(mes, (0, 0, 0))[1] or 0),
+                    'custo_total': float(custos.get(mes, (0, 0, 0))[2] or 0)
+                } for mes in range(1, 13)]
+            }
+
+        return _responder('custos-mensais', (ano,), ['manutencoes'], calcular)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@dashboard_bp.route('/cache', methods=['GET'])
+@jwt_required()
+def get_estatisticas_cache():
+    """Retorna as taxas de acerto do cache de dashboards (somadas entre os workers)."""
+    try:
+        return jsonify(get_dashboard_cache().stats()), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,42 +1,146 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models import Equipamento, Departamento
+from app.models import Equipamento, Departamento, Manutencao
+from app.models.types import uuid7
 from app import db
 from app.utils.validators import validate_equipamento
-from app.utils.helpers import generate_qrcode
-import uuid
+from app.utils.loading import with_loading
+from app.utils.serializers import register, iso, number, first, select_fields
+from app.utils.streaming import NDJSON_MIMETYPE, wants_ndjson, stream_ndjson
+from app.utils.pagination import keyset_paginate
+from app.utils.conditional import resource_version, list_version, is_not_modified, not_modified, set_validators
+from app.utils.search import search_equipamento_ids
+from app.utils.qrcode_jobs import (
+    QRCODE_PENDENTE, RegeneracaoEmAndamento, enqueue_qrcode, enqueue_qrcodes, enqueue_regenerate_all_qrcodes
+)
+from app.utils.bulk_import import EquipamentoImporter, read_csv_rows, read_ndjson_rows
+from app.utils.qrcode_cache import QRCODE_FORMATS, DEFAULT_BOX_SIZE, get_qrcode_cache, qrcode_content
+from app.routes.admin_routes import admin_required
 from datetime import datetime
 
 equipamento_bp = Blueprint('equipamento', __name__)
 
+# Serializadores das listagens e do detalhe
+
+serialize_equipamento_lista = register(Equipamento, 'lista', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'nome': 'nome',
+    'modelo': 'modelo',
+    'fabricante': 'fabricante',
+    'status': 'status',
+    'departamento': 'departamento.nome',
+    'criticidade': 'criticidade',
+    'proxima_manutencao': iso('proxima_manutencao_planejada')
+})
+
+serialize_equipamento_por_departamento = register(Equipamento, 'por_departamento', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'nome': 'nome',
+    'modelo': 'modelo',
+    'status': 'status',
+    'criticidade': 'criticidade'
+})
+
+serialize_equipamento_por_status = register(Equipamento, 'por_status', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'nome': 'nome',
+    'modelo': 'modelo',
+    'departamento': 'departamento.nome',
+    'criticidade': 'criticidade'
+})
+
+serialize_equipamento_busca = register(Equipamento, 'busca', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'nome': 'nome',
+    'modelo': 'modelo',
+    'fabricante': 'fabricante',
+    'numero_serie': 'numero_serie',
+    'departamento': 'departamento.nome',
+    'status': 'status'
+})
+
+serialize_equipamento_historico = register(Manutencao, 'historico_equipamento', {
+    'id': 'id',
+    'tipo_manutencao': 'tipo_manutencao',
+    'status': 'status',
+    'data_inicio': iso('data_inicio'),
+    'data_fim': iso('data_fim'),
+    'tecnico': first('tecnico.nome', 'tecnico_externo.nome'),
+    'custo_total': number('custo_total', 0),
+    'tempo_parada': 'tempo_parada'
+})
+
+serialize_equipamento_detalhe = register(Equipamento, 'detalhe', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'nome': 'nome',
+    'modelo': 'modelo',
+    'fabricante': 'fabricante',
+    'numero_serie': 'numero_serie',
+    'data_aquisicao': iso('data_aquisicao'),
+    'data_garantia': iso('data_garantia'),
+    'valor_aquisicao': number('valor_aquisicao'),
+    'departamento_id': 'departamento_id',
+    'departamento_nome': 'departamento.nome',
+    'localizacao': 'localizacao',
+    'status': 'status',
+    'criticidade': 'criticidade',
+    'ultima_manutencao': iso('ultima_manutencao'),
+    'proxima_manutencao_planejada': iso('proxima_manutencao_planejada'),
+    'especificacoes_tecnicas': 'especificacoes_tecnicas',
+    'documentacao': 'documentacao',
+    'imagens_url': 'imagens_url',
+    'qr_code': 'qr_code',
+    'criado_em': iso('criado_em'),
+    'atualizado_em': iso('atualizado_em')
+})
+
 @equipamento_bp.route('', methods=['GET'])
 @jwt_required()
 def get_equipamentos():
     """Retorna todos os equipamentos cadastrados."""
     try:
+        try:
+            serializer = select_fields(serialize_equipamento_lista)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('size', 10, type=int)
-        
-        equipamentos = Equipamento.query.paginate(page=page, per_page=per_page)
+        cursor = request.args.get('cursor')
+        
+        etag = list_version(Equipamento)
+        if is_not_modified(etag):
+            return not_modified(etag)
+        
+        # Paginação por cursor (keyset), sem OFFSET e sem COUNT por padrão
+        if cursor is not None:
+            try:
+                pagina = keyset_paginate(
+                    serializer.query(), Equipamento, cursor, per_page,
+                    include_total=request.args.get('incluir_total', '').lower() in ('1', 'true')
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            pagina['items'] = serializer.rows(pagina['items'])
+            return set_validators(jsonify(pagina), etag), 200
+        
+        # Colunas lidas como tuplas (Core), sem instanciar objetos do ORM
+        equipamentos = serializer.query().paginate(page=page, per_page=per_page)
         
         result = {
-            'items': [{
-                'id': eq.id,
-                'codigo': eq.codigo,
-                'nome': eq.nome,
-                'modelo': eq.modelo,
-                'fabricante': eq.fabricante,
-                'status': eq.status,
-                'departamento': eq.departamento.nome if eq.departamento else None,
-                'criticidade': eq.criticidade,
-                'proxima_manutencao': eq.proxima_manutencao_planejada.isoformat() if eq.proxima_manutencao_planejada else None
-            } for eq in equipamentos.items],
+            'items': serializer.rows(equipamentos.items),
             'total': equipamentos.total,
             'pages': equipamentos.pages,
             'current_page': equipamentos.page
         }
         
-        return jsonify(result), 200
+        return set_validators(jsonify(result), etag), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -45,37 +149,29 @@ def get_equipamentos():
 def get_equipamento(id):
     """Retorna um equipamento específico pelo ID."""
     try:
-        equipamento = Equipamento.query.get(id)
+        try:
+            serializer = select_fields(serialize_equipamento_detalhe)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        versao = resource_version(Equipamento, id)
+        
+        if not versao:
+            return jsonify({'error': 'Equipamento não encontrado'}), 404
+        
+        # Versão atual já em poder do cliente: 304 sem carregar o registro e seus relacionamentos
+        etag, atualizado_em = versao
+        if is_not_modified(etag, atualizado_em):
+            return not_modified(etag, atualizado_em)
+        
+        equipamento = with_loading(Equipamento.query, serializer).get(id)
         
         if not equipamento:
             return jsonify({'error': 'Equipamento não encontrado'}), 404
         
-        result = {
-            'id': equipamento.id,
-            'codigo': equipamento.codigo,
-            'nome': equipamento.nome,
-            'modelo': equipamento.modelo,
-            'fabricante': equipamento.fabricante,
-            'numero_serie': equipamento.numero_serie,
-            'data_aquisicao': equipamento.data_aquisicao.isoformat() if equipamento.data_aquisicao else None,
-            'data_garantia': equipamento.data_garantia.isoformat() if equipamento.data_garantia else None,
-            'valor_aquisicao': float(equipamento.valor_aquisicao) if equipamento.valor_aquisicao else None,
-            'departamento_id': equipamento.departamento_id,
-            'departamento_nome': equipamento.departamento.nome if equipamento.departamento else None,
-            'localizacao': equipamento.localizacao,
-            'status': equipamento.status,
-            'criticidade': equipamento.criticidade,
-            'ultima_manutencao': equipamento.ultima_manutencao.isoformat() if equipamento.ultima_manutencao else None,
-            'proxima_manutencao_planejada': equipamento.proxima_manutencao_planejada.isoformat() if equipamento.proxima_manutencao_planejada else None,
-            'especificacoes_tecnicas': equipamento.especificacoes_tecnicas,
-            'documentacao': equipamento.documentacao,
-            'imagens_url': equipamento.imagens_url,
-            'qr_code': equipamento.qr_code,
-            'criado_em': equipamento.criado_em.isoformat(),
-            'atualizado_em': equipamento.atualizado_em.isoformat()
-        }
+        result = serializer(equipamento)
         
-        return jsonify(result), 200
+        return set_validators(jsonify(result), etag, atualizado_em), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -105,7 +201,7 @@ def create_equipamento():
         
         # Criar novo equipamento
         novo_equipamento = Equipamento(
-            id=str(uuid.uuid4()),
+            id=uuid7(),
             codigo=data.get('codigo'),
             nome=data.get('nome'),
             modelo=data.get('modelo'),
@@ -123,22 +219,57 @@ def create_equipamento():
             imagens_url=data.get('imagens_url')
         )
         
-        # Gerar QR Code se solicitado
+        # Gerar QR Code em segundo plano se solicitado
         if data.get('gerar_qrcode', False):
-            qr_code_url = generate_qrcode(novo_equipamento.id, novo_equipamento.codigo)
-            novo_equipamento.qr_code = qr_code_url
+            novo_equipamento.qr_code = QRCODE_PENDENTE
         
         db.session.add(novo_equipamento)
         db.session.commit()
         
+        if novo_equipamento.qr_code == QRCODE_PENDENTE:
+            enqueue_qrcode(novo_equipamento.id, novo_equipamento.codigo)
+        
         return jsonify({
             'message': 'Equipamento criado com sucesso',
-            'id': novo_equipamento.id
+            'id': novo_equipamento.id,
+            'qr_code': novo_equipamento.qr_code
         }), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@equipamento_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def importar_equipamentos():
+    """Importa equipamentos em lote a partir de um arquivo CSV ou NDJSON."""
+    try:
+        # Arquivo enviado como multipart (campo "arquivo") ou diretamente no corpo
+        arquivo = request.files.get('arquivo')
+        if arquivo:
+            stream = arquivo.stream
+            formato = 'csv' if (arquivo.filename or '').lower().endswith('.csv') or arquivo.mimetype == 'text/csv' else 'ndjson'
+        else:
+            stream = request.stream
+            formato = {'text/csv': 'csv', NDJSON_MIMETYPE: 'ndjson'}.get(request.mimetype)
+        
+        if formato is None:
+            return jsonify({'error': f'Formato não suportado. Envie text/csv ou {NDJSON_MIMETYPE}'}), 415
+        
+        rows = read_csv_rows(stream) if formato == 'csv' else read_ndjson_rows(stream)
+        importador = EquipamentoImporter(
+            gerar_qrcode=request.args.get('gerar_qrcode', '').lower() in ('1', 'true'),
+            batch_size=min(request.args.get('lote', 1000, type=int), 5000)
+        ).run(rows)
+        
+        # QR Codes gerados em segundo plano, após o commit dos lotes
+        if importador.gerar_qrcode and importador.importados:
+            enqueue_qrcodes([(row['id'], row['codigo']) for _, row in importador.importados])
+        
+        return jsonify(importador.result()), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @equipamento_bp.route('/<id>', methods=['PUT'])
 @jwt_required()
 def update_equipamento(id):
@@ -203,17 +334,21 @@ def update_equipamento(id):
         if data.get('imagens_url'):
             equipamento.imagens_url = data.get('imagens_url')
         
-        # Atualizar QR Code se solicitado
-        if data.get('gerar_qrcode', False):
-            qr_code_url = generate_qrcode(equipamento.id, equipamento.codigo)
-            equipamento.qr_code = qr_code_url
+        # Atualizar QR Code em segundo plano se solicitado
+        gerar_qrcode = data.get('gerar_qrcode', False)
+        if gerar_qrcode:
+            equipamento.qr_code = QRCODE_PENDENTE
         
         equipamento.atualizado_em = datetime.utcnow()
         db.session.commit()
         
+        if gerar_qrcode:
+            enqueue_qrcode(equipamento.id, equipamento.codigo)
+        
         return jsonify({
             'message': 'Equipamento atualizado com sucesso',
-            'id': equipamento.id
+            'id': equipamento.id,
+            'qr_code': equipamento.qr_code
         }), 200
     except Exception as e:
         db.session.rollback()
@@ -250,23 +385,19 @@ def delete_equipamento(id):
 def get_equipamento_historico(id):
     """Retorna o histórico de manutenções de um equipamento."""
     try:
+        try:
+            serializer = select_fields(serialize_equipamento_historico)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         equipamento = Equipamento.query.get(id)
         
         if not equipamento:
             return jsonify({'error': 'Equipamento não encontrado'}), 404
         
-        manutencoes = equipamento.manutencoes
+        manutencoes = serializer.query().filter(Manutencao.equipamento_id == id).all()
         
-        result = [{
-            'id': m.id,
-            'tipo_manutencao': m.tipo_manutencao,
-            'status': m.status,
-            'data_inicio': m.data_inicio.isoformat() if m.data_inicio else None,
-            'data_fim': m.data_fim.isoformat() if m.data_fim else None,
-            'tecnico': m.tecnico.nome if m.tecnico else (m.tecnico_externo.nome if m.tecnico_externo else None),
-            'custo_total': float(m.custo_total) if m.custo_total else 0,
-            'tempo_parada': m.tempo_parada
-        } for m in manutencoes]
+        result = serializer.rows(manutencoes)
         
         return jsonify(result), 200
     except Exception as e:
@@ -275,46 +406,95 @@ def get_equipamento_historico(id):
 @equipamento_bp.route('/<id>/gerar-qrcode', methods=['POST'])
 @jwt_required()
 def gerar_qrcode_equipamento(id):
-    """Gera ou regenera o QR Code para um equipamento."""
+    """Agenda a geração ou regeneração do QR Code de um equipamento."""
     try:
         equipamento = Equipamento.query.get(id)
         
         if not equipamento:
             return jsonify({'error': 'Equipamento não encontrado'}), 404
         
-        qr_code_url = generate_qrcode(equipamento.id, equipamento.codigo)
-        equipamento.qr_code = qr_code_url
-        
+        equipamento.qr_code = QRCODE_PENDENTE
         db.session.commit()
         
+        enqueue_qrcode(equipamento.id, equipamento.codigo)
+        
         return jsonify({
-            'message': 'QR Code gerado com sucesso',
-            'qr_code_url': qr_code_url
-        }), 200
+            'message': 'Geração do QR Code agendada',
+            'qr_code': QRCODE_PENDENTE
+        }), 202
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@equipamento_bp.route('/<id>/qrcode', methods=['GET'])
+@jwt_required()
+def get_qrcode_equipamento(id):
+    """Retorna a imagem do QR Code de um equipamento, renderizada no primeiro acesso."""
+    try:
+        formato = request.args.get('formato', 'png').lower()
+        tamanho = request.args.get('tamanho', DEFAULT_BOX_SIZE, type=int)
+        
+        if formato not in QRCODE_FORMATS:
+            return jsonify({'error': f'Formato inválido. Valores permitidos: {", ".join(QRCODE_FORMATS)}'}), 400
+        
+        if tamanho < 1 or tamanho > 40:
+            return jsonify({'error': 'Tamanho deve ser um número inteiro entre 1 e 40'}), 400
+        
+        if not db.session.query(Equipamento.id).filter_by(id=id).first():
+            return jsonify({'error': 'Equipamento não encontrado'}), 404
+        
+        chave, imagem = get_qrcode_cache(current_app.config).get(qrcode_content(id), formato, tamanho)
+        
+        if chave in request.if_none_match:
+            return Response(status=304)
+        
+        response = Response(imagem, mimetype=QRCODE_FORMATS[formato])
+        response.set_etag(chave)
+        response.cache_control.private = True
+        response.cache_control.max_age = 86400
+        
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@equipamento_bp.route('/qrcodes/regenerar', methods=['POST'])
+@jwt_required()
+@admin_required
+def regenerar_qrcodes():
+    """Agenda a regeneração dos QR Codes de todos os equipamentos em segundo plano."""
+    try:
+        try:
+            enqueue_regenerate_all_qrcodes()
+        except RegeneracaoEmAndamento:
+            return jsonify({'error': 'Já existe uma regeneração dos QR Codes em andamento'}), 409
+        
+        return jsonify({
+            'message': 'Regeneração dos QR Codes agendada'
+        }), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @equipamento_bp.route('/por-departamento/<departamento_id>', methods=['GET'])
 @jwt_required()
 def get_equipamentos_por_departamento(departamento_id):
     """Retorna todos os equipamentos de um departamento específico."""
     try:
+        try:
+            serializer = select_fields(serialize_equipamento_por_departamento)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         departamento = Departamento.query.get(departamento_id)
         
         if not departamento:
             return jsonify({'error': 'Departamento não encontrado'}), 404
         
-        equipamentos = Equipamento.query.filter_by(departamento_id=departamento_id).all()
+        query = serializer.query().filter(Equipamento.departamento_id == departamento_id)
+        
+        if wants_ndjson():
+            return stream_ndjson(query, serializer.from_row)
         
-        result = [{
-            'id': eq.id,
-            'codigo': eq.codigo,
-            'nome': eq.nome,
-            'modelo': eq.modelo,
-            'status': eq.status,
-            'criticidade': eq.criticidade
-        } for eq in equipamentos]
+        result = serializer.rows(query.all())
         
         return jsonify(result), 200
     except Exception as e:
@@ -325,16 +505,17 @@ def get_equipamentos_por_departamento(departamento_id):
 def get_equipamentos_por_status(status):
     """Retorna todos os equipamentos com um status específico."""
     try:
-        equipamentos = Equipamento.query.filter_by(status=status.upper()).all()
+        try:
+            serializer = select_fields(serialize_equipamento_por_status)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        result = [{
-            'id': eq.id,
-            'codigo': eq.codigo,
-            'nome': eq.nome,
-            'modelo': eq.modelo,
-            'departamento': eq.departamento.nome if eq.departamento else None,
-            'criticidade': eq.criticidade
-        } for eq in equipamentos]
+        query = serializer.query().filter(Equipamento.status == status.upper())
+        
+        if wants_ndjson():
+            return stream_ndjson(query, serializer.from_row)
+        
+        result = serializer.rows(query.all())
         
         return jsonify(result), 200
     except Exception as e:
@@ -343,32 +524,42 @@ def get_equipamentos_por_status(status):
 @equipamento_bp.route('/busca', methods=['GET'])
 @jwt_required()
 def buscar_equipamentos():
-    """Busca equipamentos por termo em vários campos."""
+    """Busca equipamentos por termo em vários campos, ordenados por relevância."""
     try:
+        try:
+            serializer = select_fields(serialize_equipamento_busca)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         termo = request.args.get('termo', '')
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = max(min(request.args.get('size', 20, type=int), 100), 1)
         
         if not termo:
             return jsonify({'error': 'Termo de busca não fornecido'}), 400
         
-        # Busca em vários campos
-        equipamentos = Equipamento.query.filter(
-            (Equipamento.codigo.ilike(f'%{termo}%')) |
-            (Equipamento.nome.ilike(f'%{termo}%')) |
-            (Equipamento.modelo.ilike(f'%{termo}%')) |
-            (Equipamento.fabricante.ilike(f'%{termo}%')) |
-            (Equipamento.numero_serie.ilike(f'%{termo}%'))
-        ).all()
-        
-        result = [{
-            'id': eq.id,
-            'codigo': eq.codigo,
-            'nome': eq.nome,
-            'modelo': eq.modelo,
-            'fabricante': eq.fabricante,
-            'numero_serie': eq.numero_serie,
-            'departamento': eq.departamento.nome if eq.departamento else None,
-            'status': eq.status
-        } for eq in equipamentos]
+        # Busca no índice textual (FTS5 no SQLite, pg_trgm/tsvector no PostgreSQL)
+        ids = search_equipamento_ids(termo, page=page, per_page=per_page)
+        
+        if ids is None:
+            # Banco sem índice de busca: busca em vários campos
+            equipamentos = serializer.query().filter(
+                (Equipamento.codigo.ilike(f'%{termo}%')) |
+                (Equipamento.nome.ilike(f'%{termo}%')) |
+                (Equipamento.modelo.ilike(f'%{termo}%')) |
+                (Equipamento.fabricante.ilike(f'%{termo}%')) |
+                (Equipamento.numero_serie.ilike(f'%{termo}%'))
+            ).order_by(Equipamento.codigo).offset((page - 1) * per_page).limit(per_page).all()
+        elif ids:
+            encontrados = {
+                eq.id: eq for eq in
+                serializer.query().filter(Equipamento.id.in_(ids)).all()
+            }
+            equipamentos = [encontrados[eq_id] for eq_id in ids if eq_id in encontrados]
+        else:
+            equipamentos = []
+        
+        result = serializer.rows(equipamentos)
         
         return jsonify(result), 200
     except Exception as e:
@@ -1,41 +1,128 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import Manutencao, Equipamento, Tecnico, TecnicoExterno, EmpresaExterna
+from app.models.types import uuid7
 from app import db
 from app.utils.validators import validate_manutencao
-import uuid
+from app.utils.loading import with_loading
+from app.utils.serializers import register, iso, number, first, select_fields
+from app.utils.streaming import wants_ndjson, stream_ndjson
+from app.utils.pagination import keyset_paginate
+from app.utils.conditional import resource_version, list_version, is_not_modified, not_modified, set_validators
+from app.utils.status_updates import MANUTENCAO_STATUS, bulk_update_manutencao_status
 from datetime import datetime
 
 manutencao_bp = Blueprint('manutencao', __name__)
 
+# Serializadores das listagens e do detalhe
+
+serialize_manutencao_lista = register(Manutencao, 'lista', {
+    'id': 'id',
+    'equipamento': 'equipamento.nome',
+    'tipo_manutencao': 'tipo_manutencao',
+    'status': 'status',
+    'prioridade': 'prioridade',
+    'data_agendamento': iso('data_agendamento'),
+    'data_inicio': iso('data_inicio'),
+    'data_fim': iso('data_fim'),
+    'tecnico': first('tecnico.nome', 'tecnico_externo.nome')
+})
+
+serialize_manutencao_por_equipamento = register(Manutencao, 'por_equipamento', {
+    'id': 'id',
+    'tipo_manutencao': 'tipo_manutencao',
+    'status': 'status',
+    'prioridade': 'prioridade',
+    'data_agendamento': iso('data_agendamento'),
+    'data_inicio': iso('data_inicio'),
+    'data_fim': iso('data_fim'),
+    'tecnico': first('tecnico.nome', 'tecnico_externo.nome'),
+    'custo_total': number('custo_total', 0)
+})
+
+serialize_manutencao_por_tecnico = register(Manutencao, 'por_tecnico', {
+    'id': 'id',
+    'equipamento': 'equipamento.nome',
+    'tipo_manutencao': 'tipo_manutencao',
+    'status': 'status',
+    'prioridade': 'prioridade',
+    'data_agendamento': iso('data_agendamento'),
+    'data_inicio': iso('data_inicio'),
+    'data_fim': iso('data_fim')
+})
+
+serialize_manutencao_detalhe = register(Manutencao, 'detalhe', {
+    'id': 'id',
+    'equipamento_id': 'equipamento_id',
+    'equipamento_nome': 'equipamento.nome',
+    'tipo_manutencao': 'tipo_manutencao',
+    'status': 'status',
+    'prioridade': 'prioridade',
+    'descricao': 'descricao',
+    'data_agendamento': iso('data_agendamento'),
+    'data_inicio': iso('data_inicio'),
+    'data_fim': iso('data_fim'),
+    'tecnico_id': 'tecnico_id',
+    'tecnico_nome': 'tecnico.nome',
+    'tecnico_externo_id': 'tecnico_externo_id',
+    'tecnico_externo_nome': 'tecnico_externo.nome',
+    'empresa_externa_id': 'empresa_externa_id',
+    'empresa_externa_nome': 'empresa_externa.razao_social',
+    'custo_mao_de_obra': number('custo_mao_de_obra', 0),
+    'custo_pecas': number('custo_pecas', 0),
+    'custo_total': number('custo_total', 0),
+    'tempo_parada': 'tempo_parada',
+    'observacoes': 'observacoes',
+    'pecas_substituidas': 'pecas_substituidas',
+    'anexos_url': 'anexos_url',
+    'assinatura_responsavel_url': 'assinatura_responsavel_url',
+    'assinatura_tecnico_url': 'assinatura_tecnico_url',
+    'criado_em': iso('criado_em'),
+    'atualizado_em': iso('atualizado_em')
+})
+
 @manutencao_bp.route('', methods=['GET'])
 @jwt_required()
 def get_manutencoes():
     """Retorna todas as manutenções cadastradas."""
     try:
+        try:
+            serializer = select_fields(serialize_manutencao_lista)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('size', 10, type=int)
+        cursor = request.args.get('cursor')
+        
+        etag = list_version(Manutencao)
+        if is_not_modified(etag):
+            return not_modified(etag)
+        
+        # Paginação por cursor (keyset), sem OFFSET e sem COUNT por padrão
+        if cursor is not None:
+            try:
+                pagina = keyset_paginate(
+                    serializer.query(), Manutencao, cursor, per_page,
+                    include_total=request.args.get('incluir_total', '').lower() in ('1', 'true')
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            pagina['items'] = serializer.rows(pagina['items'])
+            return set_validators(jsonify(pagina), etag), 200
         
-        manutencoes = Manutencao.query.paginate(page=page, per_page=per_page)
+        # Colunas lidas como tuplas (Core), sem instanciar objetos do ORM
+        manutencoes = serializer.query().paginate(page=page, per_page=per_page)
         
         result = {
-            'items': [{
-                'id': m.id,
-                'equipamento': m.equipamento.nome if m.equipamento else None,
-                'tipo_manutencao': m.tipo_manutencao,
-                'status': m.status,
-                'prioridade': m.prioridade,
-                'data_agendamento': m.data_agendamento.isoformat() if m.data_agendamento else None,
-                'data_inicio': m.data_inicio.isoformat() if m.data_inicio else None,
-                'data_fim': m.data_fim.isoformat() if m.data_fim else None,
-                'tecnico': m.tecnico.nome if m.tecnico else (m.tecnico_externo.nome if m.tecnico_externo else None)
-            } for m in manutencoes.items],
+            'items': serializer.rows(manutencoes.items),
             'total': manutencoes.total,
             'pages': manutencoes.pages,
             'current_page': manutencoes.page
         }
         
-        return jsonify(result), 200
+        return set_validators(jsonify(result), etag), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -44,42 +131,29 @@ def get_manutencoes():
 def get_manutencao(id):
     """Retorna uma manutenção específica pelo ID."""
     try:
-        manutencao = Manutencao.query.get(id)
+        try:
+            serializer = select_fields(serialize_manutencao_detalhe)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        versao = resource_version(Manutencao, id)
+        
+        if not versao:
+            return jsonify({'error': 'Manutenção não encontrada'}), 404
+        
+        # Versão atual já em poder do cliente: 304 sem carregar o registro e seus relacionamentos
+        etag, atualizado_em = versao
+        if is_not_modified(etag, atualizado_em):
+            return not_modified(etag, atualizado_em)
+        
+        manutencao = with_loading(Manutencao.query, serializer).get(id)
         
         if not manutencao:
             return jsonify({'error': 'Manutenção não encontrada'}), 404
         
-        result = {
-            'id': manutencao.id,
-            'equipamento_id': manutencao.equipamento_id,
-            'equipamento_nome': manutencao.equipamento.nome if manutencao.equipamento else None,
-            'tipo_manutencao': manutencao.tipo_manutencao,
-            'status': manutencao.status,
-            'prioridade': manutencao.prioridade,
-            'descricao': manutencao.descricao,
-            'data_agendamento': manutencao.data_agendamento.isoformat() if manutencao.data_agendamento else None,
-            'data_inicio': manutencao.data_inicio.isoformat() if manutencao.data_inicio else None,
-            'data_fim': manutencao.data_fim.isoformat() if manutencao.data_fim else None,
-            'tecnico_id': manutencao.tecnico_id,
-            'tecnico_nome': manutencao.tecnico.nome if manutencao.tecnico else None,
-            'tecnico_externo_id': manutencao.tecnico_externo_id,
-            'tecnico_externo_nome': manutencao.tecnico_externo.nome if manutencao.tecnico_externo else None,
-            'empresa_externa_id': manutencao.empresa_externa_id,
-            'empresa_externa_nome': manutencao.empresa_externa.razao_social if manutencao.empresa_externa else None,
-            'custo_mao_de_obra': float(manutencao.custo_mao_de_obra) if manutencao.custo_mao_de_obra else 0,
-            'custo_pecas': float(manutencao.custo_pecas) if manutencao.custo_pecas else 0,
-            'custo_total': float(manutencao.custo_total) if manutencao.custo_total else 0,
-            'tempo_parada': manutencao.tempo_parada,
-            'observacoes': manutencao.observacoes,
-            'pecas_substituidas': manutencao.pecas_substituidas,
-            'anexos_url': manutencao.anexos_url,
-            'assinatura_responsavel_url': manutencao.assinatura_responsavel_url,
-            'assinatura_tecnico_url': manutencao.assinatura_tecnico_url,
-            'criado_em': manutencao.criado_em.isoformat(),
-            'atualizado_em': manutencao.atualizado_em.isoformat()
-        }
+        result = serializer(manutencao)
         
-        return jsonify(result), 200
+        return set_validators(jsonify(result), etag, atualizado_em), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -120,7 +194,7 @@ def create_manutencao():
         
         # Criar nova manutenção
         nova_manutencao = Manutencao(
-            id=str(uuid.uuid4()),
+            id=uuid7(),
             equipamento_id=data.get('equipamento_id'),
             tipo_manutencao=data.get('tipo_manutencao'),
             status=data.get('status', 'AGENDADA'),
@@ -287,6 +361,39 @@ def delete_manutencao(id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@manutencao_bp.route('/status', methods=['PUT'])
+@jwt_required()
+def update_manutencoes_status():
+    """Atualiza o status de várias manutenções em uma única transação."""
+    try:
+        data = request.get_json()
+        
+        if not data or not data.get('status'):
+            return jsonify({'error': 'Status não fornecido'}), 400
+        
+        ids = data.get('ids')
+        if not isinstance(ids, list) or not ids or not all(isinstance(id, str) for id in ids):
+            return jsonify({'error': 'Lista de IDs não fornecida'}), 400
+        
+        if len(ids) > 1000:
+            return jsonify({'error': 'Máximo de 1000 IDs por requisição'}), 400
+        
+        status = data.get('status')
+        if status not in MANUTENCAO_STATUS:
+            return jsonify({'error': f'Status inválido. Valores permitidos: {", ".join(MANUTENCAO_STATUS)}'}), 400
+        
+        resultados = bulk_update_manutencao_status(ids, status)
+        db.session.commit()
+        
+        return jsonify({
+            'status': status,
+            'atualizadas': sum(1 for r in resultados if r['sucesso']),
+            'resultados': resultados
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @manutencao_bp.route('/<id>/status', methods=['PUT'])
 @jwt_required()
 def update_manutencao_status(id):
@@ -326,8 +433,9 @@ def update_manutencao_status(id):
         equipamento = Equipamento.query.get(manutencao.equipamento_id)
         if status == 'EM_ANDAMENTO':
             equipamento.status = 'EM_MANUTENCAO'
-        elif status == 'CONCLUIDA' and equipamento.status == 'EM_MANUTENCAO':
-            equipamento.status = 'ATIVO'
+        elif status == 'CONCLUIDA':
+            if equipamento.status == 'EM_MANUTENCAO':
+                equipamento.status = 'ATIVO'
             equipamento.ultima_manutencao = datetime.utcnow().date()
         
         manutencao.atualizado_em = datetime.utcnow()
@@ -347,24 +455,22 @@ def update_manutencao_status(id):
 def get_manutencoes_por_equipamento(equipamento_id):
     """Retorna todas as manutenções de um equipamento específico."""
     try:
+        try:
+            serializer = select_fields(serialize_manutencao_por_equipamento)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         equipamento = Equipamento.query.get(equipamento_id)
         
         if not equipamento:
             return jsonify({'error': 'Equipamento não encontrado'}), 404
         
-        manutencoes = Manutencao.query.filter_by(equipamento_id=equipamento_id).all()
+        query = serializer.query().filter(Manutencao.equipamento_id == equipamento_id)
         
-        result = [{
-            'id': m.id,
-            'tipo_manutencao': m.tipo_manutencao,
-            'status': m.status,
-            'prioridade': m.prioridade,
-            'data_agendamento': m.data_agendamento.isoformat() if m.data_agendamento else None,
-            'data_inicio': m.data_inicio.isoformat() if m.data_inicio else None,
-            'data_fim': m.data_fim.isoformat() if m.data_fim else None,
-            'tecnico': m.tecnico.nome if m.tecnico else (m.tecnico_externo.nome if m.tecnico_externo else None),
-            'custo_total': float(m.custo_total) if m.custo_total else 0
-        } for m in manutencoes]
+        if wants_ndjson():
+            return stream_ndjson(query, serializer.from_row)
+        
+        result = serializer.rows(query.all())
         
         return jsonify(result), 200
     except Exception as e:
@@ -375,23 +481,22 @@ def get_manutencoes_por_equipamento(equipamento_id):
 def get_manutencoes_por_tecnico(tecnico_id):
     """Retorna todas as manutenções atribuídas a um técnico específico."""
     try:
+        try:
+            serializer = select_fields(serialize_manutencao_por_tecnico)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         tecnico = Tecnico.query.get(tecnico_id)
         
         if not tecnico:
             return jsonify({'error': 'Técnico não encontrado'}), 404
         
-        manutencoes = Manutencao.query.filter_by(tecnico_id=tecnico_id).all()
+        query = serializer.query().filter(Manutencao.tecnico_id == tecnico_id)
         
-        result = [{
-            'id': m.id,
-            'equipamento': m.equipamento.nome if m.equipamento else None,
-            'tipo_manutencao': m.tipo_manutencao,
-            'status': m.status,
-            'prioridade': m.prioridade,
-            'data_agendamento': m.data_agendamento.isoformat() if m.data_agendamento else None,
-            'data_inicio': m.data_inicio.isoformat() if m.data_inicio else None,
-            'data_fim': m.data_fim.isoformat() if m.data_fim else None
-        } for m in manutencoes]
+        if wants_ndjson():
+            return stream_ndjson(query, serializer.from_row)
+        
+        result = serializer.rows(query.all())
         
         return jsonify(result), 200
     except Exception as e:
@@ -402,6 +507,11 @@ def get_manutencoes_por_tecnico(tecnico_id):
 def get_manutencoes_por_periodo():
     """Retorna todas as manutenções em um período específico."""
     try:
+        try:
+            serializer = select_fields(serialize_manutencao_lista)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         inicio = request.args.get('inicio')
         fim = request.args.get('fim')
         
@@ -415,22 +525,15 @@ def get_manutencoes_por_periodo():
             return jsonify({'error': 'Formato de data inválido. Use ISO 8601 (YYYY-MM-DDTHH:MM:SS)'}), 400
         
         # Buscar manutenções no período
-        manutencoes = Manutencao.query.filter(
+        query = serializer.query().filter(
             Manutencao.data_agendamento >= data_inicio,
             Manutencao.data_agendamento <= data_fim
-        ).all()
-        
-        result = [{
-            'id': m.id,
-            'equipamento': m.equipamento.nome if m.equipamento else None,
-            'tipo_manutencao': m.tipo_manutencao,
-            'status': m.status,
-            'prioridade': m.prioridade,
-            'data_agendamento': m.data_agendamento.isoformat() if m.data_agendamento else None,
-            'data_inicio': m.data_inicio.isoformat() if m.data_inicio else None,
-            'data_fim': m.data_fim.isoformat() if m.data_fim else None,
-            'tecnico': m.tecnico.nome if m.tecnico else (m.tecnico_externo.nome if m.tecnico_externo else None)
-        } for m in manutencoes]
+        )
+        
+        if wants_ndjson():
+            return stream_ndjson(query, serializer.from_row)
+        
+        result = serializer.rows(query.all())
         
         return jsonify(result), 200
     except Exception as e:
@@ -0,0 +1,28 @@
+import hmac
+from flask import Blueprint, current_app, jsonify, request
+from prometheus_client import CONTENT_TYPE_LATEST
+from app.utils.metrics import generate_metrics
+
+metricas_bp = Blueprint('metricas', __name__)
+
+@metricas_bp.route('', methods=['GET'])
+def get_metricas():
+    """Retorna as métricas da aplicação no formato de exposição do Prometheus."""
+    try:
+        if not current_app.config.get('METRICAS', True):
+            return jsonify({'error': 'Métricas desativadas'}), 404
+
+        # O coletor do Prometheus não usa os tokens JWT da API; o acesso é protegido por
+        # um token fixo ou, sem token configurado, restrito aos endereços de METRICAS_IPS
+        token = current_app.config.get('METRICAS_TOKEN')
+        if token:
+            if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+                return jsonify({'error': 'Token de métricas inválido'}), 401
+        else:
+            permitidos = {ip.strip() for ip in (current_app.config.get('METRICAS_IPS') or '').split(',') if ip.strip()}
+            if request.remote_addr not in permitidos:
+                return jsonify({'error': 'Acesso às métricas não permitido'}), 403
+
+        return current_app.response_class(generate_metrics(), content_type=CONTENT_TYPE_LATEST), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,194 @@
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import or_, and_
+from app.models import Notificacao
+from app import db
+from app.utils.pagination import keyset_paginate, encode_cursor, decode_cursor
+from app.utils.notifications import get_unread_counter, mark_as_read
+from datetime import datetime
+import json
+import threading
+import time
+
+notificacao_bp = Blueprint('notificacao', __name__)
+
+# Segundos sugeridos (Retry-After) ao cliente recusado por excesso de conexões SSE
+SSE_RETRY_AFTER = 30
+
+_streams_lock = threading.Lock()
+
+def serialize_notificacao(n):
+    return {
+        'id': n.id,
+        'titulo': n.titulo,
+        'mensagem': n.mensagem,
+        'tipo': n.tipo,
+        'lida': n.lida,
+        'link': n.link,
+        'criado_em': n.criado_em.isoformat() if n.criado_em else None
+    }
+
+@notificacao_bp.route('', methods=['GET'])
+@jwt_required()
+def get_notificacoes():
+    """Retorna as notificações do usuário autenticado, paginadas por cursor."""
+    try:
+        usuario_id = get_jwt_identity()
+        query = Notificacao.query.filter(Notificacao.usuario_id == usuario_id)
+
+        if request.args.get('nao_lidas', '').lower() in ('1', 'true'):
+            query = query.filter(Notificacao.lida.is_(False))
+
+        try:
+            pagina = keyset_paginate(query, Notificacao, request.args.get('cursor'), request.args.get('size', 20, type=int))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        pagina['items'] = [serialize_notificacao(n) for n in pagina['items']]
+        pagina['nao_lidas'] = get_unread_counter().get(usuario_id)
+        return jsonify(pagina), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@notificacao_bp.route('/nao-lidas', methods=['GET'])
+@jwt_required()
+def get_notificacoes_nao_lidas():
+    """Retorna a quantidade de notificações não lidas (contador em cache, sem consulta ao banco)."""
+    try:
+        return jsonify({'nao_lidas': get_unread_counter().get(get_jwt_identity())}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@notificacao_bp.route('/lidas', methods=['PUT'])
+@jwt_required()
+def marcar_notificacoes_lidas():
+    """Marca como lidas as notificações informadas ou, com "todas": true, todas as não lidas."""
+    try:
+        usuario_id = get_jwt_identity()
+        data = request.get_json() or {}
+
+        if data.get('todas') is True:
+            ids = None
+        else:
+            ids = data.get('ids')
+            if not isinstance(ids, list) or not ids or not all(isinstance(id, str) for id in ids):
+                return jsonify({'error': 'Lista de IDs não fornecida'}), 400
+
+            if len(ids) > 1000:
+                return jsonify({'error': 'Máximo de 1000 IDs por requisição'}), 400
+
+        marcadas = mark_as_read(usuario_id, ids)
+        db.session.commit()
+
+        return jsonify({
+            'marcadas': marcadas,
+            'nao_lidas': get_unread_counter().get(usuario_id)
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def _evento(nome, dados, id=None):
+    """Formata um evento no protocolo Server-Sent Events."""
+    linhas = [f'event: {nome}']
+    if id:
+        linhas.append(f'id: {id}')
+    linhas.append(f'data: {json.dumps(dados)}')
+    return '\n'.join(linhas) + '\n\n'
+
+def _streams():
+    """Retorna o semáforo das conexões SSE abertas no worker (NOTIFICACOES_SSE_MAXIMO)."""
+    app = current_app._get_current_object()
+    with _streams_lock:
+        semaforo = app.extensions.get('notificacoes_sse')
+        if semaforo is None:
+            semaforo = app.extensions['notificacoes_sse'] = threading.BoundedSemaphore(
+                app.config.get('NOTIFICACOES_SSE_MAXIMO', 4)
+            )
+        return semaforo
+
+@notificacao_bp.route('/stream', methods=['GET'])
+@jwt_required(locations=['headers', 'query_string'])
+def stream_notificacoes():
+    """
+    Envia as novas notificações do usuário por Server-Sent Events.
+
+    A cada intervalo apenas a versão do contador compartilhado é verificada; o banco
+    só é consultado quando um commit criou ou alterou notificações do usuário. A
+    conexão é encerrada após NOTIFICACOES_SSE_DURACAO segundos e o cliente (EventSource)
+    reconecta enviando Last-Event-ID, continuando do ponto em que parou.
+
+    Cada conexão ocupa uma thread do worker; acima de NOTIFICACOES_SSE_MAXIMO conexões
+    simultâneas a requisição é recusada com 503, preservando as demais threads para a API.
+    """
+    try:
+        usuario_id = get_jwt_identity()
+        cursor = request.headers.get('Last-Event-ID') or request.args.get('desde')
+
+        if cursor:
+            try:
+                ultima = decode_cursor(cursor)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        else:
+            # Sem cursor: enviar apenas as notificações criadas a partir de agora
+            recente = db.session.query(Notificacao.criado_em, Notificacao.id).filter(
+                Notificacao.usuario_id == usuario_id
+            ).order_by(Notificacao.criado_em.desc(), Notificacao.id.desc()).first()
+            ultima = tuple(recente) if recente else (datetime.min, '')
+
+        counter = get_unread_counter()
+        intervalo = current_app.config.get('NOTIFICACOES_SSE_INTERVALO', 1)
+        duracao = current_app.config.get('NOTIFICACOES_SSE_DURACAO', 300)
+        heartbeat = current_app.config.get('NOTIFICACOES_SSE_HEARTBEAT', 15)
+
+        def generate():
+            nonlocal ultima
+            fim = time.monotonic() + duracao
+            versao = None
+            ultimo_envio = time.monotonic()
+            yield 'retry: 3000\n\n'
+
+            while True:
+                atual = counter.version(usuario_id)
+                if atual != versao:
+                    versao = atual
+                    novas = Notificacao.query.filter(
+                        Notificacao.usuario_id == usuario_id,
+                        or_(Notificacao.criado_em > ultima[0],
+                            and_(Notificacao.criado_em == ultima[0], Notificacao.id > ultima[1]))
+                    ).order_by(Notificacao.criado_em, Notificacao.id).limit(100).all()
+
+                    for n in novas:
+                        ultima = (n.criado_em, n.id)
+                        yield _evento('notificacao', serialize_notificacao(n), encode_cursor(n.criado_em, n.id))
+                    yield _evento('contador', {'nao_lidas': counter.get(usuario_id)})
+
+                    # Devolver a conexão ao pool enquanto aguarda
+                    db.session.close()
+                    ultimo_envio = time.monotonic()
+                    if len(novas) == 100:
+                        versao = None
+                        continue
+                elif time.monotonic() - ultimo_envio >= heartbeat:
+                    yield ': ping\n\n'
+                    ultimo_envio = time.monotonic()
+
+                if time.monotonic() >= fim:
+                    return
+                time.sleep(intervalo)
+
+        streams = _streams()
+        if not streams.acquire(blocking=False):
+            response = jsonify({'error': 'Limite de conexões de notificações atingido'})
+            response.headers['Retry-After'] = str(SSE_RETRY_AFTER)
+            return response, 503
+
+        response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+        # Liberada ao encerrar a resposta, inclusive quando o cliente desconecta
+        response.call_on_close(streams.release)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
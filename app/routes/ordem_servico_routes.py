@@ -1,41 +1,145 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models import OrdemServico, Equipamento, Departamento, Usuario, Manutencao
+from app.models.types import uuid7
 from app import db
 from app.utils.validators import validate_ordem_servico
-import uuid
+from app.utils.loading import with_loading
+from app.utils.serializers import register, iso, select_fields
+from app.utils.streaming import wants_ndjson, stream_ndjson
+from app.utils.pagination import keyset_paginate
+from app.utils.conditional import resource_version, list_version, is_not_modified, not_modified, set_validators
+from app.utils.sequences import next_codigo_ordem_servico
+from app.utils.status_updates import ORDEM_SERVICO_STATUS, bulk_update_ordem_servico_status
 from datetime import datetime
 
 ordem_servico_bp = Blueprint('ordem_servico', __name__)
 
+# Serializadores das listagens e do detalhe
+
+serialize_ordem_lista = register(OrdemServico, 'lista', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'equipamento': 'equipamento.nome',
+    'departamento': 'departamento.nome',
+    'solicitante': 'solicitante.nome',
+    'tipo_servico': 'tipo_servico',
+    'prioridade': 'prioridade',
+    'status': 'status',
+    'data_abertura': iso('data_abertura')
+})
+
+serialize_ordem_por_solicitante = register(OrdemServico, 'por_solicitante', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'equipamento': 'equipamento.nome',
+    'tipo_servico': 'tipo_servico',
+    'prioridade': 'prioridade',
+    'status': 'status',
+    'data_abertura': iso('data_abertura')
+})
+
+serialize_ordem_por_departamento = register(OrdemServico, 'por_departamento', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'equipamento': 'equipamento.nome',
+    'solicitante': 'solicitante.nome',
+    'tipo_servico': 'tipo_servico',
+    'prioridade': 'prioridade',
+    'status': 'status',
+    'data_abertura': iso('data_abertura')
+})
+
+serialize_ordem_por_equipamento = register(OrdemServico, 'por_equipamento', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'departamento': 'departamento.nome',
+    'solicitante': 'solicitante.nome',
+    'tipo_servico': 'tipo_servico',
+    'prioridade': 'prioridade',
+    'status': 'status',
+    'data_abertura': iso('data_abertura')
+})
+
+serialize_ordem_por_status = register(OrdemServico, 'por_status', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'equipamento': 'equipamento.nome',
+    'departamento': 'departamento.nome',
+    'solicitante': 'solicitante.nome',
+    'tipo_servico': 'tipo_servico',
+    'prioridade': 'prioridade',
+    'data_abertura': iso('data_abertura')
+})
+
+serialize_ordem_detalhe = register(OrdemServico, 'detalhe', {
+    'id': 'id',
+    'codigo': 'codigo',
+    'equipamento_id': 'equipamento_id',
+    'equipamento_nome': 'equipamento.nome',
+    'departamento_id': 'departamento_id',
+    'departamento_nome': 'departamento.nome',
+    'solicitante_id': 'solicitante_id',
+    'solicitante_nome': 'solicitante.nome',
+    'tipo_servico': 'tipo_servico',
+    'descricao_problema': 'descricao_problema',
+    'prioridade': 'prioridade',
+    'status': 'status',
+    'data_abertura': iso('data_abertura'),
+    'data_atribuicao': iso('data_atribuicao'),
+    'data_inicio': iso('data_inicio'),
+    'data_fim': iso('data_fim'),
+    'manutencao_id': 'manutencao_id',
+    'anexos_url': 'anexos_url',
+    'observacoes': 'observacoes',
+    'avaliacao_satisfacao': 'avaliacao_satisfacao',
+    'comentario_avaliacao': 'comentario_avaliacao',
+    'criado_em': iso('criado_em'),
+    'atualizado_em': iso('atualizado_em')
+})
+
 @ordem_servico_bp.route('', methods=['GET'])
 @jwt_required()
 def get_ordens_servico():
     """Retorna todas as ordens de serviço cadastradas."""
     try:
+        try:
+            serializer = select_fields(serialize_ordem_lista)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('size', 10, type=int)
+        cursor = request.args.get('cursor')
+        
+        etag = list_version(OrdemServico)
+        if is_not_modified(etag):
+            return not_modified(etag)
         
-        ordens = OrdemServico.query.paginate(page=page, per_page=per_page)
+        # Paginação por cursor (keyset), sem OFFSET e sem COUNT por padrão
+        if cursor is not None:
+            try:
+                pagina = keyset_paginate(
+                    serializer.query(), OrdemServico, cursor, per_page,
+                    include_total=request.args.get('incluir_total', '').lower() in ('1', 'true')
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
+            pagina['items'] = serializer.rows(pagina['items'])
+            return set_validators(jsonify(pagina), etag), 200
+        
+        # Colunas lidas como tuplas (Core), sem instanciar objetos do ORM
+        ordens = serializer.query().paginate(page=page, per_page=per_page)
         
         result = {
-            'items': [{
-                'id': os.id,
-                'codigo': os.codigo,
-                'equipamento': os.equipamento.nome if os.equipamento else None,
-                'departamento': os.departamento.nome if os.departamento else None,
-                'solicitante': os.solicitante.nome if os.solicitante else None,
-                'tipo_servico': os.tipo_servico,
-                'prioridade': os.prioridade,
-                'status': os.status,
-                'data_abertura': os.data_abertura.isoformat() if os.data_abertura else None
-            } for os in ordens.items],
+            'items': serializer.rows(ordens.items),
             'total': ordens.total,
             'pages': ordens.pages,
             'current_page': ordens.page
         }
         
-        return jsonify(result), 200
+        return set_validators(jsonify(result), etag), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -44,38 +148,29 @@ def get_ordens_servico():
 def get_ordem_servico(id):
     """Retorna uma ordem de serviço específica pelo ID."""
     try:
-        ordem = OrdemServico.query.get(id)
+        try:
+            serializer = select_fields(serialize_ordem_detalhe)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        versao = resource_version(OrdemServico, id)
+        
+        if not versao:
+            return jsonify({'error': 'Ordem de serviço não encontrada'}), 404
+        
+        # Versão atual já em poder do cliente: 304 sem carregar o registro e seus relacionamentos
+        etag, atualizado_em = versao
+        if is_not_modified(etag, atualizado_em):
+            return not_modified(etag, atualizado_em)
+        
+        ordem = with_loading(OrdemServico.query, serializer).get(id)
         
         if not ordem:
             return jsonify({'error': 'Ordem de serviço não encontrada'}), 404
         
-        result = {
-            'id': ordem.id,
-            'codigo': ordem.codigo,
-            'equipamento_id': ordem.equipamento_id,
-            'equipamento_nome': ordem.equipamento.nome if ordem.equipamento else None,
-            'departamento_id': ordem.departamento_id,
-            'departamento_nome': ordem.departamento.nome if ordem.departamento else None,
-            'solicitante_id': ordem.solicitante_id,
-            'solicitante_nome': ordem.solicitante.nome if ordem.solicitante else None,
-            'tipo_servico': ordem.tipo_servico,
-            'descricao_problema': ordem.descricao_problema,
-            'prioridade': ordem.prioridade,
-            'status': ordem.status,
-            'data_abertura': ordem.data_abertura.isoformat() if ordem.data_abertura else None,
-            'data_atribuicao': ordem.data_atribuicao.isoformat() if ordem.data_atribuicao else None,
-            'data_inicio': ordem.data_inicio.isoformat() if ordem.data_inicio else None,
-            'data_fim': ordem.data_fim.isoformat() if ordem.data_fim else None,
-            'manutencao_id': ordem.manutencao_id,
-            'anexos_url': ordem.anexos_url,
-            'observacoes': ordem.observacoes,
-            'avaliacao_satisfacao': ordem.avaliacao_satisfacao,
-            'comentario_avaliacao': ordem.comentario_avaliacao,
-            'criado_em': ordem.criado_em.isoformat(),
-            'atualizado_em': ordem.atualizado_em.isoformat()
-        }
+        result = serializer(ordem)
         
-        return jsonify(result), 200
+        return set_validators(jsonify(result), etag, atualizado_em), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -107,19 +202,11 @@ def create_ordem_servico():
             return jsonify({'error': 'Solicitante não encontrado'}), 404
         
         # Gerar código único para a ordem de serviço
-        ultimo_codigo = OrdemServico.query.order_by(OrdemServico.codigo.desc()).first()
-        if ultimo_codigo:
-            try:
-                num = int(ultimo_codigo.codigo.split('-')[1]) + 1
-                codigo = f"OS-{num:06d}"
-            except:
-                codigo = f"OS-{1:06d}"
-        else:
-            codigo = f"OS-{1:06d}"
+        codigo = next_codigo_ordem_servico()
         
         # Criar nova ordem de serviço
         nova_ordem = OrdemServico(
-            id=str(uuid.uuid4()),
+            id=uuid7(),
             codigo=codigo,
             equipamento_id=data.get('equipamento_id'),
             departamento_id=data.get('departamento_id'),
@@ -255,6 +342,39 @@ def delete_ordem_servico(id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@ordem_servico_bp.route('/status', methods=['PUT'])
+@jwt_required()
+def update_ordens_servico_status():
+    """Atualiza o status de várias ordens de serviço em uma única transação."""
+    try:
+        data = request.get_json()
+        
+        if not data or not data.get('status'):
+            return jsonify({'error': 'Status não fornecido'}), 400
+        
+        ids = data.get('ids')
+        if not isinstance(ids, list) or not ids or not all(isinstance(id, str) for id in ids):
+            return jsonify({'error': 'Lista de IDs não fornecida'}), 400
+        
+        if len(ids) > 1000:
+            return jsonify({'error': 'Máximo de 1000 IDs por requisição'}), 400
+        
+        status = data.get('status')
+        if status not in ORDEM_SERVICO_STATUS:
+            return jsonify({'error': f'Status inválido. Valores permitidos: {", ".join(ORDEM_SERVICO_STATUS)}'}), 400
+        
+        resultados = bulk_update_ordem_servico_status(ids, status)
+        db.session.commit()
+        
+        return jsonify({
+            'status': status,
+            'atualizadas': sum(1 for r in resultados if r['sucesso']),
+            'resultados': resultados
+        }), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @ordem_servico_bp.route('/<id>/status', methods=['PUT'])
 @jwt_required()
 def update_ordem_servico_status(id):
@@ -304,22 +424,22 @@ def update_ordem_servico_status(id):
 def get_ordens_por_solicitante(solicitante_id):
     """Retorna todas as ordens de serviço de um solicitante específico."""
     try:
+        try:
+            serializer = select_fields(serialize_ordem_por_solicitante)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         solicitante = Usuario.query.get(solicitante_id)
         
         if not solicitante:
             return jsonify({'error': 'Solicitante não encontrado'}), 404
         
-        ordens = OrdemServico.query.filter_by(solicitante_id=solicitante_id).all()
+        query = serializer.query().filter(OrdemServico.solicitante_id == solicitante_id)
+        
+        if wants_ndjson():
+            return stream_ndjson(query, serializer.from_row)
         
-        result = [{
-            'id': os.id,
-            'codigo': os.codigo,
-            'equipamento': os.equipamento.nome if os.equipamento else None,
-            'tipo_servico': os.tipo_servico,
-            'prioridade': os.prioridade,
-            'status': os.status,
-            'data_abertura': os.data_abertura.isoformat() if os.data_abertura else None
-        } for os in ordens]
+        result = serializer.rows(query.all())
         
         return jsonify(result), 200
     except Exception as e:
@@ -330,23 +450,22 @@ def get_ordens_por_solicitante(solicitante_id):
 def get_ordens_por_departamento(departamento_id):
     """Retorna todas as ordens de serviço de um departamento específico."""
     try:
+        try:
+            serializer = select_fields(serialize_ordem_por_departamento)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         departamento = Departamento.query.get(departamento_id)
         
         if not departamento:
             return jsonify({'error': 'Departamento não encontrado'}), 404
         
-        ordens = OrdemServico.query.filter_by(departamento_id=departamento_id).all()
+        query = serializer.query().filter(OrdemServico.departamento_id == departamento_id)
         
-        result = [{
-            'id': os.id,
-            'codigo': os.codigo,
-            'equipamento': os.equipamento.nome if os.equipamento else None,
-            'solicitante': os.solicitante.nome if os.solicitante else None,
-            'tipo_servico': os.tipo_servico,
-            'prioridade': os.prioridade,
-            'status': os.status,
-            'data_abertura': os.data_abertura.isoformat() if os.data_abertura else None
-        } for os in ordens]
+        if wants_ndjson():
+            return stream_ndjson(query, serializer.from_row)
+        
+        result = serializer.rows(query.all())
         
         return jsonify(result), 200
     except Exception as e:
@@ -357,23 +476,22 @@ def get_ordens_por_departamento(departamento_id):
 def get_ordens_por_equipamento(equipamento_id):
     """Retorna todas as ordens de serviço de um equipamento específico."""
     try:
+        try:
+            serializer = select_fields(serialize_ordem_por_equipamento)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         equipamento = Equipamento.query.get(equipamento_id)
         
         if not equipamento:
             return jsonify({'error': 'Equipamento não encontrado'}), 404
         
-        ordens = OrdemServico.query.filter_by(equipamento_id=equipamento_id).all()
+        query = serializer.query().filter(OrdemServico.equipamento_id == equipamento_id)
+        
+        if wants_ndjson():
+            return stream_ndjson(query, serializer.from_row)
         
-        result = [{
-            'id': os.id,
-            'codigo': os.codigo,
-            'departamento': os.departamento.nome if os.departamento else None,
-            'solicitante': os.solicitante.nome if os.solicitante else None,
-            'tipo_servico': os.tipo_servico,
-            'prioridade': os.prioridade,
-            'status': os.status,
-            'data_abertura': os.data_abertura.isoformat() if os.data_abertura else None
-        } for os in ordens]
+        result = serializer.rows(query.all())
         
         return jsonify(result), 200
     except Exception as e:
@@ -384,23 +502,22 @@ def get_ordens_por_equipamento(equipamento_id):
 def get_ordens_por_status(status):
     """Retorna todas as ordens de serviço com um status específico."""
     try:
+        try:
+            serializer = select_fields(serialize_ordem_por_status)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         status_validos = ['ABERTA', 'ATRIBUIDA', 'EM_ANDAMENTO', 'AGUARDANDO_PECAS', 'CONCLUIDA', 'CANCELADA']
         
         if status.upper() not in status_validos:
             return jsonify({'error': f'Status inválido. Valores permitidos: {", ".join(status_validos)}'}), 400
         
-        ordens = OrdemServico.query.filter_by(status=status.upper()).all()
-        
-        result = [{
-            'id': os.id,
-            'codigo': os.codigo,
-            'equipamento': os.equipamento.nome if os.equipamento else None,
-            'departamento': os.departamento.nome if os.departamento else None,
-            'solicitante': os.solicitante.nome if os.solicitante else None,
-            'tipo_servico': os.tipo_servico,
-            'prioridade': os.prioridade,
-            'data_abertura': os.data_abertura.isoformat() if os.data_abertura else None
-        } for os in ordens]
+        query = serializer.query().filter(OrdemServico.status == status.upper())
+        
+        if wants_ndjson():
+            return stream_ndjson(query, serializer.from_row)
+        
+        result = serializer.rows(query.all())
         
         return jsonify(result), 200
     except Exception as e:
@@ -0,0 +1,337 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from app.models import (Manutencao, Equipamento, Departamento, Tecnico, Certificado,
+                        ResumoManutencao, ResumoOrdemServico)
+from app import db
+from app.utils.aggregates import month_start, next_month
+from datetime import datetime, date
+
+relatorio_bp = Blueprint('relatorio', __name__)
+
+# Os relatórios com período são calculados a partir das tabelas de resumo mensal
+# (resumo_manutencoes e resumo_ordens_servico), mantidas incrementalmente a cada
+# escrita em manutenções e ordens de serviço. Por isso o período tem granularidade
+# de mês: inicio e fim são arredondados para os meses que os contêm.
+
+def _periodo():
+    """Lê os parâmetros inicio/fim e retorna (primeiro mês, último mês) ou uma resposta de erro."""
+    inicio = request.args.get('inicio')
+    fim = request.args.get('fim')
+
+    if not inicio:
+        return None, (jsonify({'error': 'Data de início não fornecida'}), 400)
+
+    try:
+        data_inicio = datetime.fromisoformat(inicio)
+        data_fim = datetime.fromisoformat(fim) if fim else datetime.utcnow()
+    except ValueError:
+        return None, (jsonify({'error': 'Formato de data inválido. Use ISO 8601 (YYYY-MM-DD)'}), 400)
+
+    if data_fim < data_inicio:
+        return None, (jsonify({'error': 'Data de fim anterior à data de início'}), 400)
+
+    return (month_start(data_inicio), month_start(data_fim)), None
+
+def _media(total, quantidade):
+    return round(total / quantidade, 2) if quantidade else None
+
+@relatorio_bp.route('/manutencoes', methods=['GET'])
+@jwt_required()
+def get_relatorio_manutencoes():
+    """Retorna o resumo das manutenções no período, por status, tipo e mês."""
+    try:
+        periodo, erro = _periodo()
+        if erro:
+            return erro
+
+        filtro = ResumoManutencao.mes.between(*periodo)
+        quantidade = func.sum(ResumoManutencao.quantidade)
+
+        por_status = db.session.query(ResumoManutencao.status, quantidade).filter(filtro).group_by(ResumoManutencao.status).all()
+        por_tipo = db.session.query(ResumoManutencao.tipo_manutencao, quantidade).filter(filtro).group_by(ResumoManutencao.tipo_manutencao).all()
+        por_mes = db.session.query(ResumoManutencao.mes, quantidade).filter(filtro).group_by(ResumoManutencao.mes).order_by(ResumoManutencao.mes).all()
+
+        return jsonify({
+            'inicio': periodo[0].isoformat(),
+            'fim': periodo[1].isoformat(),
+            'total': sum(int(q) for _, q in por_status),
+            'por_status': {status: int(q) for status, q in por_status},
+            'por_tipo': {tipo: int(q) for tipo, q in por_tipo},
+            'por_mes': [{'mes': mes.isoformat(), 'quantidade': int(q)} for mes, q in por_mes]
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@relatorio_bp.route('/custos-manutencao', methods=['GET'])
+@jwt_required()
+def get_relatorio_custos_manutencao():
+    """Retorna os custos de manutenção no período, por mês e por departamento."""
+    try:
+        periodo, erro = _periodo()
+        if erro:
+            return erro
+
+        filtros = [ResumoManutencao.mes.between(*periodo), ResumoManutencao.status != 'CANCELADA']
+        custos = [
+            func.sum(ResumoManutencao.custo_mao_de_obra),
+            func.sum(ResumoManutencao.custo_pecas),
+            func.sum(ResumoManutencao.custo_total)
+        ]
+
+        def serializar_custos(mao_de_obra, pecas, total):
+            return {
+                'custo_mao_de_obra': float(mao_de_obra or 0),
+                'custo_pecas': float(pecas or 0),
+                'custo_total': float(total or 0)
+            }
+
+        por_mes = db.session.query(ResumoManutencao.mes, *custos).filter(*filtros).group_by(ResumoManutencao.mes).order_by(ResumoManutencao.mes).all()
+
+        por_departamento = db.session.query(Departamento.id, Departamento.nome, *custos).select_from(ResumoManutencao).join(
+            Equipamento, Equipamento.id == ResumoManutencao.equipamento_id
+        ).join(
+            Departamento, Departamento.id == Equipamento.departamento_id
+        ).filter(*filtros).group_by(Departamento.id, Departamento.nome).all()
+
+        return jsonify({
+            'inicio': periodo[0].isoformat(),
+            'fim': periodo[1].isoformat(),
+            'total': serializar_custos(
+                sum(row[1] or 0 for row in por_mes),
+                sum(row[2] or 0 for row in por_mes),
+                sum(row[3] or 0 for row in por_mes)
+            ),
+            'por_mes': [dict(mes=row[0].isoformat(), **serializar_custos(*row[1:])) for row in por_mes],
+            'por_departamento': [
+                dict(departamento_id=row[0], departamento=row[1], **serializar_custos(*row[2:]))
+                for row in por_departamento
+            ]
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@relatorio_bp.route('/tempo-medio-atendimento', methods=['GET'])
+@jwt_required()
+def get_relatorio_tempo_medio_atendimento():
+    """Retorna o tempo médio de atendimento e de resolução das ordens de serviço (em minutos)."""
+    try:
+        periodo, erro = _periodo()
+        if erro:
+            return erro
+
+        rows = db.session.query(
+            ResumoOrdemServico.prioridade,
+            func.sum(ResumoOrdemServico.quantidade),
+            func.sum(ResumoOrdemServico.atendidas),
+            func.sum(ResumoOrdemServico.tempo_atendimento),
+            func.sum(ResumoOrdemServico.resolvidas),
+            func.sum(ResumoOrdemServico.tempo_resolucao)
+        ).filter(
+            ResumoOrdemServico.mes.between(*periodo)
+        ).group_by(ResumoOrdemServico.prioridade).all()
+
+        def serializar(quantidade, atendidas, tempo_atendimento, resolvidas, tempo_resolucao):
+            return {
+                'quantidade': int(quantidade or 0),
+                'atendidas': int(atendidas or 0),
+                'tempo_medio_atendimento': _media(tempo_atendimento or 0, atendidas),
+                'resolvidas': int(resolvidas or 0),
+                'tempo_medio_resolucao': _media(tempo_resolucao or 0, resolvidas)
+            }
+
+        totais = [sum(row[i] or 0 for row in rows) for i in range(1, 6)]
+
+        return jsonify({
+            'inicio': periodo[0].isoformat(),
+            'fim': periodo[1].isoformat(),
+            'geral': serializar(*totais),
+            'por_prioridade': {row[0]: serializar(*row[1:]) for row in rows}
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@relatorio_bp.route('/disponibilidade-equipamentos', methods=['GET'])
+@jwt_required()
+def get_relatorio_disponibilidade_equipamentos():
+    """Retorna a disponibilidade dos equipamentos no período, com base no tempo de parada das manutenções."""
+    try:
+        periodo, erro = _periodo()
+        if erro:
+            return erro
+
+        minutos_periodo = (next_month(periodo[1]) - periodo[0]).days * 24 * 60
+
+        paradas = db.session.query(
+            Equipamento.id, Equipamento.codigo, Equipamento.nome,
+            func.sum(ResumoManutencao.tempo_parada)
+        ).join(
+            ResumoManutencao, ResumoManutencao.equipamento_id == Equipamento.id
+        ).filter(
+            ResumoManutencao.mes.between(*periodo),
+            ResumoManutencao.status != 'CANCELADA'
+        ).group_by(Equipamento.id, Equipamento.codigo, Equipamento.nome).having(
+            func.sum(ResumoManutencao.tempo_parada) > 0
+        ).order_by(func.sum(ResumoManutencao.tempo_parada).desc()).all()
+
+        # count(*) permite contar pelo índice de status, sem ler a tabela
+        total_equipamentos = db.session.query(func.count()).select_from(Equipamento).filter(
+            Equipamento.status != 'DESCONTINUADO'
+        ).scalar()
+        total_parada = sum(int(row[3]) for row in paradas)
+
+        def disponibilidade(parada, equipamentos=1):
+            if not equipamentos:
+                return None
+            return round(max(0.0, 100 * (1 - parada / (minutos_periodo * equipamentos))), 2)
+
+        return jsonify({
+            'inicio': periodo[0].isoformat(),
+            'fim': periodo[1].isoformat(),
+            'total_equipamentos': total_equipamentos,
+            'disponibilidade_media': disponibilidade(total_parada, total_equipamentos),
+            'equipamentos_com_parada': [{
+                'id': row[0],
+                'codigo': row[1],
+                'nome': row[2],
+                'tempo_parada': int(row[3]),
+                'disponibilidade': disponibilidade(int(row[3]))
+            } for row in paradas]
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@relatorio_bp.route('/desempenho-tecnicos', methods=['GET'])
+@jwt_required()
+def get_relatorio_desempenho_tecnicos():
+    """Retorna o desempenho dos técnicos internos no período."""
+    try:
+        periodo, erro = _periodo()
+        if erro:
+            return erro
+
+        concluidas = func.sum(db.case((ResumoManutencao.status == 'CONCLUIDA', ResumoManutencao.quantidade), else_=0))
+        duracao = func.sum(db.case((ResumoManutencao.status == 'CONCLUIDA', ResumoManutencao.duracao), else_=0))
+
+        rows = db.session.query(
+            Tecnico.id, Tecnico.nome,
+            func.sum(ResumoManutencao.quantidade), concluidas, duracao
+        ).join(
+            ResumoManutencao, ResumoManutencao.tecnico_id == Tecnico.id
+        ).filter(
+            ResumoManutencao.mes.between(*periodo)
+        ).group_by(Tecnico.id, Tecnico.nome).order_by(concluidas.desc()).all()
+
+        return jsonify([{
+            'id': row[0],
+            'nome': row[1],
+            'manutencoes': int(row[2] or 0),
+            'concluidas': int(row[3] or 0),
+            'taxa_conclusao': round(100 * int(row[3] or 0) / int(row[2]), 2) if row[2] else None,
+            'duracao_media': _media(int(row[4] or 0), int(row[3] or 0))
+        } for row in rows]), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@relatorio_bp.route('/satisfacao-usuarios', methods=['GET'])
+@jwt_required()
+def get_relatorio_satisfacao_usuarios():
+    """Retorna a satisfação dos usuários com as ordens de serviço, geral e por departamento."""
+    try:
+        periodo, erro = _periodo()
+        if erro:
+            return erro
+
+        rows = db.session.query(
+            Departamento.id, Departamento.nome,
+            func.sum(ResumoOrdemServico.avaliacoes),
+            func.sum(ResumoOrdemServico.soma_avaliacoes)
+        ).join(
+            ResumoOrdemServico, ResumoOrdemServico.departamento_id == Departamento.id
+        ).filter(
+            ResumoOrdemServico.mes.between(*periodo)
+        ).group_by(Departamento.id, Departamento.nome).all()
+
+        avaliacoes = sum(int(row[2] or 0) for row in rows)
+        soma = sum(int(row[3] or 0) for row in rows)
+
+        return jsonify({
+            'inicio': periodo[0].isoformat(),
+            'fim': periodo[1].isoformat(),
+            'avaliacoes': avaliacoes,
+            'media': _media(soma, avaliacoes),
+            'por_departamento': [{
+                'departamento_id': row[0],
+                'departamento': row[1],
+                'avaliacoes': int(row[2] or 0),
+                'media': _media(int(row[3] or 0), int(row[2] or 0))
+            } for row in rows if row[2]]
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@relatorio_bp.route('/equipamentos-criticos', methods=['GET'])
+@jwt_required()
+def get_relatorio_equipamentos_criticos():
+    """Retorna os equipamentos de criticidade alta ou crítica em uso."""
+    try:
+        equipamentos = Equipamento.query.options(joinedload(Equipamento.departamento)).filter(
+            Equipamento.criticidade.in_(['ALTA', 'CRITICA']),
+            Equipamento.status != 'DESCONTINUADO'
+        ).order_by(Equipamento.criticidade.desc(), Equipamento.nome).all()
+
+        return jsonify([{
+            'id': e.id,
+            'codigo': e.codigo,
+            'nome': e.nome,
+            'criticidade': e.criticidade,
+            'status': e.status,
+            'departamento': e.departamento.nome if e.departamento else None,
+            'ultima_manutencao': e.ultima_manutencao.isoformat() if e.ultima_manutencao else None,
+            'proxima_manutencao_planejada': e.proxima_manutencao_planejada.isoformat() if e.proxima_manutencao_planejada else None
+        } for e in equipamentos]), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@relatorio_bp.route('/certificados-vencidos', methods=['GET'])
+@jwt_required()
+def get_relatorio_certificados_vencidos():
+    """Retorna os certificados com data de validade expirada."""
+    try:
+        certificados = Certificado.query.options(joinedload(Certificado.equipamento)).filter(
+            Certificado.data_validade < date.today()
+        ).order_by(Certificado.data_validade).all()
+
+        return jsonify([{
+            'id': c.id,
+            'tipo': c.tipo,
+            'numero': c.numero,
+            'equipamento': c.equipamento.nome if c.equipamento else None,
+            'data_validade': c.data_validade.isoformat(),
+            'dias_vencido': (date.today() - c.data_validade).days,
+            'status': c.status
+        } for c in certificados]), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@relatorio_bp.route('/manutencoes-preventivas-pendentes', methods=['GET'])
+@jwt_required()
+def get_relatorio_manutencoes_preventivas_pendentes():
+    """Retorna as manutenções preventivas agendadas ainda não iniciadas."""
+    try:
+        agora = datetime.utcnow()
+        manutencoes = Manutencao.query.options(joinedload(Manutencao.equipamento)).filter(
+            Manutencao.tipo_manutencao == 'PREVENTIVA',
+            Manutencao.status == 'AGENDADA'
+        ).order_by(Manutencao.data_agendamento).all()
+
+        return jsonify([{
+            'id': m.id,
+            'equipamento': m.equipamento.nome if m.equipamento else None,
+            'data_agendamento': m.data_agendamento.isoformat(),
+            'prioridade': m.prioridade,
+            'atrasada': m.data_agendamento < agora
+        } for m in manutencoes]), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -0,0 +1,248 @@
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import chain
+from sqlalchemy import event, inspect, select, delete, insert
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Manutencao, OrdemServico, ResumoManutencao, ResumoOrdemServico
+
+manutencoes = Manutencao.__table__
+ordens_servico = OrdemServico.__table__
+resumo_manutencoes = ResumoManutencao.__table__
+resumo_ordens_servico = ResumoOrdemServico.__table__
+
+def month_start(value):
+    """Retorna o primeiro dia do mês de uma data (ou None)."""
+    if value is None:
+        return None
+    return date(value.year, value.month, 1)
+
+def next_month(value):
+    """Retorna o primeiro dia do mês seguinte."""
+    if value.month == 12:
+        return date(value.year + 1, 1, 1)
+    return date(value.year, value.month + 1, 1)
+
+def _minutes(inicio, fim):
+    """Retorna o intervalo entre duas datas em minutos (0 se alguma estiver vazia)."""
+    if not inicio or not fim:
+        return 0
+    return max(int((fim - inicio).total_seconds() // 60), 0)
+
+def _aggregate_manutencoes(rows):
+    """Agrupa linhas de manutenções no formato de resumo_manutencoes."""
+    grupos = {}
+    for row in rows:
+        chave = (month_start(row.data_agendamento), row.equipamento_id, row.tecnico_id, row.tipo_manutencao, row.status)
+        grupo = grupos.setdefault(chave, {
+            'quantidade': 0, 'custo_mao_de_obra': Decimal(0), 'custo_pecas': Decimal(0),
+            'custo_total': Decimal(0), 'tempo_parada': 0, 'duracao': 0
+        })
+        grupo['quantidade'] += 1
+        grupo['custo_mao_de_obra'] += Decimal(row.custo_mao_de_obra or 0)
+        grupo['custo_pecas'] += Decimal(row.custo_pecas or 0)
+        grupo['custo_total'] += Decimal(row.custo_total or 0)
+        grupo['tempo_parada'] += row.tempo_parada or 0
+        grupo['duracao'] += _minutes(row.data_inicio, row.data_fim)
+
+    return [
+        dict(mes=mes, equipamento_id=equipamento_id, tecnico_id=tecnico_id,
+             tipo_manutencao=tipo_manutencao, status=status, **metricas)
+        for (mes, equipamento_id, tecnico_id, tipo_manutencao, status), metricas in grupos.items()
+        if mes is not None
+    ]
+
+def _aggregate_ordens_servico(rows):
+    """Agrupa linhas de ordens de serviço no formato de resumo_ordens_servico."""
+    grupos = {}
+    for row in rows:
+        chave = (month_start(row.data_abertura), row.equipamento_id, row.departamento_id, row.prioridade, row.status)
+        grupo = grupos.setdefault(chave, {
+            'quantidade': 0, 'atendidas': 0, 'tempo_atendimento': 0, 'resolvidas': 0,
+            'tempo_resolucao': 0, 'avaliacoes': 0, 'soma_avaliacoes': 0
+        })
+        grupo['quantidade'] += 1
+        if row.data_inicio:
+            grupo['atendidas'] += 1
+            grupo['tempo_atendimento'] += _minutes(row.data_abertura, row.data_inicio)
+        if row.data_fim:
+            grupo['resolvidas'] += 1
+            grupo['tempo_resolucao'] += _minutes(row.data_abertura, row.data_fim)
+        if row.avaliacao_satisfacao:
+            grupo['avaliacoes'] += 1
+            grupo['soma_avaliacoes'] += row.avaliacao_satisfacao
+
+    return [
+        dict(mes=mes, equipamento_id=equipamento_id, departamento_id=departamento_id,
+             prioridade=prioridade, status=status, **metricas)
+        for (mes, equipamento_id, departamento_id, prioridade, status), metricas in grupos.items()
+        if mes is not None
+    ]
+
+MANUTENCAO_COLUMNS = [
+    manutencoes.c.equipamento_id, manutencoes.c.data_agendamento, manutencoes.c.tecnico_id,
+    manutencoes.c.tipo_manutencao, manutencoes.c.status, manutencoes.c.custo_mao_de_obra,
+    manutencoes.c.custo_pecas, manutencoes.c.custo_total, manutencoes.c.tempo_parada,
+    manutencoes.c.data_inicio, manutencoes.c.data_fim
+]
+
+ORDEM_SERVICO_COLUMNS = [
+    ordens_servico.c.equipamento_id, ordens_servico.c.departamento_id, ordens_servico.c.data_abertura,
+    ordens_servico.c.prioridade, ordens_servico.c.status, ordens_servico.c.data_inicio,
+    ordens_servico.c.data_fim, ordens_servico.c.avaliacao_satisfacao
+]
+
+def _lock_equipamentos(connection, equipamento_ids):
+    """No PostgreSQL, serializa a recomputação dos resumos de um mesmo equipamento."""
+    if connection.dialect.name == 'postgresql' and equipamento_ids:
+        from app.models import Equipamento
+        connection.execute(
+            select(Equipamento.__table__.c.id)
+            .where(Equipamento.__table__.c.id.in_(sorted(equipamento_ids)))
+            .order_by(Equipamento.__table__.c.id)
+            .with_for_update()
+        )
+
+def _keys_by_month(keys, chunk_size=500):
+    """Agrupa chaves (equipamento_id, mês) por mês, em blocos de até chunk_size equipamentos."""
+    meses = {}
+    for equipamento_id, mes in keys:
+        meses.setdefault(mes, set()).add(equipamento_id)
+
+    for mes, equipamentos in meses.items():
+        equipamentos = sorted(equipamentos)
+        for inicio in range(0, len(equipamentos), chunk_size):
+            yield mes, equipamentos[inicio:inicio + chunk_size]
+
+def _refresh_table(connection, keys, tabela, colunas, coluna_data, resumo, agregar):
+    """Recalcula os resumos de uma tabela para as chaves informadas, um mês por vez."""
+    for mes, equipamento_ids in _keys_by_month(keys):
+        inicio = datetime(mes.year, mes.month, 1)
+        fim = datetime.combine(next_month(mes), datetime.min.time())
+        rows = connection.execute(select(*colunas).where(
+            tabela.c.equipamento_id.in_(equipamento_ids),
+            coluna_data >= inicio,
+            coluna_data < fim
+        )).all()
+
+        connection.execute(delete(resumo).where(
+            resumo.c.equipamento_id.in_(equipamento_ids),
+            resumo.c.mes == mes
+        ))
+        resumos = agregar(rows)
+        if resumos:
+            connection.execute(insert(resumo), resumos)
+
+def refresh_summaries(connection, manutencao_keys=(), ordem_servico_keys=()):
+    """
+    Recalcula os resumos mensais afetados por alterações em manutenções e ordens de serviço.
+
+    Cada chave (equipamento_id, mês) é recalculada a partir das linhas daquele
+    equipamento no mês, o que torna a operação idempotente e de custo proporcional
+    apenas aos registros alterados. As chaves de um mesmo mês são recalculadas em
+    conjunto, com três comandos SQL por mês e bloco de equipamentos.
+
+    Args:
+        connection (Connection): Conexão da transação corrente
+        manutencao_keys (iterable): Pares (equipamento_id, mês) de manutenções alteradas
+        ordem_servico_keys (iterable): Pares (equipamento_id, mês) de ordens de serviço alteradas
+    """
+    manutencao_keys = {chave for chave in manutencao_keys if chave[0] and chave[1]}
+    ordem_servico_keys = {chave for chave in ordem_servico_keys if chave[0] and chave[1]}
+    _lock_equipamentos(connection, {chave[0] for chave in chain(manutencao_keys, ordem_servico_keys)})
+
+    _refresh_table(connection, manutencao_keys, manutencoes, MANUTENCAO_COLUMNS,
+                   manutencoes.c.data_agendamento, resumo_manutencoes, _aggregate_manutencoes)
+    _refresh_table(connection, ordem_servico_keys, ordens_servico, ORDEM_SERVICO_COLUMNS,
+                   ordens_servico.c.data_abertura, resumo_ordens_servico, _aggregate_ordens_servico)
+
+def _attribute_values(obj, attribute):
+    """Retorna os valores atual e anterior (antes do flush) de um atributo."""
+    history = inspect(obj).attrs[attribute].history
+    atual = history.added[0] if history.added else (history.unchanged[0] if history.unchanged else None)
+    anterior = history.deleted[0] if history.deleted else atual
+    return atual, anterior
+
+def _summary_keys(obj, date_attribute):
+    """Retorna as chaves (equipamento_id, mês) atual e anterior de um registro."""
+    equipamento_atual, equipamento_anterior = _attribute_values(obj, 'equipamento_id')
+    data_atual, data_anterior = _attribute_values(obj, date_attribute)
+    return {
+        (equipamento_atual, month_start(data_atual)),
+        (equipamento_anterior, month_start(data_anterior)),
+    }
+
+def _keep_previous_value(target, value, oldvalue, initiator):
+    """Listener vazio: basta registrá-lo com active_history=True."""
+
+# Carregar o valor anterior ao alterar a chave do resumo, mesmo em objetos expirados,
+# para que o mês (ou equipamento) de origem também seja recalculado
+for _attribute in (Manutencao.equipamento_id, Manutencao.data_agendamento,
+                   OrdemServico.equipamento_id, OrdemServico.data_abertura):
+    event.listen(_attribute, 'set', _keep_previous_value, active_history=True)
+
+@event.listens_for(Session, 'after_flush')
+def _refresh_summaries_after_flush(session, flush_context):
+    """Mantém os resumos atualizados na mesma transação das escritas em manutenções e ordens de serviço."""
+    manutencao_keys = set()
+    ordem_servico_keys = set()
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Manutencao):
+            manutencao_keys |= _summary_keys(obj, 'data_agendamento')
+        elif isinstance(obj, OrdemServico):
+            ordem_servico_keys |= _summary_keys(obj, 'data_abertura')
+
+    if manutencao_keys or ordem_servico_keys:
+        refresh_summaries(session.connection(), manutencao_keys, ordem_servico_keys)
+
+def rebuild_summaries(session=None, batch_size=5000):
+    """
+    Recria todos os resumos a partir das tabelas de manutenções e ordens de serviço.
+
+    Útil para bancos com histórico anterior aos resumos ou após cargas feitas com SQL
+    direto. As linhas são lidas em lotes, ordenadas por equipamento, e os resumos de
+    cada grupo de equipamentos são gravados em lote.
+
+    Args:
+        session (Session): Sessão do SQLAlchemy (padrão: db.session)
+        batch_size (int): Quantidade de linhas lidas por lote
+
+    Returns:
+        tuple: Quantidade de resumos de manutenções e de ordens de serviço gravados
+    """
+    session = session or db.session
+    connection = session.connection()
+    connection.execute(delete(resumo_manutencoes))
+    connection.execute(delete(resumo_ordens_servico))
+
+    totais = []
+    for tabela, colunas, resumo, agregar in [
+        (manutencoes, MANUTENCAO_COLUMNS, resumo_manutencoes, _aggregate_manutencoes),
+        (ordens_servico, ORDEM_SERVICO_COLUMNS, resumo_ordens_servico, _aggregate_ordens_servico),
+    ]:
+        total = 0
+        pendentes = []
+        equipamento_atual = None
+        result = connection.execution_options(yield_per=batch_size).execute(
+            select(*colunas).order_by(tabela.c.equipamento_id)
+        )
+        for row in result:
+            # Gravar ao trocar de equipamento, para que cada grupo fique completo
+            if row.equipamento_id != equipamento_atual and len(pendentes) >= batch_size:
+                resumos = agregar(pendentes)
+                connection.execute(insert(resumo), resumos)
+                total += len(resumos)
+                pendentes = []
+            equipamento_atual = row.equipamento_id
+            pendentes.append(row)
+
+        if pendentes:
+            resumos = agregar(pendentes)
+            if resumos:
+                connection.execute(insert(resumo), resumos)
+            total += len(resumos)
+        totais.append(total)
+
+    session.commit()
+    return tuple(totais)
@@ -0,0 +1,235 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Equipamento, Departamento
+from app.models.types import uuid7, uuid_bytes, uuid_str
+from app.utils.validators import validate_equipamento
+from app.utils.qrcode_jobs import QRCODE_PENDENTE
+
+# Campos aceitos na importação de equipamentos
+CAMPOS_EQUIPAMENTO = [
+    'codigo', 'nome', 'modelo', 'fabricante', 'numero_serie', 'data_aquisicao', 'data_garantia',
+    'valor_aquisicao', 'departamento_id', 'localizacao', 'status', 'criticidade',
+    'especificacoes_tecnicas', 'documentacao', 'imagens_url'
+]
+CAMPOS_JSON = {'especificacoes_tecnicas', 'documentacao', 'imagens_url'}
+# Campos que devem ser texto (no NDJSON podem vir com qualquer tipo JSON)
+CAMPOS_TEXTO = set(CAMPOS_EQUIPAMENTO) - CAMPOS_JSON - {'valor_aquisicao'}
+
+def read_csv_rows(stream):
+    """
+    Lê registros de um arquivo CSV com cabeçalho.
+
+    Colunas vazias são ignoradas e os campos JSON (especificacoes_tecnicas,
+    documentacao, imagens_url) são decodificados.
+
+    Args:
+        stream: Arquivo binário
+
+    Yields:
+        tuple: (número da linha, dados ou None, mensagem de erro ou None)
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    for row in reader:
+        data = {campo: valor.strip() for campo, valor in row.items() if campo and valor and valor.strip()}
+        try:
+            for campo in CAMPOS_JSON & data.keys():
+                data[campo] = json.loads(data[campo])
+        except ValueError:
+            yield reader.line_num, None, f"Campo '{campo}' deve conter JSON válido"
+            continue
+        yield reader.line_num, data, None
+
+def read_ndjson_rows(stream):
+    """
+    Lê registros de um arquivo NDJSON (um objeto JSON por linha).
+
+    Args:
+        stream: Arquivo binário
+
+    Yields:
+        tuple: (número da linha, dados ou None, mensagem de erro ou None)
+    """
+    for numero, linha in enumerate(io.TextIOWrapper(stream, encoding='utf-8-sig'), start=1):
+        if not linha.strip():
+            continue
+        try:
+            data = json.loads(linha)
+        except ValueError:
+            yield numero, None, 'JSON inválido'
+            continue
+        if not isinstance(data, dict):
+            yield numero, None, 'Cada linha deve conter um objeto JSON'
+            continue
+        yield numero, data, None
+
+def _check_types(data):
+    """Retorna a mensagem de erro se algum campo tiver tipo inválido (ex.: lista no código)."""
+    for campo in CAMPOS_TEXTO & data.keys():
+        if data[campo] is not None and not isinstance(data[campo], str):
+            return f"Campo '{campo}' deve ser texto"
+    valor = data.get('valor_aquisicao')
+    if valor is not None and (isinstance(valor, bool) or not isinstance(valor, (str, int, float))):
+        return "Campo 'valor_aquisicao' deve ser numérico"
+    return None
+
+def _build_row(data, gerar_qrcode):
+    """Converte os dados validados de um registro nos valores da tabela de equipamentos."""
+    row = {campo: data.get(campo) for campo in CAMPOS_EQUIPAMENTO}
+    row['id'] = uuid7()
+    row['status'] = row['status'] or 'ATIVO'
+    row['criticidade'] = row['criticidade'] or 'MEDIA'
+    row['qr_code'] = QRCODE_PENDENTE if gerar_qrcode else None
+
+    # ID no formato canônico (maiúsculas ou sem hífens são aceitos, como nas demais rotas)
+    departamento_id = uuid_bytes(row['departamento_id'])
+    if departamento_id is None:
+        raise ValueError('Departamento não encontrado')
+    row['departamento_id'] = uuid_str(departamento_id)
+
+    try:
+        row['data_aquisicao'] = datetime.fromisoformat(row['data_aquisicao']).date()
+        row['data_garantia'] = datetime.fromisoformat(row['data_garantia']).date() if row['data_garantia'] else None
+    except (TypeError, ValueError):
+        raise ValueError('Formato de data inválido. Use ISO 8601 (YYYY-MM-DD)')
+
+    if row['valor_aquisicao'] not in (None, ''):
+        try:
+            row['valor_aquisicao'] = Decimal(str(row['valor_aquisicao']))
+        except InvalidOperation:
+            raise ValueError('Valor de aquisição inválido')
+    else:
+        row['valor_aquisicao'] = None
+
+    return row
+
+class EquipamentoImporter:
+    """
+    Importa equipamentos em lote, com validação por registro.
+
+    Cada lote é validado com validate_equipamento e verificado contra o banco com
+    três consultas por lote (departamentos existentes, códigos e números de série
+    já cadastrados), em vez de três consultas por registro. Os registros válidos são
+    inseridos com um único INSERT em lote e confirmados a cada lote; os inválidos são
+    reportados com o número da linha e o motivo.
+    """
+
+    def __init__(self, gerar_qrcode=False, batch_size=1000):
+        self.gerar_qrcode = gerar_qrcode
+        self.batch_size = batch_size
+        self.importados = []
+        self.erros = []
+        self.total = 0
+        self._codigos = set()
+        self._numeros_serie = set()
+
+    def _erro(self, linha, data, mensagem):
+        self.erros.append({'linha': linha, 'codigo': (data or {}).get('codigo'), 'error': mensagem})
+
+    def run(self, rows):
+        """
+        Processa os registros lidos do arquivo.
+
+        Args:
+            rows (iterable): Tuplas (número da linha, dados, erro) produzidas pelos leitores
+
+        Returns:
+            EquipamentoImporter: O próprio importador, com o resultado
+        """
+        lote = []
+        for linha, data, erro in rows:
+            self.total += 1
+            if erro:
+                self._erro(linha, data, erro)
+                continue
+
+            lote.append((linha, data))
+            if len(lote) >= self.batch_size:
+                self._import_batch(lote)
+                lote = []
+
+        if lote:
+            self._import_batch(lote)
+
+        return self
+
+    def _import_batch(self, lote):
+        validos = []
+        for linha, data in lote:
+            erro = _check_types(data) or validate_equipamento(data)
+            if not erro:
+                try:
+                    validos.append((linha, _build_row(data, self.gerar_qrcode)))
+                    continue
+                except ValueError as e:
+                    erro = str(e)
+            self._erro(linha, data, erro)
+
+        if not validos:
+            return
+
+        # Verificações de existência e unicidade em consultas por conjunto
+        departamentos = {row['departamento_id'] for _, row in validos}
+        codigos = {row['codigo'] for _, row in validos}
+        numeros_serie = {row['numero_serie'] for _, row in validos}
+
+        departamentos_existentes = {
+            id for (id,) in db.session.query(Departamento.id).filter(Departamento.id.in_(departamentos))
+        }
+        codigos_existentes = {
+            codigo for (codigo,) in db.session.query(Equipamento.codigo).filter(Equipamento.codigo.in_(codigos))
+        }
+        series_existentes = {
+            numero for (numero,) in db.session.query(Equipamento.numero_serie).filter(Equipamento.numero_serie.in_(numeros_serie))
+        }
+
+        inserir = []
+        for linha, row in validos:
+            if row['departamento_id'] not in departamentos_existentes:
+                self._erro(linha, row, 'Departamento não encontrado')
+            elif row['codigo'] in codigos_existentes or row['codigo'] in self._codigos:
+                self._erro(linha, row, 'Já existe um equipamento com este código')
+            elif row['numero_serie'] in series_existentes or row['numero_serie'] in self._numeros_serie:
+                self._erro(linha, row, 'Já existe um equipamento com este número de série')
+            else:
+                self._codigos.add(row['codigo'])
+                self._numeros_serie.add(row['numero_serie'])
+                inserir.append((linha, row))
+
+        if not inserir:
+            return
+
+        try:
+            db.session.execute(insert(Equipamento), [row for _, row in inserir])
+            db.session.commit()
+            self.importados.extend(inserir)
+        except IntegrityError:
+            # Cadastro concorrente: inserir um a um para identificar as linhas em conflito
+            db.session.rollback()
+            self._insert_one_by_one(inserir)
+
+    def _insert_one_by_one(self, inserir):
+        for linha, row in inserir:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(Equipamento), [row])
+                self.importados.append((linha, row))
+            except IntegrityError:
+                self._erro(linha, row, 'Já existe um equipamento com este código ou número de série')
+        db.session.commit()
+
+    def result(self):
+        """Retorna o relatório da importação."""
+        return {
+            'total': self.total,
+            'importados': len(self.importados),
+            'erros': sorted(self.erros, key=lambda erro: erro['linha']),
+            'equipamentos': [
+                {'linha': linha, 'id': row['id'], 'codigo': row['codigo']} for linha, row in self.importados
+            ]
+        }
@@ -0,0 +1,123 @@
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import insert, update, or_
+from app import db
+from app.models import Certificado, Equipamento, Departamento, Usuario, Notificacao
+from app.models.types import uuid7
+
+def _certificados_query(*criterios):
+    """Certificados válidos com o responsável ativo do departamento do equipamento."""
+    return db.session.query(
+        Certificado.id, Certificado.tipo, Certificado.numero, Certificado.data_validade,
+        Equipamento.codigo, Equipamento.nome, Usuario.id.label('responsavel_id')
+    ).join(
+        Equipamento, Equipamento.id == Certificado.equipamento_id
+    ).join(
+        Departamento, Departamento.id == Equipamento.departamento_id
+    ).outerjoin(
+        Usuario, (Usuario.id == Departamento.responsavel_id) & Usuario.ativo.is_(True)
+    ).filter(
+        Certificado.status == 'VALIDO', *criterios
+    ).order_by(Certificado.data_validade)
+
+def _descricao(row):
+    numero = f' {row.numero}' if row.numero else ''
+    return f'O certificado {row.tipo}{numero} do equipamento {row.codigo} - {row.nome}'
+
+def _notificacoes(rows, tipo, titulo, mensagem, agora):
+    """Monta uma notificação por certificado para o responsável pelo equipamento."""
+    return [{
+        'id': uuid7(),
+        'usuario_id': row.responsavel_id,
+        'titulo': titulo,
+        'mensagem': mensagem(row),
+        'tipo': tipo,
+        'lida': False,
+        'link': f'/api/certificados/{row.id}',
+        'criado_em': agora,
+        'atualizado_em': agora,
+    } for row in rows if row.responsavel_id]
+
+def _process(query, atualizar, tipo, titulo, mensagem, batch_size):
+    """
+    Processa os certificados da consulta em lotes até que nenhum reste.
+
+    Cada lote é confirmado com um UPDATE por conjunto, que retira os certificados
+    do filtro da consulta, e um INSERT em lote das notificações.
+    """
+    certificados = 0
+    notificacoes = 0
+    while True:
+        rows = query.limit(batch_size).all()
+        if not rows:
+            break
+
+        agora = datetime.utcnow()
+        db.session.execute(
+            update(Certificado)
+            .where(Certificado.id.in_([row.id for row in rows]), Certificado.status == 'VALIDO')
+            .values(atualizado_em=agora, **atualizar)
+            .execution_options(synchronize_session=False)
+        )
+
+        novas = _notificacoes(rows, tipo, titulo, mensagem, agora)
+        if novas:
+            db.session.execute(insert(Notificacao), novas)
+
+        db.session.commit()
+        certificados += len(rows)
+        notificacoes += len(novas)
+
+    return certificados, notificacoes
+
+def scan_certificate_expiry(hoje=None, dias_aviso=None, batch_size=5000):
+    """
+    Atualiza os certificados vencidos e avisa os responsáveis pelos equipamentos.
+
+    Certificados VALIDO com data de validade anterior a hoje passam a VENCIDO; os que
+    vencem dentro de dias_aviso são marcados em aviso_vencimento, para que o aviso
+    seja enviado uma única vez por data de validade (uma renovação volta a avisar).
+    As consultas usam o índice (status, data_validade) e percorrem apenas os
+    certificados a alterar, em lotes; o responsável é o usuário ativo definido como
+    responsável pelo departamento do equipamento.
+
+    Args:
+        hoje (datetime.date): Data de referência (padrão: hoje)
+        dias_aviso (int): Antecedência do aviso de vencimento (padrão: CERTIFICADO_DIAS_AVISO)
+        batch_size (int): Certificados por lote
+
+    Returns:
+        dict: Certificados vencidos, certificados a vencer e notificações criadas
+    """
+    hoje = hoje or date.today()
+    if dias_aviso is None:
+        dias_aviso = current_app.config.get('CERTIFICADO_DIAS_AVISO', 30)
+    limite = hoje + timedelta(days=dias_aviso)
+
+    vencidos, notificacoes_vencidos = _process(
+        _certificados_query(Certificado.data_validade < hoje),
+        {'status': 'VENCIDO'},
+        'CERTIFICADO_VENCIDO',
+        'Certificado vencido',
+        lambda row: f'{_descricao(row)} venceu em {row.data_validade.strftime("%d/%m/%Y")}.',
+        batch_size
+    )
+
+    a_vencer, notificacoes_a_vencer = _process(
+        _certificados_query(
+            Certificado.data_validade >= hoje,
+            Certificado.data_validade <= limite,
+            or_(Certificado.aviso_vencimento.is_(None), Certificado.aviso_vencimento != Certificado.data_validade)
+        ),
+        {'aviso_vencimento': Certificado.data_validade},
+        'CERTIFICADO_A_VENCER',
+        'Certificado próximo do vencimento',
+        lambda row: f'{_descricao(row)} vence em {row.data_validade.strftime("%d/%m/%Y")}.',
+        batch_size
+    )
+
+    return {
+        'vencidos': vencidos,
+        'a_vencer': a_vencer,
+        'notificacoes': notificacoes_vencidos + notificacoes_a_vencer
+    }
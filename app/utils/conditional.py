@@ -0,0 +1,90 @@
+import hashlib
+from datetime import timezone
+from flask import Response, request
+from sqlalchemy import func
+from app import db
+from app.utils.dashboard_cache import get_dashboard_cache
+
+def make_etag(*partes):
+    """
+    Gera uma ETag forte a partir dos valores que identificam a versão de um recurso.
+
+    Returns:
+        str: Hash hexadecimal (sem aspas)
+    """
+    payload = ':'.join('' if parte is None else str(parte) for parte in partes)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+def resource_version(model, id):
+    """
+    Obtém a versão de um registro consultando apenas atualizado_em pela chave primária.
+
+    Args:
+        model (db.Model): Modelo com colunas id e atualizado_em
+        id (str): ID do registro
+
+    Returns:
+        tuple: (ETag, atualizado_em) ou None se o registro não existir
+    """
+    row = db.session.query(model.atualizado_em).filter(model.id == id).first()
+    if row is None:
+        return None
+    return make_etag(model.__tablename__, id, row[0].isoformat() if row[0] else None), row[0]
+
+def list_version(model):
+    """
+    Obtém a versão de uma listagem: maior atualizado_em da tabela (busca no índice)
+    e versão da tabela incrementada a cada commit que a altera, inclusive exclusões.
+
+    A ETag inclui o caminho e os parâmetros da requisição, pois cada página tem conteúdo próprio.
+
+    Args:
+        model (db.Model): Modelo listado
+
+    Returns:
+        str: ETag da listagem
+    """
+    tabela = model.__tablename__
+    atualizado_em = db.session.query(func.max(model.atualizado_em)).scalar()
+    versao = get_dashboard_cache().versions([tabela])[tabela]
+    return make_etag(tabela, atualizado_em.isoformat() if atualizado_em else None, versao, request.full_path)
+
+def is_not_modified(etag, atualizado_em=None):
+    """
+    Verifica se a versão que o cliente possui ainda é a atual.
+
+    If-None-Match tem precedência; If-Modified-Since só é considerado na ausência
+    dele e com resolução de segundos, como no cabeçalho Last-Modified.
+
+    Args:
+        etag (str): ETag atual
+        atualizado_em (datetime): Última alteração (UTC) ou None
+
+    Returns:
+        bool: True se a resposta pode ser 304 Not Modified
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if atualizado_em and request.if_modified_since:
+        return atualizado_em.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    return False
+
+def set_validators(response, etag, atualizado_em=None):
+    """
+    Adiciona à resposta os cabeçalhos de validação (ETag e Last-Modified).
+
+    Cache-Control: private, no-cache faz o cliente guardar a resposta e revalidá-la a cada uso.
+
+    Returns:
+        Response: A própria resposta
+    """
+    response.set_etag(etag)
+    if atualizado_em:
+        response.last_modified = atualizado_em.replace(tzinfo=timezone.utc)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+def not_modified(etag, atualizado_em=None):
+    """Retorna a resposta 304 Not Modified com os cabeçalhos de validação."""
+    return set_validators(Response(status=304), etag, atualizado_em)
@@ -0,0 +1,256 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import db
+
+# Tabelas cujas alterações invalidam os dashboards
+TABELAS_MONITORADAS = {'equipamentos', 'manutencoes', 'ordens_servico'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entradas (
+    chave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL,
+    versoes TEXT NOT NULL,
+    expira_em REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS versoes (
+    tabela TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS estatisticas (
+    nome TEXT PRIMARY KEY,
+    acertos INTEGER NOT NULL DEFAULT 0,
+    falhas INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+class DashboardCache:
+    """
+    Cache de resultados dos dashboards compartilhado entre processos (arquivo SQLite).
+
+    Cada entrada registra a versão das tabelas de que depende no momento do cálculo.
+    Um commit que altera uma dessas tabelas incrementa a versão correspondente, o
+    que invalida imediatamente, em todos os workers, apenas as entradas afetadas.
+    As estatísticas de acertos e falhas são acumuladas em memória e gravadas no
+    arquivo periodicamente, para não transformar cada leitura em uma escrita.
+    """
+
+    def __init__(self, path, ttl=300, stats_interval=5):
+        self.path = path
+        self.ttl = ttl
+        self.stats_interval = stats_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pendentes = {}
+        self._ultima_gravacao = time.monotonic()
+
+    def _connection(self):
+        """Retorna a conexão SQLite da thread atual (recriada após fork)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def versions(self, tabelas):
+        """Retorna a versão atual de cada tabela."""
+        tabelas = sorted(tabelas)
+        rows = self._connection().execute(
+            f"SELECT tabela, versao FROM versoes WHERE tabela IN ({','.join('?' * len(tabelas))})", tabelas
+        ).fetchall()
+        versoes = dict.fromkeys(tabelas, 0)
+        versoes.update(rows)
+        return versoes
+
+    def get(self, chave, tabelas, idade_maxima=0):
+        """
+        Retorna o valor em cache, ou None se ausente, expirado ou invalidado.
+
+        Com idade_maxima, um valor expirado ou invalidado ainda é retornado se tiver
+        sido calculado há menos de idade_maxima segundos.
+        """
+        row = self._connection().execute(
+            "SELECT valor, versoes, expira_em FROM entradas WHERE chave = ?", (chave,)
+        ).fetchone()
+        if row is None:
+            return None
+        agora = time.time()
+        if agora - (row[2] - self.ttl) < idade_maxima:
+            return json.loads(row[0])
+        if row[2] < agora or json.loads(row[1]) != self.versions(tabelas):
+            return None
+        return json.loads(row[0])
+
+    def set(self, chave, valor, versoes):
+        """Grava um valor calculado com as versões lidas antes do cálculo."""
+        self._connection().execute(
+            "INSERT OR REPLACE INTO entradas (chave, valor, versoes, expira_em) VALUES (?, ?, ?, ?)",
+            (chave, json.dumps(valor), json.dumps(versoes), time.time() + self.ttl)
+        )
+
+    def get_or_compute(self, nome, parametros, tabelas, calcular, idade_maxima=0):
+        """
+        Retorna o resultado de um dashboard, calculando-o apenas em caso de falha no cache.
+
+        Args:
+            nome (str): Nome do dashboard (usado também nas estatísticas)
+            parametros (tuple): Parâmetros da consulta que compõem a chave
+            tabelas (iterable): Tabelas das quais o resultado depende
+            calcular (function): Função que calcula o resultado
+            idade_maxima (float): Segundos durante os quais um resultado desatualizado
+                ainda é servido sem recálculo (padrão: 0, sempre atual)
+
+        Returns:
+            tuple: (resultado, True se veio do cache)
+        """
+        chave = json.dumps([nome, *parametros])
+        valor = self.get(chave, tabelas, idade_maxima)
+        if valor is not None:
+            self._record(nome, True)
+            return valor, True
+
+        # As versões são lidas antes do cálculo: um commit concorrente invalida o resultado
+        versoes = self.versions(tabelas)
+        valor = calcular()
+        self.set(chave, valor, versoes)
+        self._record(nome, False)
+        return valor, False
+
+    def invalidate(self, tabelas):
+        """Incrementa a versão das tabelas alteradas, invalidando as entradas dependentes."""
+        tabelas = sorted(tabelas)
+        if not tabelas:
+            return
+        self._connection().executemany(
+            "INSERT INTO versoes (tabela, versao) VALUES (?, 1) "
+            "ON CONFLICT(tabela) DO UPDATE SET versao = versao + 1",
+            [(tabela,) for tabela in tabelas]
+        )
+
+    def clear(self):
+        """Remove todas as entradas e invalida as que estiverem sendo calculadas."""
+        conn = self._connection()
+        conn.execute("DELETE FROM entradas")
+        conn.execute("UPDATE versoes SET versao = versao + 1")
+
+    def _record(self, nome, acerto):
+        """Contabiliza um acerto ou falha, gravando as estatísticas periodicamente."""
+        with self._lock:
+            contadores = self._pendentes.setdefault(nome, [0, 0])
+            contadores[0 if acerto else 1] += 1
+            gravar = time.monotonic() - self._ultima_gravacao >= self.stats_interval
+
+        if gravar:
+            self.flush_stats()
+
+    def flush_stats(self):
+        """Grava no arquivo compartilhado as estatísticas acumuladas neste processo."""
+        with self._lock:
+            pendentes, self._pendentes = self._pendentes, {}
+            self._ultima_gravacao = time.monotonic()
+
+        if pendentes:
+            self._connection().executemany(
+                "INSERT INTO estatisticas (nome, acertos, falhas) VALUES (?, ?, ?) "
+                "ON CONFLICT(nome) DO UPDATE SET acertos = acertos + excluded.acertos, falhas = falhas + excluded.falhas",
+                [(nome, acertos, falhas) for nome, (acertos, falhas) in pendentes.items()]
+            )
+
+    def stats(self):
+        """
+        Retorna as taxas de acerto do cache somadas entre todos os processos.
+
+        Returns:
+            dict: Acertos, falhas e taxa de acerto por dashboard e no total
+        """
+        self.flush_stats()
+        rows = self._connection().execute("SELECT nome, acertos, falhas FROM estatisticas ORDER BY nome").fetchall()
+
+        def resumo(acertos, falhas):
+            total = acertos + falhas
+            return {
+                'acertos': acertos,
+                'falhas': falhas,
+                'taxa_acerto': round(acertos / total, 4) if total else None
+            }
+
+        return {
+            'dashboards': {nome: resumo(acertos, falhas) for nome, acertos, falhas in rows},
+            'total': resumo(sum(row[1] for row in rows), sum(row[2] for row in rows))
+        }
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_dashboard_cache(app=None):
+    """
+    Retorna o cache de dashboards da aplicação.
+
+    O arquivo é definido por DASHBOARD_CACHE_PATH (padrão: instance/dashboard_cache.db)
+    e é compartilhado por todos os workers que apontam para o mesmo caminho.
+
+    Args:
+        app (Flask): Aplicação (padrão: current_app)
+
+    Returns:
+        DashboardCache: Instância do cache
+    """
+    app = app or current_app
+    path = app.config.get('DASHBOARD_CACHE_PATH') or os.path.join(app.instance_path, 'dashboard_cache.db')
+
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = DashboardCache(path, ttl=app.config.get('DASHBOARD_CACHE_TTL', 300))
+            _caches[path] = cache
+        return cache
+
+# Invalidação: as tabelas alteradas em cada transação são acumuladas na sessão e,
+# somente após o commit, as versões correspondentes são incrementadas.
+
+def _tabelas_alteradas(session):
+    return session.info.setdefault('dashboard_tabelas_alteradas', set())
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_tables(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tabela = getattr(obj, '__tablename__', None)
+        if tabela in TABELAS_MONITORADAS:
+            _tabelas_alteradas(session).add(tabela)
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_tables(orm_execute_state):
+    # INSERT/UPDATE/DELETE em lote (ex.: db.session.execute(update(Equipamento))) não passam pelo flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        tabela = getattr(orm_execute_state.statement.table, 'name', None)
+        if tabela in TABELAS_MONITORADAS:
+            _tabelas_alteradas(orm_execute_state.session).add(tabela)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    tabelas = session.info.pop('dashboard_tabelas_alteradas', None)
+    if tabelas and has_app_context():
+        try:
+            get_dashboard_cache().invalidate(tabelas)
+        except sqlite3.Error:
+            current_app.logger.exception('Falha ao invalidar o cache de dashboards')
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('dashboard_tabelas_alteradas', None)
+
+@event.listens_for(db.metadata, 'after_drop')
+def _clear_after_drop(target, connection, **kw):
+    # Tabelas recriadas: nenhum resultado anterior continua válido
+    if has_app_context():
+        get_dashboard_cache().clear()
@@ -0,0 +1,37 @@
+from sqlalchemy import event
+from app import db
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas):
+    """
+    Aplica os pragmas a uma conexão SQLite recém-aberta.
+
+    Args:
+        dbapi_connection: Conexão sqlite3
+        pragmas (dict): Nome e valor de cada pragma
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        for nome, valor in pragmas.items():
+            cursor.execute(f'PRAGMA {nome}={valor}')
+    finally:
+        cursor.close()
+
+def configure_engine(app):
+    """
+    Registra os ajustes de conexão do engine da aplicação conforme o banco.
+
+    No SQLite, os pragmas de SQLITE_PRAGMAS (WAL, synchronous, busy_timeout,
+    mmap_size, cache_size) valem por conexão e são aplicados a cada nova conexão
+    do pool. As opções de pool do PostgreSQL vêm de SQLALCHEMY_ENGINE_OPTIONS.
+
+    Args:
+        app (Flask): Aplicação
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    with app.app_context():
+        engine = db.engine
+
+    if engine.dialect.name == 'sqlite' and pragmas:
+        @event.listens_for(engine, 'connect')
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
@@ -1,42 +1,36 @@
 import os
-import qrcode
 from datetime import datetime
+from flask import current_app
+from app.utils.qrcode_cache import qrcode_content, qrcode_dir, qrcode_key, render_qrcode, write_atomic
 
-def generate_qrcode(equipment_id, equipment_code):
+def generate_qrcode(equipment_id, equipment_code, directory=None):
     """
     Gera um QR Code para um equipamento e salva como imagem.
     
+    O nome do arquivo é o hash do conteúdo e dos parâmetros de renderização: como o
+    conteúdo é determinístico, regenerações reutilizam a imagem existente em vez de
+    criar um novo arquivo.
+    
     Args:
         equipment_id (str): ID do equipamento
-        equipment_code (str): Código do equipamento
+        equipment_code (str): Código do equipamento (não interfere no conteúdo do QR Code)
+        directory (str): Diretório das imagens (padrão: QRCODE_DIR da aplicação atual)
         
     Returns:
         str: Caminho relativo para a imagem do QR Code
     """
-    # Criar diretório para QR Codes se não existir
-    qr_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'uploads', 'qrcodes')
-    os.makedirs(qr_dir, exist_ok=True)
-    
     # Gerar conteúdo do QR Code (URL para acessar o equipamento)
-    qr_content = f"https://manutencao-clinica.com/equipamentos/{equipment_id}"
-    
-    # Criar QR Code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_L,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(qr_content)
-    qr.make(fit=True)
-    
-    # Criar imagem
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Salvar imagem
-    filename = f"qrcode_{equipment_code}_{datetime.now().strftime('%Y%m%d%H%M%S')}.png"
-    file_path = os.path.join(qr_dir, filename)
-    img.save(file_path)
+    qr_content = qrcode_content(equipment_id)
+    
+    if directory is None:
+        directory = qrcode_dir(current_app.config)
+    
+    filename = f"{qrcode_key(qr_content, 'png')}.png"
+    file_path = os.path.join(directory, filename)
+    
+    # Renderizar apenas se a imagem ainda não existir
+    if not os.path.exists(file_path):
+        write_atomic(file_path, render_qrcode(qr_content, 'png'))
     
     # Retornar caminho relativo
     return f"/uploads/qrcodes/{filename}"
@@ -56,39 +50,61 @@ def format_currency(value):
     
     return f"R$ {value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
-def calculate_next_maintenance_date(last_maintenance_date, frequency):
+# Intervalo de cada frequência de manutenção: (meses, dias)
+FREQUENCIAS = {
+    'DIARIA': (0, 1),
+    'SEMANAL': (0, 7),
+    'QUINZENAL': (0, 14),
+    'MENSAL': (1, 0),
+    'BIMESTRAL': (2, 0),
+    'TRIMESTRAL': (3, 0),
+    'SEMESTRAL': (6, 0),
+    'ANUAL': (12, 0),
+}
+
+def add_months(value, months):
+    """
+    Soma meses de calendário a uma data, ajustando o dia ao último dia do mês quando necessário.
+    
+    Args:
+        value (datetime.date): Data inicial
+        months (int): Quantidade de meses
+        
+    Returns:
+        datetime.date: Data resultante (ex.: 31/01 + 1 mês = 28/02 ou 29/02)
+    """
+    import calendar
+    
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
+
+def calculate_next_maintenance_date(last_maintenance_date, frequency, occurrences=1):
     """
     Calcula a próxima data de manutenção com base na última manutenção e frequência.
     
+    Frequências mensais (MENSAL, BIMESTRAL, TRIMESTRAL, SEMESTRAL, ANUAL) usam meses
+    de calendário, e não aproximações em dias.
+    
     Args:
         last_maintenance_date (datetime.date): Data da última manutenção
         frequency (str): Frequência de manutenção (DIARIA, SEMANAL, QUINZENAL, MENSAL, etc.)
+        occurrences (int): Quantidade de intervalos a somar (padrão: 1)
         
     Returns:
         datetime.date: Data da próxima manutenção
     """
-    if not last_maintenance_date:
+    if not last_maintenance_date or frequency not in FREQUENCIAS:
         return None
     
     from datetime import timedelta
     
-    if frequency == 'DIARIA':
-        return last_maintenance_date + timedelta(days=1)
-    elif frequency == 'SEMANAL':
-        return last_maintenance_date + timedelta(weeks=1)
-    elif frequency == 'QUINZENAL':
-        return last_maintenance_date + timedelta(weeks=2)
-    elif frequency == 'MENSAL':
-        # Aproximação simples para um mês
-        return last_maintenance_date + timedelta(days=30)
-    elif frequency == 'TRIMESTRAL':
-        return last_maintenance_date + timedelta(days=90)
-    elif frequency == 'SEMESTRAL':
-        return last_maintenance_date + timedelta(days=180)
-    elif frequency == 'ANUAL':
-        return last_maintenance_date + timedelta(days=365)
-    else:
-        return None
+    months, days = FREQUENCIAS[frequency]
+    if months:
+        return add_months(last_maintenance_date, months * occurrences)
+    return last_maintenance_date + timedelta(days=days * occurrences)
 
 def is_certificate_expired(expiration_date):
     """
@@ -0,0 +1,202 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+import orjson
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from app import db
+
+logger = logging.getLogger('app.desempenho')
+
+PERCENTIS = (50, 90, 99)
+
+class RequestMetrics:
+    """Medidas de uma requisição: tempo total, SQL, linhas e serialização."""
+    __slots__ = ('inicio', 'sql_tempo', 'sql_consultas', 'linhas', 'serializacao')
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.sql_tempo = 0.0
+        self.sql_consultas = 0
+        self.linhas = 0
+        self.serializacao = 0.0
+
+def current_metrics():
+    """Retorna as medidas da requisição em andamento ou None (fora de requisição ou sem instrumentação)."""
+    if has_request_context():
+        return g.get('_metricas')
+    return None
+
+def record_rows(quantidade):
+    """Soma as linhas lidas do banco e entregues à serialização à requisição em andamento."""
+    metricas = current_metrics()
+    if metricas is not None:
+        metricas.linhas += quantidade
+
+def record_serialization(segundos):
+    """Soma o tempo gasto na serialização (montagem dos dicionários e JSON) à requisição em andamento."""
+    metricas = current_metrics()
+    if metricas is not None:
+        metricas.serializacao += segundos
+
+class RouteStats:
+    """
+    Amostras recentes das requisições de cada rota, para o cálculo dos percentis.
+
+    Cada worker mantém as suas amostras (as últimas max_amostras por rota) em memória.
+    """
+
+    def __init__(self, max_amostras=1000):
+        self.max_amostras = max_amostras
+        self._rotas = {}
+        self._lock = threading.Lock()
+
+    def record(self, rota, duracao, sql_tempo, sql_consultas, linhas, serializacao, erro):
+        with self._lock:
+            dados = self._rotas.get(rota)
+            if dados is None:
+                dados = self._rotas[rota] = {'amostras': deque(maxlen=self.max_amostras), 'total': 0, 'erros': 0}
+            dados['amostras'].append((duracao, sql_tempo, sql_consultas, linhas, serializacao))
+            dados['total'] += 1
+            dados['erros'] += erro
+
+    def summary(self):
+        """
+        Calcula os percentis de cada rota sobre as amostras recentes.
+
+        Returns:
+            dict: Rota -> requisições, erros e percentis (tempos em milissegundos)
+        """
+        with self._lock:
+            copia = {rota: (list(dados['amostras']), dados['total'], dados['erros']) for rota, dados in self._rotas.items()}
+
+        resultado = {}
+        for rota, (amostras, total, erros) in copia.items():
+            colunas = list(zip(*amostras))
+            duracao, sql_tempo, consultas, linhas, serializacao = (sorted(coluna) for coluna in colunas)
+            resultado[rota] = {
+                'requisicoes': total,
+                'erros': erros,
+                'amostras': len(amostras),
+                'duracao_ms': _percentis(duracao, 1000),
+                'sql_ms': _percentis(sql_tempo, 1000),
+                'sql_consultas': _percentis(consultas),
+                'linhas': _percentis(linhas),
+                'serializacao_ms': _percentis(serializacao, 1000),
+            }
+        return resultado
+
+    def reset(self):
+        with self._lock:
+            self._rotas = {}
+
+def _percentis(valores, escala=1):
+    """Percentis (método do posto mais próximo) de uma lista ordenada."""
+    n = len(valores)
+    return {
+        f'p{p}': round(valores[min(n - 1, max(0, -(-p * n // 100) - 1))] * escala, 3)
+        for p in PERCENTIS
+    }
+
+def get_route_stats(app):
+    """Retorna as estatísticas por rota do worker."""
+    return app.extensions['desempenho']
+
+def server_timing(metricas, duracao):
+    """Monta o cabeçalho Server-Timing da requisição."""
+    return (
+        f'app;dur={duracao * 1000:.1f}, '
+        f'db;dur={metricas.sql_tempo * 1000:.1f};desc="{metricas.sql_consultas} consultas, {metricas.linhas} linhas", '
+        f'ser;dur={metricas.serializacao * 1000:.1f}'
+    )
+
+def init_instrumentation(app):
+    """
+    Registra a instrumentação das requisições.
+
+    Para cada requisição são medidos o tempo total, o tempo e a quantidade de
+    comandos SQL (eventos before/after_cursor_execute e handle_error do engine), as
+    linhas lidas do banco (registradas pelos serializadores com record_rows) e o
+    tempo de serialização. As medidas são enviadas no cabeçalho
+    Server-Timing (INSTRUMENTACAO_SERVER_TIMING), registradas em uma linha de log
+    JSON no logger app.desempenho (INSTRUMENTACAO_LOG), acumuladas por rota para
+    os percentis de GET /api/admin/desempenho e, com METRICAS, registradas nas
+    métricas do Prometheus (GET /api/metrics).
+
+    Args:
+        app (Flask): Aplicação
+    """
+    if not app.config.get('INSTRUMENTACAO', True):
+        return
+
+    stats = app.extensions.setdefault('desempenho', RouteStats(app.config.get('INSTRUMENTACAO_AMOSTRAS', 1000)))
+    enviar_cabecalho = app.config.get('INSTRUMENTACAO_SERVER_TIMING', True)
+    registrar_log = app.config.get('INSTRUMENTACAO_LOG', True)
+    observar = None
+    if app.config.get('METRICAS', True):
+        from app.utils.metrics import observe_request as observar
+
+    with app.app_context():
+        engine = db.engine
+
+    def _encerrar_comando(conn):
+        # O início é removido também quando o comando falha, para não ser somado ao seguinte
+        inicio = conn.info.pop('_inicio_sql', None)
+        metricas = current_metrics()
+        if metricas is None or inicio is None:
+            return
+        metricas.sql_tempo += time.perf_counter() - inicio
+        metricas.sql_consultas += 1
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        if current_metrics() is not None:
+            conn.info['_inicio_sql'] = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _depois(conn, cursor, statement, parameters, context, executemany):
+        _encerrar_comando(conn)
+
+    @event.listens_for(engine, 'handle_error')
+    def _falha(exception_context):
+        if exception_context.connection is not None:
+            _encerrar_comando(exception_context.connection)
+
+    @app.before_request
+    def _iniciar_medicao():
+        g._metricas = RequestMetrics()
+
+    @app.after_request
+    def _registrar_medicao(response):
+        metricas = g.pop('_metricas', None)
+        if metricas is None:
+            return response
+
+        duracao = time.perf_counter() - metricas.inicio
+        regra = request.url_rule.rule if request.url_rule else '<sem rota>'
+        stats.record(f'{request.method} {regra}', duracao, metricas.sql_tempo, metricas.sql_consultas,
+                     metricas.linhas, metricas.serializacao, response.status_code >= 500)
+
+        if observar is not None:
+            observar(request.method, regra, response.status_code, duracao, metricas.sql_tempo)
+
+        if enviar_cabecalho:
+            response.headers['Server-Timing'] = server_timing(metricas, duracao)
+
+        if registrar_log and logger.isEnabledFor(logging.INFO):
+            logger.info(orjson.dumps({
+                'metodo': request.method,
+                'rota': regra,
+                'caminho': request.path,
+                'status': response.status_code,
+                'duracao_ms': round(duracao * 1000, 3),
+                'sql_ms': round(metricas.sql_tempo * 1000, 3),
+                'sql_consultas': metricas.sql_consultas,
+                'linhas': metricas.linhas,
+                'serializacao_ms': round(metricas.serializacao * 1000, 3),
+                'worker': os.getpid(),
+            }).decode())
+
+        return response
@@ -0,0 +1,41 @@
+import time
+import orjson
+from flask.json.provider import DefaultJSONProvider, _default
+from app.utils.instrumentation import record_serialization
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Provedor JSON do Flask baseado no orjson (jsonify, request.get_json, NDJSON).
+
+    Gera os bytes da resposta diretamente, sem passar por str. Tipos que o orjson
+    não serializa de forma nativa (Decimal, date/datetime) são convertidos como no
+    provedor padrão do Flask. As chaves mantêm a ordem declarada nos serializadores
+    em vez de serem ordenadas, e o texto é enviado em UTF-8 sem escapes.
+    """
+    sort_keys = False
+
+    # Datas são repassadas para _default, que usa o formato HTTP do provedor padrão;
+    # os serializadores já enviam as datas como texto ISO 8601
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def _options(self, pretty=False):
+        option = self.option
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_default, option=self._options('indent' in kwargs)).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        inicio = time.perf_counter()
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_default, option=self._options(pretty) | orjson.OPT_APPEND_NEWLINE)
+        record_serialization(time.perf_counter() - inicio)
+        return self._app.response_class(body, mimetype=self.mimetype)
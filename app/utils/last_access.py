@@ -0,0 +1,146 @@
+import atexit
+import threading
+from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import bindparam, event, or_, update
+from app import db
+from app.models import Usuario
+
+# Atualização condicional: um worker com horário mais antigo não sobrescreve um mais recente
+_UPDATE = update(Usuario.__table__).where(
+    Usuario.__table__.c.id == bindparam('b_id'),
+    or_(Usuario.__table__.c.ultimo_acesso.is_(None), Usuario.__table__.c.ultimo_acesso < bindparam('b_ultimo_acesso'))
+).values(ultimo_acesso=bindparam('b_ultimo_acesso'))
+
+class LastAccessBuffer:
+    """
+    Acumula em memória os horários de último acesso dos usuários e os grava em lote.
+
+    Cada worker mantém o seu buffer; os horários são gravados com uma única
+    instrução UPDATE (executemany) quando o buffer atinge max_entradas, quando
+    expira o intervalo contado a partir do primeiro registro pendente, ou no
+    encerramento do processo. A gravação usa uma conexão própria, independente da
+    sessão da requisição.
+    """
+
+    def __init__(self, app, intervalo=10, max_entradas=500):
+        self.app = app
+        self.intervalo = intervalo
+        self.max_entradas = max_entradas
+        self._pendentes = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def record(self, usuario_id, quando=None):
+        """
+        Registra um acesso do usuário.
+
+        Args:
+            usuario_id (str): ID do usuário
+            quando (datetime): Horário do acesso (padrão: agora, em UTC)
+        """
+        quando = quando or datetime.utcnow()
+        with self._lock:
+            anterior = self._pendentes.get(usuario_id)
+            if anterior is None or quando > anterior:
+                self._pendentes[usuario_id] = quando
+            gravar = len(self._pendentes) >= self.max_entradas
+            if not gravar and self._timer is None:
+                self._timer = threading.Timer(self.intervalo, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if gravar:
+            self.flush()
+
+    def get(self, usuario_id):
+        """Retorna o horário pendente de gravação do usuário, se houver."""
+        with self._lock:
+            return self._pendentes.get(usuario_id)
+
+    def flush(self):
+        """
+        Grava os horários pendentes com uma única instrução UPDATE em lote.
+
+        Returns:
+            int: Quantidade de usuários gravados
+        """
+        with self._lock:
+            pendentes, self._pendentes = self._pendentes, {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not pendentes:
+            return 0
+
+        with self.app.app_context():
+            try:
+                with db.engine.begin() as conn:
+                    conn.execute(_UPDATE, [
+                        {'b_id': usuario_id, 'b_ultimo_acesso': quando} for usuario_id, quando in pendentes.items()
+                    ])
+            except Exception:
+                self.app.logger.exception('Falha ao gravar o último acesso de %d usuários', len(pendentes))
+                return 0
+
+        return len(pendentes)
+
+    def discard(self):
+        """Descarta os horários pendentes sem gravá-los."""
+        with self._lock:
+            self._pendentes = {}
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+def get_last_access_buffer(app=None):
+    """
+    Retorna o buffer de último acesso da aplicação, criado no primeiro uso.
+
+    O intervalo e o tamanho máximo do lote são definidos por ULTIMO_ACESSO_INTERVALO
+    e ULTIMO_ACESSO_LOTE.
+
+    Args:
+        app (Flask): Aplicação (padrão: current_app)
+
+    Returns:
+        LastAccessBuffer: Instância do buffer
+    """
+    app = app or current_app._get_current_object()
+    buffer = app.extensions.get('ultimo_acesso')
+    if buffer is None:
+        buffer = app.extensions.setdefault('ultimo_acesso', LastAccessBuffer(
+            app,
+            intervalo=app.config.get('ULTIMO_ACESSO_INTERVALO', 10),
+            max_entradas=app.config.get('ULTIMO_ACESSO_LOTE', 500)
+        ))
+    return buffer
+
+def record_last_access(usuario_id):
+    """Registra o acesso do usuário para gravação em lote."""
+    get_last_access_buffer().record(usuario_id)
+
+def get_last_access(usuario):
+    """
+    Retorna o último acesso mais recente do usuário, considerando o valor ainda não gravado.
+
+    Args:
+        usuario (Usuario): Usuário
+
+    Returns:
+        datetime: Último acesso ou None
+    """
+    pendente = get_last_access_buffer().get(usuario.id)
+    if pendente is None or (usuario.ultimo_acesso and usuario.ultimo_acesso >= pendente):
+        return usuario.ultimo_acesso
+    return pendente
+
+@event.listens_for(db.metadata, 'before_drop')
+def _discard_before_drop(target, connection, **kw):
+    # Tabelas removidas (testes): horários pendentes não têm onde ser gravados
+    if has_app_context():
+        buffer = current_app.extensions.get('ultimo_acesso')
+        if buffer is not None:
+            buffer.discard()
@@ -0,0 +1,36 @@
+def eager_load(*options):
+    """
+    Declara as opções de carregamento (joinedload/selectinload) usadas por um serializador.
+
+    Os relacionamentos acessados pelo serializador devem ser declarados aqui para que
+    as consultas de listagem carreguem tudo em um número constante de queries,
+    independentemente do tamanho da página.
+
+    Args:
+        *options: Opções de carregamento do SQLAlchemy (ex.: joinedload(Equipamento.departamento))
+
+    Returns:
+        function: Decorador que anexa as opções ao serializador
+    """
+    def decorator(serializer):
+        serializer.load_options = options
+        return serializer
+
+    return decorator
+
+def with_loading(query, serializer):
+    """
+    Aplica a uma consulta as opções de carregamento declaradas por um serializador.
+
+    Args:
+        query (Query): Consulta do SQLAlchemy
+        serializer (function): Serializador decorado com eager_load
+
+    Returns:
+        Query: Consulta com as opções de carregamento aplicadas
+    """
+    options = getattr(serializer, 'load_options', ())
+    if options:
+        query = query.options(*options)
+
+    return query
@@ -0,0 +1,154 @@
+import os
+from flask import current_app
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from app import db
+
+# Com PROMETHEUS_MULTIPROC_DIR definido (gunicorn.conf.py), cada worker grava seus
+# valores em arquivos mapeados em memória (mmap) nesse diretório e a coleta soma os
+# arquivos de todos os workers. Sem a variável, os valores ficam na memória do processo.
+
+REGISTRO = CollectorRegistry()
+
+# Limites (em segundos) dos intervalos dos histogramas de tempo
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUISICOES = Counter(
+    'http_requests_total', 'Requisições HTTP atendidas',
+    ['method', 'route', 'status'], registry=REGISTRO
+)
+DURACAO = Histogram(
+    'http_request_duration_seconds', 'Tempo de resposta das requisições HTTP',
+    ['method', 'route'], buckets=BUCKETS, registry=REGISTRO
+)
+DURACAO_SQL = Histogram(
+    'http_request_db_duration_seconds', 'Tempo gasto em comandos SQL por requisição',
+    ['method', 'route'], buckets=BUCKETS, registry=REGISTRO
+)
+ERROS = Counter(
+    'http_request_errors_total', 'Requisições que terminaram com erro interno (status 5xx)',
+    ['method', 'route'], registry=REGISTRO
+)
+
+# Gauges do pool: somados entre os workers vivos
+POOL_TAMANHO = Gauge(
+    'db_pool_size', 'Tamanho configurado do pool de conexões',
+    multiprocess_mode='livesum', registry=REGISTRO
+)
+POOL_EM_USO = Gauge(
+    'db_pool_checked_out', 'Conexões do pool em uso',
+    multiprocess_mode='livesum', registry=REGISTRO
+)
+POOL_EXCEDENTES = Gauge(
+    'db_pool_overflow', 'Conexões abertas além do tamanho do pool',
+    multiprocess_mode='livesum', registry=REGISTRO
+)
+
+# Indicadores do domínio: (métrica, descrição, rótulo, dashboard, tabelas, função de contagem)
+INDICADORES = [
+    ('ordens_servico_abertas', 'Ordens de serviço em aberto por prioridade', 'prioridade',
+     'ordens-servico-por-prioridade', ['ordens_servico'], 'ordens_servico_abertas_por_prioridade'),
+    ('equipamentos', 'Equipamentos por status', 'status',
+     'equipamentos-por-status', ['equipamentos'], 'equipamentos_por_status'),
+    ('manutencoes', 'Manutenções por status', 'status',
+     'manutencoes-por-status', ['manutencoes'], 'manutencoes_por_status'),
+]
+
+def multiprocess_enabled():
+    """Indica se as métricas são gravadas no diretório compartilhado entre os workers."""
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+def observe_request(metodo, rota, status, duracao, sql_tempo):
+    """
+    Registra uma requisição atendida.
+
+    Args:
+        metodo (str): Método HTTP
+        rota (str): Regra da rota (ex.: /api/equipamentos/<id>), nunca o caminho, para
+            não criar uma série por ID
+        status (int): Código de status da resposta
+        duracao (float): Tempo total em segundos
+        sql_tempo (float): Tempo gasto em comandos SQL em segundos
+    """
+    REQUISICOES.labels(metodo, rota, str(status)).inc()
+    DURACAO.labels(metodo, rota).observe(duracao)
+    DURACAO_SQL.labels(metodo, rota).observe(sql_tempo)
+    if status >= 500:
+        ERROS.labels(metodo, rota).inc()
+
+class DomainCollector:
+    """
+    Indicadores do domínio calculados no momento da coleta.
+
+    As contagens vêm do cache compartilhado dos dashboards. Depois de uma alteração nas
+    tabelas de origem, a coleta continua servindo o valor em cache e só consulta o banco
+    quando ele tiver mais de METRICAS_RECALCULO segundos.
+    """
+
+    def collect(self):
+        from app.routes import dashboard_routes
+        from app.utils.dashboard_cache import get_dashboard_cache
+
+        cache = get_dashboard_cache()
+        idade_maxima = current_app.config.get('METRICAS_RECALCULO', 60)
+        for nome, descricao, rotulo, dashboard, tabelas, contagem in INDICADORES:
+            calcular = getattr(dashboard_routes, contagem)
+            valores, _ = cache.get_or_compute(dashboard, (None,), tabelas, calcular, idade_maxima)
+            familia = GaugeMetricFamily(nome, descricao, labels=[rotulo])
+            for valor, quantidade in sorted(valores.items()):
+                familia.add_metric([str(valor)], quantidade)
+            yield familia
+
+def generate_metrics():
+    """
+    Gera o texto no formato de exposição do Prometheus.
+
+    Returns:
+        bytes: Métricas de requisições e do pool (somadas entre os workers quando
+            PROMETHEUS_MULTIPROC_DIR está definido) seguidas dos indicadores do domínio
+    """
+    if multiprocess_enabled():
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+    else:
+        registro = REGISTRO
+
+    dominio = CollectorRegistry()
+    dominio.register(DomainCollector())
+    return generate_latest(registro) + generate_latest(dominio)
+
+def _update_pool_gauges(pool, devolvida=0):
+    # O evento checkin é disparado antes de a conexão voltar ao pool; ao voltar, as
+    # conexões excedentes são fechadas se o pool já tiver pool_size conexões livres
+    em_uso = pool.checkedout() - devolvida
+    POOL_EM_USO.set(em_uso)
+    POOL_EXCEDENTES.set(max(min(pool.overflow(), em_uso), 0))
+
+def init_metrics(app):
+    """
+    Registra o acompanhamento do pool de conexões do engine da aplicação.
+
+    As métricas das requisições são registradas pela instrumentação
+    (init_instrumentation), que chama observe_request ao final de cada requisição.
+
+    Args:
+        app (Flask): Aplicação
+    """
+    with app.app_context():
+        engine = db.engine
+
+    pool = engine.pool
+    # Pools sem limite de conexões (SingletonThreadPool, NullPool, StaticPool) não têm esses contadores
+    if not hasattr(pool, 'checkedout') or not hasattr(pool, 'overflow'):
+        return
+
+    POOL_TAMANHO.set(pool.size())
+
+    @event.listens_for(engine, 'checkout')
+    def _conexao_retirada(dbapi_connection, connection_record, connection_proxy):
+        _update_pool_gauges(pool)
+
+    @event.listens_for(engine, 'checkin')
+    def _conexao_devolvida(dbapi_connection, connection_record):
+        _update_pool_gauges(pool, devolvida=1)
@@ -0,0 +1,232 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, update
+from sqlalchemy.orm import Session
+from app import db
+from app.models import Notificacao
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contadores (
+    usuario_id TEXT PRIMARY KEY,
+    nao_lidas INTEGER,
+    versao INTEGER NOT NULL DEFAULT 0,
+    expira_em REAL NOT NULL DEFAULT 0
+);
+"""
+
+class UnreadCounter:
+    """
+    Contador de notificações não lidas por usuário, compartilhado entre processos (arquivo SQLite).
+
+    O contador é ajustado pelos commits que criam, leem ou removem notificações e
+    só consulta o banco quando não é conhecido (primeiro acesso, alteração em lote
+    sem contagem ou expiração). A versão de cada usuário é incrementada a cada
+    alteração e é usada pelo stream de eventos para detectar novas notificações
+    sem consultar o banco.
+    """
+
+    def __init__(self, path, ttl=300):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+
+    def _connection(self):
+        """Retorna a conexão SQLite da thread atual (recriada após fork)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def version(self, usuario_id):
+        """Retorna a versão atual do contador do usuário."""
+        row = self._connection().execute(
+            "SELECT versao FROM contadores WHERE usuario_id = ?", (usuario_id,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get(self, usuario_id):
+        """
+        Retorna a quantidade de notificações não lidas do usuário.
+
+        Args:
+            usuario_id (str): ID do usuário
+
+        Returns:
+            int: Notificações não lidas
+        """
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT nao_lidas, versao, expira_em FROM contadores WHERE usuario_id = ?", (usuario_id,)
+        ).fetchone()
+        if row and row[0] is not None and row[2] >= time.time():
+            return row[0]
+
+        # Contagem pelo índice (usuario_id, lida); só é gravada se nenhum commit alterou a versão no intervalo
+        versao = row[1] if row else 0
+        nao_lidas = db.session.query(func.count(Notificacao.id)).filter(
+            Notificacao.usuario_id == usuario_id, Notificacao.lida.is_(False)
+        ).scalar()
+        conn.execute(
+            "INSERT INTO contadores (usuario_id, nao_lidas, versao, expira_em) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(usuario_id) DO UPDATE SET nao_lidas = excluded.nao_lidas, expira_em = excluded.expira_em "
+            "WHERE contadores.versao = excluded.versao",
+            (usuario_id, nao_lidas, versao, time.time() + self.ttl)
+        )
+        return nao_lidas
+
+    def apply(self, deltas, desconhecidos=()):
+        """
+        Aplica variações confirmadas aos contadores e incrementa suas versões.
+
+        Args:
+            deltas (dict): Variação de não lidas por usuário
+            desconhecidos (iterable): Usuários cuja contagem deve ser refeita no próximo acesso
+        """
+        conn = self._connection()
+        conn.executemany(
+            "INSERT INTO contadores (usuario_id, nao_lidas, versao) VALUES (?, NULL, 1) "
+            "ON CONFLICT(usuario_id) DO UPDATE SET nao_lidas = nao_lidas + ?, versao = versao + 1",
+            [(usuario_id, delta) for usuario_id, delta in deltas.items()]
+        )
+        conn.executemany(
+            "INSERT INTO contadores (usuario_id, nao_lidas, versao) VALUES (?, NULL, 1) "
+            "ON CONFLICT(usuario_id) DO UPDATE SET nao_lidas = NULL, versao = versao + 1",
+            [(usuario_id,) for usuario_id in desconhecidos]
+        )
+
+    def invalidate_all(self):
+        """Descarta todas as contagens (alteração em lote sem usuário conhecido)."""
+        self._connection().execute("UPDATE contadores SET nao_lidas = NULL, versao = versao + 1")
+
+    def clear(self):
+        """Remove todos os contadores."""
+        self._connection().execute("DELETE FROM contadores")
+
+_counters = {}
+_counters_lock = threading.Lock()
+
+def get_unread_counter(app=None):
+    """
+    Retorna o contador de notificações não lidas da aplicação.
+
+    O arquivo é definido por NOTIFICACOES_CONTADOR_PATH (padrão: instance/notificacoes.db)
+    e é compartilhado por todos os workers que apontam para o mesmo caminho.
+
+    Args:
+        app (Flask): Aplicação (padrão: current_app)
+
+    Returns:
+        UnreadCounter: Instância do contador
+    """
+    app = app or current_app
+    path = app.config.get('NOTIFICACOES_CONTADOR_PATH') or os.path.join(app.instance_path, 'notificacoes.db')
+
+    with _counters_lock:
+        counter = _counters.get(path)
+        if counter is None:
+            counter = UnreadCounter(path, ttl=app.config.get('NOTIFICACOES_CONTADOR_TTL', 300))
+            _counters[path] = counter
+        return counter
+
+def mark_as_read(usuario_id, ids=None):
+    """
+    Marca notificações do usuário como lidas com uma única instrução UPDATE.
+
+    Args:
+        usuario_id (str): ID do usuário
+        ids (list): IDs das notificações (None para todas as não lidas)
+
+    Returns:
+        int: Quantidade de notificações marcadas
+    """
+    filtros = [Notificacao.usuario_id == usuario_id, Notificacao.lida.is_(False)]
+    if ids is not None:
+        filtros.append(Notificacao.id.in_(ids))
+
+    resultado = db.session.execute(
+        update(Notificacao).where(*filtros).values(lida=True, atualizado_em=datetime.utcnow())
+        .execution_options(synchronize_session=False, notificacoes_usuario=usuario_id)
+    )
+    if resultado.rowcount:
+        _alteracoes(db.session)['deltas'][usuario_id] -= resultado.rowcount
+    return resultado.rowcount
+
+# Atualização do contador: as variações de cada transação são acumuladas na sessão e
+# aplicadas somente após o commit.
+
+def _alteracoes(session):
+    return session.info.setdefault('notificacoes_alteradas', {'deltas': Counter(), 'desconhecidos': set(), 'todos': False})
+
+@event.listens_for(Session, 'after_flush')
+def _collect_flushed_notifications(session, flush_context):
+    alteracoes = None
+    for obj in session.new:
+        if isinstance(obj, Notificacao) and not obj.lida:
+            alteracoes = alteracoes or _alteracoes(session)
+            alteracoes['deltas'][obj.usuario_id] += 1
+
+    for obj in session.dirty:
+        if isinstance(obj, Notificacao):
+            historico = db.inspect(obj).attrs.lida.history
+            if historico.has_changes():
+                alteracoes = alteracoes or _alteracoes(session)
+                alteracoes['deltas'][obj.usuario_id] += -1 if obj.lida else 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Notificacao):
+            _alteracoes(session)['desconhecidos'].add(obj.usuario_id)
+
+@event.listens_for(Session, 'do_orm_execute')
+def _collect_bulk_notifications(orm_execute_state):
+    if getattr(getattr(orm_execute_state.statement, 'table', None), 'name', None) != Notificacao.__tablename__:
+        return
+
+    if orm_execute_state.is_insert:
+        # INSERT em lote (ex.: avisos de vencimento de certificados)
+        parametros = orm_execute_state.parameters
+        linhas = parametros if isinstance(parametros, list) else [parametros or {}]
+        deltas = _alteracoes(orm_execute_state.session)['deltas']
+        for linha in linhas:
+            if linha.get('usuario_id') and not linha.get('lida'):
+                deltas[linha['usuario_id']] += 1
+    elif orm_execute_state.is_update or orm_execute_state.is_delete:
+        # mark_as_read contabiliza as próprias alterações; outras instruções em lote invalidam a contagem
+        if 'notificacoes_usuario' not in orm_execute_state.execution_options:
+            _alteracoes(orm_execute_state.session)['todos'] = True
+
+@event.listens_for(Session, 'after_commit')
+def _apply_after_commit(session):
+    alteracoes = session.info.pop('notificacoes_alteradas', None)
+    if not alteracoes or not has_app_context():
+        return
+
+    try:
+        counter = get_unread_counter()
+        if alteracoes['todos']:
+            counter.invalidate_all()
+        else:
+            deltas = {usuario_id: delta for usuario_id, delta in alteracoes['deltas'].items()
+                      if delta and usuario_id not in alteracoes['desconhecidos']}
+            counter.apply(deltas, alteracoes['desconhecidos'])
+    except sqlite3.Error:
+        current_app.logger.exception('Falha ao atualizar o contador de notificações')
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_after_rollback(session):
+    session.info.pop('notificacoes_alteradas', None)
+
+@event.listens_for(db.metadata, 'after_drop')
+def _clear_after_drop(target, connection, **kw):
+    if has_app_context():
+        get_unread_counter().clear()
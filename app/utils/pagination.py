@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import or_, and_
+
+def encode_cursor(criado_em, id):
+    """
+    Gera um cursor opaco a partir da chave de ordenação de um registro.
+
+    Args:
+        criado_em (datetime): Data de criação do registro
+        id (str): ID do registro
+
+    Returns:
+        str: Cursor codificado em base64 (seguro para URLs)
+    """
+    payload = json.dumps([criado_em.isoformat() if criado_em else None, id])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Decodifica um cursor gerado por encode_cursor.
+
+    Args:
+        cursor (str): Cursor opaco recebido do cliente
+
+    Returns:
+        tuple: (criado_em, id) do último registro da página anterior
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        criado_em, id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return datetime.fromisoformat(criado_em), str(id)
+    except Exception:
+        raise ValueError('Cursor inválido')
+
+def keyset_paginate(query, model, cursor, per_page, include_total=False):
+    """
+    Pagina uma consulta por chave (criado_em, id) em vez de OFFSET.
+
+    Cada página é obtida com uma busca por intervalo no índice (criado_em, id), com
+    custo constante independentemente da profundidade. O total só é calculado
+    quando solicitado explicitamente.
+
+    Args:
+        query (Query): Consulta base (com filtros e opções de carregamento)
+        model (db.Model): Modelo paginado, com colunas criado_em e id
+        cursor (str): Cursor da página anterior ou vazio para a primeira página
+        per_page (int): Quantidade de itens por página
+        include_total (bool): Se True, calcula também o total de registros
+
+    Returns:
+        dict: Itens da página, próximo cursor e, opcionalmente, o total
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    per_page = max(1, min(per_page, 1000))
+    page_query = query.order_by(model.criado_em, model.id)
+
+    if cursor:
+        criado_em, id = decode_cursor(cursor)
+        page_query = page_query.filter(or_(
+            model.criado_em > criado_em,
+            and_(model.criado_em == criado_em, model.id > id)
+        ))
+
+    items = page_query.limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+
+    result = {
+        'items': items,
+        'next_cursor': encode_cursor(items[-1].criado_em, items[-1].id) if has_more else None
+    }
+
+    if include_total:
+        result['total'] = query.order_by(None).enable_eagerloads(False).count()
+
+    return result
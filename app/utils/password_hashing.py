@@ -0,0 +1,112 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+class HashingUnavailable(Exception):
+    """Fila de verificação de senhas cheia ou tempo de espera esgotado."""
+
+_executor = None
+_executor_key = None
+_slots = None
+_lock = threading.Lock()
+
+def _get_executor(processos, fila):
+    """
+    Retorna o pool de processos e o limite de tarefas pendentes do processo atual (recriados após fork).
+
+    Os processos são iniciados por um forkserver (ou spawn), e não por fork do worker,
+    que tem várias threads (gthread, agendador, geração de QR Codes) cujas travas
+    poderiam ficar presas no processo filho.
+    """
+    global _executor, _executor_key, _slots
+
+    with _lock:
+        key = (os.getpid(), processos, fila)
+        if _executor is None or _executor_key != key:
+            if _executor is not None and _executor_key[0] == os.getpid():
+                _executor.shutdown(wait=False)
+            metodo = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _executor = ProcessPoolExecutor(max_workers=processos, mp_context=multiprocessing.get_context(metodo))
+            _executor_key = key
+            _slots = threading.BoundedSemaphore(fila) if fila else threading.Semaphore(0)
+        return _executor, _slots
+
+def _reset_executor(executor):
+    """Descarta um pool interrompido (ex.: processo encerrado pelo sistema) para que seja recriado."""
+    global _executor
+
+    with _lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+def needs_rehash(senha_hash, metodo):
+    """
+    Verifica se um hash foi gerado com método ou custo diferente do configurado.
+
+    Args:
+        senha_hash (str): Hash armazenado (formato do Werkzeug: metodo$salt$hash)
+        metodo (str): Método configurado, com custo explícito (ex.: pbkdf2:sha256:600000)
+
+    Returns:
+        bool: True se o hash deve ser regerado
+    """
+    return senha_hash.split('$', 1)[0] != metodo
+
+def _verify(senha_hash, senha, metodo):
+    """Verifica a senha e, se o hash estiver desatualizado, gera o novo (executado no pool)."""
+    if not check_password_hash(senha_hash, senha):
+        return False, None
+    return True, generate_password_hash(senha, method=metodo) if needs_rehash(senha_hash, metodo) else None
+
+def verify_password(senha_hash, senha):
+    """
+    Verifica uma senha em um pool de processos limitado.
+
+    O cálculo do hash consome dezenas de milissegundos de CPU; executá-lo fora do
+    processo do worker evita que logins simultâneos bloqueiem as demais requisições.
+    A quantidade de verificações pendentes por worker é limitada por LOGIN_HASH_FILA:
+    acima dela a verificação é recusada imediatamente, em vez de acumular espera.
+    Com LOGIN_HASH_PROCESSOS = 0 a verificação é feita no próprio processo.
+
+    Args:
+        senha_hash (str): Hash armazenado
+        senha (str): Senha informada
+
+    Returns:
+        tuple: (senha válida, novo hash no método configurado ou None)
+
+    Raises:
+        HashingUnavailable: Se a fila estiver cheia ou a verificação exceder LOGIN_HASH_TIMEOUT
+    """
+    config = current_app.config
+    metodo = config.get('SENHA_HASH_METODO', 'pbkdf2:sha256:600000')
+    processos = config.get('LOGIN_HASH_PROCESSOS', 2)
+
+    if not processos:
+        return _verify(senha_hash, senha, metodo)
+
+    executor, slots = _get_executor(processos, config.get('LOGIN_HASH_FILA', 16))
+    if not slots.acquire(blocking=False):
+        raise HashingUnavailable('Muitas verificações de senha em andamento')
+
+    # A vaga só é liberada quando o processo termina, mesmo que a requisição desista antes
+    try:
+        future = executor.submit(_verify, senha_hash, senha, metodo)
+    except BrokenProcessPool:
+        slots.release()
+        _reset_executor(executor)
+        raise HashingUnavailable('Pool de verificação de senhas indisponível')
+    future.add_done_callback(lambda f: slots.release())
+
+    try:
+        return future.result(timeout=config.get('LOGIN_HASH_TIMEOUT', 5))
+    except FutureTimeoutError:
+        raise HashingUnavailable('Tempo de verificação de senha esgotado')
+    except BrokenProcessPool:
+        _reset_executor(executor)
+        raise HashingUnavailable('Pool de verificação de senhas indisponível')
@@ -0,0 +1,183 @@
+from datetime import date, datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, update
+from sqlalchemy.dialects import postgresql, sqlite
+from app import db
+from app.models import ProgramaManutencao, Equipamento, Manutencao
+from app.models.types import uuid7
+from app.utils.aggregates import month_start, refresh_summaries
+from app.utils.helpers import FREQUENCIAS, calculate_next_maintenance_date
+
+# Equipamentos que não recebem novas manutenções preventivas
+STATUS_SEM_PREVENTIVA = ['INATIVO', 'DESCONTINUADO']
+
+def due_dates(ancora, frequencia, hoje, limite):
+    """
+    Calcula as datas de manutenção de um programa dentro do horizonte.
+
+    As datas são múltiplos do intervalo a partir da âncora (última manutenção gerada
+    ou realizada), o que evita o acúmulo de ajustes de fim de mês. Uma manutenção já
+    vencida e não gerada é agendada para hoje.
+
+    Args:
+        ancora (datetime.date): Última manutenção gerada ou realizada (ou None)
+        frequencia (str): Frequência do programa
+        hoje (datetime.date): Data de referência
+        limite (datetime.date): Última data do horizonte
+
+    Returns:
+        list: Datas a agendar, em ordem
+    """
+    if ancora is None:
+        datas = [hoje]
+        ancora, ocorrencia = hoje, 1
+    else:
+        datas = []
+        ocorrencia = 1
+        proxima = calculate_next_maintenance_date(ancora, frequencia)
+        if proxima < hoje:
+            # Atrasada: agendar para hoje e seguir a partir de hoje
+            datas.append(hoje)
+            ancora = hoje
+
+    while True:
+        proxima = calculate_next_maintenance_date(ancora, frequencia, ocorrencia)
+        if proxima > limite:
+            break
+        if proxima >= hoje:
+            datas.append(proxima)
+        ocorrencia += 1
+
+    return datas
+
+def _insert_ignoring_duplicates(rows):
+    """INSERT em lote que ignora manutenções já geradas (índice único programa/data)."""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        stmt = postgresql.insert(Manutencao).on_conflict_do_nothing(index_elements=['programa_id', 'data_agendamento'])
+    elif dialect == 'sqlite':
+        stmt = sqlite.insert(Manutencao).on_conflict_do_nothing(index_elements=['programa_id', 'data_agendamento'])
+    else:
+        stmt = Manutencao.__table__.insert()
+    db.session.execute(stmt, rows)
+
+def _schedule_batch(programas, hoje, limite):
+    """Gera as manutenções de um lote de programas e atualiza a próxima data dos equipamentos."""
+    programa_ids = [p.id for p in programas]
+
+    # Última manutenção já gerada por programa e datas já existentes no horizonte (2 consultas por lote)
+    ultimas = dict(db.session.query(
+        Manutencao.programa_id, func.max(Manutencao.data_agendamento)
+    ).filter(Manutencao.programa_id.in_(programa_ids)).group_by(Manutencao.programa_id).all())
+
+    existentes = set(db.session.query(Manutencao.programa_id, Manutencao.data_agendamento).filter(
+        Manutencao.programa_id.in_(programa_ids),
+        Manutencao.data_agendamento >= datetime.combine(hoje, datetime.min.time())
+    ).all())
+
+    agora = datetime.utcnow()
+    novas = []
+    for programa in programas:
+        ultima = ultimas.get(programa.id)
+        ancora = ultima.date() if ultima else programa.ultima_manutencao
+
+        for data in due_dates(ancora, programa.frequencia, hoje, limite):
+            data_agendamento = datetime.combine(data, datetime.min.time())
+            if (programa.id, data_agendamento) in existentes:
+                continue
+            novas.append({
+                'id': uuid7(),
+                'equipamento_id': programa.equipamento_id,
+                'programa_id': programa.id,
+                'tipo_manutencao': 'PREVENTIVA',
+                'status': 'AGENDADA',
+                'prioridade': 'NORMAL',
+                'descricao': f'Manutenção preventiva programada: {programa.nome}',
+                'data_agendamento': data_agendamento,
+                'criado_em': agora,
+                'atualizado_em': agora,
+            })
+
+    if novas:
+        _insert_ignoring_duplicates(novas)
+
+        # INSERT em lote não passa pelo flush: atualizar os resumos explicitamente
+        refresh_summaries(
+            db.session.connection(),
+            manutencao_keys={(row['equipamento_id'], month_start(row['data_agendamento'])) for row in novas}
+        )
+
+    # Próxima manutenção planejada = preventiva agendada mais próxima de cada equipamento
+    equipamento_ids = {p.equipamento_id for p in programas}
+    proximas = db.session.query(
+        Manutencao.equipamento_id, func.min(Manutencao.data_agendamento)
+    ).filter(
+        Manutencao.equipamento_id.in_(equipamento_ids),
+        Manutencao.tipo_manutencao == 'PREVENTIVA',
+        Manutencao.status == 'AGENDADA'
+    ).group_by(Manutencao.equipamento_id).all()
+
+    atuais = {p.equipamento_id: p.proxima_manutencao_planejada for p in programas}
+    alteradas = [
+        {'id': equipamento_id, 'proxima_manutencao_planejada': proxima.date()}
+        for equipamento_id, proxima in proximas
+        if atuais.get(equipamento_id) != proxima.date()
+    ]
+    if alteradas:
+        db.session.execute(update(Equipamento), alteradas)
+
+    db.session.commit()
+    return len(novas)
+
+def schedule_preventive_maintenance(hoje=None, horizonte_dias=None, batch_size=1000):
+    """
+    Gera as manutenções preventivas (AGENDADA) de todos os programas ativos.
+
+    Os programas são percorridos em lotes pela chave primária; para cada lote são
+    feitas poucas consultas por conjunto (última manutenção gerada, datas existentes,
+    próxima data por equipamento), as datas são calculadas em memória e as novas
+    manutenções são inseridas com um único INSERT em lote. A execução é idempotente:
+    datas já geradas não são inseridas novamente, e o índice único (programa, data)
+    protege contra execuções simultâneas.
+
+    Programas sem equipamento associado (apenas tipo_equipamento) são ignorados.
+
+    Args:
+        hoje (datetime.date): Data de referência (padrão: hoje)
+        horizonte_dias (int): Dias à frente a agendar (padrão: PREVENTIVA_HORIZONTE_DIAS)
+        batch_size (int): Programas por lote
+
+    Returns:
+        dict: Quantidade de programas processados e de manutenções geradas
+    """
+    hoje = hoje or date.today()
+    if horizonte_dias is None:
+        horizonte_dias = current_app.config.get('PREVENTIVA_HORIZONTE_DIAS', 90)
+    limite = hoje + timedelta(days=horizonte_dias)
+
+    query = db.session.query(
+        ProgramaManutencao.id, ProgramaManutencao.nome, ProgramaManutencao.frequencia,
+        ProgramaManutencao.equipamento_id, Equipamento.ultima_manutencao,
+        Equipamento.proxima_manutencao_planejada
+    ).join(
+        Equipamento, Equipamento.id == ProgramaManutencao.equipamento_id
+    ).filter(
+        ProgramaManutencao.ativo.is_(True),
+        ProgramaManutencao.frequencia.in_(list(FREQUENCIAS)),
+        Equipamento.status.notin_(STATUS_SEM_PREVENTIVA)
+    ).order_by(ProgramaManutencao.id)
+
+    programas_processados = 0
+    geradas = 0
+    ultimo_id = None
+    while True:
+        lote_query = query.filter(ProgramaManutencao.id > ultimo_id) if ultimo_id else query
+        programas = lote_query.limit(batch_size).all()
+        if not programas:
+            break
+
+        geradas += _schedule_batch(programas, hoje, limite)
+        programas_processados += len(programas)
+        ultimo_id = programas[-1].id
+
+    return {'programas': programas_processados, 'manutencoes_geradas': geradas}
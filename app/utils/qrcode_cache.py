@@ -0,0 +1,252 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+import qrcode
+import qrcode.image.svg
+
+QRCODE_FORMATS = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+DEFAULT_BOX_SIZE = 10
+DEFAULT_BORDER = 4
+
+def qrcode_dir(config):
+    """
+    Retorna o diretório das imagens de QR Code.
+
+    Args:
+        config (dict): Configuração da aplicação (QRCODE_DIR, padrão: UPLOAD_FOLDER/qrcodes)
+
+    Returns:
+        str: Caminho absoluto do diretório
+    """
+    return os.path.abspath(config.get('QRCODE_DIR') or os.path.join(config['UPLOAD_FOLDER'], 'qrcodes'))
+
+def qrcode_content(equipment_id):
+    """
+    Retorna o conteúdo codificado no QR Code de um equipamento.
+
+    Args:
+        equipment_id (str): ID do equipamento
+
+    Returns:
+        str: URL para acessar o equipamento
+    """
+    return f"https://manutencao-clinica.com/equipamentos/{equipment_id}"
+
+def qrcode_key(content, fmt='png', box_size=DEFAULT_BOX_SIZE, border=DEFAULT_BORDER):
+    """
+    Calcula a chave de cache de um QR Code a partir do conteúdo e dos parâmetros de renderização.
+
+    Returns:
+        str: Hash hexadecimal que identifica a imagem
+    """
+    payload = f"{content}|{fmt}|{box_size}|{border}|L"
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+def render_qrcode(content, fmt='png', box_size=DEFAULT_BOX_SIZE, border=DEFAULT_BORDER):
+    """
+    Renderiza um QR Code em memória.
+
+    Args:
+        content (str): Conteúdo do QR Code
+        fmt (str): Formato da imagem ('png' ou 'svg')
+        box_size (int): Tamanho de cada módulo (pixels no PNG, décimos de mm no SVG)
+        border (int): Largura da borda em módulos
+
+    Returns:
+        bytes: Imagem renderizada
+    """
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=box_size,
+        border=border,
+    )
+    qr.add_data(content)
+    qr.make(fit=True)
+
+    if fmt == 'svg':
+        img = qr.make_image(image_factory=qrcode.image.svg.SvgPathImage)
+    else:
+        img = qr.make_image(fill_color="black", back_color="white")
+
+    buffer = io.BytesIO()
+    img.save(buffer)
+    return buffer.getvalue()
+
+def write_atomic(file_path, data):
+    """Grava um arquivo de forma atômica (arquivo temporário + rename)."""
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, file_path)
+
+class QRCodeCache:
+    """
+    Cache de QR Codes endereçado pelo conteúdo, em memória e em disco.
+
+    Cada imagem é identificada pelo hash do conteúdo e dos parâmetros de renderização,
+    de modo que requisições repetidas nunca renderizam a mesma imagem duas vezes.
+    Ambos os níveis são limitados em bytes e descartam as entradas menos usadas (LRU).
+    """
+
+    def __init__(self, cache_dir, memory_limit=8 * 1024 * 1024, disk_limit=256 * 1024 * 1024, qrcode_dir=None):
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.cache_dir = cache_dir
+        self.qrcode_dir = qrcode_dir
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _file_path(self, key, fmt):
+        return os.path.join(self.cache_dir, f"{key}.{fmt}")
+
+    def _remember(self, key, data):
+        """Guarda a imagem no cache em memória, descartando as menos usadas."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            if len(data) > self.memory_limit:
+                return
+
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.memory_limit:
+                _, removed = self._memory.popitem(last=False)
+                self._memory_bytes -= len(removed)
+
+    def _disk_usage(self):
+        """Calcula o espaço ocupado pelo cache em disco."""
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        return sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.is_file())
+
+    def _evict_disk(self):
+        """Remove do disco os arquivos menos usados até respeitar o limite."""
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        total = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if total <= self.disk_limit:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except FileNotFoundError:
+                continue
+        self._disk_bytes = total
+
+    def _store_disk(self, key, fmt, data):
+        """Grava a imagem no cache em disco, aplicando o limite de tamanho."""
+        write_atomic(self._file_path(key, fmt), data)
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._disk_usage()
+            else:
+                self._disk_bytes += len(data)
+
+            if self._disk_bytes > self.disk_limit:
+                self._evict_disk()
+
+    def _load_disk(self, key, fmt):
+        """Lê a imagem do cache em disco ou das imagens canônicas, se existir."""
+        file_paths = [self._file_path(key, fmt)]
+        if self.qrcode_dir:
+            file_paths.append(os.path.join(self.qrcode_dir, f"{key}.{fmt}"))
+
+        for file_path in file_paths:
+            try:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+
+            # Atualizar a data de modificação marca o arquivo como usado recentemente
+            if file_path.startswith(self.cache_dir):
+                try:
+                    os.utime(file_path)
+                except OSError:
+                    pass
+            return data
+
+        return None
+
+    def get(self, content, fmt='png', box_size=DEFAULT_BOX_SIZE, border=DEFAULT_BORDER):
+        """
+        Retorna um QR Code do cache, renderizando-o apenas no primeiro acesso.
+
+        Args:
+            content (str): Conteúdo do QR Code
+            fmt (str): Formato da imagem ('png' ou 'svg')
+            box_size (int): Tamanho de cada módulo
+            border (int): Largura da borda em módulos
+
+        Returns:
+            tuple: (chave, bytes da imagem)
+        """
+        key = qrcode_key(content, fmt, box_size, border)
+
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return key, data
+
+        data = self._load_disk(key, fmt)
+        if data is not None:
+            with self._lock:
+                self.hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            data = render_qrcode(content, fmt, box_size, border)
+            self._store_disk(key, fmt, data)
+
+        self._remember(key, data)
+        return key, data
+
+_caches = {}
+_cache_lock = threading.Lock()
+
+def get_qrcode_cache(config):
+    """
+    Retorna o cache de QR Codes do processo atual para o diretório configurado.
+
+    Args:
+        config (dict): Configuração da aplicação (QRCODE_DIR, QRCODE_CACHE_DIR, QRCODE_CACHE_MEMORIA
+            e QRCODE_CACHE_DISCO)
+
+    Returns:
+        QRCodeCache: Instância compartilhada do cache
+    """
+    diretorio = qrcode_dir(config)
+    # Renderizações sob demanda (sujeitas a remoção por LRU), separadas das imagens canônicas
+    cache_dir = os.path.abspath(config.get('QRCODE_CACHE_DIR') or os.path.join(diretorio, 'cache'))
+
+    with _cache_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = QRCodeCache(
+                cache_dir,
+                memory_limit=config.get('QRCODE_CACHE_MEMORIA', 8 * 1024 * 1024),
+                disk_limit=config.get('QRCODE_CACHE_DISCO', 256 * 1024 * 1024),
+                qrcode_dir=diretorio
+            )
+            _caches[cache_dir] = cache
+        return cache
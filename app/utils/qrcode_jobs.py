@@ -0,0 +1,343 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+from datetime import datetime, timedelta
+from functools import partial
+from flask import current_app
+from sqlalchemy import update
+from app import db
+from app.models import Equipamento
+from app.utils.helpers import generate_qrcode
+from app.utils.qrcode_cache import qrcode_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: a regeneração fica limitada a uma por processo
+    fcntl = None
+
+# Valor de Equipamento.qr_code enquanto a geração está na fila
+QRCODE_PENDENTE = 'PENDENTE'
+
+# Valor de Equipamento.qr_code quando a geração falhou (refeita por recover_stale_qrcodes)
+QRCODE_ERRO = 'ERRO'
+
+_executor = None
+_executor_pid = None
+_futures = set()
+_lock = threading.Lock()
+
+def _get_executor(max_workers):
+    """Retorna o pool de threads do processo atual (recriado após fork)."""
+    global _executor, _executor_pid
+
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='qrcode')
+            _executor_pid = os.getpid()
+            _futures.clear()
+        return _executor
+
+def _submit(funcao, *args):
+    """Envia uma tarefa ao pool de threads, registrando-a para wait_for_qrcode_jobs."""
+    executor = _get_executor(current_app.config.get('QRCODE_WORKERS', 2))
+    future = executor.submit(funcao, *args)
+
+    with _lock:
+        _futures.add(future)
+    future.add_done_callback(lambda f: _futures.discard(f))
+
+    return future
+
+def _save_results(resultados):
+    """
+    Grava os caminhos dos QR Codes gerados.
+
+    Nas falhas, apenas os equipamentos ainda pendentes passam a QRCODE_ERRO; um
+    caminho válido gravado antes (regeneração) é mantido.
+
+    Args:
+        resultados (list): Pares (id, caminho ou None em caso de falha)
+
+    Returns:
+        int: Quantidade de QR Codes gerados
+    """
+    gerados = [{'id': equipamento_id, 'qr_code': url} for equipamento_id, url in resultados if url]
+    falhas = [equipamento_id for equipamento_id, url in resultados if not url]
+
+    if gerados:
+        db.session.execute(update(Equipamento), gerados)
+    if falhas:
+        db.session.execute(
+            update(Equipamento)
+            .where(Equipamento.id.in_(falhas), Equipamento.qr_code == QRCODE_PENDENTE)
+            .values(qr_code=QRCODE_ERRO)
+        )
+    db.session.commit()
+
+    return len(gerados)
+
+def _run_qrcode_job(app, equipamento_id, equipamento_code):
+    """Gera o QR Code de um equipamento e grava o resultado no banco."""
+    with app.app_context():
+        try:
+            qr_code_url = generate_qrcode(equipamento_id, equipamento_code)
+        except Exception:
+            app.logger.exception('Falha ao gerar QR Code do equipamento %s', equipamento_id)
+            qr_code_url = None
+
+        _save_results([(equipamento_id, qr_code_url)])
+
+def enqueue_qrcode(equipamento_id, equipamento_code):
+    """
+    Agenda a geração do QR Code de um equipamento fora da requisição.
+
+    Deve ser chamado após o commit do equipamento com qr_code = QRCODE_PENDENTE;
+    ao final da tarefa o campo recebe o caminho da imagem gerada.
+
+    Args:
+        equipamento_id (str): ID do equipamento
+        equipamento_code (str): Código do equipamento
+
+    Returns:
+        Future: Tarefa agendada
+    """
+    app = current_app._get_current_object()
+    return _submit(_run_qrcode_job, app, equipamento_id, equipamento_code)
+
+def _render_qrcode(diretorio, item):
+    """Gera um QR Code em um processo do pool (sem acesso ao banco nem à aplicação)."""
+    equipamento_id, equipamento_code = item
+    try:
+        return equipamento_id, generate_qrcode(equipamento_id, equipamento_code, diretorio)
+    except Exception:
+        return equipamento_id, None
+
+def _process_pool(processes=None):
+    """
+    Cria o pool de processos de renderização.
+
+    Os processos são iniciados por um forkserver (ou spawn), e não por fork do
+    worker, que tem várias threads e conexões abertas com o banco.
+    """
+    metodo = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context(metodo))
+
+def _generate_batch(pool, lote, processes=None):
+    """Renderiza um lote de QR Codes no pool de processos e grava os caminhos com um UPDATE em lote."""
+    chunksize = max(1, len(lote) // ((processes or os.cpu_count() or 1) * 4))
+    renderizar = partial(_render_qrcode, qrcode_dir(current_app.config))
+    return _save_results(list(pool.map(renderizar, lote, chunksize=chunksize)))
+
+def regenerate_all_qrcodes(batch_size=500, processes=None):
+    """
+    Regenera o QR Code de todos os equipamentos em paralelo, usando vários processos.
+
+    Os equipamentos são lidos em lotes; cada lote é renderizado por um pool de
+    processos e gravado com uma única instrução UPDATE em lote.
+
+    Args:
+        batch_size (int): Quantidade de equipamentos por lote
+        processes (int): Quantidade de processos (padrão: número de CPUs)
+
+    Returns:
+        int: Quantidade de QR Codes gerados
+    """
+    total = 0
+    query = db.session.query(Equipamento.id, Equipamento.codigo).order_by(Equipamento.id)
+
+    with _process_pool(processes) as pool:
+        ultimo_id = None
+        while True:
+            lote_query = query.filter(Equipamento.id > ultimo_id) if ultimo_id else query
+            lote = [tuple(row) for row in lote_query.limit(batch_size).all()]
+            if not lote:
+                break
+
+            total += _generate_batch(pool, lote, processes)
+            ultimo_id = lote[-1][0]
+
+    return total
+
+def generate_qrcodes(equipamentos, batch_size=500, processes=None):
+    """
+    Gera os QR Codes de uma lista de equipamentos em paralelo, usando vários processos.
+
+    Args:
+        equipamentos (list): Pares (id, código) dos equipamentos
+        batch_size (int): Quantidade de equipamentos por lote
+        processes (int): Quantidade de processos (padrão: número de CPUs)
+
+    Returns:
+        int: Quantidade de QR Codes gerados
+    """
+    total = 0
+
+    with _process_pool(processes) as pool:
+        for inicio in range(0, len(equipamentos), batch_size):
+            total += _generate_batch(pool, equipamentos[inicio:inicio + batch_size], processes)
+
+    return total
+
+def enqueue_qrcodes(equipamentos, batch_size=500, processes=None):
+    """
+    Agenda a geração dos QR Codes de vários equipamentos em segundo plano.
+
+    Deve ser chamado após o commit dos equipamentos com qr_code = QRCODE_PENDENTE.
+
+    Args:
+        equipamentos (list): Pares (id, código) dos equipamentos
+
+    Returns:
+        Future: Tarefa agendada (resultado: quantidade de QR Codes gerados)
+    """
+    app = current_app._get_current_object()
+    equipamentos = list(equipamentos)
+
+    def job():
+        with app.app_context():
+            return generate_qrcodes(equipamentos, batch_size=batch_size, processes=processes)
+
+    return _submit(job)
+
+class RegeneracaoEmAndamento(Exception):
+    """Já existe uma regeneração de todos os QR Codes em execução."""
+
+_regeneracao_local = threading.Lock()
+
+class _RegenerationLock:
+    """
+    Trava de uma única regeneração de todos os QR Codes por vez.
+
+    A trava vale para todos os processos (workers do gunicorn e comando flask
+    regenerate-qrcodes) por meio de flock em QRCODE_LOCK_PATH; o sistema a libera
+    se o processo terminar durante a regeneração.
+    """
+
+    def __init__(self, app):
+        self.path = app.config.get('QRCODE_LOCK_PATH') or os.path.join(app.instance_path, 'qrcodes.lock')
+        self.arquivo = None
+
+    def acquire(self):
+        if not _regeneracao_local.acquire(blocking=False):
+            raise RegeneracaoEmAndamento()
+        if fcntl is None:
+            return
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.arquivo = open(self.path, 'a')
+        try:
+            fcntl.flock(self.arquivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self.release()
+            raise RegeneracaoEmAndamento()
+
+    def release(self):
+        if self.arquivo is not None:
+            self.arquivo.close()
+            self.arquivo = None
+        _regeneracao_local.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+def regenerate_all_qrcodes_locked(batch_size=500, processes=None):
+    """
+    Regenera todos os QR Codes com a trava de regeneração (comando flask regenerate-qrcodes).
+
+    Raises:
+        RegeneracaoEmAndamento: Se outra regeneração estiver em execução
+    """
+    with _RegenerationLock(current_app):
+        return regenerate_all_qrcodes(batch_size=batch_size, processes=processes)
+
+def enqueue_regenerate_all_qrcodes(batch_size=500, processes=None):
+    """
+    Agenda a regeneração de todos os QR Codes em segundo plano.
+
+    A trava é obtida antes do agendamento e liberada ao final da tarefa.
+
+    Returns:
+        Future: Tarefa agendada (resultado: quantidade de QR Codes gerados)
+
+    Raises:
+        RegeneracaoEmAndamento: Se outra regeneração estiver em execução
+    """
+    app = current_app._get_current_object()
+    trava = _RegenerationLock(app)
+    trava.acquire()
+
+    def job():
+        try:
+            with app.app_context():
+                return regenerate_all_qrcodes(batch_size=batch_size, processes=processes)
+        finally:
+            trava.release()
+
+    try:
+        return _submit(job)
+    except Exception:
+        trava.release()
+        raise
+
+def recover_stale_qrcodes(minutos=None, batch_size=500, processes=None):
+    """
+    Refaz os QR Codes que ficaram pendentes ou falharam.
+
+    Um equipamento fica PENDENTE para sempre se o worker terminar entre o commit e a
+    geração; os pendentes há mais de QRCODE_PENDENTE_MINUTOS e os com erro são gerados
+    novamente. Executado pelo agendador (flask run-scheduler) e por flask recover-qrcodes.
+
+    Args:
+        minutos (int): Idade mínima dos pendentes (padrão: QRCODE_PENDENTE_MINUTOS)
+        batch_size (int): Quantidade de equipamentos por lote
+        processes (int): Quantidade de processos (padrão: número de CPUs)
+
+    Returns:
+        dict: Quantidade de equipamentos encontrados e de QR Codes gerados
+    """
+    if minutos is None:
+        minutos = current_app.config.get('QRCODE_PENDENTE_MINUTOS', 15)
+    limite = datetime.utcnow() - timedelta(minutes=minutos)
+
+    equipamentos = [
+        tuple(row) for row in db.session.query(Equipamento.id, Equipamento.codigo).filter(
+            ((Equipamento.qr_code == QRCODE_PENDENTE) & (Equipamento.atualizado_em < limite))
+            | (Equipamento.qr_code == QRCODE_ERRO)
+        ).order_by(Equipamento.id)
+    ]
+    if not equipamentos:
+        return {'equipamentos': 0, 'gerados': 0}
+
+    gerados = 0
+    with _process_pool(processes) as pool:
+        for inicio in range(0, len(equipamentos), batch_size):
+            lote = equipamentos[inicio:inicio + batch_size]
+
+            # Marcados como pendentes para que uma nova falha volte a ERRO
+            db.session.execute(
+                update(Equipamento)
+                .where(Equipamento.id.in_([equipamento_id for equipamento_id, _ in lote]))
+                .values(qr_code=QRCODE_PENDENTE)
+            )
+            db.session.commit()
+
+            gerados += _generate_batch(pool, lote, processes)
+
+    return {'equipamentos': len(equipamentos), 'gerados': gerados}
+
+def wait_for_qrcode_jobs(timeout=None):
+    """
+    Aguarda a conclusão das tarefas de QR Code agendadas neste processo.
+
+    Args:
+        timeout (float): Tempo máximo de espera em segundos
+    """
+    with _lock:
+        pendentes = list(_futures)
+
+    wait(pendentes, timeout=timeout)
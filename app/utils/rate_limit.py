@@ -0,0 +1,148 @@
+import os
+import sqlite3
+import threading
+import time
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from app import db
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS baldes (
+    chave TEXT PRIMARY KEY,
+    fichas REAL NOT NULL,
+    atualizado_em REAL NOT NULL
+);
+"""
+
+class TokenBucketLimiter:
+    """
+    Limitador por balde de fichas compartilhado entre processos (arquivo SQLite).
+
+    Cada chave (ex.: email ou IP) tem um balde com capacidade fixa, reabastecido
+    continuamente a uma taxa por segundo; cada tentativa consome uma ficha de todos
+    os baldes envolvidos, ou de nenhum se algum estiver vazio.
+    """
+
+    def __init__(self, path, limpeza_interval=1000):
+        self.path = path
+        self.limpeza_interval = limpeza_interval
+        self._local = threading.local()
+        self._chamadas = 0
+
+    def _connection(self):
+        """Retorna a conexão SQLite da thread atual (recriada após fork)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def acquire(self, baldes):
+        """
+        Consome uma ficha de cada balde, se todos tiverem fichas disponíveis.
+
+        Args:
+            baldes (list): Tuplas (chave, capacidade, fichas por segundo)
+
+        Returns:
+            float: 0 se a tentativa foi aceita, ou os segundos até haver fichas
+        """
+        conn = self._connection()
+        agora = time.time()
+        chaves = [chave for chave, _, _ in baldes]
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            atuais = {
+                chave: (fichas, atualizado_em)
+                for chave, fichas, atualizado_em in conn.execute(
+                    f"SELECT chave, fichas, atualizado_em FROM baldes WHERE chave IN ({','.join('?' * len(chaves))})",
+                    chaves
+                )
+            }
+
+            espera = 0.0
+            novos = []
+            for chave, capacidade, taxa in baldes:
+                fichas, atualizado_em = atuais.get(chave, (capacidade, agora))
+                fichas = min(capacidade, fichas + (agora - atualizado_em) * taxa)
+                if fichas < 1:
+                    espera = max(espera, (1 - fichas) / taxa)
+                novos.append((chave, fichas - 1, agora))
+
+            if not espera:
+                conn.executemany("INSERT OR REPLACE INTO baldes (chave, fichas, atualizado_em) VALUES (?, ?, ?)", novos)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+        self._chamadas += 1
+        if self._chamadas % self.limpeza_interval == 0:
+            self._purge(agora)
+
+        return espera
+
+    def _purge(self, agora, idade=3600):
+        """Remove baldes sem uso recente (já estariam cheios novamente)."""
+        self._connection().execute("DELETE FROM baldes WHERE atualizado_em < ?", (agora - idade,))
+
+    def clear(self):
+        """Remove todos os baldes."""
+        self._connection().execute("DELETE FROM baldes")
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_login_limiter(app=None):
+    """
+    Retorna o limitador de tentativas de login da aplicação.
+
+    O arquivo é definido por LOGIN_LIMITE_PATH (padrão: instance/login_limites.db)
+    e é compartilhado por todos os workers que apontam para o mesmo caminho.
+
+    Args:
+        app (Flask): Aplicação (padrão: current_app)
+
+    Returns:
+        TokenBucketLimiter: Instância do limitador
+    """
+    app = app or current_app
+    path = app.config.get('LOGIN_LIMITE_PATH') or os.path.join(app.instance_path, 'login_limites.db')
+
+    with _limiters_lock:
+        limiter = _limiters.get(path)
+        if limiter is None:
+            limiter = TokenBucketLimiter(path)
+            _limiters[path] = limiter
+        return limiter
+
+def login_buckets(email, ip):
+    """
+    Monta os baldes de uma tentativa de login (por email e por IP) a partir da configuração.
+
+    Args:
+        email (str): Email informado
+        ip (str): Endereço do cliente
+
+    Returns:
+        list: Tuplas (chave, capacidade, fichas por segundo)
+    """
+    config = current_app.config
+    return [
+        (f'email:{email.strip().lower()}', config.get('LOGIN_LIMITE_EMAIL', 5),
+         config.get('LOGIN_LIMITE_EMAIL_POR_MINUTO', 2) / 60),
+        (f'ip:{ip}', config.get('LOGIN_LIMITE_IP', 100),
+         config.get('LOGIN_LIMITE_IP_POR_MINUTO', 300) / 60),
+    ]
+
+@event.listens_for(db.metadata, 'after_drop')
+def _clear_after_drop(target, connection, **kw):
+    # Banco recriado (testes): os limites anteriores não se aplicam
+    if has_app_context():
+        get_login_limiter().clear()
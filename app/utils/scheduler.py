@@ -0,0 +1,73 @@
+import time
+
+# Tarefas periódicas: nome -> (chave de configuração do intervalo, intervalo padrão em segundos, função)
+_jobs = {}
+
+def register_job(nome, config_key, intervalo_padrao, funcao):
+    """
+    Registra uma tarefa executada periodicamente pelo comando flask run-scheduler.
+
+    Args:
+        nome (str): Nome da tarefa
+        config_key (str): Chave de configuração com o intervalo em segundos
+        intervalo_padrao (int): Intervalo usado quando a configuração não existir
+        funcao (function): Função executada dentro do contexto da aplicação
+    """
+    _jobs[nome] = (config_key, intervalo_padrao, funcao)
+
+def run_scheduler(app, once=False, sleep=time.sleep):
+    """
+    Executa as tarefas registradas em laço, cada uma no seu intervalo.
+
+    Deve rodar em um único processo dedicado (ex.: "scheduler: flask --app run
+    run-scheduler" no Procfile), e não dentro dos workers do gunicorn, para que as
+    tarefas não sejam executadas uma vez por worker. As tarefas são idempotentes:
+    uma execução duplicada não gera registros repetidos.
+
+    Args:
+        app (Flask): Aplicação
+        once (bool): Executa cada tarefa uma única vez e retorna
+        sleep (function): Função de espera (substituível em testes)
+    """
+    proximas = dict.fromkeys(_jobs, 0.0)
+
+    while True:
+        agora = time.monotonic()
+        for nome, (config_key, intervalo_padrao, funcao) in _jobs.items():
+            if proximas[nome] > agora:
+                continue
+
+            with app.app_context():
+                try:
+                    resultado = funcao()
+                    app.logger.info('Tarefa %s concluída: %s', nome, resultado)
+                except Exception:
+                    app.logger.exception('Falha na tarefa %s', nome)
+
+            proximas[nome] = agora + app.config.get(config_key, intervalo_padrao)
+
+        if once:
+            return
+
+        sleep(max(0.0, min(proximas.values()) - time.monotonic()))
+
+def _schedule_preventive_job():
+    from app.utils.preventive import schedule_preventive_maintenance
+
+    return schedule_preventive_maintenance()
+
+register_job('manutencoes-preventivas', 'PREVENTIVA_INTERVALO', 3600, _schedule_preventive_job)
+
+def _scan_certificates_job():
+    from app.utils.certificate_expiry import scan_certificate_expiry
+
+    return scan_certificate_expiry()
+
+register_job('vencimento-certificados', 'CERTIFICADO_INTERVALO', 3600, _scan_certificates_job)
+
+def _recover_qrcodes_job():
+    from app.utils.qrcode_jobs import recover_stale_qrcodes
+
+    return recover_stale_qrcodes()
+
+register_job('qrcodes-pendentes', 'QRCODE_INTERVALO', 600, _recover_qrcodes_job)
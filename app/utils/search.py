@@ -0,0 +1,188 @@
+import re
+from sqlalchemy import event, text
+from app import db
+from app.models import Equipamento
+from app.models.types import uuid_str
+
+# Colunas de Equipamento indexadas para busca textual
+SEARCH_COLUMNS = ['codigo', 'nome', 'modelo', 'fabricante', 'numero_serie']
+
+# Pesos usados no ranking (bm25) do SQLite, na ordem de SEARCH_COLUMNS
+SEARCH_WEIGHTS = [10.0, 5.0, 2.0, 2.0, 8.0]
+
+# Expressão indexada no PostgreSQL (deve ser idêntica nos índices e nas consultas)
+PG_DOCUMENT = "lower(codigo || ' ' || nome || ' ' || modelo || ' ' || fabricante || ' ' || numero_serie)"
+
+# Na tabela FTS o ID do equipamento (BLOB de 16 bytes) é guardado em hexadecimal
+SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS equipamentos_fts USING fts5(
+        equipamento_id, codigo, nome, modelo, fabricante, numero_serie,
+        tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS equipamentos_fts_ai AFTER INSERT ON equipamentos BEGIN
+        INSERT INTO equipamentos_fts (equipamento_id, codigo, nome, modelo, fabricante, numero_serie)
+        VALUES (lower(hex(new.id)), new.codigo, new.nome, new.modelo, new.fabricante, new.numero_serie);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS equipamentos_fts_ad AFTER DELETE ON equipamentos BEGIN
+        DELETE FROM equipamentos_fts WHERE equipamentos_fts MATCH 'equipamento_id:"' || lower(hex(old.id)) || '"';
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS equipamentos_fts_au AFTER UPDATE OF id, codigo, nome, modelo, fabricante, numero_serie ON equipamentos BEGIN
+        DELETE FROM equipamentos_fts WHERE equipamentos_fts MATCH 'equipamento_id:"' || lower(hex(old.id)) || '"';
+        INSERT INTO equipamentos_fts (equipamento_id, codigo, nome, modelo, fabricante, numero_serie)
+        VALUES (lower(hex(new.id)), new.codigo, new.nome, new.modelo, new.fabricante, new.numero_serie);
+    END""",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS equipamentos_fts_ai",
+    "DROP TRIGGER IF EXISTS equipamentos_fts_ad",
+    "DROP TRIGGER IF EXISTS equipamentos_fts_au",
+    "DROP TABLE IF EXISTS equipamentos_fts",
+]
+
+POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_equipamentos_busca_trgm ON equipamentos USING gin (({PG_DOCUMENT}) gin_trgm_ops)",
+    f"CREATE INDEX IF NOT EXISTS ix_equipamentos_busca_tsv ON equipamentos USING gin (to_tsvector('simple', {PG_DOCUMENT}))",
+]
+
+def _create_search_index(target, connection, **kw):
+    """Cria a estrutura de busca junto com a tabela de equipamentos."""
+    if connection.dialect.name == 'sqlite':
+        for statement in SQLITE_DDL:
+            connection.exec_driver_sql(statement)
+    elif connection.dialect.name == 'postgresql':
+        for statement in POSTGRES_DDL:
+            connection.exec_driver_sql(statement)
+
+def _drop_search_index(target, connection, **kw):
+    """Remove a estrutura de busca antes da remoção da tabela de equipamentos."""
+    if connection.dialect.name == 'sqlite':
+        for statement in SQLITE_DROP:
+            connection.exec_driver_sql(statement)
+
+event.listen(Equipamento.__table__, 'after_create', _create_search_index)
+event.listen(Equipamento.__table__, 'before_drop', _drop_search_index)
+
+def tokenize_term(termo):
+    """
+    Divide o termo de busca em tokens alfanuméricos.
+
+    Args:
+        termo (str): Termo informado pelo usuário
+
+    Returns:
+        list: Tokens em minúsculas
+    """
+    return [token for token in re.split(r'[\W_]+', termo.lower()) if token]
+
+def build_fts_query(tokens):
+    """
+    Monta a expressão MATCH do FTS5 com correspondência por prefixo em todos os tokens.
+
+    Args:
+        tokens (list): Tokens retornados por tokenize_term
+
+    Returns:
+        str: Expressão MATCH restrita às colunas pesquisáveis
+    """
+    phrases = ' AND '.join(f'"{token}"*' for token in tokens)
+    return f"{{{' '.join(SEARCH_COLUMNS)}}} : ({phrases})"
+
+def search_index_available(session=None):
+    """
+    Verifica se o índice de busca pode ser usado no banco atual.
+
+    Returns:
+        str: 'sqlite' ou 'postgresql' se houver índice disponível, None caso contrário
+    """
+    session = session or db.session
+    dialect = session.get_bind().dialect.name
+
+    if dialect == 'sqlite':
+        exists = session.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'equipamentos_fts'"
+        )).first()
+        return 'sqlite' if exists else None
+    if dialect == 'postgresql':
+        return 'postgresql'
+
+    return None
+
+def search_equipamento_ids(termo, page=1, per_page=20, session=None):
+    """
+    Busca equipamentos pelo índice textual, ordenados por relevância.
+
+    Args:
+        termo (str): Termo de busca (cada palavra é tratada como prefixo)
+        page (int): Página de resultados (iniciando em 1)
+        per_page (int): Quantidade de resultados por página
+        session (Session): Sessão do SQLAlchemy (padrão: db.session)
+
+    Returns:
+        list: IDs dos equipamentos encontrados, em ordem de relevância, ou None se
+        não houver índice disponível no banco atual
+    """
+    session = session or db.session
+    engine = search_index_available(session)
+    if engine is None:
+        return None
+
+    tokens = tokenize_term(termo)
+    if not tokens:
+        return []
+
+    params = {'limit': per_page, 'offset': (page - 1) * per_page}
+
+    if engine == 'sqlite':
+        weights = ', '.join(str(w) for w in [0.0] + SEARCH_WEIGHTS)
+        params['match'] = build_fts_query(tokens)
+        rows = session.execute(text(
+            f"SELECT equipamento_id FROM equipamentos_fts WHERE equipamentos_fts MATCH :match "
+            f"ORDER BY bm25(equipamentos_fts, {weights}) LIMIT :limit OFFSET :offset"
+        ), params)
+    else:
+        params['tsquery'] = ' & '.join(f'{token}:*' for token in tokens)
+        params['termo'] = ' '.join(tokens)
+        params['like'] = '%' + termo.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        rows = session.execute(text(
+            f"SELECT id FROM equipamentos "
+            f"WHERE to_tsvector('simple', {PG_DOCUMENT}) @@ to_tsquery('simple', :tsquery) "
+            f"OR {PG_DOCUMENT} LIKE :like "
+            f"ORDER BY ts_rank(to_tsvector('simple', {PG_DOCUMENT}), to_tsquery('simple', :tsquery)) DESC, "
+            f"similarity({PG_DOCUMENT}, :termo) DESC, codigo "
+            f"LIMIT :limit OFFSET :offset"
+        ), params)
+
+    if engine == 'sqlite':
+        return [uuid_str(bytes.fromhex(row[0])) for row in rows]
+    return [str(row[0]) for row in rows]
+
+def rebuild_search_index(session=None):
+    """
+    Recria o índice de busca a partir da tabela de equipamentos.
+
+    Útil para bancos criados antes da existência do índice ou após cargas feitas
+    fora da aplicação.
+
+    Args:
+        session (Session): Sessão do SQLAlchemy (padrão: db.session)
+
+    Returns:
+        int: Quantidade de equipamentos indexados
+    """
+    session = session or db.session
+    connection = session.connection()
+    _create_search_index(Equipamento.__table__, connection)
+
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql("DELETE FROM equipamentos_fts")
+        connection.exec_driver_sql(
+            "INSERT INTO equipamentos_fts (equipamento_id, codigo, nome, modelo, fabricante, numero_serie) "
+            "SELECT lower(hex(id)), codigo, nome, modelo, fabricante, numero_serie FROM equipamentos"
+        )
+
+    total = session.query(Equipamento).count()
+    session.commit()
+
+    return total
@@ -0,0 +1,145 @@
+import os
+import threading
+from flask import current_app
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models import Sequencia, OrdemServico, ordem_servico_codigo_seq
+
+# Blocos reservados por processo: (pid, url do banco, nome) -> [próximo valor, último valor]
+_blocos = {}
+_lock = threading.Lock()
+
+def _clear_blocks(target, connection, **kw):
+    """Descarta os blocos reservados quando a tabela de contadores é removida."""
+    with _lock:
+        _blocos.clear()
+
+event.listen(Sequencia.__table__, 'after_drop', _clear_blocks)
+
+def _ultimo_codigo_ordem_servico(connection):
+    """Retorna o maior número já usado em OrdemServico.codigo (consulta pelo índice único)."""
+    row = connection.execute(
+        text("SELECT codigo FROM ordens_servico WHERE codigo LIKE 'OS-%' ORDER BY codigo DESC LIMIT 1")
+    ).first()
+    if not row:
+        return 0
+
+    try:
+        return int(row[0].split('-')[1])
+    except (IndexError, ValueError):
+        return 0
+
+def _reserve_block(nome, tamanho, valor_inicial):
+    """
+    Reserva um bloco de valores no contador, em uma transação própria e curta.
+
+    Args:
+        nome (str): Nome do contador
+        tamanho (int): Quantidade de valores reservados
+        valor_inicial (function): Função que recebe a conexão e retorna o último valor
+            já utilizado, usada apenas na criação do contador
+
+    Returns:
+        list: [primeiro valor, último valor] do bloco reservado
+    """
+    for _ in range(2):
+        try:
+            with db.engine.begin() as connection:
+                updated = connection.execute(
+                    text("UPDATE sequencias SET valor = valor + :tamanho WHERE nome = :nome"),
+                    {'tamanho': tamanho, 'nome': nome}
+                ).rowcount
+
+                if not updated:
+                    connection.execute(
+                        text("INSERT INTO sequencias (nome, valor) VALUES (:nome, :valor)"),
+                        {'nome': nome, 'valor': valor_inicial(connection) + tamanho}
+                    )
+
+                # A escrita acima mantém o bloqueio até o commit: a leitura é consistente
+                ultimo = connection.execute(
+                    text("SELECT valor FROM sequencias WHERE nome = :nome"), {'nome': nome}
+                ).scalar()
+
+            return [ultimo - tamanho + 1, ultimo]
+        except IntegrityError:
+            # Outro processo criou o contador ao mesmo tempo: tentar novamente com UPDATE
+            continue
+
+    raise RuntimeError(f'Não foi possível reservar valores para a sequência {nome}')
+
+def next_value(nome, valor_inicial):
+    """
+    Retorna o próximo valor de um contador sem varrer a tabela de origem.
+
+    Os valores são reservados no banco em blocos de SEQUENCIA_BLOCO e distribuídos
+    em memória, de forma que a maioria das chamadas não acessa o banco. Valores
+    reservados e não utilizados (ex.: reinício do processo) geram lacunas, como em
+    qualquer sequência de banco de dados, mas nunca duplicidades.
+
+    Args:
+        nome (str): Nome do contador
+        valor_inicial (function): Função que recebe a conexão e retorna o último valor
+            já utilizado, usada apenas na criação do contador
+
+    Returns:
+        int: Próximo valor
+    """
+    chave = (os.getpid(), str(db.engine.url), nome)
+
+    with _lock:
+        bloco = _blocos.get(chave)
+        if bloco is None or bloco[0] > bloco[1]:
+            bloco = _reserve_block(nome, current_app.config.get('SEQUENCIA_BLOCO', 20), valor_inicial)
+            _blocos[chave] = bloco
+
+        valor = bloco[0]
+        bloco[0] += 1
+
+    return valor
+
+def next_codigo_ordem_servico():
+    """
+    Gera o próximo código de ordem de serviço (OS-000001, OS-000002, ...).
+
+    No PostgreSQL usa uma sequência nativa, ajustada aos códigos existentes pela
+    migração b8e3d5a17c42; nos demais bancos, o contador da tabela sequencias com
+    reserva em blocos. Em ambos os casos o custo é O(1) e não há disputa entre
+    processos pelo mesmo código.
+
+    Returns:
+        str: Código da ordem de serviço
+    """
+    if db.engine.dialect.name == 'postgresql':
+        numero = db.session.execute(ordem_servico_codigo_seq.next_value()).scalar()
+    else:
+        numero = next_value(OrdemServico.__tablename__, _ultimo_codigo_ordem_servico)
+
+    return f"OS-{numero:06d}"
+
+def reserve_codigos_ordem_servico(quantidade):
+    """
+    Reserva números de ordem de serviço para cargas em lote.
+
+    No PostgreSQL, os números são obtidos da sequência nativa em uma única instrução
+    (nextval sobre generate_series): cada número é exclusivo, mas a faixa pode ter
+    intervalos se outros processos usarem a sequência ao mesmo tempo. Nos demais
+    bancos, a faixa contínua é reservada no contador em uma única transação. As
+    ordens criadas depois pela API continuam a numeração.
+
+    Args:
+        quantidade (int): Quantidade de códigos
+
+    Returns:
+        list: Números reservados, em ordem crescente (os códigos são OS-{numero:06d})
+    """
+    if db.engine.dialect.name == 'postgresql':
+        numeros = db.session.execute(
+            text(f"SELECT nextval('{ordem_servico_codigo_seq.name}') FROM generate_series(1, :quantidade)"),
+            {'quantidade': quantidade}
+        ).scalars().all()
+        return sorted(numeros)
+
+    primeiro, ultimo = _reserve_block(OrdemServico.__tablename__, quantidade, _ultimo_codigo_ordem_servico)
+    return list(range(primeiro, ultimo + 1))
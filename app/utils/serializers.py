@@ -0,0 +1,286 @@
+import time
+from functools import lru_cache
+from flask import request
+from sqlalchemy.orm import aliased, joinedload, load_only as orm_load_only
+from app import db
+from app.utils.instrumentation import record_rows, record_serialization
+
+# Conversões aplicadas aos valores (mesma semântica de "x.isoformat() if x else None" e "float(x) if x else padrão")
+ISO = 'iso'
+FLOAT = 'float'
+
+# Colunas usadas na ordenação da paginação por cursor, incluídas nas consultas mesmo fora da resposta
+SORT_COLUMNS = ('criado_em', 'id')
+
+# Serializadores declarados, por nome ("<tabela>.<visão>")
+SERIALIZERS = {}
+
+class Field:
+    """
+    Campo de um serializador.
+
+    Attributes:
+        paths (tuple): Caminhos do valor (ex.: 'codigo', 'departamento.nome'); com mais de um,
+            o primeiro disponível é usado
+        convert (str): Conversão aplicada ao valor (ISO, FLOAT) ou None
+        default: Valor usado pela conversão quando o valor está vazio
+    """
+    __slots__ = ('paths', 'convert', 'default')
+
+    def __init__(self, *paths, convert=None, default=None):
+        self.paths = paths
+        self.convert = convert
+        self.default = default
+
+def iso(path):
+    """Campo data/hora no formato ISO 8601 (None se vazio)."""
+    return Field(path, convert=ISO)
+
+def number(path, default=None):
+    """Campo numérico (Decimal) convertido para float (default se vazio)."""
+    return Field(path, convert=FLOAT, default=default)
+
+def first(*paths):
+    """Campo com o primeiro valor disponível entre vários caminhos (ex.: técnico interno ou externo)."""
+    return Field(*paths)
+
+def _convert(expr, field):
+    """Gera o código da conversão de um valor."""
+    if field.convert == ISO:
+        return f'(_v.isoformat() if (_v := {expr}) else None)'
+    if field.convert == FLOAT:
+        return f'(float(_v) if (_v := {expr}) else {field.default!r})'
+    return expr
+
+def _build(name, args, body, lines=()):
+    """Compila uma função a partir do código gerado."""
+    source = f'def {name}({args}):\n' + ''.join(f'    {line}\n' for line in lines) + f'    return {{{body}}}\n'
+    namespace = {}
+    exec(compile(source, f'<serializer {name}>', 'exec'), namespace)
+    return namespace[name]
+
+class Serializer:
+    """
+    Serializador declarativo de um modelo para uma visão (listagem, detalhe etc.).
+
+    A declaração é compilada em funções que montam o dicionário diretamente, sem
+    laços nem chamadas por campo: uma para objetos do ORM e outra para as tuplas
+    de consultas Core, que leem apenas as colunas necessárias (com junções externas
+    para os relacionamentos) sem instanciar objetos do ORM.
+
+    Args:
+        model (db.Model): Modelo serializado
+        view (str): Nome da visão
+        fields (dict): Nome do campo na resposta -> caminho (str) ou Field
+    """
+
+    def __init__(self, model, view, fields):
+        self.model = model
+        self.view = view
+        self.name = f'{model.__tablename__}.{view}'
+        self.fields = {
+            chave: campo if isinstance(campo, Field) else Field(campo)
+            for chave, campo in fields.items()
+        }
+        self._compile_object()
+        self._compile_row()
+
+    def _compile_object(self):
+        relations = {}
+        columns = {'': {'id'}}
+        lines = []
+
+        def relation(path):
+            # Variável local com o objeto relacionado (None se ausente), uma por relacionamento
+            parent, chave = 'o', ''
+            partes = path.split('.')
+            for i in range(len(partes) - 1):
+                chave = '.'.join(partes[:i + 1])
+                if chave not in relations:
+                    nome = f'r{len(relations)}'
+                    if parent == 'o':
+                        lines.append(f'{nome} = o.{partes[i]}')
+                    else:
+                        lines.append(f'{nome} = {parent}.{partes[i]} if {parent} is not None else None')
+                    relations[chave] = nome
+                    columns[chave] = {'id'}
+                parent = relations[chave]
+            columns[chave].add(partes[-1])
+            return parent, partes[-1]
+
+        valores = []
+        for chave, campo in self.fields.items():
+            expr = 'None'
+            for path in reversed(campo.paths):
+                parent, atributo = relation(path)
+                if parent == 'o':
+                    expr = f'o.{atributo}' if expr == 'None' else f'(_a if (_a := o.{atributo}) is not None else {expr})'
+                else:
+                    expr = f'({parent}.{atributo} if {parent} is not None else {expr})'
+            valores.append(f'{chave!r}: {_convert(expr, campo)}')
+
+        self._from_object = _build('serialize_object', 'o', ', '.join(valores), lines)
+        self.load_options = tuple(self._load_options(columns))
+
+    def _load_options(self, columns):
+        # Apenas as colunas usadas (load_only) e joinedload só dos relacionamentos acessados;
+        # as demais colunas, como os campos JSON, não são lidas do banco
+        def load_only(entidade, nomes):
+            return [getattr(entidade, nome) for nome in sorted(nomes)]
+
+        yield orm_load_only(*load_only(self.model, columns['']), raiseload=False)
+        for chave in columns:
+            if not chave:
+                continue
+            entidade, opcao = self.model, None
+            for parte in chave.split('.'):
+                atributo = getattr(entidade, parte)
+                opcao = joinedload(atributo) if opcao is None else opcao.joinedload(atributo)
+                entidade = atributo.property.mapper.class_
+            yield opcao.load_only(*load_only(entidade, columns[chave]))
+
+    def _compile_row(self):
+        aliases = {}
+        self.joins = []
+        self.columns = []
+        indices = {}
+
+        def column(path):
+            entidade = self.model
+            partes = path.split('.')
+            for i, parte in enumerate(partes[:-1]):
+                chave = '.'.join(partes[:i + 1])
+                if chave not in aliases:
+                    atributo = getattr(entidade, parte)
+                    aliases[chave] = aliased(atributo.property.mapper.class_)
+                    self.joins.append(atributo.of_type(aliases[chave]))
+                entidade = aliases[chave]
+            return getattr(entidade, partes[-1])
+
+        valores = []
+        for chave, campo in self.fields.items():
+            posicoes = []
+            for path in campo.paths:
+                if path not in indices:
+                    indices[path] = len(self.columns)
+                    rotulo = path if path in SORT_COLUMNS else f'c{len(self.columns)}'
+                    self.columns.append(column(path).label(rotulo))
+                posicoes.append(indices[path])
+            expr = 'None'
+            for posicao in reversed(posicoes):
+                expr = f'r[{posicao}]' if expr == 'None' else f'(r[{posicao}] if r[{posicao}] is not None else {expr})'
+            valores.append(f'{chave!r}: {_convert(expr, campo)}')
+
+        # Colunas de ordenação ausentes da resposta ficam no final da tupla, ignoradas pela função
+        for coluna in SORT_COLUMNS:
+            if coluna not in indices:
+                self.columns.append(getattr(self.model, coluna).label(coluna))
+
+        self._from_row = _build('serialize_row', 'r', ', '.join(valores))
+
+    def __call__(self, obj):
+        """Serializa um objeto do ORM."""
+        record_rows(1)
+        return self._from_object(obj)
+
+    def from_row(self, row):
+        """Serializa uma tupla da consulta retornada por query()."""
+        return self._from_row(row)
+
+    def rows(self, rows):
+        """Serializa uma lista de tuplas da consulta retornada por query()."""
+        inicio = time.perf_counter()
+        from_row = self._from_row
+        resultado = [from_row(row) for row in rows]
+        record_serialization(time.perf_counter() - inicio)
+        record_rows(len(resultado))
+        return resultado
+
+    def only(self, keys):
+        """
+        Retorna o serializador com apenas alguns dos campos (fieldset esparso), na ordem declarada.
+
+        O serializador parcial consulta somente as colunas e os relacionamentos
+        usados pelos campos escolhidos.
+
+        Args:
+            keys (set): Nomes dos campos
+
+        Returns:
+            Serializer: Serializador parcial (o próprio serializador se todos os campos forem pedidos)
+
+        Raises:
+            ValueError: Se algum campo não existir
+        """
+        invalidos = sorted(chave for chave in keys if chave not in self.fields)
+        if invalidos:
+            raise ValueError(
+                f"Campos inválidos: {', '.join(invalidos)}. Campos disponíveis: {', '.join(self.fields)}"
+            )
+
+        chaves = tuple(chave for chave in self.fields if chave in keys)
+        if len(chaves) == len(self.fields):
+            return self
+        return _subset(self, chaves)
+
+    def query(self):
+        """
+        Consulta apenas as colunas do serializador, com junções externas para os relacionamentos.
+
+        As tuplas retornadas têm também as colunas criado_em e id, para a paginação
+        por cursor. Os filtros devem referenciar as colunas do modelo (filter), e não
+        filter_by, que se aplicaria à última tabela da junção.
+
+        Returns:
+            Query: Consulta do SQLAlchemy (com paginate)
+        """
+        query = db.session.query(*self.columns).select_from(self.model)
+        for join in self.joins:
+            query = query.outerjoin(join)
+        return query
+
+@lru_cache(maxsize=256)
+def _subset(serializer, keys):
+    # Compilado uma vez por combinação de campos; o limite evita crescimento ilimitado
+    return Serializer(
+        serializer.model, f"{serializer.view}[{','.join(keys)}]",
+        {chave: serializer.fields[chave] for chave in keys}
+    )
+
+def register(model, view, fields):
+    """
+    Declara e registra o serializador de uma visão de um modelo.
+
+    Args:
+        model (db.Model): Modelo serializado
+        view (str): Nome da visão (ex.: 'lista', 'detalhe')
+        fields (dict): Nome do campo na resposta -> caminho (str) ou Field
+
+    Returns:
+        Serializer: Serializador compilado
+    """
+    serializer = Serializer(model, view, fields)
+    SERIALIZERS[serializer.name] = serializer
+    return serializer
+
+def get_serializer(name):
+    """Retorna um serializador registrado pelo nome ("<tabela>.<visão>")."""
+    return SERIALIZERS[name]
+
+def select_fields(serializer):
+    """
+    Aplica o parâmetro ?fields= da requisição (lista de campos separados por vírgula).
+
+    Args:
+        serializer (Serializer): Serializador completo da rota
+
+    Returns:
+        Serializer: Serializador com os campos pedidos ou o completo, sem o parâmetro
+
+    Raises:
+        ValueError: Se algum campo não existir
+    """
+    campos = {campo.strip() for campo in request.args.get('fields', '').split(',') if campo.strip()}
+    if not campos:
+        return serializer
+    return serializer.only(campos)
@@ -0,0 +1,145 @@
+from datetime import datetime
+from sqlalchemy import update, case, func
+from app import db
+from app.models import Manutencao, OrdemServico, Equipamento
+from app.models.types import uuid_bytes, uuid_str
+from app.utils.aggregates import month_start, refresh_summaries
+
+MANUTENCAO_STATUS = ['AGENDADA', 'EM_ANDAMENTO', 'CONCLUIDA', 'CANCELADA']
+ORDEM_SERVICO_STATUS = ['ABERTA', 'ATRIBUIDA', 'EM_ANDAMENTO', 'AGUARDANDO_PECAS', 'CONCLUIDA', 'CANCELADA']
+
+def _canonical_ids(ids):
+    """
+    Converte os IDs para o formato canônico, sem repetições, na ordem recebida.
+
+    UUIDs em maiúsculas ou sem hífens são aceitos, como nas rotas individuais; valores
+    que não são UUID são mantidos e resultam em "não encontrada".
+    """
+    canonicos = []
+    for id in ids:
+        valor = uuid_bytes(id)
+        canonicos.append(uuid_str(valor) if valor is not None else id)
+    return list(dict.fromkeys(canonicos))
+
+def _resultados(ids, encontrados, mensagem):
+    """Monta o resultado por ID, na ordem recebida."""
+    return [
+        {'id': id, 'sucesso': True} if id in encontrados else {'id': id, 'sucesso': False, 'error': mensagem}
+        for id in ids
+    ]
+
+def bulk_update_manutencao_status(ids, status):
+    """
+    Atualiza o status de várias manutenções com instruções UPDATE por conjunto.
+
+    Aplica as mesmas regras da atualização individual: data de início ao iniciar,
+    data de fim e tempo de parada ao concluir, e o status do equipamento
+    (EM_MANUTENCAO ao iniciar, ATIVO e data da última manutenção ao concluir).
+    Como as instruções em lote não passam pelo flush da sessão, os resumos dos
+    relatórios são recalculados explicitamente. O commit fica a cargo de quem chama.
+
+    Args:
+        ids (list): IDs das manutenções
+        status (str): Novo status
+
+    Returns:
+        list: Resultado por ID, no formato canônico ({'id', 'sucesso', 'error'})
+    """
+    agora = datetime.utcnow()
+    ids = _canonical_ids(ids)
+
+    rows = db.session.query(
+        Manutencao.id, Manutencao.equipamento_id, Manutencao.data_agendamento,
+        Manutencao.data_inicio, Manutencao.data_fim, Manutencao.tempo_parada
+    ).filter(Manutencao.id.in_(ids)).all()
+    encontrados = {row.id for row in rows}
+
+    if rows:
+        valores = {'status': status, 'atualizado_em': agora}
+        if status == 'EM_ANDAMENTO':
+            valores['data_inicio'] = func.coalesce(Manutencao.data_inicio, agora)
+        elif status == 'CONCLUIDA':
+            valores['data_fim'] = func.coalesce(Manutencao.data_fim, agora)
+
+            # Tempo de parada das manutenções concluídas agora e ainda sem valor informado
+            tempos = {
+                row.id: int((agora - row.data_inicio).total_seconds() / 60)
+                for row in rows
+                if not row.data_fim and not row.tempo_parada and row.data_inicio
+            }
+            if tempos:
+                valores['tempo_parada'] = case(tempos, value=Manutencao.id, else_=Manutencao.tempo_parada)
+
+        db.session.execute(
+            update(Manutencao).where(Manutencao.id.in_(encontrados)).values(**valores)
+            .execution_options(synchronize_session=False)
+        )
+
+        equipamentos = {row.equipamento_id for row in rows}
+        if status == 'EM_ANDAMENTO':
+            db.session.execute(
+                update(Equipamento).where(Equipamento.id.in_(equipamentos))
+                .values(status='EM_MANUTENCAO', atualizado_em=agora)
+                .execution_options(synchronize_session=False)
+            )
+        elif status == 'CONCLUIDA':
+            db.session.execute(
+                update(Equipamento).where(Equipamento.id.in_(equipamentos))
+                .values(
+                    status=case((Equipamento.status == 'EM_MANUTENCAO', 'ATIVO'), else_=Equipamento.status),
+                    ultima_manutencao=agora.date(),
+                    atualizado_em=agora
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        refresh_summaries(
+            db.session.connection(),
+            manutencao_keys={(row.equipamento_id, month_start(row.data_agendamento)) for row in rows}
+        )
+
+    return _resultados(ids, encontrados, 'Manutenção não encontrada')
+
+def bulk_update_ordem_servico_status(ids, status):
+    """
+    Atualiza o status de várias ordens de serviço com uma instrução UPDATE por conjunto.
+
+    Aplica as mesmas regras da atualização individual (datas de atribuição, início e
+    fim preenchidas na primeira transição) e recalcula os resumos dos relatórios.
+    O commit fica a cargo de quem chama.
+
+    Args:
+        ids (list): IDs das ordens de serviço
+        status (str): Novo status
+
+    Returns:
+        list: Resultado por ID, no formato canônico ({'id', 'sucesso', 'error'})
+    """
+    agora = datetime.utcnow()
+    ids = _canonical_ids(ids)
+
+    rows = db.session.query(
+        OrdemServico.id, OrdemServico.equipamento_id, OrdemServico.data_abertura
+    ).filter(OrdemServico.id.in_(ids)).all()
+    encontrados = {row.id for row in rows}
+
+    if rows:
+        valores = {'status': status, 'atualizado_em': agora}
+        if status == 'ATRIBUIDA':
+            valores['data_atribuicao'] = func.coalesce(OrdemServico.data_atribuicao, agora)
+        elif status == 'EM_ANDAMENTO':
+            valores['data_inicio'] = func.coalesce(OrdemServico.data_inicio, agora)
+        elif status == 'CONCLUIDA':
+            valores['data_fim'] = func.coalesce(OrdemServico.data_fim, agora)
+
+        db.session.execute(
+            update(OrdemServico).where(OrdemServico.id.in_(encontrados)).values(**valores)
+            .execution_options(synchronize_session=False)
+        )
+
+        refresh_summaries(
+            db.session.connection(),
+            ordem_servico_keys={(row.equipamento_id, month_start(row.data_abertura)) for row in rows}
+        )
+
+    return _resultados(ids, encontrados, 'Ordem de serviço não encontrada')
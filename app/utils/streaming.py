@@ -0,0 +1,39 @@
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def wants_ndjson():
+    """
+    Verifica se o cliente solicitou a resposta em streaming (NDJSON).
+
+    O modo é ativado pelo parâmetro ?stream=1 ou pelo cabeçalho Accept: application/x-ndjson.
+
+    Returns:
+        bool: True se a resposta deve ser enviada em streaming
+    """
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return True
+
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def stream_ndjson(query, serializer, batch_size=500):
+    """
+    Envia o resultado de uma consulta como NDJSON, um registro por linha.
+
+    As linhas são lidas do banco em lotes com yield_per (cursor do lado do servidor
+    quando suportado) e enviadas à medida que são serializadas, mantendo o uso de
+    memória limitado ao tamanho do lote.
+
+    Args:
+        query (Query): Consulta do SQLAlchemy
+        serializer (function): Função que converte um registro em dicionário
+        batch_size (int): Quantidade de registros lidos por lote
+
+    Returns:
+        Response: Resposta em streaming com mimetype application/x-ndjson
+    """
+    def generate():
+        for row in query.yield_per(batch_size):
+            yield current_app.json.dumps(serializer(row)) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
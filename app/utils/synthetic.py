@@ -0,0 +1,462 @@
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from flask import current_app
+from sqlalchemy import bindparam
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models import (
+    Departamento, Usuario, Tecnico, EmpresaExterna, TecnicoExterno, Equipamento,
+    ProgramaManutencao, Certificado, Manutencao, OrdemServico
+)
+from app.models.types import uuid7
+from app.utils.aggregates import rebuild_summaries
+from app.utils.sequences import reserve_codigos_ordem_servico
+
+# Tipos de equipamento: (nome, fabricantes, prefixo do modelo, frequência da preventiva)
+CATALOGO = [
+    ('Monitor Multiparamétrico', ['Philips', 'Mindray', 'GE Healthcare'], 'MX', 'SEMESTRAL'),
+    ('Ventilador Pulmonar', ['Dräger', 'Hamilton Medical', 'Mindray'], 'VP', 'TRIMESTRAL'),
+    ('Bomba de Infusão', ['B. Braun', 'Baxter', 'Fresenius Kabi'], 'BI', 'SEMESTRAL'),
+    ('Desfibrilador', ['Philips', 'Zoll', 'Instramed'], 'DF', 'TRIMESTRAL'),
+    ('Eletrocardiógrafo', ['GE Healthcare', 'Bionet', 'Philips'], 'ECG', 'ANUAL'),
+    ('Ultrassom', ['Samsung Medison', 'GE Healthcare', 'Siemens Healthineers'], 'US', 'SEMESTRAL'),
+    ('Aparelho de Raio-X', ['Siemens Healthineers', 'Philips', 'Shimadzu'], 'RX', 'SEMESTRAL'),
+    ('Autoclave', ['Baumer', 'Cristófoli', 'Sercon'], 'AC', 'MENSAL'),
+    ('Incubadora Neonatal', ['Fanem', 'Dräger', 'GE Healthcare'], 'IN', 'TRIMESTRAL'),
+    ('Mesa Cirúrgica', ['Maquet', 'Barrfab', 'Sismatec'], 'MC', 'ANUAL'),
+    ('Bisturi Elétrico', ['Medtronic', 'Wem', 'Emai'], 'BE', 'SEMESTRAL'),
+    ('Oxímetro de Pulso', ['Nonin', 'Mindray', 'Bionet'], 'OX', 'ANUAL'),
+]
+
+SETORES = [
+    'UTI Adulto', 'UTI Neonatal', 'Centro Cirúrgico', 'Pronto-Socorro', 'Radiologia', 'Cardiologia',
+    'Enfermaria', 'Hemodiálise', 'Laboratório', 'Ambulatório', 'Central de Material', 'Maternidade',
+]
+
+EMISSORES = ['Rede Brasileira de Calibração', 'Laboratório Metrológico', 'Organismo de Certificação']
+
+DESCRICOES_MANUTENCAO = {
+    'PREVENTIVA': 'Manutenção preventiva conforme programa: limpeza, inspeção e testes funcionais',
+    'CORRETIVA': 'Equipamento apresentou falha durante o uso',
+    'CALIBRACAO': 'Calibração dos sensores com padrões rastreáveis',
+    'VERIFICACAO': 'Verificação de segurança elétrica e desempenho',
+}
+
+PROBLEMAS = [
+    'Equipamento não liga', 'Alarme disparando sem motivo', 'Leitura divergente do esperado',
+    'Tela sem imagem', 'Ruído anormal durante o funcionamento', 'Bateria não mantém carga',
+    'Vazamento identificado', 'Erro de comunicação com a central',
+]
+
+# Distribuições: (valores, pesos)
+STATUS_EQUIPAMENTO = (['ATIVO', 'EM_MANUTENCAO', 'INATIVO', 'DESCONTINUADO'], [85, 8, 5, 2])
+CRITICIDADE = (['BAIXA', 'MEDIA', 'ALTA', 'CRITICA'], [20, 45, 25, 10])
+PESO_CRITICIDADE = {'BAIXA': 1, 'MEDIA': 2, 'ALTA': 4, 'CRITICA': 8}  # equipamentos críticos geram mais chamados
+TIPO_MANUTENCAO = (['PREVENTIVA', 'CORRETIVA', 'CALIBRACAO', 'VERIFICACAO'], [45, 35, 12, 8])
+PRIORIDADE = (['BAIXA', 'NORMAL', 'ALTA', 'EMERGENCIA'], [15, 60, 20, 5])
+TIPO_SERVICO = (['MANUTENCAO_CORRETIVA', 'MANUTENCAO_PREVENTIVA', 'CALIBRACAO', 'INSTALACAO', 'REMOCAO'],
+                [55, 20, 10, 10, 5])
+AVALIACAO = ([1, 2, 3, 4, 5], [5, 10, 20, 35, 30])
+
+# Status das ordens de serviço conforme a idade (dias desde a abertura)
+STATUS_ORDEM_POR_IDADE = [
+    (2, (['ABERTA', 'ATRIBUIDA', 'EM_ANDAMENTO'], [50, 30, 20])),
+    (30, (['ABERTA', 'ATRIBUIDA', 'EM_ANDAMENTO', 'AGUARDANDO_PECAS', 'CONCLUIDA', 'CANCELADA'],
+          [10, 15, 25, 15, 30, 5])),
+    (None, (['CONCLUIDA', 'CANCELADA', 'AGUARDANDO_PECAS'], [90, 8, 2])),
+]
+
+SENHA_PADRAO = 'senha123'
+EMAIL_ADMIN = 'admin@sintetico.local'
+
+def _sortear(rng, distribuicao):
+    valores, pesos = distribuicao
+    return rng.choices(valores, pesos)[0]
+
+def _cnpj(numero):
+    texto = f'{numero:012d}'
+    return f'{texto[:2]}.{texto[2:5]}.{texto[5:8]}/{texto[8:12]}-{numero % 97:02d}'
+
+class SyntheticDataGenerator:
+    """
+    Gera uma base sintética consistente para testes de carga e benchmarks.
+
+    Departamentos, usuários, técnicos internos e externos, empresas terceirizadas,
+    equipamentos, programas de manutenção, certificados, manutenções e ordens de
+    serviço são gravados com INSERT em lote (sem passar pelo flush do ORM), em
+    proporções semelhantes às de uma rede hospitalar: as quantidades auxiliares são
+    derivadas da quantidade de equipamentos. Todas as chaves estrangeiras apontam para
+    registros gerados na mesma execução e as datas e status são coerentes entre si
+    (manutenções futuras agendadas, ordens antigas concluídas, certificados vencidos).
+
+    A distribuição dos dados é reproduzível pela semente; os IDs (UUIDv7) não.
+    """
+
+    def __init__(self, equipamentos=1000, manutencoes=None, ordens_servico=None, anos=3,
+                 semente=42, batch_size=10000, senha=SENHA_PADRAO, hoje=None):
+        self.total_equipamentos = equipamentos
+        self.total_manutencoes = manutencoes if manutencoes is not None else equipamentos * 20
+        self.total_ordens = ordens_servico if ordens_servico is not None else equipamentos * 5
+        self.dias = anos * 365
+        self.batch_size = batch_size
+        self.senha = senha
+        self.agora = hoje or datetime.utcnow().replace(microsecond=0)
+        self.rng = random.Random(semente)
+        self.totais = {}
+
+    def _insert(self, model, linhas):
+        """Grava as linhas em lotes de batch_size, com um commit por lote."""
+        tabela = model.__table__
+        total = 0
+        lote = []
+        for linha in linhas:
+            lote.append(linha)
+            if len(lote) >= self.batch_size:
+                db.session.execute(tabela.insert(), lote)
+                db.session.commit()
+                total += len(lote)
+                lote = []
+        if lote:
+            db.session.execute(tabela.insert(), lote)
+            db.session.commit()
+            total += len(lote)
+
+        self.totais[tabela.name] = self.totais.get(tabela.name, 0) + total
+
+    def _datas(self, criado_em):
+        return {'criado_em': criado_em, 'atualizado_em': criado_em}
+
+    def generate(self):
+        """
+        Gera e grava a base completa.
+
+        Returns:
+            dict: Quantidade de registros gravados por tabela
+
+        Raises:
+            ValueError: Se já existirem equipamentos na base
+        """
+        if db.session.query(Equipamento.id).first() is not None:
+            raise ValueError('A base já possui equipamentos. Use um banco vazio para a carga sintética.')
+
+        self._departamentos()
+        self._usuarios()
+        self._tecnicos()
+        self._empresas()
+        self._equipamentos()
+        self._programas()
+        self._certificados()
+        self._manutencoes()
+        self._ordens_servico()
+
+        # Os resumos dos relatórios são mantidos no flush do ORM, que o INSERT em lote não usa
+        rebuild_summaries()
+        db.session.commit()
+        return self.totais
+
+    def _departamentos(self):
+        quantidade = max(5, self.total_equipamentos // 1000)
+        self.departamentos = []
+        linhas = []
+        for i in range(quantidade):
+            setor = SETORES[i % len(SETORES)]
+            nome = setor if i < len(SETORES) else f'{setor} {i // len(SETORES) + 1}'
+            departamento_id = uuid7()
+            self.departamentos.append(departamento_id)
+            linhas.append({'id': departamento_id, 'nome': nome, 'descricao': f'Setor {nome}',
+                           'localizacao': f'Bloco {chr(65 + i % 6)}, andar {i % 8}',
+                           **self._datas(self.agora - timedelta(days=self.dias))})
+        self._insert(Departamento, linhas)
+
+    def _usuarios(self):
+        # Um único hash para todos: a geração de hashes dominaria o tempo da carga
+        metodo = current_app.config.get('SENHA_HASH_METODO', 'pbkdf2:sha256:600000')
+        self.senha_hash = senha_hash = generate_password_hash(self.senha, method=metodo)
+        criado_em = self.agora - timedelta(days=self.dias)
+        self.admin_id = uuid7()
+        self.gestores = {}
+        self.solicitantes = {}
+        linhas = [{'id': self.admin_id, 'nome': 'Administrador', 'email': EMAIL_ADMIN, 'senha_hash': senha_hash,
+                   'perfil': 'ADMIN', 'ativo': True, **self._datas(criado_em)}]
+
+        numero = 0
+        for departamento_id in self.departamentos:
+            for perfil, quantidade in [('GESTOR', 1), ('SOLICITANTE', 8), ('VISUALIZADOR', 1)]:
+                for _ in range(quantidade):
+                    numero += 1
+                    usuario_id = uuid7()
+                    if perfil == 'GESTOR':
+                        self.gestores[departamento_id] = usuario_id
+                    elif perfil == 'SOLICITANTE':
+                        self.solicitantes.setdefault(departamento_id, []).append(usuario_id)
+                    linhas.append({
+                        'id': usuario_id, 'nome': f'Usuário {numero}', 'email': f'usuario{numero:06d}@sintetico.local',
+                        'senha_hash': senha_hash, 'cargo': perfil.title(), 'departamento_id': departamento_id,
+                        'perfil': perfil, 'ativo': True, **self._datas(criado_em)
+                    })
+        self._insert(Usuario, linhas)
+
+        db.session.execute(
+            Departamento.__table__.update()
+            .where(Departamento.__table__.c.id == bindparam('b_id'))
+            .values(responsavel_id=bindparam('b_responsavel')),
+            [{'b_id': departamento_id, 'b_responsavel': gestor} for departamento_id, gestor in self.gestores.items()]
+        )
+        db.session.commit()
+
+    def _tecnicos(self):
+        quantidade = max(10, self.total_equipamentos // 400)
+        criado_em = self.agora - timedelta(days=self.dias)
+        especialidades = [tipo for tipo, _, _, _ in CATALOGO]
+        self.tecnicos = []
+        usuarios = []
+        tecnicos = []
+        for i in range(quantidade):
+            usuario_id = uuid7()
+            tecnico_id = uuid7()
+            self.tecnicos.append(tecnico_id)
+            email = f'tecnico{i + 1:05d}@sintetico.local'
+            usuarios.append({'id': usuario_id, 'nome': f'Técnico {i + 1}', 'email': email,
+                             'senha_hash': self.senha_hash, 'cargo': 'Técnico', 'perfil': 'TECNICO', 'ativo': True,
+                             **self._datas(criado_em)})
+            tecnicos.append({'id': tecnico_id, 'nome': f'Técnico {i + 1}', 'email': email,
+                             'telefone': f'(11) 9{i:04d}-{i % 10000:04d}',
+                             'especialidades': self.rng.sample(especialidades, 3), 'interno': True,
+                             'disponivel': self.rng.random() < 0.85, 'usuario_id': usuario_id,
+                             **self._datas(criado_em)})
+        self._insert(Usuario, usuarios)
+        self._insert(Tecnico, tecnicos)
+
+    def _empresas(self):
+        quantidade = max(3, self.total_equipamentos // 10000)
+        inicio_contrato = (self.agora - timedelta(days=self.dias)).date()
+        self.tecnicos_externos = []
+        empresas = []
+        tecnicos = []
+        for i in range(quantidade):
+            empresa_id = uuid7()
+            empresas.append({
+                'id': empresa_id, 'razao_social': f'Engenharia Clínica {i + 1} Ltda', 'cnpj': _cnpj(i + 1),
+                'telefone': f'(11) 3{i:03d}-0000', 'email': f'contato{i + 1}@empresa.sintetico.local',
+                'contato_principal': f'Contato {i + 1}', 'especialidades': [CATALOGO[i % len(CATALOGO)][0]],
+                'data_inicio_contrato': inicio_contrato,
+                'data_fim_contrato': inicio_contrato + timedelta(days=self.dias + 365),
+                **self._datas(self.agora - timedelta(days=self.dias))
+            })
+            for j in range(4):
+                tecnico_id = uuid7()
+                self.tecnicos_externos.append((tecnico_id, empresa_id))
+                tecnicos.append({'id': tecnico_id, 'nome': f'Técnico Externo {i + 1}.{j + 1}',
+                                 'email': f'tecnico{j + 1}@empresa{i + 1}.sintetico.local', 'empresa_id': empresa_id,
+                                 **self._datas(self.agora - timedelta(days=self.dias))})
+        self._insert(EmpresaExterna, empresas)
+        self._insert(TecnicoExterno, tecnicos)
+
+    def _equipamentos(self):
+        rng = self.rng
+        # (id, departamento, índice no catálogo, criticidade) de cada equipamento
+        self.equipamentos = []
+
+        def linhas():
+            for i in range(self.total_equipamentos):
+                equipamento_id = uuid7()
+                tipo = rng.randrange(len(CATALOGO))
+                nome, fabricantes, prefixo, _ = CATALOGO[tipo]
+                departamento_id = rng.choice(self.departamentos)
+                criticidade = _sortear(rng, CRITICIDADE)
+                aquisicao = self.agora - timedelta(days=self.dias + rng.randrange(2000))
+                self.equipamentos.append((equipamento_id, departamento_id, tipo, criticidade))
+                yield {
+                    'id': equipamento_id,
+                    'codigo': f'EQ-{i + 1:07d}',
+                    'nome': f'{nome} {i + 1}',
+                    'modelo': f'{prefixo}-{rng.randrange(100, 999)}',
+                    'fabricante': rng.choice(fabricantes),
+                    'numero_serie': f'SN{i + 1:09d}',
+                    'data_aquisicao': aquisicao.date(),
+                    'data_garantia': (aquisicao + timedelta(days=730)).date(),
+                    'valor_aquisicao': Decimal(rng.randrange(2000, 900000)) / 10,
+                    'departamento_id': departamento_id,
+                    'localizacao': f'Sala {rng.randrange(1, 60)}',
+                    'status': _sortear(rng, STATUS_EQUIPAMENTO),
+                    'criticidade': criticidade,
+                    'ultima_manutencao': (self.agora - timedelta(days=rng.randrange(1, 180))).date(),
+                    'proxima_manutencao_planejada': (self.agora + timedelta(days=rng.randrange(1, 180))).date(),
+                    'especificacoes_tecnicas': {'tensao': rng.choice(['127V', '220V', 'Bivolt']),
+                                                'potencia_w': rng.randrange(20, 3000)},
+                    **self._datas(aquisicao),
+                }
+
+        self._insert(Equipamento, linhas())
+
+        acumulado = 0
+        self.pesos_acumulados = []
+        for _, _, _, criticidade in self.equipamentos:
+            acumulado += PESO_CRITICIDADE[criticidade]
+            self.pesos_acumulados.append(acumulado)
+
+    def _programas(self):
+        rng = self.rng
+        # Programa preventivo de cada equipamento crítico ou de criticidade alta e de parte dos demais
+        self.programas = {}
+        linhas = []
+        for equipamento_id, departamento_id, tipo, criticidade in self.equipamentos:
+            if criticidade in ('ALTA', 'CRITICA') or rng.random() < 0.2:
+                programa_id = uuid7()
+                nome, _, _, frequencia = CATALOGO[tipo]
+                self.programas[equipamento_id] = programa_id
+                linhas.append({
+                    'id': programa_id, 'nome': f'Preventiva {nome}', 'equipamento_id': equipamento_id,
+                    'tipo_equipamento': nome, 'frequencia': frequencia,
+                    'checklist': ['Inspeção visual', 'Limpeza', 'Teste de alarmes', 'Teste funcional'],
+                    'duracao_estimada': rng.choice([30, 60, 90, 120]),
+                    'responsavel_id': self.gestores[departamento_id], 'ativo': True,
+                    **self._datas(self.agora - timedelta(days=self.dias)),
+                })
+        self._insert(ProgramaManutencao, linhas)
+
+    def _certificados(self):
+        rng = self.rng
+        hoje = self.agora.date()
+
+        def linhas():
+            numero = 0
+            for equipamento_id, _, _, criticidade in self.equipamentos:
+                tipos = ['CALIBRACAO', 'SEGURANCA_ELETRICA'] if criticidade in ('ALTA', 'CRITICA') else ['CALIBRACAO']
+                if criticidade == 'BAIXA' and rng.random() < 0.5:
+                    continue
+                for tipo in tipos:
+                    numero += 1
+                    emissao = hoje - timedelta(days=rng.randrange(0, 730))
+                    validade = emissao + timedelta(days=365)
+                    yield {
+                        'id': uuid7(), 'equipamento_id': equipamento_id, 'tipo': tipo,
+                        'numero': f'CERT-{numero:08d}', 'data_emissao': emissao, 'data_validade': validade,
+                        'emissor': rng.choice(EMISSORES), 'status': 'VENCIDO' if validade < hoje else 'VALIDO',
+                        **self._datas(datetime.combine(emissao, datetime.min.time())),
+                    }
+
+        self._insert(Certificado, linhas())
+
+    def _escolher_equipamentos(self, quantidade):
+        """Sorteia equipamentos (com repetição), com peso maior para os mais críticos."""
+        return self.rng.choices(self.equipamentos, cum_weights=self.pesos_acumulados, k=quantidade)
+
+    def _manutencoes(self):
+        rng = self.rng
+        n = self.total_manutencoes
+        inicio = self.agora - timedelta(days=self.dias)
+        # Datas de agendamento distintas (únicas por programa) entre o início do período e 90 dias à frente
+        passo = (self.dias + 90) * 86400 / max(n, 1)
+
+        def linhas():
+            for lote in range(0, n, self.batch_size):
+                equipamentos = self._escolher_equipamentos(min(self.batch_size, n - lote))
+                for i, (equipamento_id, _, _, _) in enumerate(equipamentos, start=lote):
+                    agendamento = inicio + timedelta(seconds=int(i * passo))
+                    tipo = _sortear(rng, TIPO_MANUTENCAO)
+                    idade = (self.agora - agendamento).days
+
+                    if agendamento > self.agora:
+                        status = 'CANCELADA' if rng.random() < 0.03 else 'AGENDADA'
+                    elif idade < 7:
+                        status = rng.choices(['EM_ANDAMENTO', 'AGENDADA', 'CONCLUIDA'], [50, 20, 30])[0]
+                    else:
+                        status = rng.choices(['CONCLUIDA', 'CANCELADA', 'AGENDADA'], [91, 8, 1])[0]
+
+                    data_inicio = data_fim = None
+                    custo_mao_de_obra = custo_pecas = Decimal(0)
+                    tempo_parada = 0
+                    if status in ('EM_ANDAMENTO', 'CONCLUIDA'):
+                        data_inicio = agendamento + timedelta(minutes=rng.randrange(0, 240))
+                    if status == 'CONCLUIDA':
+                        data_fim = data_inicio + timedelta(minutes=rng.randrange(30, 480))
+                        custo_mao_de_obra = Decimal(rng.randrange(8000, 150000)) / 100
+                        custo_pecas = Decimal(rng.randrange(5000, 500000)) / 100 if rng.random() < 0.4 else Decimal(0)
+                        tempo_parada = rng.randrange(60, 4320) if tipo == 'CORRETIVA' else rng.randrange(0, 240)
+
+                    tecnico_id = tecnico_externo_id = empresa_externa_id = None
+                    if rng.random() < 0.8:
+                        tecnico_id = rng.choice(self.tecnicos)
+                    else:
+                        tecnico_externo_id, empresa_externa_id = rng.choice(self.tecnicos_externos)
+
+                    prioridade = _sortear(rng, PRIORIDADE)
+                    if tipo == 'CORRETIVA' and prioridade in ('BAIXA', 'NORMAL') and rng.random() < 0.4:
+                        prioridade = 'ALTA'
+
+                    yield {
+                        'id': uuid7(),
+                        'equipamento_id': equipamento_id,
+                        'tipo_manutencao': tipo,
+                        'status': status,
+                        'prioridade': prioridade,
+                        'descricao': DESCRICOES_MANUTENCAO[tipo],
+                        'data_agendamento': agendamento,
+                        'data_inicio': data_inicio,
+                        'data_fim': data_fim,
+                        'tecnico_id': tecnico_id,
+                        'tecnico_externo_id': tecnico_externo_id,
+                        'empresa_externa_id': empresa_externa_id,
+                        'programa_id': self.programas.get(equipamento_id) if tipo == 'PREVENTIVA' else None,
+                        'custo_mao_de_obra': custo_mao_de_obra,
+                        'custo_pecas': custo_pecas,
+                        'custo_total': custo_mao_de_obra + custo_pecas,
+                        'tempo_parada': tempo_parada,
+                        'pecas_substituidas': [],
+                        'anexos_url': [],
+                        'criado_em': min(agendamento, self.agora) - timedelta(days=rng.randrange(0, 15)),
+                        'atualizado_em': data_fim or min(agendamento, self.agora),
+                    }
+
+        self._insert(Manutencao, linhas())
+
+    def _ordens_servico(self):
+        rng = self.rng
+        n = self.total_ordens
+        inicio = self.agora - timedelta(days=self.dias)
+        passo = self.dias * 86400 / max(n, 1)
+        numeros = reserve_codigos_ordem_servico(n) if n else []
+        db.session.commit()
+
+        def linhas():
+            for lote in range(0, n, self.batch_size):
+                equipamentos = self._escolher_equipamentos(min(self.batch_size, n - lote))
+                for i, (equipamento_id, departamento_id, _, _) in enumerate(equipamentos, start=lote):
+                    abertura = inicio + timedelta(seconds=int(i * passo))
+                    idade = (self.agora - abertura).days
+                    status = next(_sortear(rng, distribuicao) for limite, distribuicao in STATUS_ORDEM_POR_IDADE
+                                  if limite is None or idade < limite)
+
+                    atribuicao = data_inicio = data_fim = None
+                    if status != 'ABERTA':
+                        atribuicao = abertura + timedelta(minutes=rng.randrange(10, 1440))
+                    if status in ('EM_ANDAMENTO', 'AGUARDANDO_PECAS', 'CONCLUIDA'):
+                        data_inicio = atribuicao + timedelta(minutes=rng.randrange(10, 2880))
+                    if status in ('CONCLUIDA', 'CANCELADA'):
+                        data_fim = (data_inicio or atribuicao) + timedelta(minutes=rng.randrange(30, 4320))
+                    avaliacao = _sortear(rng, AVALIACAO) if status == 'CONCLUIDA' and rng.random() < 0.6 else None
+
+                    yield {
+                        'id': uuid7(),
+                        'codigo': f'OS-{numeros[i]:06d}',
+                        'equipamento_id': equipamento_id,
+                        'departamento_id': departamento_id,
+                        'solicitante_id': rng.choice(self.solicitantes[departamento_id]),
+                        'tipo_servico': _sortear(rng, TIPO_SERVICO),
+                        'descricao_problema': rng.choice(PROBLEMAS),
+                        'prioridade': _sortear(rng, PRIORIDADE),
+                        'status': status,
+                        'data_abertura': abertura,
+                        'data_atribuicao': atribuicao,
+                        'data_inicio': data_inicio,
+                        'data_fim': data_fim,
+                        'anexos_url': [],
+                        'avaliacao_satisfacao': avaliacao,
+                        'comentario_avaliacao': 'Atendimento registrado pela carga sintética' if avaliacao else None,
+                        'criado_em': abertura,
+                        'atualizado_em': data_fim or data_inicio or atribuicao or abertura,
+                    }
+
+        self._insert(OrdemServico, linhas())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca de equipamentos: índice textual (FTS5) x ILIKE em vários campos.
+
+Uso:
+    python benchmarks/bench_busca.py --total 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+NOMES = ['Ultrassom', 'Monitor Multiparamétrico', 'Desfibrilador', 'Bomba de Infusão', 'Ventilador Pulmonar',
+         'Eletrocardiógrafo', 'Autoclave', 'Oxímetro', 'Raio-X Digital', 'Incubadora Neonatal']
+FABRICANTES = ['MedTech', 'CardioTech', 'Ultramed', 'Philips', 'GE Healthcare', 'Mindray', 'Dräger']
+TERMOS = ['ultra', 'monitor', 'EQ-0500', 'SN-99', 'bomba infus', 'drager', 'desfib', 'x']
+
+def medir(funcao, repeticoes):
+    """Executa a função várias vezes e retorna as latências em milissegundos."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--total', type=int, default=100000, help='Quantidade de equipamentos')
+    parser.add_argument('--repeticoes', type=int, default=20, help='Execuções por termo')
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench_busca.db')
+    os.environ['TEST_DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from app import create_app, db
+    from app.models import Equipamento, Departamento
+    from app.utils.search import search_equipamento_ids
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+
+        departamento_id = str(uuid.uuid4())
+        db.session.add(Departamento(id=departamento_id, nome='Departamento Benchmark'))
+        db.session.commit()
+
+        inicio = time.perf_counter()
+        lote = []
+        for i in range(args.total):
+            lote.append({
+                'id': str(uuid.uuid4()),
+                'codigo': f'EQ-{i:06d}',
+                'nome': f'{NOMES[i % len(NOMES)]} {i}',
+                'modelo': f'MOD-{i % 997}',
+                'fabricante': FABRICANTES[i % len(FABRICANTES)],
+                'numero_serie': f'SN-{i:07d}',
+                'data_aquisicao': date(2024, 1, 1),
+                'departamento_id': departamento_id,
+                'status': 'ATIVO',
+                'criticidade': 'MEDIA',
+            })
+            if len(lote) == 5000:
+                db.session.execute(Equipamento.__table__.insert(), lote)
+                lote = []
+        if lote:
+            db.session.execute(Equipamento.__table__.insert(), lote)
+        db.session.commit()
+        print(f'{args.total} equipamentos inseridos em {time.perf_counter() - inicio:.1f}s')
+
+        def ilike(termo):
+            # Consulta equivalente à rota anterior (sem índice, sem ranking e sem limite)
+            return Equipamento.query.filter(
+                (Equipamento.codigo.ilike(f'%{termo}%')) |
+                (Equipamento.nome.ilike(f'%{termo}%')) |
+                (Equipamento.modelo.ilike(f'%{termo}%')) |
+                (Equipamento.fabricante.ilike(f'%{termo}%')) |
+                (Equipamento.numero_serie.ilike(f'%{termo}%'))
+            ).all()
+
+        def indice(termo):
+            ids = search_equipamento_ids(termo, per_page=20)
+            return Equipamento.query.filter(Equipamento.id.in_(ids)).all() if ids else []
+
+        print(f"{'termo':<14}{'ILIKE p50':>12}{'ILIKE p95':>12}{'FTS5 p50':>12}{'FTS5 p95':>12}")
+        for termo in TERMOS:
+            t_ilike = sorted(medir(lambda: ilike(termo), args.repeticoes))
+            t_indice = sorted(medir(lambda: indice(termo), args.repeticoes))
+            p95 = int(args.repeticoes * 0.95) - 1
+            print(f'{termo:<14}{statistics.median(t_ilike):>10.2f}ms{t_ilike[p95]:>10.2f}ms'
+                  f'{statistics.median(t_indice):>10.2f}ms{t_indice[p95]:>10.2f}ms')
+
+        db.session.remove()
+        db.drop_all()
+
+if __name__ == '__main__':
+    main()
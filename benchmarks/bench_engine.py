@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark de leitura e escrita concorrentes no SQLite: configuração padrão x perfil da aplicação
+(WAL, synchronous=NORMAL, busy_timeout, mmap_size e cache_size).
+
+Cada cenário usa processos separados, como os workers do gunicorn: leitores executam
+consultas de listagem e escritores gravam atualizações curtas.
+
+Uso:
+    python benchmarks/bench_engine.py --leitores 4 --escritores 2 --segundos 10
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+
+from app.config import Config, engine_options
+from app.utils.engine import apply_sqlite_pragmas
+
+def criar_engine(url, perfil):
+    """Cria o engine com a configuração padrão do SQLAlchemy ou com o perfil da aplicação."""
+    if perfil == 'padrao':
+        return create_engine(url)
+
+    engine = create_engine(url, **engine_options(url))
+    event.listen(engine, 'connect', lambda conn, record: apply_sqlite_pragmas(conn, Config.SQLITE_PRAGMAS))
+    return engine
+
+def preparar(url, total):
+    """Cria as tabelas e os dados iniciais do benchmark."""
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE equipamentos (id TEXT PRIMARY KEY, codigo TEXT, nome TEXT, status TEXT, "
+            "data_aquisicao DATE, atualizado_em REAL)"
+        ))
+        conn.execute(text("CREATE INDEX ix_equipamentos_status ON equipamentos (status)"))
+        conn.execute(
+            text("INSERT INTO equipamentos VALUES (:id, :codigo, :nome, :status, :data, 0)"),
+            [{
+                'id': str(uuid.uuid4()),
+                'codigo': f'EQ-{i:06d}',
+                'nome': f'Equipamento {i}',
+                'status': ('ATIVO', 'EM_MANUTENCAO', 'INATIVO')[i % 3],
+                'data': date(2024, 1, 1),
+            } for i in range(total)]
+        )
+    engine.dispose()
+
+def leitor(url, perfil, fim, resultados):
+    engine = criar_engine(url, perfil)
+    operacoes = erros = 0
+    while time.time() < fim:
+        try:
+            with engine.connect() as conn:
+                conn.execute(text(
+                    "SELECT id, codigo, nome FROM equipamentos WHERE status = 'ATIVO' ORDER BY codigo LIMIT 50"
+                )).fetchall()
+                conn.execute(text("SELECT status, COUNT(*) FROM equipamentos GROUP BY status")).fetchall()
+            operacoes += 1
+        except OperationalError:
+            erros += 1
+    resultados.put(('leitura', operacoes, erros))
+
+def escritor(url, perfil, fim, total, resultados):
+    engine = criar_engine(url, perfil)
+    operacoes = erros = 0
+    while time.time() < fim:
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    text("UPDATE equipamentos SET atualizado_em = :agora WHERE codigo = :codigo"),
+                    {'agora': time.time(), 'codigo': f'EQ-{operacoes % total:06d}'}
+                )
+            operacoes += 1
+        except OperationalError:
+            erros += 1
+    resultados.put(('escrita', operacoes, erros))
+
+def executar(perfil, args):
+    """Executa um cenário e retorna as operações por segundo e os erros de lock."""
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), f'bench_{perfil}.db')}"
+    preparar(url, args.total)
+
+    resultados = multiprocessing.Queue()
+    fim = time.time() + args.segundos
+    processos = [multiprocessing.Process(target=leitor, args=(url, perfil, fim, resultados))
+                 for _ in range(args.leitores)]
+    processos += [multiprocessing.Process(target=escritor, args=(url, perfil, fim, args.total, resultados))
+                  for _ in range(args.escritores)]
+
+    for processo in processos:
+        processo.start()
+    totais = {'leitura': [0, 0], 'escrita': [0, 0]}
+    for _ in processos:
+        tipo, operacoes, erros = resultados.get()
+        totais[tipo][0] += operacoes
+        totais[tipo][1] += erros
+    for processo in processos:
+        processo.join()
+
+    return {tipo: (operacoes / args.segundos, erros) for tipo, (operacoes, erros) in totais.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--leitores', type=int, default=4, help='Processos leitores')
+    parser.add_argument('--escritores', type=int, default=2, help='Processos escritores')
+    parser.add_argument('--segundos', type=float, default=10, help='Duração de cada cenário')
+    parser.add_argument('--total', type=int, default=20000, help='Equipamentos na tabela')
+    args = parser.parse_args()
+
+    print(f'{args.leitores} leitores, {args.escritores} escritores, {args.segundos:.0f}s por cenário')
+    print(f"{'cenário':<12}{'leituras/s':>14}{'escritas/s':>14}{'erros de lock':>16}")
+    for perfil in ('padrao', 'otimizado'):
+        resultado = executar(perfil, args)
+        erros = resultado['leitura'][1] + resultado['escrita'][1]
+        print(f"{perfil:<12}{resultado['leitura'][0]:>14.1f}{resultado['escrita'][0]:>14.1f}{erros:>16}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark do agendador de manutenções preventivas.
+
+Uso:
+    python benchmarks/bench_preventiva.py --programas 50000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+FREQUENCIAS = ['MENSAL', 'TRIMESTRAL', 'SEMESTRAL', 'ANUAL', 'QUINZENAL']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--programas', type=int, default=50000, help='Quantidade de programas (um por equipamento)')
+    parser.add_argument('--horizonte', type=int, default=90, help='Dias agendados à frente')
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench_preventiva.db')
+    os.environ['TEST_DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from app import create_app, db
+    from app.models import Equipamento, Departamento, ProgramaManutencao
+    from app.utils.preventive import schedule_preventive_maintenance
+
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+
+        departamento_id = str(uuid.uuid4())
+        db.session.add(Departamento(id=departamento_id, nome='Departamento Benchmark'))
+        db.session.commit()
+
+        hoje = date.today()
+        equipamentos, programas = [], []
+        for i in range(args.programas):
+            equipamento_id = str(uuid.uuid4())
+            equipamentos.append({
+                'id': equipamento_id,
+                'codigo': f'EQ-{i:06d}',
+                'nome': f'Equipamento {i}',
+                'modelo': 'Modelo',
+                'fabricante': 'Fabricante',
+                'numero_serie': f'SN-{i:07d}',
+                'data_aquisicao': date(2024, 1, 1),
+                'departamento_id': departamento_id,
+                'status': 'ATIVO',
+                'criticidade': 'MEDIA',
+                'ultima_manutencao': hoje - timedelta(days=i % 400),
+            })
+            programas.append({
+                'id': str(uuid.uuid4()),
+                'nome': f'Programa {i}',
+                'equipamento_id': equipamento_id,
+                'frequencia': FREQUENCIAS[i % len(FREQUENCIAS)],
+                'ativo': True,
+            })
+        db.session.execute(Equipamento.__table__.insert(), equipamentos)
+        db.session.execute(ProgramaManutencao.__table__.insert(), programas)
+        db.session.commit()
+
+        for rodada in ('primeira execução', 'execução repetida'):
+            inicio = time.perf_counter()
+            resultado = schedule_preventive_maintenance(horizonte_dias=args.horizonte)
+            print(f"{rodada}: {resultado['manutencoes_geradas']} manutenções para "
+                  f"{resultado['programas']} programas em {time.perf_counter() - inicio:.2f}s")
+
+        db.session.remove()
+        db.drop_all()
+
+if __name__ == '__main__':
+    main()
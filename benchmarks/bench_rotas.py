@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Benchmark das rotas de equipamentos, manutenções, ordens de serviço e autenticação,
+com requisições concorrentes contra um servidor em execução.
+
+Para cada cenário (método + rota) mede a latência (p50/p95/p99), a vazão e as
+respostas por status e, pelo cabeçalho Server-Timing, os comandos SQL e as linhas
+lidas por requisição. Os resultados são gravados em JSON e podem ser comparados
+com uma execução anterior; o código de saída é 1 quando há regressões.
+
+Uso:
+    flask seed-synthetic --equipamentos 100000 --manutencoes 2000000 --ordens 500000
+    LOGIN_LIMITE_IP=100000 gunicorn --worker-class gthread --threads 8 -w 4 -b 127.0.0.1:8000 run:app
+    python benchmarks/bench_rotas.py --url http://127.0.0.1:8000 --concorrencia 16 --requisicoes 300
+    python benchmarks/bench_rotas.py --url http://127.0.0.1:8000 --comparar benchmarks/resultados/<base>.json
+
+As rotas de escrita alteram a base: use um banco dedicado ao benchmark.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+import uuid
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+RESULTADOS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resultados')
+
+# Usuários criados por flask seed-synthetic (a senha é a mesma para todos)
+EMAIL_ADMIN = 'admin@sintetico.local'
+EMAILS_LOGIN = [f'usuario{i:06d}@sintetico.local' for i in range(1, 51)]
+
+TERMOS_BUSCA = ['monitor', 'ventilador', 'bomba infusao', 'philips', 'EQ-00001', 'SN00000', 'desfib', 'mindray']
+
+# Rotas que disparam tarefas sobre a base inteira: executadas apenas quando pedidas em --cenarios
+EXCLUIDAS = {'POST /api/equipamentos/qrcodes/regenerar'}
+
+SERVER_TIMING = re.compile(r'desc="(\d+) consultas, (\d+) linhas"')
+
+Cenario = namedtuple('Cenario', ['metodo', 'rota', 'montar'])
+
+def percentis(valores, *ps):
+    """Percentis (método do posto mais próximo) de uma lista ordenada."""
+    n = len(valores)
+    return {f'p{p}': valores[min(n - 1, max(0, -(-p * n // 100) - 1))] for p in ps} if n else {}
+
+class Cliente:
+    """Conexão HTTP persistente (keep-alive) por thread."""
+
+    def __init__(self, url):
+        partes = urlsplit(url)
+        self.host = partes.hostname
+        self.port = partes.port
+        self.https = partes.scheme == 'https'
+        self._local = threading.local()
+
+    def _conexao(self):
+        conexao = getattr(self._local, 'conexao', None)
+        if conexao is None:
+            classe = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            conexao = self._local.conexao = classe(self.host, self.port, timeout=60)
+        return conexao
+
+    def request(self, metodo, caminho, corpo=None, headers=None, content_type='application/json'):
+        """
+        Executa uma requisição.
+
+        Returns:
+            tuple: (status, segundos, corpo da resposta, comandos SQL, linhas lidas); status 0 em
+                falha de conexão e comandos/linhas None sem o cabeçalho Server-Timing
+        """
+        headers = dict(headers or {})
+        if corpo is not None and not isinstance(corpo, bytes):
+            corpo = json.dumps(corpo).encode()
+        if corpo is not None:
+            headers['Content-Type'] = content_type
+
+        inicio = time.perf_counter()
+        try:
+            conexao = self._conexao()
+            conexao.request(metodo, caminho, body=corpo, headers=headers)
+            resposta = conexao.getresponse()
+            dados = resposta.read()
+        except (OSError, http.client.HTTPException):
+            self._local.conexao = None
+            return 0, time.perf_counter() - inicio, b'', None, None
+        duracao = time.perf_counter() - inicio
+
+        medidas = SERVER_TIMING.search(resposta.getheader('Server-Timing', ''))
+        consultas, linhas = (int(medidas.group(1)), int(medidas.group(2))) if medidas else (None, None)
+        return resposta.status, duracao, dados, consultas, linhas
+
+class Contexto:
+    """Credenciais e IDs existentes na base, amostrados antes do benchmark."""
+
+    def __init__(self, cliente, senha, amostras):
+        self.cliente = cliente
+        self.senha = senha
+        self.rng = random.Random(42)
+        self.criados = {'equipamentos': [], 'manutencoes': [], 'ordens': []}
+        self._lock = threading.Lock()
+
+        status, _, dados, _, _ = cliente.request('POST', '/api/auth/login', {'email': EMAIL_ADMIN, 'senha': senha})
+        if status != 200:
+            raise SystemExit(f'Falha no login de {EMAIL_ADMIN} ({status}): {dados[:200]!r}. '
+                             'Popule a base com flask seed-synthetic.')
+        tokens = json.loads(dados)
+        self.headers = {'Authorization': f"Bearer {tokens['access_token']}"}
+        self.headers_refresh = {'Authorization': f"Bearer {tokens['refresh_token']}"}
+
+        self.equipamentos = self._ids('/api/equipamentos', amostras)
+        self.manutencoes = self._ids('/api/manutencoes', amostras)
+        self.ordens = self._ids('/api/ordens-servico', amostras)
+        self.ordens_concluidas = self._ids('/api/ordens-servico/por-status/concluida', amostras)
+
+        # Páginas de 20 itens existentes em cada listagem (páginas além da última não são válidas)
+        self.paginas = {
+            caminho: min(self._get(f'{caminho}?fields=id&size=20')['pages'], 50)
+            for caminho in ('/api/equipamentos', '/api/manutencoes', '/api/ordens-servico')
+        }
+
+        # IDs relacionados, lidos do detalhe com campos esparsos
+        amostra = self.ordens[:20]
+        ordens = [self._get(f'/api/ordens-servico/{id}?fields=departamento_id,solicitante_id') for id in amostra]
+        self.departamentos = sorted({o['departamento_id'] for o in ordens})
+        self.solicitantes = sorted({o['solicitante_id'] for o in ordens})
+        manutencoes = [self._get(f'/api/manutencoes/{id}?fields=tecnico_id') for id in self.manutencoes[:40]]
+        self.tecnicos = sorted({m['tecnico_id'] for m in manutencoes if m['tecnico_id']})
+
+        if not (self.equipamentos and self.manutencoes and self.ordens and self.tecnicos):
+            raise SystemExit('A base não tem dados suficientes. Popule-a com flask seed-synthetic.')
+
+    def _get(self, caminho):
+        status, _, dados, _, _ = self.cliente.request('GET', caminho, headers=self.headers)
+        if status != 200:
+            raise SystemExit(f'GET {caminho} retornou {status}: {dados[:200]!r}')
+        return json.loads(dados)
+
+    def _ids(self, caminho, quantidade):
+        ids = []
+        for pagina in range(1, 4):
+            dados = self._get(f'{caminho}?fields=id&size={quantidade}&page={pagina}')
+            # Rotas de filtro sem paginação retornam a lista completa
+            if isinstance(dados, list):
+                return [item['id'] for item in dados[:quantidade * 3]]
+            ids.extend(item['id'] for item in dados['items'])
+            if pagina >= dados['pages']:
+                break
+        return ids
+
+    def pagina(self, caminho):
+        return f'{caminho}?page={self.rng.randint(1, self.paginas[caminho])}&size=20'
+
+    def escolher(self, nome):
+        return self.rng.choice(getattr(self, nome))
+
+    def criado(self, tipo, id):
+        with self._lock:
+            self.criados[tipo].append(id)
+
+    def retirar_criado(self, tipo):
+        """Retira um registro criado pelo benchmark (para exclusão); None se não houver."""
+        with self._lock:
+            return self.criados[tipo].pop() if self.criados[tipo] else None
+
+    def alguns_criados(self, tipo, quantidade):
+        with self._lock:
+            return self.criados[tipo][-quantidade:]
+
+def _codigo():
+    return uuid.uuid4().hex[:12].upper()
+
+def _equipamento(ctx):
+    codigo = _codigo()
+    return {
+        'codigo': f'BENCH-{codigo}', 'nome': f'Equipamento Benchmark {codigo}', 'modelo': 'BM-1',
+        'fabricante': 'Benchmark', 'numero_serie': f'BSN-{codigo}', 'data_aquisicao': '2024-01-10',
+        'departamento_id': ctx.escolher('departamentos'), 'criticidade': 'MEDIA'
+    }
+
+def _data_futura(ctx):
+    return (datetime(2030, 1, 1) + timedelta(seconds=ctx.rng.randrange(10 ** 8))).isoformat()
+
+def _periodo(ctx):
+    inicio = datetime.utcnow() - timedelta(days=ctx.rng.randrange(7, 900))
+    return f'inicio={inicio.isoformat(timespec="seconds")}&fim={(inicio + timedelta(days=7)).isoformat(timespec="seconds")}'
+
+def _csv_equipamentos(ctx, quantidade=50):
+    linhas = ['codigo,nome,modelo,fabricante,numero_serie,data_aquisicao,departamento_id']
+    for _ in range(quantidade):
+        e = _equipamento(ctx)
+        linhas.append(','.join(e[c] for c in ('codigo', 'nome', 'modelo', 'fabricante', 'numero_serie',
+                                             'data_aquisicao', 'departamento_id')))
+    return ('\n'.join(linhas) + '\n').encode()
+
+def _com_criado(tipo, montar_caminho):
+    """Usa um registro criado pelo benchmark, ou um existente se ainda não houver."""
+    def montar(ctx):
+        ids = ctx.alguns_criados(tipo, 1)
+        return montar_caminho(ids[0] if ids else ctx.escolher(tipo))
+    return montar
+
+def _excluir(tipo, prefixo):
+    def montar(ctx):
+        id = ctx.retirar_criado(tipo) or ctx.escolher(tipo)
+        return f'{prefixo}/{id}', None
+    return montar
+
+# Cada função montar recebe o contexto e retorna (caminho, corpo); corpo bytes é enviado como text/csv.
+# A ordem importa: as rotas de escrita usam e depois excluem os registros criados pelos POSTs.
+CENARIOS = [
+    # Autenticação
+    Cenario('POST', '/api/auth/login', lambda ctx: ('/api/auth/login', {'email': ctx.rng.choice(EMAILS_LOGIN), 'senha': ctx.senha})),
+    Cenario('POST', '/api/auth/refresh-token', lambda ctx: ('/api/auth/refresh-token', None)),
+    Cenario('POST', '/api/auth/logout', lambda ctx: ('/api/auth/logout', None)),
+
+    # Equipamentos
+    Cenario('GET', '/api/equipamentos', lambda ctx: (ctx.pagina('/api/equipamentos'), None)),
+    Cenario('GET', '/api/equipamentos/<id>', lambda ctx: (f"/api/equipamentos/{ctx.escolher('equipamentos')}", None)),
+    Cenario('GET', '/api/equipamentos/<id>/historico',
+            lambda ctx: (f"/api/equipamentos/{ctx.escolher('equipamentos')}/historico", None)),
+    Cenario('GET', '/api/equipamentos/<id>/qrcode', lambda ctx: (f"/api/equipamentos/{ctx.escolher('equipamentos')}/qrcode", None)),
+    Cenario('GET', '/api/equipamentos/busca',
+            lambda ctx: (f"/api/equipamentos/busca?termo={ctx.rng.choice(TERMOS_BUSCA).replace(' ', '+')}", None)),
+    Cenario('GET', '/api/equipamentos/por-departamento/<departamento_id>',
+            lambda ctx: (f"/api/equipamentos/por-departamento/{ctx.escolher('departamentos')}?size=20", None)),
+    Cenario('GET', '/api/equipamentos/por-status/<status>',
+            lambda ctx: (f"/api/equipamentos/por-status/{ctx.rng.choice(['ativo', 'em_manutencao', 'inativo'])}?size=20", None)),
+    Cenario('POST', '/api/equipamentos', lambda ctx: ('/api/equipamentos', _equipamento(ctx))),
+    Cenario('POST', '/api/equipamentos/bulk', lambda ctx: ('/api/equipamentos/bulk', _csv_equipamentos(ctx))),
+    Cenario('PUT', '/api/equipamentos/<id>',
+            _com_criado('equipamentos', lambda id: (f'/api/equipamentos/{id}', {'localizacao': 'Sala do benchmark'}))),
+    Cenario('POST', '/api/equipamentos/<id>/gerar-qrcode',
+            _com_criado('equipamentos', lambda id: (f'/api/equipamentos/{id}/gerar-qrcode', None))),
+    Cenario('POST', '/api/equipamentos/qrcodes/regenerar', lambda ctx: ('/api/equipamentos/qrcodes/regenerar', None)),
+
+    # Manutenções
+    Cenario('GET', '/api/manutencoes', lambda ctx: (ctx.pagina('/api/manutencoes'), None)),
+    Cenario('GET', '/api/manutencoes/<id>', lambda ctx: (f"/api/manutencoes/{ctx.escolher('manutencoes')}", None)),
+    Cenario('GET', '/api/manutencoes/por-equipamento/<equipamento_id>',
+            lambda ctx: (f"/api/manutencoes/por-equipamento/{ctx.escolher('equipamentos')}", None)),
+    Cenario('GET', '/api/manutencoes/por-periodo', lambda ctx: (f'/api/manutencoes/por-periodo?{_periodo(ctx)}', None)),
+    Cenario('GET', '/api/manutencoes/por-tecnico/<tecnico_id>',
+            lambda ctx: (f"/api/manutencoes/por-tecnico/{ctx.escolher('tecnicos')}", None)),
+    Cenario('POST', '/api/manutencoes', lambda ctx: ('/api/manutencoes', {
+        'equipamento_id': ctx.escolher('equipamentos'), 'tipo_manutencao': 'CORRETIVA',
+        'descricao': 'Manutenção criada pelo benchmark', 'data_agendamento': _data_futura(ctx),
+        'tecnico_id': ctx.escolher('tecnicos')
+    })),
+    Cenario('PUT', '/api/manutencoes/<id>',
+            _com_criado('manutencoes', lambda id: (f'/api/manutencoes/{id}', {'observacoes': 'Atualizada pelo benchmark'}))),
+    Cenario('PUT', '/api/manutencoes/<id>/status',
+            _com_criado('manutencoes', lambda id: (f'/api/manutencoes/{id}/status', {'status': 'EM_ANDAMENTO'}))),
+    Cenario('PUT', '/api/manutencoes/status',
+            lambda ctx: ('/api/manutencoes/status', {'ids': ctx.alguns_criados('manutencoes', 50) or [ctx.escolher('manutencoes')],
+                                                     'status': 'AGENDADA'})),
+
+    # Ordens de serviço
+    Cenario('GET', '/api/ordens-servico', lambda ctx: (ctx.pagina('/api/ordens-servico'), None)),
+    Cenario('GET', '/api/ordens-servico/<id>', lambda ctx: (f"/api/ordens-servico/{ctx.escolher('ordens')}", None)),
+    Cenario('GET', '/api/ordens-servico/por-departamento/<departamento_id>',
+            lambda ctx: (f"/api/ordens-servico/por-departamento/{ctx.escolher('departamentos')}?size=20", None)),
+    Cenario('GET', '/api/ordens-servico/por-equipamento/<equipamento_id>',
+            lambda ctx: (f"/api/ordens-servico/por-equipamento/{ctx.escolher('equipamentos')}", None)),
+    Cenario('GET', '/api/ordens-servico/por-solicitante/<solicitante_id>',
+            lambda ctx: (f"/api/ordens-servico/por-solicitante/{ctx.escolher('solicitantes')}?size=20", None)),
+    Cenario('GET', '/api/ordens-servico/por-status/<status>',
+            lambda ctx: (f"/api/ordens-servico/por-status/{ctx.rng.choice(['aberta', 'em_andamento', 'concluida'])}?size=20", None)),
+    Cenario('POST', '/api/ordens-servico', lambda ctx: ('/api/ordens-servico', {
+        'equipamento_id': ctx.escolher('equipamentos'), 'departamento_id': ctx.escolher('departamentos'),
+        'solicitante_id': ctx.escolher('solicitantes'), 'tipo_servico': 'MANUTENCAO_CORRETIVA',
+        'descricao_problema': 'Ordem criada pelo benchmark', 'prioridade': 'ALTA'
+    })),
+    Cenario('PUT', '/api/ordens-servico/<id>',
+            _com_criado('ordens', lambda id: (f'/api/ordens-servico/{id}', {'observacoes': 'Atualizada pelo benchmark'}))),
+    Cenario('PUT', '/api/ordens-servico/<id>/status',
+            _com_criado('ordens', lambda id: (f'/api/ordens-servico/{id}/status', {'status': 'ATRIBUIDA'}))),
+    Cenario('PUT', '/api/ordens-servico/status',
+            lambda ctx: ('/api/ordens-servico/status', {'ids': ctx.alguns_criados('ordens', 50) or [ctx.escolher('ordens')],
+                                                        'status': 'ABERTA'})),
+    Cenario('POST', '/api/ordens-servico/<id>/avaliacao',
+            lambda ctx: (f"/api/ordens-servico/{ctx.escolher('ordens_concluidas')}/avaliacao",
+                         {'avaliacao': ctx.rng.randrange(1, 6), 'comentario': 'Avaliação do benchmark'})),
+
+    # Exclusões dos registros criados acima
+    Cenario('DELETE', '/api/ordens-servico/<id>', _excluir('ordens', '/api/ordens-servico')),
+    Cenario('DELETE', '/api/manutencoes/<id>', _excluir('manutencoes', '/api/manutencoes')),
+    Cenario('DELETE', '/api/equipamentos/<id>', _excluir('equipamentos', '/api/equipamentos')),
+]
+
+# Registros criados por cada POST, para os cenários de atualização e exclusão
+CRIACOES = {
+    'POST /api/equipamentos': 'equipamentos',
+    'POST /api/manutencoes': 'manutencoes',
+    'POST /api/ordens-servico': 'ordens',
+}
+
+def executar(cliente, ctx, cenario, requisicoes, concorrencia, aquecimento):
+    """Executa um cenário e retorna o resumo das medidas."""
+    nome = f'{cenario.metodo} {cenario.rota}'
+    headers = ctx.headers_refresh if cenario.rota == '/api/auth/refresh-token' else ctx.headers
+
+    def uma(_):
+        caminho, corpo = cenario.montar(ctx)
+        content_type = 'text/csv' if isinstance(corpo, bytes) else 'application/json'
+        status, duracao, dados, consultas, linhas = cliente.request(
+            cenario.metodo, caminho, corpo, headers, content_type=content_type
+        )
+        if nome in CRIACOES and status == 201:
+            ctx.criado(CRIACOES[nome], json.loads(dados)['id'])
+        return status, duracao, consultas, linhas
+
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        list(executor.map(uma, range(aquecimento)))
+        inicio = time.perf_counter()
+        medidas = list(executor.map(uma, range(requisicoes)))
+        total = time.perf_counter() - inicio
+
+    latencias = sorted(duracao * 1000 for _, duracao, _, _ in medidas)
+    consultas = sorted(c for _, _, c, _ in medidas if c is not None)
+    linhas = sorted(n for _, _, _, n in medidas if n is not None)
+    status = Counter(str(s) for s, _, _, _ in medidas)
+    return {
+        'requisicoes': requisicoes,
+        'vazao_rps': round(requisicoes / total, 1),
+        'status': dict(sorted(status.items())),
+        'erros': sum(q for s, q in status.items() if s == '0' or s >= '500'),
+        'latencia_ms': {**{k: round(v, 2) for k, v in percentis(latencias, 50, 95, 99).items()},
+                        'media': round(sum(latencias) / len(latencias), 2), 'max': round(latencias[-1], 2)},
+        'consultas': {'media': round(sum(consultas) / len(consultas), 2), **percentis(consultas, 50, 95)} if consultas else None,
+        'linhas': {'media': round(sum(linhas) / len(linhas), 1), **percentis(linhas, 95)} if linhas else None,
+    }
+
+def comparar(atual, base, tolerancia):
+    """
+    Compara os resultados com uma execução anterior.
+
+    Uma regressão é um p95 acima da tolerância (em %) ou mais consultas por requisição.
+
+    Returns:
+        list: Nomes dos cenários com regressão
+    """
+    regressoes = []
+    print(f"\nComparação com {base['data']} ({base.get('commit') or 'sem commit'}), tolerância {tolerancia}%")
+    print(f"{'cenário':<62}{'p95 base':>10}{'p95 atual':>11}{'variação':>10}{'consultas':>14}")
+    for nome, resultado in atual['cenarios'].items():
+        anterior = base['cenarios'].get(nome)
+        if anterior is None:
+            continue
+        p95_base, p95 = anterior['latencia_ms']['p95'], resultado['latencia_ms']['p95']
+        variacao = (p95 - p95_base) / p95_base * 100 if p95_base else 0
+        consultas_base = (anterior.get('consultas') or {}).get('media')
+        consultas = (resultado.get('consultas') or {}).get('media')
+
+        regrediu = variacao > tolerancia or (consultas_base is not None and consultas is not None and consultas > consultas_base)
+        if regrediu:
+            regressoes.append(nome)
+        texto_consultas = f'{consultas_base} -> {consultas}' if consultas is not None else '-'
+        print(f"{nome:<62}{p95_base:>10.1f}{p95:>11.1f}{variacao:>+9.1f}%{texto_consultas:>14}"
+              + ('  REGRESSÃO' if regrediu else ''))
+    return regressoes
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Endereço do servidor')
+    parser.add_argument('--senha', default='senha123', help='Senha dos usuários da carga sintética')
+    parser.add_argument('--concorrencia', type=int, default=8, help='Requisições simultâneas')
+    parser.add_argument('--requisicoes', type=int, default=200, help='Requisições medidas por cenário')
+    parser.add_argument('--aquecimento', type=int, default=10, help='Requisições descartadas por cenário')
+    parser.add_argument('--amostras', type=int, default=100, help='IDs lidos por página na preparação')
+    parser.add_argument('--cenarios', help='Expressão regular sobre "MÉTODO /rota" para filtrar os cenários')
+    parser.add_argument('--somente-leitura', action='store_true', help='Executa apenas os cenários GET')
+    parser.add_argument('--saida', default=RESULTADOS_DIR, help='Diretório dos resultados')
+    parser.add_argument('--comparar', help='Arquivo de resultados de uma execução anterior')
+    parser.add_argument('--tolerancia', type=float, default=10, help='Aumento aceito no p95 (em %%)')
+    args = parser.parse_args()
+
+    cenarios = [c for c in CENARIOS if not args.somente_leitura or c.metodo == 'GET']
+    if args.cenarios:
+        cenarios = [c for c in cenarios if re.search(args.cenarios, f'{c.metodo} {c.rota}')]
+    else:
+        cenarios = [c for c in cenarios if f'{c.metodo} {c.rota}' not in EXCLUIDAS]
+
+    cliente = Cliente(args.url)
+    ctx = Contexto(cliente, args.senha, args.amostras)
+
+    print(f'{args.url}: {len(cenarios)} cenários, {args.requisicoes} requisições, concorrência {args.concorrencia}')
+    print(f"{'cenário':<62}{'req/s':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'consultas':>11}{'erros':>7}")
+    resultados = {}
+    for cenario in cenarios:
+        nome = f'{cenario.metodo} {cenario.rota}'
+        r = resultados[nome] = executar(cliente, ctx, cenario, args.requisicoes, args.concorrencia, args.aquecimento)
+        latencia = r['latencia_ms']
+        consultas = r['consultas']['media'] if r['consultas'] else '-'
+        print(f"{nome:<62}{r['vazao_rps']:>8.1f}{latencia['p50']:>9.1f}{latencia['p95']:>9.1f}{latencia['p99']:>9.1f}"
+              f"{consultas:>11}{r['erros']:>7}")
+
+    atual = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'url': args.url,
+        'concorrencia': args.concorrencia,
+        'requisicoes': args.requisicoes,
+        'cenarios': resultados,
+    }
+    os.makedirs(args.saida, exist_ok=True)
+    arquivo = os.path.join(args.saida, f"rotas-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        json.dump(atual, f, ensure_ascii=False, indent=2)
+    print(f'\nResultados gravados em {arquivo}')
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            regressoes = comparar(atual, json.load(f), args.tolerancia)
+        if regressoes:
+            raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
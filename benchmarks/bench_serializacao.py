@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Benchmark da serialização das listagens: dicionários montados à mão + json padrão do Flask
+x serializadores compilados + orjson, a partir de objetos do ORM ou de tuplas (Core).
+
+Para cada formato de listagem (equipamentos, manutenções e ordens de serviço) mede
+a consulta, a montagem dos dicionários e a geração do JSON de uma página.
+
+Uso:
+    python benchmarks/bench_serializacao.py --registros 20000 --pagina 1000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def medir(funcao, repeticoes):
+    """Executa a função várias vezes e retorna as latências em milissegundos."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+# Serializadores escritos à mão, como eram nas rotas antes do registro de serializadores
+
+def manual_equipamento(eq):
+    return {
+        'id': eq.id,
+        'codigo': eq.codigo,
+        'nome': eq.nome,
+        'modelo': eq.modelo,
+        'fabricante': eq.fabricante,
+        'status': eq.status,
+        'departamento': eq.departamento.nome if eq.departamento else None,
+        'criticidade': eq.criticidade,
+        'proxima_manutencao': eq.proxima_manutencao_planejada.isoformat() if eq.proxima_manutencao_planejada else None
+    }
+
+def manual_manutencao(m):
+    return {
+        'id': m.id,
+        'equipamento': m.equipamento.nome if m.equipamento else None,
+        'tipo_manutencao': m.tipo_manutencao,
+        'status': m.status,
+        'prioridade': m.prioridade,
+        'data_agendamento': m.data_agendamento.isoformat() if m.data_agendamento else None,
+        'data_inicio': m.data_inicio.isoformat() if m.data_inicio else None,
+        'data_fim': m.data_fim.isoformat() if m.data_fim else None,
+        'tecnico': m.tecnico.nome if m.tecnico else (m.tecnico_externo.nome if m.tecnico_externo else None)
+    }
+
+def manual_ordem(os):
+    return {
+        'id': os.id,
+        'codigo': os.codigo,
+        'equipamento': os.equipamento.nome if os.equipamento else None,
+        'departamento': os.departamento.nome if os.departamento else None,
+        'solicitante': os.solicitante.nome if os.solicitante else None,
+        'tipo_servico': os.tipo_servico,
+        'prioridade': os.prioridade,
+        'status': os.status,
+        'data_abertura': os.data_abertura.isoformat() if os.data_abertura else None
+    }
+
+def popular(db, models, total):
+    """Insere departamentos, usuários, técnicos, equipamentos, manutenções e ordens de serviço."""
+    from app.models.types import uuid7
+
+    inicio = datetime(2024, 1, 1)
+    departamentos = [{'id': uuid7(), 'nome': f'Departamento {i}'} for i in range(20)]
+    usuarios = [{'id': uuid7(), 'nome': f'Usuário {i}', 'email': f'usuario{i}@exemplo.com', 'senha_hash': 'x',
+                 'perfil': 'SOLICITANTE'} for i in range(50)]
+    tecnicos = [{'id': uuid7(), 'nome': f'Técnico {i}', 'email': f'tecnico{i}@exemplo.com'} for i in range(30)]
+    equipamentos = [{
+        'id': uuid7(), 'codigo': f'EQ-{i:06d}', 'nome': f'Equipamento {i}', 'modelo': f'MOD-{i % 97}',
+        'fabricante': f'Fabricante {i % 13}', 'numero_serie': f'SN-{i:07d}', 'data_aquisicao': date(2023, 1, 1),
+        'departamento_id': random.choice(departamentos)['id'], 'status': 'ATIVO', 'criticidade': 'MEDIA',
+        'valor_aquisicao': Decimal('15000.00'), 'proxima_manutencao_planejada': inicio + timedelta(days=i % 365),
+    } for i in range(total)]
+    manutencoes = [{
+        'id': uuid7(), 'equipamento_id': random.choice(equipamentos)['id'], 'tipo_manutencao': 'PREVENTIVA',
+        'status': 'CONCLUIDA', 'prioridade': 'NORMAL', 'descricao': 'Manutenção de rotina',
+        'data_agendamento': inicio + timedelta(hours=i), 'data_inicio': inicio + timedelta(hours=i),
+        'data_fim': inicio + timedelta(hours=i + 2), 'tecnico_id': random.choice(tecnicos)['id'],
+        'custo_total': Decimal('350.00'),
+    } for i in range(total)]
+    ordens = [{
+        'id': uuid7(), 'codigo': f'OS-{i:07d}', 'equipamento_id': random.choice(equipamentos)['id'],
+        'departamento_id': random.choice(departamentos)['id'], 'solicitante_id': random.choice(usuarios)['id'],
+        'tipo_servico': 'CORRETIVA', 'descricao_problema': 'Equipamento não liga', 'prioridade': 'ALTA',
+        'status': 'ABERTA', 'data_abertura': inicio + timedelta(hours=i),
+    } for i in range(total)]
+
+    for model, linhas in [(models.Departamento, departamentos), (models.Usuario, usuarios),
+                          (models.Tecnico, tecnicos), (models.Equipamento, equipamentos),
+                          (models.Manutencao, manutencoes), (models.OrdemServico, ordens)]:
+        for i in range(0, len(linhas), 5000):
+            db.session.execute(model.__table__.insert(), linhas[i:i + 5000])
+    db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--registros', type=int, default=20000, help='Registros de cada tabela')
+    parser.add_argument('--pagina', type=int, default=1000, help='Itens por página')
+    parser.add_argument('--repeticoes', type=int, default=20, help='Execuções de cada cenário')
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench_serializacao.db')
+    os.environ['TEST_DATABASE_URL'] = f'sqlite:///{db_path}'
+
+    from flask.json.provider import DefaultJSONProvider
+    from app import create_app, db
+    from app import models
+    from app.utils.loading import with_loading
+    from app.routes.equipamento_routes import serialize_equipamento_lista
+    from app.routes.manutencao_routes import serialize_manutencao_lista
+    from app.routes.ordem_servico_routes import serialize_ordem_lista
+
+    app = create_app('testing')
+    padrao = DefaultJSONProvider(app)
+
+    formatos = [
+        ('equipamentos', models.Equipamento, manual_equipamento, serialize_equipamento_lista),
+        ('manutencoes', models.Manutencao, manual_manutencao, serialize_manutencao_lista),
+        ('ordens_servico', models.OrdemServico, manual_ordem, serialize_ordem_lista),
+    ]
+
+    with app.app_context():
+        db.create_all()
+        popular(db, models, args.registros)
+        print(f'{args.registros} registros por tabela, páginas de {args.pagina} itens (mediana em ms)')
+        print(f"{'listagem':<16}{'manual + json':>15}{'ORM + orjson':>15}{'Core + orjson':>15}"
+              f"{'dicts à mão':>14}{'dicts compilados':>18}")
+
+        for nome, model, manual, serializer in formatos:
+            def antes():
+                itens = with_loading(model.query, serializer).limit(args.pagina).all()
+                return padrao.dumps([manual(item) for item in itens], separators=(',', ':'))
+
+            def orm():
+                itens = with_loading(model.query, serializer).limit(args.pagina).all()
+                return app.json.dumps([serializer(item) for item in itens])
+
+            def core():
+                return app.json.dumps(serializer.rows(serializer.query().limit(args.pagina).all()))
+
+            # Apenas a montagem dos dicionários, sobre objetos já carregados
+            objetos = with_loading(model.query, serializer).limit(args.pagina).all()
+            so_manual = medir(lambda: [manual(item) for item in objetos], args.repeticoes)
+            so_compilado = medir(lambda: [serializer(item) for item in objetos], args.repeticoes)
+            db.session.expunge_all()
+
+            resultados = [statistics.median(medir(funcao, args.repeticoes)) for funcao in (antes, orm, core)]
+            print(f'{nome:<16}' + ''.join(f'{valor:>15.1f}' for valor in resultados)
+                  + f'{statistics.median(so_manual):>14.2f}{statistics.median(so_compilado):>18.2f}')
+
+if __name__ == '__main__':
+    main()
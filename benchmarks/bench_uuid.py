@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark das chaves UUID: texto de 36 caracteres x BLOB de 16 bytes, com UUID versão 4 e versão 7.
+
+Para cada cenário cria equipamentos e manutenções (chave estrangeira indexada) no
+SQLite e mede o tempo de inserção, o tamanho das tabelas e índices (dbstat), a
+junção manutenções x equipamentos e a busca por chave primária.
+
+Uso:
+    python benchmarks/bench_uuid.py --equipamentos 50000 --manutencoes 500000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import Column, ForeignKey, Index, MetaData, String, Table, create_engine, func, insert, select
+
+from app.models.types import UUIDType, uuid7
+
+CENARIOS = [
+    ('texto-uuid4', String(36), lambda: str(uuid.uuid4())),
+    ('blob-uuid4', UUIDType(), lambda: str(uuid.uuid4())),
+    ('blob-uuid7', UUIDType(), uuid7),
+]
+
+def criar_tabelas(tipo):
+    metadata = MetaData()
+    equipamentos = Table(
+        'equipamentos', metadata,
+        Column('id', tipo, primary_key=True),
+        Column('codigo', String(50), nullable=False),
+        Column('status', String(20), nullable=False),
+    )
+    manutencoes = Table(
+        'manutencoes', metadata,
+        Column('id', tipo, primary_key=True),
+        Column('equipamento_id', tipo, ForeignKey('equipamentos.id'), nullable=False),
+        Column('status', String(20), nullable=False),
+        Index('ix_manutencoes_equipamento_id', 'equipamento_id'),
+    )
+    return metadata, equipamentos, manutencoes
+
+def medir(funcao, repeticoes):
+    """Executa a função várias vezes e retorna as latências em milissegundos."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+def executar(nome, tipo, gerar, args):
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), f'bench_{nome}.db')}"
+    engine = create_engine(url)
+    metadata, equipamentos, manutencoes = criar_tabelas(tipo)
+    metadata.create_all(engine)
+
+    # Inserções em lotes pequenos, como as requisições da API, com IDs gerados na ordem de criação
+    inicio = time.perf_counter()
+    ids = []
+    with engine.begin() as conn:
+        for i in range(0, args.equipamentos, args.lote):
+            lote = [{'id': gerar(), 'codigo': f'EQ-{j:06d}', 'status': ('ATIVO', 'INATIVO')[j % 2]}
+                    for j in range(i, min(i + args.lote, args.equipamentos))]
+            conn.execute(insert(equipamentos), lote)
+            ids.extend(row['id'] for row in lote)
+    with engine.begin() as conn:
+        for i in range(0, args.manutencoes, args.lote):
+            conn.execute(insert(manutencoes), [
+                {'id': gerar(), 'equipamento_id': random.choice(ids), 'status': 'CONCLUIDA'}
+                for _ in range(i, min(i + args.lote, args.manutencoes))
+            ])
+    tempo_insercao = time.perf_counter() - inicio
+
+    with engine.connect() as conn:
+        tamanhos = dict(conn.exec_driver_sql("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").all())
+
+        juncao = select(func.count()).select_from(
+            manutencoes.join(equipamentos, equipamentos.c.id == manutencoes.c.equipamento_id)
+        ).where(equipamentos.c.status == 'ATIVO')
+        tempos_juncao = medir(lambda: conn.execute(juncao).scalar(), args.repeticoes)
+
+        amostra = random.sample(ids, min(1000, len(ids)))
+        busca = select(equipamentos.c.codigo).where(equipamentos.c.id.in_(amostra))
+        tempos_busca = medir(lambda: conn.execute(busca).all(), args.repeticoes)
+
+    engine.dispose()
+
+    # Índices automáticos da chave primária (sqlite_autoindex_*) e índice da chave estrangeira
+    indice_pk = sum(tamanho for tabela, tamanho in tamanhos.items() if tabela.startswith('sqlite_autoindex_'))
+    return {
+        'insercao': tempo_insercao,
+        'tabelas': tamanhos.get('equipamentos', 0) + tamanhos.get('manutencoes', 0),
+        'indice_pk': indice_pk,
+        'indice_fk': tamanhos.get('ix_manutencoes_equipamento_id', 0),
+        'juncao': statistics.median(tempos_juncao),
+        'busca': statistics.median(tempos_busca),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--equipamentos', type=int, default=50000, help='Quantidade de equipamentos')
+    parser.add_argument('--manutencoes', type=int, default=500000, help='Quantidade de manutenções')
+    parser.add_argument('--lote', type=int, default=100, help='Registros por inserção')
+    parser.add_argument('--repeticoes', type=int, default=10, help='Execuções de cada consulta')
+    args = parser.parse_args()
+
+    print(f'{args.equipamentos} equipamentos, {args.manutencoes} manutenções')
+    print(f"{'cenário':<14}{'inserção (s)':>14}{'tabelas (MB)':>14}{'índice PK (MB)':>16}"
+          f"{'índice FK (MB)':>16}{'junção (ms)':>13}{'1000 PKs (ms)':>15}")
+    for nome, tipo, gerar in CENARIOS:
+        r = executar(nome, tipo, gerar, args)
+        print(f"{nome:<14}{r['insercao']:>14.2f}{r['tabelas'] / 2**20:>14.1f}{r['indice_pk'] / 2**20:>16.1f}"
+              f"{r['indice_fk'] / 2**20:>16.1f}{r['juncao']:>13.1f}{r['busca']:>15.1f}")
+
+if __name__ == '__main__':
+    main()
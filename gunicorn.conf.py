@@ -0,0 +1,21 @@
+import os
+import shutil
+import tempfile
+
+# Métricas do Prometheus compartilhadas entre os workers: cada worker grava seus valores
+# em arquivos mmap neste diretório e GET /api/metrics soma os arquivos de todos eles.
+# A variável precisa estar definida antes de os workers importarem a aplicação.
+prometheus_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'prometheus_multiproc')
+)
+
+from prometheus_client import multiprocess  # noqa: E402 (depois de PROMETHEUS_MULTIPROC_DIR)
+
+def on_starting(server):
+    """Descarta as métricas de execuções anteriores do servidor."""
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+
+def child_exit(server, worker):
+    """Remove os gauges do worker encerrado (os contadores continuam somados)."""
+    multiprocess.mark_process_dead(worker.pid)
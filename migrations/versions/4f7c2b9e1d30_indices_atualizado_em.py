@@ -0,0 +1,34 @@
+"""Índices de atualizado_em
+
+Revision ID: 4f7c2b9e1d30
+Revises: da15d4182953
+Create Date: 2026-10-17 01:32:10.418233
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4f7c2b9e1d30'
+down_revision = 'da15d4182953'
+branch_labels = None
+depends_on = None
+
+# max(atualizado_em) das listagens com GET condicional (ETag)
+INDICES = [
+    ('ix_equipamentos_atualizado_em', 'equipamentos', ['atualizado_em']),
+    ('ix_manutencoes_atualizado_em', 'manutencoes', ['atualizado_em']),
+    ('ix_ordens_servico_atualizado_em', 'ordens_servico', ['atualizado_em']),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""Índices secundários
+
+Revision ID: 9a2dc65e42cb
+Revises: acc8f5e017b1
+Create Date: 2026-10-17 00:55:49.924562
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9a2dc65e42cb'
+down_revision = 'acc8f5e017b1'
+branch_labels = None
+depends_on = None
+
+# Índices dos filtros, junções e ordenações das listagens, relatórios e dashboards
+INDICES = [
+    ('ix_certificados_data_validade', 'certificados', ['data_validade']),
+    ('ix_certificados_equipamento_id', 'certificados', ['equipamento_id']),
+    ('ix_equipamentos_criticidade', 'equipamentos', ['criticidade']),
+    ('ix_equipamentos_departamento_status', 'equipamentos', ['departamento_id', 'status']),
+    ('ix_equipamentos_status', 'equipamentos', ['status']),
+    ('ix_manutencoes_data_agendamento', 'manutencoes', ['data_agendamento']),
+    ('ix_manutencoes_equipamento_data', 'manutencoes', ['equipamento_id', 'data_agendamento']),
+    ('ix_manutencoes_status_tipo_data', 'manutencoes', ['status', 'tipo_manutencao', 'data_agendamento']),
+    ('ix_manutencoes_tecnico_id', 'manutencoes', ['tecnico_id']),
+    ('ix_ordens_servico_departamento_status', 'ordens_servico', ['departamento_id', 'status']),
+    ('ix_ordens_servico_equipamento_id', 'ordens_servico', ['equipamento_id']),
+    ('ix_ordens_servico_solicitante_id', 'ordens_servico', ['solicitante_id']),
+    ('ix_ordens_servico_status', 'ordens_servico', ['status']),
+    ('ix_programas_manutencao_equipamento_id', 'programas_manutencao', ['equipamento_id']),
+]
+
+
+def upgrade():
+    # No PostgreSQL os índices são criados com CONCURRENTLY, fora de transação,
+    # para não bloquear as escritas nas tabelas durante a criação
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True)
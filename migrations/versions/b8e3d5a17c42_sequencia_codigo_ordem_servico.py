@@ -0,0 +1,43 @@
+"""Sequência dos códigos de ordem de serviço
+
+Revision ID: b8e3d5a17c42
+Revises: 4f7c2b9e1d30
+Create Date: 2026-10-17 02:10:41.207315
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e3d5a17c42'
+down_revision = '4f7c2b9e1d30'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Apenas PostgreSQL: nos demais bancos os códigos vêm da tabela sequencias,
+    # cujo contador é criado com o maior código existente no primeiro uso
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE SEQUENCE IF NOT EXISTS ordens_servico_codigo_seq')
+
+    # Continuar a numeração dos códigos existentes (OS-000123), uma única vez,
+    # antes de os workers usarem a sequência
+    op.execute("""
+        SELECT setval('ordens_servico_codigo_seq', ultimo)
+        FROM (
+            SELECT max(substring(codigo FROM 4)::bigint) AS ultimo
+            FROM ordens_servico
+            WHERE codigo ~ '^OS-[0-9]+$'
+        ) AS codigos
+        WHERE ultimo IS NOT NULL
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('DROP SEQUENCE IF EXISTS ordens_servico_codigo_seq')
@@ -0,0 +1,138 @@
+"""IDs UUID binários
+
+Converte as chaves primárias e estrangeiras de texto (36 caracteres) para UUID
+nativo no PostgreSQL e BLOB de 16 bytes no SQLite, preservando os valores.
+
+Revision ID: da15d4182953
+Revises: 9a2dc65e42cb
+Create Date: 2026-10-17 01:01:31.697568
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import UUIDType, uuid_bytes, uuid_str
+from app.utils.search import SQLITE_DDL, SQLITE_DROP
+
+
+# revision identifiers, used by Alembic.
+revision = 'da15d4182953'
+down_revision = '9a2dc65e42cb'
+branch_labels = None
+depends_on = None
+
+# Colunas com UUID de cada tabela
+COLUNAS = {
+    'departamentos': ['id', 'responsavel_id'],
+    'empresas_externas': ['id'],
+    'fornecedores': ['id'],
+    'resumo_manutencoes': ['equipamento_id', 'tecnico_id'],
+    'resumo_ordens_servico': ['equipamento_id', 'departamento_id'],
+    'usuarios': ['id', 'departamento_id'],
+    'equipamentos': ['id', 'departamento_id'],
+    'notificacoes': ['id', 'usuario_id'],
+    'pecas': ['id', 'fornecedor_id'],
+    'tecnicos': ['id', 'usuario_id'],
+    'tecnicos_externos': ['id', 'empresa_id'],
+    'certificados': ['id', 'equipamento_id'],
+    'programas_manutencao': ['id', 'equipamento_id', 'responsavel_id'],
+    'manutencoes': ['id', 'equipamento_id', 'tecnico_id', 'tecnico_externo_id', 'programa_id', 'empresa_externa_id'],
+    'ordens_servico': ['id', 'equipamento_id', 'departamento_id', 'solicitante_id', 'manutencao_id'],
+}
+
+LOTE = 5000
+
+
+def _converter_valores(tabela, colunas, converter):
+    """Regrava os valores das colunas de uma tabela do SQLite, em lotes por rowid."""
+    bind = op.get_bind()
+    ultimo = 0
+    while True:
+        rows = bind.exec_driver_sql(
+            f"SELECT rowid, {', '.join(colunas)} FROM {tabela} WHERE rowid > ? ORDER BY rowid LIMIT {LOTE}",
+            (ultimo,)
+        ).fetchall()
+        if not rows:
+            break
+        bind.exec_driver_sql(
+            f"UPDATE {tabela} SET {', '.join(f'{coluna} = ?' for coluna in colunas)} WHERE rowid = ?",
+            [tuple(None if valor is None else converter(valor) for valor in row[1:]) + (row[0],) for row in rows]
+        )
+        ultimo = rows[-1][0]
+
+
+def _chaves_estrangeiras():
+    """Lista as chaves estrangeiras do PostgreSQL entre as tabelas convertidas."""
+    inspector = sa.inspect(op.get_bind())
+    return [(tabela, fk) for tabela in COLUNAS for fk in inspector.get_foreign_keys(tabela)]
+
+
+def _alterar_postgresql(tipo, expressao):
+    # As chaves estrangeiras são removidas enquanto os dois lados têm tipos diferentes
+    chaves = _chaves_estrangeiras()
+    for tabela, fk in chaves:
+        op.drop_constraint(fk['name'], tabela, type_='foreignkey')
+
+    for tabela, colunas in COLUNAS.items():
+        for coluna in colunas:
+            op.alter_column(tabela, coluna, type_=tipo, postgresql_using=expressao.format(coluna=coluna))
+
+    for tabela, fk in chaves:
+        op.create_foreign_key(fk['name'], tabela, fk['referred_table'], fk['constrained_columns'], fk['referred_columns'])
+
+
+def _bytes(valor):
+    convertido = uuid_bytes(valor)
+    if convertido is None:
+        raise ValueError(f'ID inválido: {valor!r}')
+    return convertido
+
+
+def _texto(valor):
+    return uuid_str(valor) if isinstance(valor, bytes) and len(valor) == 16 else valor
+
+
+def upgrade():
+    dialeto = op.get_bind().dialect.name
+
+    if dialeto == 'postgresql':
+        _alterar_postgresql(UUIDType(), '{coluna}::uuid')
+        return
+
+    # A busca textual guarda o ID em hexadecimal; é recriada depois da conversão
+    if dialeto == 'sqlite':
+        for statement in SQLITE_DROP:
+            op.execute(statement)
+
+    for tabela, colunas in COLUNAS.items():
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            for coluna in colunas:
+                batch_op.alter_column(coluna, existing_type=sa.String(length=36), type_=UUIDType())
+        _converter_valores(tabela, colunas, _bytes)
+
+    if dialeto == 'sqlite':
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        op.execute(
+            "INSERT INTO equipamentos_fts (equipamento_id, codigo, nome, modelo, fabricante, numero_serie) "
+            "SELECT lower(hex(id)), codigo, nome, modelo, fabricante, numero_serie FROM equipamentos"
+        )
+
+
+def downgrade():
+    dialeto = op.get_bind().dialect.name
+
+    if dialeto == 'postgresql':
+        _alterar_postgresql(sa.String(length=36), '{coluna}::text')
+        return
+
+    # Recriar a busca textual com `flask rebuild-search-index` após o downgrade
+    if dialeto == 'sqlite':
+        for statement in SQLITE_DROP:
+            op.execute(statement)
+
+    for tabela, colunas in COLUNAS.items():
+        _converter_valores(tabela, colunas, _texto)
+        with op.batch_alter_table(tabela, schema=None) as batch_op:
+            for coluna in colunas:
+                batch_op.alter_column(coluna, existing_type=UUIDType(), type_=sa.String(length=36))
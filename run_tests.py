@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import unittest
+import shutil
 import sys
 import os
 
@@ -11,6 +12,15 @@ from tests.test_auth_api import TestAuthAPI
 from tests.test_equipamento_api import TestEquipamentoAPI
 from tests.test_manutencao_api import TestManutencaoAPI
 from tests.test_ordem_servico_api import TestOrdemServicoAPI
+from tests.test_relatorio_api import TestRelatorioAPI
+from tests.test_dashboard_api import TestDashboardAPI
+from tests.test_notificacao_api import TestNotificacaoAPI
+from tests.test_planos_consulta_api import TestPlanosConsultaAPI
+from tests.test_desempenho_api import TestDesempenhoAPI
+from tests.test_metricas_api import TestMetricasAPI
+from tests.test_carga_sintetica_api import TestCargaSinteticaAPI
+from tests.test_vencimento_certificados_api import TestVencimentoCertificadosAPI
+from app.config import DIRETORIO_TESTES
 
 if __name__ == '__main__':
     # Criar test suite com todos os testes
@@ -21,10 +31,21 @@ if __name__ == '__main__':
     test_suite.addTest(unittest.makeSuite(TestEquipamentoAPI))
     test_suite.addTest(unittest.makeSuite(TestManutencaoAPI))
     test_suite.addTest(unittest.makeSuite(TestOrdemServicoAPI))
+    test_suite.addTest(unittest.makeSuite(TestRelatorioAPI))
+    test_suite.addTest(unittest.makeSuite(TestDashboardAPI))
+    test_suite.addTest(unittest.makeSuite(TestNotificacaoAPI))
+    test_suite.addTest(unittest.makeSuite(TestPlanosConsultaAPI))
+    test_suite.addTest(unittest.makeSuite(TestDesempenhoAPI))
+    test_suite.addTest(unittest.makeSuite(TestMetricasAPI))
+    test_suite.addTest(unittest.makeSuite(TestCargaSinteticaAPI))
+    test_suite.addTest(unittest.makeSuite(TestVencimentoCertificadosAPI))
     
     # Executar testes
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(test_suite)
     
+    # Remover os arquivos locais gerados pelos testes
+    shutil.rmtree(DIRETORIO_TESTES, ignore_errors=True)
+    
     # Retornar código de saída adequado
     sys.exit(not result.wasSuccessful())
@@ -0,0 +1,6 @@
+import shutil
+from app.config import DIRETORIO_TESTES
+
+def pytest_sessionfinish(session, exitstatus):
+    """Remove os arquivos locais gerados pelos testes ao final da execução."""
+    shutil.rmtree(DIRETORIO_TESTES, ignore_errors=True)
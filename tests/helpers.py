@@ -0,0 +1,59 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import db
+
+@contextmanager
+def contar_queries():
+    """
+    Registra os comandos SQL executados dentro do bloco.
+
+    Yields:
+        list: Lista preenchida com os comandos SQL executados
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+@contextmanager
+def assert_num_queries(testcase, expected):
+    """
+    Verifica que o bloco executa exatamente o número esperado de comandos SQL.
+
+    Args:
+        testcase (unittest.TestCase): Caso de teste em execução
+        expected (int): Número esperado de comandos SQL
+    """
+    with contar_queries() as statements:
+        yield statements
+
+    testcase.assertEqual(
+        len(statements), expected,
+        f"Esperado {expected} queries, executadas {len(statements)}:\n" + "\n".join(statements)
+    )
+
+@contextmanager
+def capturar_consultas():
+    """
+    Registra os comandos SQL executados dentro do bloco, com os parâmetros.
+
+    Yields:
+        list: Lista preenchida com tuplas (comando SQL, parâmetros); execuções em lote são ignoradas
+    """
+    consultas = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            consultas.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield consultas
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
@@ -2,9 +2,13 @@ import unittest
 from app import create_app, db
 from app.models import Usuario
 from werkzeug.security import generate_password_hash, check_password_hash
+from tests.helpers import contar_queries
+from app.utils.last_access import get_last_access_buffer, get_last_access
+from app.utils.password_hashing import verify_password, _get_executor
+import os
 import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
 class TestAuthAPI(unittest.TestCase):
     """Testes para a API de Autenticação"""
@@ -164,5 +168,81 @@ class TestAuthAPI(unittest.TestCase):
         # Verificar resposta
         self.assertEqual(response.status_code, 200)
 
+    def test_login_limite_tentativas(self):
+        """Teste para o limite de tentativas de login por email"""
+        for _ in range(self.app.config['LOGIN_LIMITE_EMAIL']):
+            response = self.client.post('/api/auth/login', json={'email': 'teste@example.com', 'senha': 'senha_errada'})
+            self.assertEqual(response.status_code, 401)
+        
+        # Com o balde vazio a senha nem é verificada, mesmo que esteja correta
+        response = self.client.post('/api/auth/login', json={'email': 'TESTE@example.com', 'senha': 'senha123'})
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response.headers['Retry-After']), 1)
+    
+    def test_login_atualiza_hash_legado(self):
+        """Teste para a substituição de hashes com custo antigo no login"""
+        usuario = Usuario.query.get(self.usuario_id)
+        usuario.senha_hash = generate_password_hash('senha123', method='pbkdf2:sha256:1000')
+        db.session.commit()
+        
+        response = self.client.post('/api/auth/login', json={'email': 'teste@example.com', 'senha': 'senha123'})
+        self.assertEqual(response.status_code, 200)
+        
+        db.session.expire_all()
+        usuario = Usuario.query.get(self.usuario_id)
+        self.assertTrue(usuario.senha_hash.startswith(self.app.config['SENHA_HASH_METODO'] + '$'))
+        self.assertTrue(check_password_hash(usuario.senha_hash, 'senha123'))
+    
+    def test_login_fila_de_verificacao_cheia(self):
+        """Teste para a recusa imediata quando a fila de verificação de senhas está cheia"""
+        self.app.config['LOGIN_HASH_FILA'] = 0
+        
+        response = self.client.post('/api/auth/login', json={'email': 'teste@example.com', 'senha': 'senha123'})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
+    def test_verificacao_em_pool_de_processos(self):
+        """Teste para a verificação de senhas no pool de processos, iniciado sem fork do worker"""
+        self.app.config['LOGIN_HASH_PROCESSOS'] = 1
+        self.app.config['LOGIN_HASH_TIMEOUT'] = 30
+        senha_hash = generate_password_hash('senha123', method='pbkdf2:sha256:1000')
+        
+        valida, novo_hash = verify_password(senha_hash, 'senha123')
+        self.assertTrue(valida)
+        self.assertTrue(check_password_hash(novo_hash, 'senha123'))
+        self.assertEqual(verify_password(senha_hash, 'senha errada'), (False, None))
+        
+        executor, _ = _get_executor(1, self.app.config['LOGIN_HASH_FILA'])
+        self.assertIn(executor._mp_context.get_start_method(), ('forkserver', 'spawn'))
+        self.assertNotEqual(executor.submit(os.getpid).result(timeout=30), os.getpid())
+
+    def test_ultimo_acesso_gravado_em_lote(self):
+        """Teste para a gravação em lote do último acesso"""
+        with contar_queries() as statements:
+            response = self.client.post('/api/auth/login', json={'email': 'teste@example.com', 'senha': 'senha123'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([s for s in statements if s.lstrip().upper().startswith('UPDATE')])
+        
+        # Antes da gravação, o valor mais recente vem do buffer
+        usuario = Usuario.query.get(self.usuario_id)
+        self.assertIsNone(usuario.ultimo_acesso)
+        pendente = get_last_access(usuario)
+        self.assertIsNotNone(pendente)
+        
+        buffer = get_last_access_buffer()
+        buffer.record(self.usuario_id, pendente - timedelta(minutes=1))
+        self.assertEqual(buffer.flush(), 1)
+        
+        db.session.expire_all()
+        usuario = Usuario.query.get(self.usuario_id)
+        self.assertEqual(usuario.ultimo_acesso, pendente)
+        self.assertEqual(get_last_access(usuario), pendente)
+        
+        # Um horário mais antigo (ex.: de outro worker) não sobrescreve o gravado
+        buffer.record(self.usuario_id, pendente - timedelta(hours=1))
+        buffer.flush()
+        db.session.expire_all()
+        self.assertEqual(Usuario.query.get(self.usuario_id).ultimo_acesso, pendente)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from app import create_app, db
+from app.models import Equipamento, Manutencao, OrdemServico, Usuario, Departamento
+from app.utils.synthetic import EMAIL_ADMIN
+from sqlalchemy import func, text
+import json
+
+class TestCargaSinteticaAPI(unittest.TestCase):
+    """Testes para a geração da carga sintética (flask seed-synthetic)"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.runner = self.app.test_cli_runner()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _seed(self):
+        return self.runner.invoke(args=[
+            'seed-synthetic', '--equipamentos', '40', '--manutencoes', '300', '--ordens', '60', '--batch-size', '50'
+        ])
+
+    def test_gerar_carga(self):
+        """Teste para as quantidades e a consistência dos registros gerados"""
+        resultado = self._seed()
+        self.assertEqual(resultado.exit_code, 0, resultado.output)
+        self.assertIn(EMAIL_ADMIN, resultado.output)
+
+        self.assertEqual(Equipamento.query.count(), 40)
+        self.assertEqual(Manutencao.query.count(), 300)
+        self.assertEqual(OrdemServico.query.count(), 60)
+        self.assertGreaterEqual(Departamento.query.count(), 5)
+        self.assertEqual(db.session.execute(text('PRAGMA foreign_key_check')).fetchall(), [])
+
+        # Os códigos das ordens são sequenciais
+        self.assertEqual(db.session.query(func.max(OrdemServico.codigo)).scalar(), 'OS-000060')
+
+        # Uma segunda carga sobre a mesma base é recusada
+        resultado = self._seed()
+        self.assertNotEqual(resultado.exit_code, 0)
+        self.assertEqual(Equipamento.query.count(), 40)
+
+    def test_api_sobre_carga(self):
+        """Teste para o uso da API com os usuários e registros gerados"""
+        self.assertEqual(self._seed().exit_code, 0)
+
+        response = self.client.post('/api/auth/login', json={'email': EMAIL_ADMIN, 'senha': 'senha123'})
+        self.assertEqual(response.status_code, 200)
+        headers = {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+        response = self.client.get('/api/manutencoes?size=5', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['total'], 300)
+
+        # Novas ordens continuam a numeração reservada pela carga
+        solicitante = Usuario.query.filter_by(perfil='SOLICITANTE').first()
+        equipamento = Equipamento.query.first()
+        response = self.client.post('/api/ordens-servico', headers=headers, json={
+            'equipamento_id': equipamento.id,
+            'departamento_id': equipamento.departamento_id,
+            'solicitante_id': solicitante.id,
+            'tipo_servico': 'MANUTENCAO_CORRETIVA',
+            'descricao_problema': 'Equipamento não liga',
+            'prioridade': 'ALTA'
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(json.loads(response.data)['codigo'], 'OS-000061')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+from app import create_app, db
+from app.models import Equipamento, Departamento, Usuario
+from werkzeug.security import generate_password_hash
+import json
+import uuid
+from datetime import datetime
+
+class TestDashboardAPI(unittest.TestCase):
+    """Testes para a API de Dashboards"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        # Criar usuário de teste
+        usuario = Usuario(
+            id=str(uuid.uuid4()),
+            nome='Usuário Teste',
+            email='teste@example.com',
+            senha_hash=generate_password_hash('senha123'),
+            perfil='ADMIN',
+            ativo=True
+        )
+
+        # Criar departamento de teste
+        departamento_id = str(uuid.uuid4())
+        departamento = Departamento(
+            id=departamento_id,
+            nome='Departamento Teste',
+            descricao='Departamento para testes'
+        )
+
+        db.session.add(usuario)
+        db.session.add(departamento)
+        db.session.commit()
+
+        self.departamento_id = departamento_id
+
+        # Obter token de autenticação
+        response = self.client.post('/api/auth/login', json={
+            'email': 'teste@example.com',
+            'senha': 'senha123'
+        })
+        data = json.loads(response.data)
+        self.token = data['access_token']
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def get(self, url):
+        return self.client.get(url, headers={'Authorization': f'Bearer {self.token}'})
+
+    def test_cache_invalidado_apos_commit(self):
+        """Teste para o cache dos dashboards e sua invalidação pelas rotas de escrita"""
+        response = self.get('/api/dashboards/equipamentos-por-status')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response.data), {})
+
+        self.assertEqual(self.get('/api/dashboards/manutencoes-por-status').headers['X-Cache'], 'MISS')
+        self.assertEqual(self.get('/api/dashboards/equipamentos-por-status').headers['X-Cache'], 'HIT')
+
+        # Criar equipamento pela API
+        response = self.client.post(
+            '/api/equipamentos',
+            json={
+                'codigo': 'EQ-DASH',
+                'nome': 'Equipamento Dashboard',
+                'modelo': 'Modelo Teste',
+                'fabricante': 'Fabricante Teste',
+                'numero_serie': 'SN-DASH',
+                'data_aquisicao': datetime.now().date().isoformat(),
+                'departamento_id': self.departamento_id
+            },
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 201)
+
+        # Somente os dashboards que dependem de equipamentos são recalculados
+        response = self.get('/api/dashboards/equipamentos-por-status')
+        self.assertEqual(response.headers['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response.data), {'ATIVO': 1})
+        self.assertEqual(self.get('/api/dashboards/manutencoes-por-status').headers['X-Cache'], 'HIT')
+
+        # Estatísticas de acerto
+        response = self.get('/api/dashboards/cache')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertGreaterEqual(data['dashboards']['equipamentos-por-status']['acertos'], 1)
+        self.assertGreaterEqual(data['dashboards']['equipamentos-por-status']['falhas'], 2)
+
+    def test_visao_geral(self):
+        """Teste para o dashboard de visão geral"""
+        db.session.add(Equipamento(
+            id=str(uuid.uuid4()),
+            codigo='EQ-TEST',
+            nome='Equipamento Teste',
+            modelo='Modelo Teste',
+            fabricante='Fabricante Teste',
+            numero_serie='SN12345',
+            data_aquisicao=datetime.now().date(),
+            departamento_id=self.departamento_id,
+            status='EM_MANUTENCAO'
+        ))
+        db.session.commit()
+
+        response = self.get(f'/api/dashboards/visao-geral?departamento_id={self.departamento_id}')
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['equipamentos']['total'], 1)
+        self.assertEqual(data['equipamentos']['em_manutencao'], 1)
+        self.assertEqual(data['ordens_servico']['abertas'], 0)
+
+        response = self.get('/api/dashboards/custos-mensais?ano=2025')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)['meses']), 12)
+
+        # Ano fora do intervalo aceito por datetime
+        for ano in (0, 10000):
+            response = self.get(f'/api/dashboards/custos-mensais?ano={ano}')
+            self.assertEqual(response.status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
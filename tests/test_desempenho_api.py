@@ -0,0 +1,135 @@
+import unittest
+from app import create_app, db
+from app.models import Equipamento, Departamento, Usuario
+from werkzeug.security import generate_password_hash
+from tests.helpers import contar_queries
+from flask import g
+from sqlalchemy import text
+import json
+import re
+import uuid
+from datetime import datetime
+
+class TestDesempenhoAPI(unittest.TestCase):
+    """Testes para a instrumentação das requisições (Server-Timing, log e percentis por rota)"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        # Administrador e usuário comum
+        for email, perfil in [('admin@example.com', 'ADMIN'), ('tecnico@example.com', 'TECNICO')]:
+            db.session.add(Usuario(
+                id=str(uuid.uuid4()),
+                nome=f'Usuário {perfil}',
+                email=email,
+                senha_hash=generate_password_hash('senha123'),
+                perfil=perfil,
+                ativo=True
+            ))
+
+        departamento_id = str(uuid.uuid4())
+        db.session.add(Departamento(id=departamento_id, nome='Departamento Teste'))
+        for i in range(3):
+            db.session.add(Equipamento(
+                id=str(uuid.uuid4()),
+                codigo=f'EQ-{700+i}',
+                nome=f'Equipamento {700+i}',
+                modelo='Modelo',
+                fabricante='Fabricante',
+                numero_serie=f'SN{700+i}',
+                data_aquisicao=datetime.now().date(),
+                departamento_id=departamento_id,
+                status='ATIVO',
+                criticidade='MEDIA'
+            ))
+        db.session.commit()
+
+        self.headers = self._login('admin@example.com')
+        self.headers_tecnico = self._login('tecnico@example.com')
+        self.client.delete('/api/admin/desempenho', headers=self.headers)
+
+    def _login(self, email):
+        response = self.client.post('/api/auth/login', json={'email': email, 'senha': 'senha123'})
+        return {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _server_timing(self, response):
+        cabecalho = response.headers['Server-Timing']
+        self.assertRegex(cabecalho, r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ consultas, \d+ linhas", ser;dur=[\d.]+$')
+        return tuple(map(int, re.search(r'(\d+) consultas, (\d+) linhas', cabecalho).groups()))
+
+    def test_server_timing(self):
+        """Teste para o cabeçalho Server-Timing com tempo, comandos SQL e linhas lidas"""
+        with contar_queries() as statements:
+            response = self.client.get('/api/equipamentos?size=2', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        consultas, linhas = self._server_timing(response)
+        self.assertEqual(consultas, len(statements))
+        # Itens da página
+        self.assertEqual(linhas, 2)
+
+        equipamento = Equipamento.query.first()
+        response = self.client.get(f'/api/equipamentos/{equipamento.id}', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._server_timing(response)[1], 1)
+
+    def test_comando_com_erro(self):
+        """Teste para a medição de um comando SQL que falha"""
+        with self.app.test_request_context():
+            self.app.preprocess_request()
+            with self.assertRaises(Exception):
+                db.session.execute(text('SELECT * FROM tabela_inexistente'))
+            db.session.rollback()
+            db.session.execute(text('SELECT 1'))
+            metricas = g._metricas
+
+        self.assertEqual(metricas.sql_consultas, 2)
+        self.assertNotIn('_inicio_sql', db.session.connection().info)
+
+    def test_log_estruturado(self):
+        """Teste para a linha de log JSON de cada requisição"""
+        with self.assertLogs('app.desempenho', level='INFO') as logs:
+            self.client.get('/api/equipamentos/nao-existe', headers=self.headers)
+
+        registro = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(registro['metodo'], 'GET')
+        self.assertEqual(registro['rota'], '/api/equipamentos/<id>')
+        self.assertEqual(registro['caminho'], '/api/equipamentos/nao-existe')
+        self.assertEqual(registro['status'], 404)
+        self.assertEqual(registro['sql_consultas'], 1)
+        for campo in ('duracao_ms', 'sql_ms', 'linhas', 'serializacao_ms', 'worker'):
+            self.assertIn(campo, registro)
+
+    def test_percentis_por_rota(self):
+        """Teste para os percentis por rota no endpoint administrativo"""
+        for _ in range(5):
+            self.client.get('/api/equipamentos', headers=self.headers)
+        self.client.get('/api/equipamentos/por-status/ativo', headers=self.headers)
+
+        response = self.client.get('/api/admin/desempenho', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        rotas = json.loads(response.data)['rotas']
+
+        listagem = rotas['GET /api/equipamentos']
+        self.assertEqual(listagem['requisicoes'], 5)
+        self.assertEqual(listagem['erros'], 0)
+        self.assertLessEqual(listagem['duracao_ms']['p50'], listagem['duracao_ms']['p99'])
+        self.assertEqual(listagem['sql_consultas']['p50'], 3)
+        self.assertEqual(rotas['GET /api/equipamentos/por-status/<status>']['linhas']['p99'], 3)
+
+        # Restrito a administradores
+        response = self.client.get('/api/admin/desempenho', headers=self.headers_tecnico)
+        self.assertEqual(response.status_code, 403)
+
+if __name__ == '__main__':
+    unittest.main()
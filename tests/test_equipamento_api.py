@@ -2,7 +2,18 @@ import unittest
 from app import create_app, db
 from app.models import Equipamento, Departamento, Usuario
 from werkzeug.security import generate_password_hash
+from tests.helpers import assert_num_queries, contar_queries
+from app.utils.qrcode_jobs import (
+    QRCODE_PENDENTE, QRCODE_ERRO, enqueue_qrcode, wait_for_qrcode_jobs, regenerate_all_qrcodes, recover_stale_qrcodes
+)
+from app.utils.qrcode_cache import get_qrcode_cache
+from app.utils.helpers import generate_qrcode
+from sqlalchemy import update
+from unittest import mock
+import fcntl
+import os
 import json
+import tempfile
 import uuid
 from datetime import datetime, timedelta
 
@@ -57,6 +68,10 @@ class TestEquipamentoAPI(unittest.TestCase):
         db.drop_all()
         self.app_context.pop()
     
+    def _arquivo_qrcode(self, qr_code):
+        """Caminho em QRCODE_DIR da imagem referenciada por Equipamento.qr_code"""
+        return os.path.join(self.app.config['QRCODE_DIR'], os.path.basename(qr_code))
+    
     def test_criar_equipamento(self):
         """Teste para criação de equipamento"""
         # Dados do equipamento
@@ -226,6 +241,511 @@ class TestEquipamentoAPI(unittest.TestCase):
         self.assertIn('total', data)
         self.assertGreaterEqual(data['total'], 5)
         self.assertGreaterEqual(len(data['items']), 5)
+    
+    def test_listar_equipamentos_queries_constantes(self):
+        """Teste para garantir que a listagem não executa uma query por equipamento"""
+        # Criar equipamentos em departamentos distintos
+        for i in range(5):
+            departamento = Departamento(id=str(uuid.uuid4()), nome=f'Departamento {i}')
+            equipamento = Equipamento(
+                id=str(uuid.uuid4()),
+                codigo=f'EQ-{200+i}',
+                nome=f'Equipamento Teste {200+i}',
+                modelo=f'Modelo Teste {200+i}',
+                fabricante=f'Fabricante Teste {200+i}',
+                numero_serie=f'SN{200+i}',
+                data_aquisicao=datetime.now().date(),
+                departamento=departamento,
+                status='ATIVO',
+                criticidade='MEDIA'
+            )
+            db.session.add(equipamento)
+        db.session.commit()
+        db.session.remove()
+        
+        # Listagem paginada: uma query para a versão (ETag), uma para os itens e outra para o total
+        with assert_num_queries(self, 3):
+            response = self.client.get(
+                '/api/equipamentos?size=5',
+                headers={'Authorization': f'Bearer {self.token}'}
+            )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(len({item['departamento'] for item in data['items']}), 5)
+        
+        # Listagem por status: uma única query
+        with assert_num_queries(self, 1):
+            response = self.client.get(
+                '/api/equipamentos/por-status/ativo',
+                headers={'Authorization': f'Bearer {self.token}'}
+            )
+        self.assertEqual(response.status_code, 200)
+    
+    def test_equipamentos_por_status_ndjson(self):
+        """Teste para listagem em streaming (NDJSON) de equipamentos por status"""
+        # Criar equipamentos
+        for i in range(3):
+            equipamento = Equipamento(
+                id=str(uuid.uuid4()),
+                codigo=f'EQ-{400+i}',
+                nome=f'Equipamento Teste {400+i}',
+                modelo=f'Modelo Teste {400+i}',
+                fabricante=f'Fabricante Teste {400+i}',
+                numero_serie=f'SN{400+i}',
+                data_aquisicao=datetime.now().date(),
+                departamento_id=self.departamento_id,
+                status='ATIVO',
+                criticidade='MEDIA'
+            )
+            db.session.add(equipamento)
+        db.session.commit()
+        
+        # Streaming via parâmetro e via cabeçalho Accept
+        for url, headers in [
+            ('/api/equipamentos/por-status/ativo?stream=1', {}),
+            ('/api/equipamentos/por-status/ativo', {'Accept': 'application/x-ndjson'})
+        ]:
+            headers['Authorization'] = f'Bearer {self.token}'
+            response = self.client.get(url, headers=headers)
+            
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, 'application/x-ndjson')
+            linhas = [json.loads(linha) for linha in response.data.decode().splitlines()]
+            self.assertEqual(len(linhas), 3)
+            self.assertEqual({linha['departamento'] for linha in linhas}, {'Departamento Teste'})
+    
+    def test_buscar_equipamentos(self):
+        """Teste para busca indexada de equipamentos"""
+        # Criar equipamentos
+        dados = [
+            ('EQ-500', 'Ultrassom Portátil', 'US-3000', 'MedTech', 'SN500'),
+            ('EQ-501', 'Monitor Multiparamétrico', 'MM-10', 'Ultramed', 'SN501'),
+            ('EQ-502', 'Desfibrilador', 'DF-1', 'CardioTech', 'SN502')
+        ]
+        for codigo, nome, modelo, fabricante, numero_serie in dados:
+            equipamento = Equipamento(
+                id=str(uuid.uuid4()),
+                codigo=codigo,
+                nome=nome,
+                modelo=modelo,
+                fabricante=fabricante,
+                numero_serie=numero_serie,
+                data_aquisicao=datetime.now().date(),
+                departamento_id=self.departamento_id
+            )
+            db.session.add(equipamento)
+        db.session.commit()
+        
+        def buscar(termo):
+            response = self.client.get(
+                f'/api/equipamentos/busca?termo={termo}',
+                headers={'Authorization': f'Bearer {self.token}'}
+            )
+            self.assertEqual(response.status_code, 200)
+            return [item['codigo'] for item in json.loads(response.data)]
+        
+        # Busca por prefixo, com ranking priorizando o nome sobre o fabricante
+        self.assertEqual(buscar('ultra'), ['EQ-500', 'EQ-501'])
+        self.assertEqual(buscar('portatil'), ['EQ-500'])
+        self.assertEqual(buscar('EQ-502'), ['EQ-502'])
+        
+        # Índice atualizado na alteração e na exclusão
+        equipamento = Equipamento.query.filter_by(codigo='EQ-502').first()
+        equipamento.nome = 'Desfibrilador Ultra'
+        db.session.commit()
+        self.assertIn('EQ-502', buscar('ultra'))
+        
+        db.session.delete(equipamento)
+        db.session.commit()
+        self.assertEqual(buscar('desfibrilador'), [])
+    
+    def test_gerar_qrcode_em_segundo_plano(self):
+        """Teste para geração de QR Code fora da requisição"""
+        equipamento_data = {
+            'codigo': 'EQ-600',
+            'nome': 'Equipamento QR',
+            'modelo': 'Modelo QR',
+            'fabricante': 'Fabricante QR',
+            'numero_serie': 'SN600',
+            'data_aquisicao': datetime.now().date().isoformat(),
+            'departamento_id': self.departamento_id,
+            'gerar_qrcode': True
+        }
+        
+        # A criação retorna imediatamente com o QR Code pendente
+        response = self.client.post(
+            '/api/equipamentos',
+            json=equipamento_data,
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 201)
+        data = json.loads(response.data)
+        self.assertEqual(data['qr_code'], QRCODE_PENDENTE)
+        
+        # Após a conclusão da tarefa o caminho da imagem é gravado
+        wait_for_qrcode_jobs(timeout=30)
+        db.session.expire_all()
+        equipamento = Equipamento.query.get(data['id'])
+        self.assertTrue(equipamento.qr_code.startswith('/uploads/qrcodes/'))
+        
+        # Regeneração em lote com vários processos
+        gerados = regenerate_all_qrcodes(batch_size=1, processes=2)
+        self.assertEqual(gerados, 1)
+        db.session.expire_all()
+        equipamento = Equipamento.query.get(data['id'])
+        self.assertTrue(equipamento.qr_code.startswith('/uploads/qrcodes/'))
+        
+        # Remover imagem gerada
+        os.remove(self._arquivo_qrcode(equipamento.qr_code))
+    
+    def test_regenerar_qrcodes_restrito(self):
+        """Teste para a regeneração de todos os QR Codes: apenas ADMIN e uma execução por vez"""
+        db.session.add(Usuario(
+            id=str(uuid.uuid4()),
+            nome='Técnico',
+            email='tecnico@example.com',
+            senha_hash=generate_password_hash('senha123'),
+            perfil='TECNICO',
+            ativo=True
+        ))
+        db.session.commit()
+        response = self.client.post('/api/auth/login', json={'email': 'tecnico@example.com', 'senha': 'senha123'})
+        token_tecnico = json.loads(response.data)['access_token']
+        
+        response = self.client.post(
+            '/api/equipamentos/qrcodes/regenerar',
+            headers={'Authorization': f'Bearer {token_tecnico}'}
+        )
+        self.assertEqual(response.status_code, 403)
+        
+        # Trava obtida por outro processo (ex.: flask regenerate-qrcodes)
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        self.app.config['QRCODE_LOCK_PATH'] = os.path.join(diretorio.name, 'qrcodes.lock')
+        with open(self.app.config['QRCODE_LOCK_PATH'], 'a') as trava:
+            fcntl.flock(trava, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            response = self.client.post(
+                '/api/equipamentos/qrcodes/regenerar',
+                headers={'Authorization': f'Bearer {self.token}'}
+            )
+            self.assertEqual(response.status_code, 409)
+        
+        response = self.client.post(
+            '/api/equipamentos/qrcodes/regenerar',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 202)
+        wait_for_qrcode_jobs(timeout=30)
+    
+    def test_falha_e_recuperacao_qrcode(self):
+        """Teste para a falha na geração do QR Code e a recuperação dos pendentes"""
+        equipamentos = {}
+        for codigo, qr_code in [('EQ-610', '/uploads/qrcodes/anterior.png'), ('EQ-611', QRCODE_PENDENTE),
+                                ('EQ-612', QRCODE_PENDENTE)]:
+            equipamento = Equipamento(
+                id=str(uuid.uuid4()),
+                codigo=codigo,
+                nome=f'Equipamento {codigo}',
+                modelo='Modelo',
+                fabricante='Fabricante',
+                numero_serie=f'SN{codigo}',
+                data_aquisicao=datetime.now().date(),
+                departamento_id=self.departamento_id,
+                qr_code=qr_code
+            )
+            db.session.add(equipamento)
+            equipamentos[codigo] = equipamento.id
+        db.session.commit()
+        
+        # Falha: o caminho anterior é mantido e o pendente passa a ERRO
+        with mock.patch('app.utils.qrcode_jobs.generate_qrcode', side_effect=OSError('disco cheio')):
+            enqueue_qrcode(equipamentos['EQ-610'], 'EQ-610')
+            enqueue_qrcode(equipamentos['EQ-611'], 'EQ-611')
+            wait_for_qrcode_jobs(timeout=30)
+        db.session.expire_all()
+        self.assertEqual(Equipamento.query.get(equipamentos['EQ-610']).qr_code, '/uploads/qrcodes/anterior.png')
+        self.assertEqual(Equipamento.query.get(equipamentos['EQ-611']).qr_code, QRCODE_ERRO)
+        
+        # EQ-612 ficou pendente (worker encerrado antes da geração)
+        self.assertEqual(recover_stale_qrcodes(processes=1), {'equipamentos': 1, 'gerados': 1})
+        db.session.execute(
+            update(Equipamento).where(Equipamento.id == equipamentos['EQ-612'])
+            .values(atualizado_em=datetime.utcnow() - timedelta(hours=1))
+        )
+        db.session.commit()
+        self.assertEqual(recover_stale_qrcodes(processes=1), {'equipamentos': 1, 'gerados': 1})
+        
+        db.session.expire_all()
+        for codigo in ('EQ-611', 'EQ-612'):
+            qr_code = Equipamento.query.get(equipamentos[codigo]).qr_code
+            self.assertTrue(qr_code.startswith('/uploads/qrcodes/'))
+            os.remove(self._arquivo_qrcode(qr_code))
+    
+    def test_importar_equipamentos_em_lote(self):
+        """Teste para importação de equipamentos em lote (CSV e NDJSON)"""
+        hoje = datetime.now().date().isoformat()
+        csv_data = (
+            'codigo,nome,modelo,fabricante,numero_serie,data_aquisicao,departamento_id,criticidade\n'
+            f'EQ-700,Monitor A,M1,Fab,SN700,{hoje},{self.departamento_id},ALTA\n'
+            f'EQ-700,Monitor B,M1,Fab,SN701,{hoje},{self.departamento_id},\n'
+            f'EQ-702,Monitor C,M1,Fab,SN702,{hoje},{uuid.uuid4()},\n'
+            f'EQ-703,Monitor D,M1,Fab,SN703,ontem,{self.departamento_id},\n'
+            f'EQ-704,,M1,Fab,SN704,{hoje},{self.departamento_id},\n'
+        )
+        
+        response = self.client.post(
+            '/api/equipamentos/bulk',
+            data=csv_data,
+            content_type='text/csv',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['total'], 5)
+        self.assertEqual(data['importados'], 1)
+        self.assertEqual([erro['linha'] for erro in data['erros']], [3, 4, 5, 6])
+        self.assertIn('código', data['erros'][0]['error'])
+        self.assertEqual(data['erros'][1]['error'], 'Departamento não encontrado')
+        self.assertEqual(Equipamento.query.filter_by(codigo='EQ-700').one().criticidade, 'ALTA')
+        
+        # NDJSON, com QR Codes gerados em segundo plano; o ID do departamento em maiúsculas
+        # é aceito e campos com tipo inválido são reportados na linha
+        registros = [{
+            'codigo': f'EQ-8{i:02d}',
+            'nome': f'Bomba {i}',
+            'modelo': 'B1',
+            'fabricante': 'Fab',
+            'numero_serie': 'SN700' if i == 2 else f'SN8{i:02d}',
+            'data_aquisicao': hoje,
+            'departamento_id': self.departamento_id.upper() if i == 1 else self.departamento_id
+        } for i in range(5)]
+        registros[3]['codigo'] = ['EQ-803']
+        registros[4]['numero_serie'] = {'numero': 804}
+        ndjson_data = '\n'.join(json.dumps(registro) for registro in registros)
+        
+        response = self.client.post(
+            '/api/equipamentos/bulk?gerar_qrcode=true&lote=2',
+            data=ndjson_data,
+            content_type='application/x-ndjson',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['importados'], 2)
+        self.assertEqual([erro['linha'] for erro in data['erros']], [3, 4, 5])
+        self.assertIn('número de série', data['erros'][0]['error'])
+        self.assertEqual(data['erros'][1]['error'], "Campo 'codigo' deve ser texto")
+        self.assertEqual(data['erros'][2]['error'], "Campo 'numero_serie' deve ser texto")
+        self.assertEqual(
+            Equipamento.query.filter_by(codigo='EQ-801').one().departamento_id, self.departamento_id
+        )
+        
+        wait_for_qrcode_jobs(timeout=30)
+        db.session.expire_all()
+        for item in data['equipamentos']:
+            equipamento = Equipamento.query.get(item['id'])
+            self.assertTrue(equipamento.qr_code.startswith('/uploads/qrcodes/'))
+            os.remove(self._arquivo_qrcode(equipamento.qr_code))
+        
+        # Formato não suportado
+        response = self.client.post(
+            '/api/equipamentos/bulk',
+            data='{}',
+            content_type='application/json',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 415)
+    
+    def test_obter_qrcode_sob_demanda(self):
+        """Teste para renderização sob demanda e cache de QR Codes"""
+        equipamento_id = str(uuid.uuid4())
+        equipamento = Equipamento(
+            id=equipamento_id,
+            codigo='EQ-700',
+            nome='Equipamento QR',
+            modelo='Modelo QR',
+            fabricante='Fabricante QR',
+            numero_serie='SN700',
+            data_aquisicao=datetime.now().date(),
+            departamento_id=self.departamento_id
+        )
+        db.session.add(equipamento)
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {self.token}'}
+        
+        # Regenerações reutilizam o mesmo arquivo
+        self.assertEqual(generate_qrcode(equipamento_id, 'EQ-700'), generate_qrcode(equipamento_id, 'EQ-700'))
+        
+        cache = get_qrcode_cache(self.app.config)
+        for formato, mimetype in [('svg', 'image/svg+xml'), ('png', 'image/png')]:
+            misses = cache.misses
+            response = self.client.get(f'/api/equipamentos/{equipamento_id}/qrcode?formato={formato}&tamanho=5', headers=headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, mimetype)
+            etag = response.headers['ETag'].strip('"')
+            
+            # Segundo acesso servido pelo cache, sem nova renderização
+            response = self.client.get(f'/api/equipamentos/{equipamento_id}/qrcode?formato={formato}&tamanho=5', headers=headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(cache.misses, misses + 1)
+            
+            response = self.client.get(
+                f'/api/equipamentos/{equipamento_id}/qrcode?formato={formato}&tamanho=5',
+                headers={**headers, 'If-None-Match': f'"{etag}"'}
+            )
+            self.assertEqual(response.status_code, 304)
+            
+            arquivo = os.path.join(self.app.config['QRCODE_CACHE_DIR'], f'{etag}.{formato}')
+            if os.path.exists(arquivo):
+                os.remove(arquivo)
+        os.remove(self._arquivo_qrcode(generate_qrcode(equipamento_id, 'EQ-700')))
+        
+        response = self.client.get(f'/api/equipamentos/{equipamento_id}/qrcode?formato=gif', headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_ids_uuid_compactos(self):
+        """Teste para IDs UUID versão 7, em ordem de criação e armazenados em 16 bytes"""
+        headers = {'Authorization': f'Bearer {self.token}'}
+        ids = []
+        for i in range(3):
+            response = self.client.post('/api/equipamentos', json={
+                'codigo': f'EQ-80{i}',
+                'nome': f'Equipamento {i}',
+                'modelo': 'Modelo',
+                'fabricante': 'Fabricante',
+                'numero_serie': f'SN80{i}',
+                'data_aquisicao': datetime.now().date().isoformat(),
+                'departamento_id': self.departamento_id
+            }, headers=headers)
+            self.assertEqual(response.status_code, 201)
+            ids.append(json.loads(response.data)['id'])
+
+        self.assertEqual([uuid.UUID(id).version for id in ids], [7, 7, 7])
+        self.assertEqual(ids, sorted(ids))
+
+        # No SQLite a chave é gravada como BLOB de 16 bytes, inclusive nas chaves estrangeiras
+        tamanhos = db.session.execute(db.text(
+            "SELECT DISTINCT length(id), length(departamento_id) FROM equipamentos"
+        )).all()
+        self.assertEqual(tamanhos, [(16, 16)])
+
+        response = self.client.get(f'/api/equipamentos/{ids[0]}', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['id'], ids[0])
+
+        # IDs que não são UUID não correspondem a nenhum registro
+        response = self.client.get('/api/equipamentos/nao-e-um-uuid', headers=headers)
+        self.assertEqual(response.status_code, 404)
+    
+    def test_campos_esparsos(self):
+        """Teste para o parâmetro fields (apenas as colunas e junções dos campos pedidos)"""
+        headers = {'Authorization': f'Bearer {self.token}'}
+        equipamento_id = str(uuid.uuid4())
+        db.session.add(Equipamento(
+            id=equipamento_id,
+            codigo='EQ-800',
+            nome='Equipamento Esparso',
+            modelo='Modelo',
+            fabricante='Fabricante',
+            numero_serie='SN80000',
+            data_aquisicao=datetime.now().date(),
+            departamento_id=self.departamento_id,
+            status='ATIVO',
+            criticidade='ALTA',
+            especificacoes_tecnicas={'tensao': '220V', 'potencia': '1500W'},
+            imagens_url=['https://exemplo.com/eq-800.png']
+        ))
+        db.session.commit()
+        db.session.remove()
+        
+        # Detalhe: só as colunas pedidas, sem os campos JSON e sem junção com departamentos
+        with contar_queries() as statements:
+            response = self.client.get(f'/api/equipamentos/{equipamento_id}?fields=status,codigo', headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), {'codigo': 'EQ-800', 'status': 'ATIVO'})
+        consulta = statements[-1]
+        self.assertNotIn('especificacoes_tecnicas', consulta)
+        self.assertNotIn('imagens_url', consulta)
+        self.assertNotIn('departamentos', consulta)
+        
+        # Relacionamento pedido: junção apenas com a tabela necessária
+        with contar_queries() as statements:
+            response = self.client.get(f'/api/equipamentos/{equipamento_id}?fields=departamento_nome', headers=headers)
+        self.assertEqual(json.loads(response.data), {'departamento_nome': 'Departamento Teste'})
+        self.assertIn('departamentos', statements[-1])
+        
+        response = self.client.get(f'/api/equipamentos/{equipamento_id}', headers=headers)
+        data = json.loads(response.data)
+        self.assertEqual(data['especificacoes_tecnicas'], {'tensao': '220V', 'potencia': '1500W'})
+        self.assertIn('departamento_nome', data)
+        
+        # Listagem
+        with contar_queries() as statements:
+            response = self.client.get('/api/equipamentos?fields=id,codigo', headers=headers)
+        self.assertEqual(json.loads(response.data)['items'], [{'id': equipamento_id, 'codigo': 'EQ-800'}])
+        self.assertFalse(any('departamentos' in statement for statement in statements))
+        
+        response = self.client.get('/api/equipamentos?cursor=&fields=codigo', headers=headers)
+        self.assertEqual(json.loads(response.data)['items'], [{'codigo': 'EQ-800'}])
+        
+        # Campo inexistente
+        response = self.client.get(f'/api/equipamentos/{equipamento_id}?fields=status,senha', headers=headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('senha', json.loads(response.data)['error'])
+    
+    def test_get_condicional(self):
+        """Teste para GET condicional (ETag / Last-Modified) de equipamento e da listagem"""
+        headers = {'Authorization': f'Bearer {self.token}'}
+        response = self.client.post('/api/equipamentos', headers=headers, json={
+            'codigo': 'EQ-900',
+            'nome': 'Equipamento Condicional',
+            'modelo': 'Modelo Teste',
+            'fabricante': 'Fabricante Teste',
+            'numero_serie': 'SN90000',
+            'data_aquisicao': datetime.now().date().isoformat(),
+            'departamento_id': self.departamento_id,
+            'status': 'ATIVO',
+            'criticidade': 'MEDIA'
+        })
+        equipamento_id = json.loads(response.data)['id']
+        url = f'/api/equipamentos/{equipamento_id}'
+        
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        last_modified = response.headers['Last-Modified']
+        self.assertIn('no-cache', response.headers['Cache-Control'])
+        
+        # Versão igual: 304 sem corpo, com uma única consulta ao atualizado_em
+        with assert_num_queries(self, 1):
+            response = self.client.get(url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+        
+        response = self.client.get(url, headers={**headers, 'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+        
+        # Após a atualização a ETag muda
+        self.client.put(url, headers=headers, json={'nome': 'Equipamento Alterado'})
+        response = self.client.get(url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        
+        # Listagem: 304 enquanto nada muda; inclusão e exclusão geram nova ETag
+        response = self.client.get('/api/equipamentos', headers=headers)
+        etag_lista = response.headers['ETag']
+        response = self.client.get('/api/equipamentos', headers={**headers, 'If-None-Match': etag_lista})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get('/api/equipamentos?size=5', headers={**headers, 'If-None-Match': etag_lista})
+        self.assertEqual(response.status_code, 200)
+        
+        self.client.delete(url, headers=headers)
+        response = self.client.get('/api/equipamentos', headers={**headers, 'If-None-Match': etag_lista})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag_lista)
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,10 +1,16 @@
 import unittest
 from app import create_app, db
-from app.models import Manutencao, Equipamento, Departamento, Usuario, Tecnico
+from app.models import Manutencao, Equipamento, Departamento, Usuario, Tecnico, TecnicoExterno, EmpresaExterna, ResumoManutencao, ProgramaManutencao
+from app.utils.helpers import calculate_next_maintenance_date
+from app.utils.preventive import schedule_preventive_maintenance
+from app.utils.loading import with_loading
+from app.utils.serializers import get_serializer
 from werkzeug.security import generate_password_hash
+from tests.helpers import assert_num_queries, contar_queries
 import json
 import uuid
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from decimal import Decimal
 
 class TestManutencaoAPI(unittest.TestCase):
     """Testes para a API de Manutenções"""
@@ -148,6 +154,46 @@ class TestManutencaoAPI(unittest.TestCase):
         self.assertEqual(data['tipo_manutencao'], 'CORRETIVA')
         self.assertEqual(data['prioridade'], 'ALTA')
     
+    def test_get_condicional(self):
+        """Teste para GET condicional (ETag / Last-Modified) de manutenção"""
+        manutencao_id = str(uuid.uuid4())
+        db.session.add(Manutencao(
+            id=manutencao_id,
+            equipamento_id=self.equipamento_id,
+            tipo_manutencao='CORRETIVA',
+            status='AGENDADA',
+            prioridade='ALTA',
+            descricao='Manutenção corretiva urgente',
+            data_agendamento=datetime.now() + timedelta(days=1),
+            tecnico_id=self.tecnico_id
+        ))
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {self.token}'}
+        url = f'/api/manutencoes/{manutencao_id}'
+        
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        last_modified = response.headers['Last-Modified']
+        
+        # Versão igual: 304 sem corpo, com uma única consulta ao atualizado_em
+        with assert_num_queries(self, 1):
+            response = self.client.get(url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+        
+        response = self.client.get(url, headers={**headers, 'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+        
+        # Após a atualização a ETag muda
+        response = self.client.put(url, headers=headers, json={'observacoes': 'Peça substituída'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(json.loads(response.data)['observacoes'], 'Peça substituída')
+    
     def test_atualizar_manutencao(self):
         """Teste para atualização de manutenção"""
         # Criar manutenção
@@ -289,6 +335,295 @@ class TestManutencaoAPI(unittest.TestCase):
         data = json.loads(response.data)
         self.assertIsInstance(data, list)
         self.assertEqual(len(data), 3)
+    
+    def test_manutencoes_ndjson(self):
+        """Teste para listagens de manutenções em streaming (NDJSON)"""
+        for i in range(3):
+            db.session.add(Manutencao(
+                id=str(uuid.uuid4()),
+                equipamento_id=self.equipamento_id,
+                tipo_manutencao='PREVENTIVA',
+                status='AGENDADA',
+                prioridade='NORMAL',
+                descricao=f'Manutenção de teste {i+1}',
+                data_agendamento=datetime.now() + timedelta(days=i+1),
+                tecnico_id=self.tecnico_id
+            ))
+        db.session.commit()
+        
+        inicio = datetime.now().isoformat()
+        fim = (datetime.now() + timedelta(days=5)).isoformat()
+        for url in [
+            f'/api/manutencoes/por-equipamento/{self.equipamento_id}',
+            f'/api/manutencoes/por-tecnico/{self.tecnico_id}',
+            f'/api/manutencoes/por-periodo?inicio={inicio}&fim={fim}'
+        ]:
+            headers = {'Authorization': f'Bearer {self.token}'}
+            esperado = sorted(json.loads(self.client.get(url, headers=headers).data), key=lambda m: m['id'])
+            self.assertEqual(len(esperado), 3)
+            
+            # Streaming via parâmetro e via cabeçalho Accept, com os mesmos registros da resposta JSON
+            separador = '&' if '?' in url else '?'
+            for url_stream, headers_stream in [
+                (f'{url}{separador}stream=1', headers),
+                (url, {**headers, 'Accept': 'application/x-ndjson'})
+            ]:
+                response = self.client.get(url_stream, headers=headers_stream)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.mimetype, 'application/x-ndjson')
+                linhas = [json.loads(linha) for linha in response.data.decode().splitlines()]
+                self.assertEqual(sorted(linhas, key=lambda m: m['id']), esperado)
+    
+    def test_serializacao_compilada(self):
+        """Teste para os serializadores compilados (objetos do ORM e tuplas) e a resposta em orjson"""
+        empresa = EmpresaExterna(id=str(uuid.uuid4()), razao_social='Empresa Teste', cnpj='00.000.000/0001-00')
+        externo = TecnicoExterno(id=str(uuid.uuid4()), nome='Técnico Externo', empresa=empresa)
+        db.session.add_all([
+            Manutencao(
+                id=str(uuid.uuid4()), equipamento_id=self.equipamento_id, tipo_manutencao='CORRETIVA',
+                status='CONCLUIDA', prioridade='ALTA', descricao='Interno', tecnico_id=self.tecnico_id,
+                data_agendamento=datetime(2024, 3, 1, 8, 30), data_inicio=datetime(2024, 3, 1, 9, 0, 0, 500),
+                custo_total=Decimal('1250.75')
+            ),
+            Manutencao(
+                id=str(uuid.uuid4()), equipamento_id=self.equipamento_id, tipo_manutencao='PREVENTIVA',
+                status='AGENDADA', prioridade='NORMAL', descricao='Externo', tecnico_externo=externo,
+                data_agendamento=datetime(2024, 3, 2), custo_total=None
+            )
+        ])
+        db.session.commit()
+        
+        response = self.client.get(
+            f'/api/manutencoes/por-equipamento/{self.equipamento_id}',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertIn('Técnico Externo'.encode(), response.data)
+        data = {item['tipo_manutencao']: item for item in json.loads(response.data)}
+        
+        # Mesmos valores das conversões feitas à mão: ISO 8601, float e técnico interno ou externo
+        self.assertEqual(data['CORRETIVA']['data_agendamento'], '2024-03-01T08:30:00')
+        self.assertEqual(data['CORRETIVA']['data_inicio'], '2024-03-01T09:00:00.000500')
+        self.assertIsNone(data['CORRETIVA']['data_fim'])
+        self.assertEqual(data['CORRETIVA']['custo_total'], 1250.75)
+        self.assertEqual(data['CORRETIVA']['tecnico'], 'Técnico Teste')
+        self.assertEqual(data['PREVENTIVA']['custo_total'], 0)
+        self.assertEqual(data['PREVENTIVA']['tecnico'], 'Técnico Externo')
+        
+        # Objetos do ORM e tuplas da consulta Core geram o mesmo resultado
+        serializer = get_serializer('manutencoes.por_equipamento')
+        ordem = Manutencao.data_agendamento
+        self.assertEqual(
+            [serializer(m) for m in with_loading(Manutencao.query, serializer).order_by(ordem).all()],
+            serializer.rows(serializer.query().order_by(ordem).all())
+        )
+    
+    def test_atualizar_status_em_lote(self):
+        """Teste para atualização de status de várias manutenções em uma transação"""
+        data_agendamento = datetime.now().replace(day=1, hour=8)
+        ids = []
+        for i in range(10):
+            manutencao = Manutencao(
+                id=str(uuid.uuid4()),
+                equipamento_id=self.equipamento_id,
+                tipo_manutencao='PREVENTIVA',
+                status='AGENDADA',
+                prioridade='NORMAL',
+                descricao=f'Manutenção {i}',
+                data_agendamento=data_agendamento,
+                tecnico_id=self.tecnico_id
+            )
+            db.session.add(manutencao)
+            ids.append(manutencao.id)
+        db.session.commit()
+        
+        inexistente = str(uuid.uuid4())
+        response = self.client.put(
+            '/api/manutencoes/status',
+            json={'ids': ids[:-1] + [ids[-1].upper(), inexistente], 'status': 'EM_ANDAMENTO'},
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['atualizadas'], 10)
+        self.assertEqual(data['resultados'][-1], {'id': inexistente, 'sucesso': False, 'error': 'Manutenção não encontrada'})
+        
+        db.session.expire_all()
+        self.assertEqual(Equipamento.query.get(self.equipamento_id).status, 'EM_MANUTENCAO')
+        
+        # A quantidade de comandos SQL não depende da quantidade de manutenções
+        db.session.remove()
+        with contar_queries() as statements:
+            response = self.client.put(
+                '/api/manutencoes/status',
+                json={'ids': ids, 'status': 'CONCLUIDA'},
+                headers={'Authorization': f'Bearer {self.token}'}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(statements), 8)
+        
+        manutencoes = Manutencao.query.filter(Manutencao.id.in_(ids)).all()
+        self.assertTrue(all(m.status == 'CONCLUIDA' and m.data_inicio and m.data_fim for m in manutencoes))
+        self.assertTrue(all(m.tempo_parada is not None for m in manutencoes))
+        
+        equipamento = Equipamento.query.get(self.equipamento_id)
+        self.assertEqual(equipamento.status, 'ATIVO')
+        self.assertIsNotNone(equipamento.ultima_manutencao)
+        
+        # Resumos dos relatórios atualizados
+        resumo = ResumoManutencao.query.filter_by(equipamento_id=self.equipamento_id).one()
+        self.assertEqual((resumo.status, resumo.quantidade), ('CONCLUIDA', 10))
+        
+        # Status inválido
+        response = self.client.put(
+            '/api/manutencoes/status',
+            json={'ids': ids, 'status': 'FINALIZADA'},
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 400)
+    
+    def test_calculo_proxima_manutencao_por_mes_de_calendario(self):
+        """Teste para o cálculo de datas com meses de calendário"""
+        self.assertEqual(calculate_next_maintenance_date(date(2025, 1, 31), 'MENSAL'), date(2025, 2, 28))
+        self.assertEqual(calculate_next_maintenance_date(date(2024, 1, 31), 'MENSAL'), date(2024, 2, 29))
+        self.assertEqual(calculate_next_maintenance_date(date(2025, 1, 31), 'MENSAL', 3), date(2025, 4, 30))
+        self.assertEqual(calculate_next_maintenance_date(date(2025, 11, 15), 'TRIMESTRAL'), date(2026, 2, 15))
+        self.assertEqual(calculate_next_maintenance_date(date(2024, 2, 29), 'ANUAL'), date(2025, 2, 28))
+        self.assertEqual(calculate_next_maintenance_date(date(2025, 1, 1), 'QUINZENAL'), date(2025, 1, 15))
+        self.assertIsNone(calculate_next_maintenance_date(date(2025, 1, 1), 'DESCONHECIDA'))
+    
+    def test_agendar_manutencoes_preventivas(self):
+        """Teste para a geração idempotente de manutenções preventivas"""
+        equipamento = Equipamento.query.get(self.equipamento_id)
+        equipamento.ultima_manutencao = date(2025, 1, 31)
+        programa = ProgramaManutencao(
+            id=str(uuid.uuid4()),
+            nome='Preventiva mensal',
+            equipamento_id=self.equipamento_id,
+            frequencia='MENSAL',
+            ativo=True
+        )
+        inativo = ProgramaManutencao(
+            id=str(uuid.uuid4()),
+            nome='Programa inativo',
+            equipamento_id=self.equipamento_id,
+            frequencia='SEMANAL',
+            ativo=False
+        )
+        db.session.add_all([programa, inativo])
+        db.session.commit()
+        
+        resultado = schedule_preventive_maintenance(hoje=date(2025, 2, 10), horizonte_dias=90)
+        self.assertEqual(resultado, {'programas': 1, 'manutencoes_geradas': 3})
+        
+        datas = [m.data_agendamento.date() for m in Manutencao.query.order_by(Manutencao.data_agendamento)]
+        self.assertEqual(datas, [date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)])
+        self.assertTrue(all(m.status == 'AGENDADA' and m.programa_id == programa.id for m in Manutencao.query))
+        
+        db.session.expire_all()
+        self.assertEqual(Equipamento.query.get(self.equipamento_id).proxima_manutencao_planejada, date(2025, 2, 28))
+        self.assertEqual(ResumoManutencao.query.filter_by(status='AGENDADA').count(), 3)
+        
+        # Nova execução no mesmo dia não gera registros repetidos
+        resultado = schedule_preventive_maintenance(hoje=date(2025, 2, 10), horizonte_dias=90)
+        self.assertEqual(resultado['manutencoes_geradas'], 0)
+        
+        # Avançar o horizonte gera apenas a data seguinte
+        resultado = schedule_preventive_maintenance(hoje=date(2025, 3, 10), horizonte_dias=90)
+        self.assertEqual(resultado['manutencoes_geradas'], 1)
+        self.assertEqual(Manutencao.query.count(), 4)
+    
+    def test_listar_manutencoes_queries_constantes(self):
+        """Teste para garantir que a listagem não executa uma query por manutenção"""
+        # Criar manutenções com técnicos distintos
+        for i in range(5):
+            tecnico = Tecnico(id=str(uuid.uuid4()), nome=f'Técnico {i}', email=f'tecnico{i}@example.com')
+            manutencao = Manutencao(
+                id=str(uuid.uuid4()),
+                equipamento_id=self.equipamento_id,
+                tipo_manutencao='PREVENTIVA',
+                status='AGENDADA',
+                prioridade='NORMAL',
+                descricao=f'Manutenção {i}',
+                data_agendamento=datetime.now() + timedelta(days=i),
+                tecnico=tecnico
+            )
+            db.session.add(manutencao)
+        db.session.commit()
+        db.session.remove()
+        
+        # Listagem paginada: uma query para a versão (ETag), uma para os itens e outra para o total
+        with assert_num_queries(self, 3):
+            response = self.client.get(
+                '/api/manutencoes?size=5',
+                headers={'Authorization': f'Bearer {self.token}'}
+            )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(len({item['tecnico'] for item in data['items']}), 5)
+        
+        # Listagem por período: uma única query
+        with assert_num_queries(self, 1):
+            response = self.client.get(
+                f'/api/manutencoes/por-periodo?inicio={(datetime.now() - timedelta(days=1)).isoformat()}'
+                f'&fim={(datetime.now() + timedelta(days=10)).isoformat()}',
+                headers={'Authorization': f'Bearer {self.token}'}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)), 5)
+    
+    def test_listar_manutencoes_por_cursor(self):
+        """Teste para paginação por cursor de manutenções"""
+        # Criar manutenções
+        ids = set()
+        for i in range(5):
+            manutencao_id = str(uuid.uuid4())
+            manutencao = Manutencao(
+                id=manutencao_id,
+                equipamento_id=self.equipamento_id,
+                tipo_manutencao='PREVENTIVA',
+                descricao=f'Manutenção {i}',
+                data_agendamento=datetime.now(),
+                criado_em=datetime(2025, 1, 1) + timedelta(minutes=i // 2)
+            )
+            db.session.add(manutencao)
+            ids.add(manutencao_id)
+        db.session.commit()
+        
+        # Percorrer todas as páginas
+        recebidos = []
+        cursor = ''
+        paginas = 0
+        while cursor is not None:
+            response = self.client.get(
+                f'/api/manutencoes?size=2&cursor={cursor}',
+                headers={'Authorization': f'Bearer {self.token}'}
+            )
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.data)
+            self.assertNotIn('total', data)
+            recebidos.extend(item['id'] for item in data['items'])
+            cursor = data['next_cursor']
+            paginas += 1
+        
+        self.assertEqual(paginas, 3)
+        self.assertEqual(len(recebidos), 5)
+        self.assertEqual(set(recebidos), ids)
+        
+        # Total apenas quando solicitado
+        response = self.client.get(
+            '/api/manutencoes?size=2&cursor=&incluir_total=true',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(json.loads(response.data)['total'], 5)
+        
+        # Cursor inválido
+        response = self.client.get(
+            '/api/manutencoes?cursor=invalido',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 400)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,165 @@
+import unittest
+from app import create_app, db
+from app.models import Equipamento, Departamento, Usuario, OrdemServico
+from werkzeug.security import generate_password_hash
+from prometheus_client import CollectorRegistry, multiprocess
+from prometheus_client.parser import text_string_to_metric_families
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+
+def valor_metrica(texto, nome, **rotulos):
+    """Retorna o valor da amostra com o nome e os rótulos informados (0 se ausente)."""
+    for familia in text_string_to_metric_families(texto):
+        for amostra in familia.samples:
+            if amostra.name == nome and all(amostra.labels.get(k) == v for k, v in rotulos.items()):
+                return amostra.value
+    return 0
+
+class TestMetricasAPI(unittest.TestCase):
+    """Testes para o endpoint de métricas no formato do Prometheus"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        usuario_id = str(uuid.uuid4())
+        db.session.add(Usuario(
+            id=usuario_id,
+            nome='Usuário Teste',
+            email='teste@example.com',
+            senha_hash=generate_password_hash('senha123'),
+            perfil='ADMIN',
+            ativo=True
+        ))
+
+        departamento_id = str(uuid.uuid4())
+        equipamento_id = str(uuid.uuid4())
+        db.session.add(Departamento(id=departamento_id, nome='Departamento Teste'))
+        db.session.add(Equipamento(
+            id=equipamento_id,
+            codigo='EQ-800',
+            nome='Equipamento 800',
+            modelo='Modelo',
+            fabricante='Fabricante',
+            numero_serie='SN800',
+            data_aquisicao=datetime.now().date(),
+            departamento_id=departamento_id,
+            status='ATIVO',
+            criticidade='MEDIA'
+        ))
+
+        # Duas ordens abertas de prioridade ALTA e uma concluída
+        for i, status in enumerate(['ABERTA', 'EM_ANDAMENTO', 'CONCLUIDA']):
+            db.session.add(OrdemServico(
+                id=str(uuid.uuid4()),
+                codigo=f'OS-80{i}',
+                equipamento_id=equipamento_id,
+                departamento_id=departamento_id,
+                solicitante_id=usuario_id,
+                tipo_servico='CORRETIVA',
+                descricao_problema='Equipamento não liga',
+                prioridade='ALTA',
+                status=status
+            ))
+        db.session.commit()
+
+        response = self.client.post('/api/auth/login', json={'email': 'teste@example.com', 'senha': 'senha123'})
+        self.headers = {'Authorization': f"Bearer {json.loads(response.data)['access_token']}"}
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _metricas(self):
+        response = self.client.get('/api/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith('text/plain; version=0.0.4'))
+        return response.get_data(as_text=True)
+
+    def test_metricas_requisicoes(self):
+        """Teste para os contadores e histogramas de requisições por rota"""
+        rotulos = {'method': 'GET', 'route': '/api/equipamentos/<id>'}
+        antes = self._metricas()
+
+        self.client.get('/api/equipamentos/nao-existe', headers=self.headers)
+        self.client.get('/api/equipamentos/outro', headers=self.headers)
+        depois = self._metricas()
+
+        # Uma série por rota, não por caminho
+        self.assertEqual(
+            valor_metrica(depois, 'http_requests_total', status='404', **rotulos)
+            - valor_metrica(antes, 'http_requests_total', status='404', **rotulos), 2
+        )
+        self.assertEqual(
+            valor_metrica(depois, 'http_request_duration_seconds_count', **rotulos)
+            - valor_metrica(antes, 'http_request_duration_seconds_count', **rotulos), 2
+        )
+        self.assertNotIn('nao-existe', depois)
+        self.assertIn('db_pool_checked_out', depois)
+
+    def test_indicadores_dominio(self):
+        """Teste para os indicadores de ordens de serviço abertas e equipamentos"""
+        texto = self._metricas()
+        self.assertEqual(valor_metrica(texto, 'ordens_servico_abertas', prioridade='ALTA'), 2)
+        self.assertEqual(valor_metrica(texto, 'equipamentos', status='ATIVO'), 1)
+
+        # Reabrir uma ordem invalida o indicador em cache, mas a coleta só o recalcula
+        # depois de METRICAS_RECALCULO segundos
+        ordem = OrdemServico.query.filter_by(status='CONCLUIDA').first()
+        ordem.status = 'ABERTA'
+        db.session.commit()
+        self.assertEqual(valor_metrica(self._metricas(), 'ordens_servico_abertas', prioridade='ALTA'), 2)
+
+        self.app.config['METRICAS_RECALCULO'] = 0
+        self.assertEqual(valor_metrica(self._metricas(), 'ordens_servico_abertas', prioridade='ALTA'), 3)
+
+    def test_token_metricas(self):
+        """Teste para o token exigido quando METRICAS_TOKEN está definido"""
+        externo = {'REMOTE_ADDR': '10.0.0.5'}
+
+        # Sem token configurado, somente os endereços de METRICAS_IPS têm acesso
+        response = self.client.get('/api/metrics', environ_base=externo)
+        self.assertEqual(response.status_code, 403)
+
+        self.app.config['METRICAS_TOKEN'] = 'segredo'
+
+        response = self.client.get('/api/metrics')
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.get('/api/metrics', headers={'Authorization': 'Bearer segredo'}, environ_base=externo)
+        self.assertEqual(response.status_code, 200)
+
+    def test_agregacao_entre_processos(self):
+        """Teste para a soma das métricas gravadas por vários processos (workers)"""
+        diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(diretorio.cleanup)
+        env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=diretorio.name)
+        codigo = (
+            "from app.utils.metrics import observe_request;"
+            "observe_request('GET', '/api/equipamentos', 200, 0.02, 0.005);"
+            "observe_request('GET', '/api/equipamentos', 500, 0.2, 0.1)"
+        )
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for _ in range(2):
+            subprocess.run([sys.executable, '-c', codigo], cwd=raiz, env=env, check=True)
+
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro, path=diretorio.name)
+        rotulos = {'method': 'GET', 'route': '/api/equipamentos'}
+        self.assertEqual(registro.get_sample_value('http_requests_total', dict(rotulos, status='200')), 2)
+        self.assertEqual(registro.get_sample_value('http_request_errors_total', rotulos), 2)
+        self.assertEqual(registro.get_sample_value('http_request_duration_seconds_count', rotulos), 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+from app import create_app, db
+from app.models import Usuario, Notificacao
+from werkzeug.security import generate_password_hash
+from sqlalchemy import insert
+from tests.helpers import assert_num_queries
+from app.utils.pagination import encode_cursor
+import json
+import uuid
+from datetime import datetime, timedelta
+
+class TestNotificacaoAPI(unittest.TestCase):
+    """Testes para a API de Notificações"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app('testing')
+        self.app.config['NOTIFICACOES_SSE_DURACAO'] = 0
+        self.app.config['NOTIFICACOES_SSE_INTERVALO'] = 0
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        # Criar usuário de teste
+        usuario_id = str(uuid.uuid4())
+        usuario = Usuario(
+            id=usuario_id,
+            nome='Usuário Teste',
+            email='teste@example.com',
+            senha_hash=generate_password_hash('senha123'),
+            perfil='ADMIN',
+            ativo=True
+        )
+        db.session.add(usuario)
+        db.session.commit()
+
+        self.usuario_id = usuario_id
+
+        # Obter token de autenticação
+        response = self.client.post('/api/auth/login', json={
+            'email': 'teste@example.com',
+            'senha': 'senha123'
+        })
+        data = json.loads(response.data)
+        self.token = data['access_token']
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def criar_notificacao(self, titulo, criado_em=None):
+        notificacao = Notificacao(
+            id=str(uuid.uuid4()),
+            usuario_id=self.usuario_id,
+            titulo=titulo,
+            mensagem=f'Mensagem de {titulo}',
+            tipo='INFO',
+            criado_em=criado_em or datetime.utcnow()
+        )
+        db.session.add(notificacao)
+        db.session.commit()
+        return notificacao
+
+    def nao_lidas(self):
+        response = self.client.get('/api/notificacoes/nao-lidas', headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.data)['nao_lidas']
+
+    def test_contador_nao_lidas(self):
+        """Teste para o contador de não lidas mantido pelos commits"""
+        self.assertEqual(self.nao_lidas(), 0)
+
+        notificacao = self.criar_notificacao('Primeira')
+
+        # INSERT em lote também atualiza o contador
+        db.session.execute(insert(Notificacao), [{
+            'id': str(uuid.uuid4()),
+            'usuario_id': self.usuario_id,
+            'titulo': f'Lote {i}',
+            'mensagem': 'Notificação em lote',
+            'tipo': 'INFO',
+            'lida': False
+        } for i in range(3)])
+        db.session.commit()
+
+        # O contador é lido do cache, sem consultar o banco
+        with assert_num_queries(self, 0):
+            self.assertEqual(self.nao_lidas(), 4)
+
+        notificacao.lida = True
+        db.session.commit()
+        with assert_num_queries(self, 0):
+            self.assertEqual(self.nao_lidas(), 3)
+
+    def test_marcar_notificacoes_lidas(self):
+        """Teste para a marcação de notificações como lidas em lote"""
+        primeira = self.criar_notificacao('Primeira')
+        segunda = self.criar_notificacao('Segunda')
+        self.criar_notificacao('Terceira')
+
+        response = self.client.put(
+            '/api/notificacoes/lidas',
+            json={'ids': [primeira.id, segunda.id, str(uuid.uuid4())]},
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data), {'marcadas': 2, 'nao_lidas': 1})
+
+        response = self.client.put(
+            '/api/notificacoes/lidas',
+            json={'todas': True},
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(json.loads(response.data), {'marcadas': 1, 'nao_lidas': 0})
+        self.assertEqual(Notificacao.query.filter_by(lida=False).count(), 0)
+
+        response = self.client.put('/api/notificacoes/lidas', json={}, headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_notificacoes(self):
+        """Teste para o envio de novas notificações por Server-Sent Events"""
+        agora = datetime.utcnow()
+        primeira = self.criar_notificacao('Primeira', agora - timedelta(minutes=2))
+        self.criar_notificacao('Segunda', agora - timedelta(minutes=1))
+
+        # Token na query string (EventSource não envia cabeçalhos) e retomada pelo Last-Event-ID
+        response = self.client.get(
+            f'/api/notificacoes/stream?jwt={self.token}',
+            headers={'Last-Event-ID': encode_cursor(primeira.criado_em, primeira.id)}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/event-stream')
+        eventos = response.get_data(as_text=True).strip().split('\n\n')
+        self.assertEqual(eventos[0], 'retry: 3000')
+        self.assertTrue(eventos[1].startswith('event: notificacao\nid: '))
+        self.assertEqual(json.loads(eventos[1].split('data: ')[1])['titulo'], 'Segunda')
+        self.assertEqual(eventos[2], 'event: contador\ndata: {"nao_lidas": 2}')
+
+        # Sem cursor, apenas as notificações posteriores à conexão são enviadas
+        response = self.client.get('/api/notificacoes/stream', headers={'Authorization': f'Bearer {self.token}'})
+        self.assertNotIn('event: notificacao', response.get_data(as_text=True))
+
+    def test_limite_streams(self):
+        """Teste para o limite de conexões SSE simultâneas, sem bloquear as demais requisições"""
+        self.app.config['NOTIFICACOES_SSE_MAXIMO'] = 1
+        headers = {'Authorization': f'Bearer {self.token}'}
+
+        aberta = self.client.get('/api/notificacoes/stream', headers=headers, buffered=False)
+        self.assertEqual(aberta.status_code, 200)
+        self.assertEqual(next(aberta.response), b'retry: 3000\n\n')
+
+        # Com a conexão aberta, a API continua respondendo
+        response = self.client.get('/api/notificacoes/nao-lidas', headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+        # Acima do limite, a nova conexão é recusada
+        response = self.client.get('/api/notificacoes/stream', headers=headers)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '30')
+
+        # Encerrada a conexão, a vaga é liberada
+        aberta.close()
+        response = self.client.get('/api/notificacoes/stream', headers=headers)
+        self.assertEqual(response.status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
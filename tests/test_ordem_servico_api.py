@@ -2,10 +2,21 @@ import unittest
 from app import create_app, db
 from app.models import OrdemServico, Equipamento, Departamento, Usuario, Manutencao
 from werkzeug.security import generate_password_hash
+from tests.helpers import assert_num_queries
+import multiprocessing
 import json
 import uuid
 from datetime import datetime, timedelta
 
+def alocar_codigos(quantidade, fila):
+    """Aloca códigos de ordem de serviço em um processo separado."""
+    from app.utils.sequences import next_codigo_ordem_servico
+    
+    app = create_app('testing')
+    app.config['SEQUENCIA_BLOCO'] = 7
+    with app.app_context():
+        fila.put([next_codigo_ordem_servico() for _ in range(quantidade)])
+
 class TestOrdemServicoAPI(unittest.TestCase):
     """Testes para a API de Ordens de Serviço"""
 
@@ -139,6 +150,48 @@ class TestOrdemServicoAPI(unittest.TestCase):
         self.assertEqual(data['tipo_servico'], 'MANUTENCAO_CORRETIVA')
         self.assertEqual(data['prioridade'], 'ALTA')
     
+    def test_get_condicional(self):
+        """Teste para GET condicional (ETag / Last-Modified) de ordem de serviço"""
+        ordem_id = str(uuid.uuid4())
+        db.session.add(OrdemServico(
+            id=ordem_id,
+            codigo='OS-000003',
+            equipamento_id=self.equipamento_id,
+            departamento_id=self.departamento_id,
+            solicitante_id=self.usuario_id,
+            tipo_servico='MANUTENCAO_PREVENTIVA',
+            descricao_problema='Verificação de rotina',
+            prioridade='NORMAL',
+            status='ABERTA',
+            data_abertura=datetime.now()
+        ))
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {self.token}'}
+        url = f'/api/ordens-servico/{ordem_id}'
+        
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+        last_modified = response.headers['Last-Modified']
+        
+        # Versão igual: 304 sem corpo, com uma única consulta ao atualizado_em
+        with assert_num_queries(self, 1):
+            response = self.client.get(url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+        
+        response = self.client.get(url, headers={**headers, 'If-Modified-Since': last_modified})
+        self.assertEqual(response.status_code, 304)
+        
+        # Após a atualização a ETag muda
+        response = self.client.put(url, headers=headers, json={'prioridade': 'ALTA'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, headers={**headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(json.loads(response.data)['prioridade'], 'ALTA')
+    
     def test_atualizar_ordem_servico(self):
         """Teste para atualização de ordem de serviço"""
         # Criar ordem de serviço
@@ -220,6 +273,49 @@ class TestOrdemServicoAPI(unittest.TestCase):
         self.assertEqual(ordem.status, 'EM_ANDAMENTO')
         self.assertIsNotNone(ordem.data_inicio)
     
+    def test_atualizar_status_em_lote(self):
+        """Teste para atualização de status de várias ordens de serviço em uma transação"""
+        ids = []
+        for i in range(3):
+            ordem = OrdemServico(
+                id=str(uuid.uuid4()),
+                codigo=f'OS-LOTE-{i}',
+                equipamento_id=self.equipamento_id,
+                departamento_id=self.departamento_id,
+                solicitante_id=self.usuario_id,
+                tipo_servico='MANUTENCAO_CORRETIVA',
+                descricao_problema='Equipamento com falha',
+                prioridade='NORMAL',
+                status='ABERTA'
+            )
+            db.session.add(ordem)
+            ids.append(ordem.id)
+        db.session.commit()
+        
+        # IDs em maiúsculas ou sem hífens são aceitos; repetições contam uma vez
+        response = self.client.put(
+            '/api/ordens-servico/status',
+            json={'ids': [ids[0], ids[1].upper(), ids[2].replace('-', ''), ids[0].upper()], 'status': 'EM_ANDAMENTO'},
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['atualizadas'], 3)
+        self.assertEqual([r['id'] for r in data['resultados']], ids)
+        self.assertTrue(all(r['sucesso'] for r in data['resultados']))
+        
+        db.session.expire_all()
+        ordens = OrdemServico.query.filter(OrdemServico.id.in_(ids)).all()
+        self.assertTrue(all(o.status == 'EM_ANDAMENTO' and o.data_inicio for o in ordens))
+        
+        # Lista de IDs obrigatória
+        response = self.client.put(
+            '/api/ordens-servico/status',
+            json={'status': 'CONCLUIDA'},
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 400)
+    
     def test_avaliar_ordem_servico(self):
         """Teste para avaliação de ordem de serviço concluída"""
         # Criar ordem de serviço concluída
@@ -326,6 +422,129 @@ class TestOrdemServicoAPI(unittest.TestCase):
         data = json.loads(response.data)
         self.assertIsInstance(data, list)
         self.assertEqual(len(data), 3)
+    
+    def test_ordens_servico_ndjson(self):
+        """Teste para listagens de ordens de serviço em streaming (NDJSON)"""
+        for i in range(3):
+            db.session.add(OrdemServico(
+                id=str(uuid.uuid4()),
+                codigo=f'OS-{300+i:06d}',
+                equipamento_id=self.equipamento_id,
+                departamento_id=self.departamento_id,
+                solicitante_id=self.usuario_id,
+                tipo_servico='MANUTENCAO_PREVENTIVA',
+                descricao_problema=f'Ordem de teste {i+1}',
+                prioridade='NORMAL',
+                status='ABERTA',
+                data_abertura=datetime.now()
+            ))
+        db.session.commit()
+        
+        for url in [
+            f'/api/ordens-servico/por-solicitante/{self.usuario_id}',
+            f'/api/ordens-servico/por-departamento/{self.departamento_id}',
+            f'/api/ordens-servico/por-equipamento/{self.equipamento_id}',
+            '/api/ordens-servico/por-status/aberta'
+        ]:
+            headers = {'Authorization': f'Bearer {self.token}'}
+            esperado = sorted(json.loads(self.client.get(url, headers=headers).data), key=lambda o: o['id'])
+            self.assertEqual(len(esperado), 3)
+            
+            # Streaming via parâmetro e via cabeçalho Accept, com os mesmos registros da resposta JSON
+            for url_stream, headers_stream in [
+                (f'{url}?stream=1', headers),
+                (url, {**headers, 'Accept': 'application/x-ndjson'})
+            ]:
+                response = self.client.get(url_stream, headers=headers_stream)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.mimetype, 'application/x-ndjson')
+                linhas = [json.loads(linha) for linha in response.data.decode().splitlines()]
+                self.assertEqual(sorted(linhas, key=lambda o: o['id']), esperado)
+    
+    def test_listar_ordens_servico_queries_constantes(self):
+        """Teste para garantir que a listagem não executa uma query por ordem de serviço"""
+        # Criar ordens com equipamentos, departamentos e solicitantes distintos
+        for i in range(5):
+            departamento = Departamento(id=str(uuid.uuid4()), nome=f'Departamento {i}')
+            solicitante = Usuario(
+                id=str(uuid.uuid4()),
+                nome=f'Solicitante {i}',
+                email=f'solicitante{i}@example.com',
+                senha_hash='hash'
+            )
+            equipamento = Equipamento(
+                id=str(uuid.uuid4()),
+                codigo=f'EQ-{300+i}',
+                nome=f'Equipamento {300+i}',
+                modelo='Modelo',
+                fabricante='Fabricante',
+                numero_serie=f'SN{300+i}',
+                data_aquisicao=datetime.now().date(),
+                departamento=departamento
+            )
+            ordem = OrdemServico(
+                id=str(uuid.uuid4()),
+                codigo=f'OS-{300+i:06d}',
+                equipamento=equipamento,
+                departamento=departamento,
+                solicitante=solicitante,
+                tipo_servico='MANUTENCAO_CORRETIVA',
+                descricao_problema='Equipamento com falha',
+                status='ABERTA'
+            )
+            db.session.add(ordem)
+        db.session.commit()
+        db.session.remove()
+        
+        # Listagem paginada: uma query para a versão (ETag), uma para os itens e outra para o total
+        with assert_num_queries(self, 3):
+            response = self.client.get(
+                '/api/ordens-servico?size=5',
+                headers={'Authorization': f'Bearer {self.token}'}
+            )
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(len({item['solicitante'] for item in data['items']}), 5)
+        
+        # Listagem por status: uma única query
+        with assert_num_queries(self, 1):
+            response = self.client.get(
+                '/api/ordens-servico/por-status/aberta',
+                headers={'Authorization': f'Bearer {self.token}'}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.data)), 5)
+    
+    def test_codigos_sem_duplicidade_entre_processos(self):
+        """Teste de concorrência: processos simultâneos nunca recebem o mesmo código"""
+        contexto = multiprocessing.get_context('fork')
+        fila = contexto.Queue()
+        processos = [contexto.Process(target=alocar_codigos, args=(100, fila)) for _ in range(4)]
+        for processo in processos:
+            processo.start()
+        codigos = []
+        for _ in processos:
+            codigos.extend(fila.get(timeout=60))
+        for processo in processos:
+            processo.join()
+        
+        self.assertEqual(len(codigos), 400)
+        self.assertEqual(len(set(codigos)), 400)
+        
+        # Novos códigos continuam após os já reservados
+        response = self.client.post(
+            '/api/ordens-servico',
+            json={
+                'equipamento_id': self.equipamento_id,
+                'departamento_id': self.departamento_id,
+                'solicitante_id': self.usuario_id,
+                'tipo_servico': 'MANUTENCAO_CORRETIVA',
+                'descricao_problema': 'Equipamento com falha'
+            },
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn(json.loads(response.data)['codigo'], codigos)
 
 if __name__ == '__main__':
     unittest.main()
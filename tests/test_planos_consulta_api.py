@@ -0,0 +1,173 @@
+import unittest
+import re
+from app import create_app, db
+from app.models import (Usuario, Departamento, Equipamento, Tecnico, Manutencao, OrdemServico,
+                        Certificado, Notificacao)
+from werkzeug.security import generate_password_hash
+from tests.helpers import capturar_consultas
+import json
+import uuid
+from datetime import datetime, date, timedelta
+
+# Linha do EXPLAIN QUERY PLAN que indica leitura completa da tabela, sem índice
+# (SQLite >= 3.36: "SCAN tabela"; versões anteriores: "SCAN TABLE tabela")
+VARREDURA = re.compile(r'^SCAN (?:TABLE )?(\w+)$')
+
+class TestPlanosConsultaAPI(unittest.TestCase):
+    """Verifica, pelo plano de execução, que as consultas das rotas usam índices"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        usuario = Usuario(
+            id=str(uuid.uuid4()),
+            nome='Usuário Teste',
+            email='teste@example.com',
+            senha_hash=generate_password_hash('senha123'),
+            perfil='ADMIN',
+            ativo=True
+        )
+        departamento = Departamento(id=str(uuid.uuid4()), nome='Departamento Teste')
+        tecnico = Tecnico(id=str(uuid.uuid4()), nome='Técnico Teste', email='tecnico@example.com')
+        equipamento = Equipamento(
+            id=str(uuid.uuid4()),
+            codigo='EQ-TEST',
+            nome='Equipamento Teste',
+            modelo='Modelo Teste',
+            fabricante='Fabricante Teste',
+            numero_serie='SN12345',
+            data_aquisicao=date.today(),
+            departamento_id=departamento.id,
+            status='ATIVO',
+            criticidade='ALTA'
+        )
+        db.session.add_all([usuario, departamento, tecnico, equipamento])
+        db.session.add_all([
+            Manutencao(
+                id=str(uuid.uuid4()),
+                equipamento_id=equipamento.id,
+                tipo_manutencao='PREVENTIVA',
+                status='AGENDADA',
+                descricao='Manutenção preventiva',
+                data_agendamento=datetime.utcnow() + timedelta(days=1),
+                tecnico_id=tecnico.id
+            ),
+            OrdemServico(
+                id=str(uuid.uuid4()),
+                codigo='OS-TEST',
+                equipamento_id=equipamento.id,
+                departamento_id=departamento.id,
+                solicitante_id=usuario.id,
+                tipo_servico='CORRETIVA',
+                descricao_problema='Problema de teste'
+            ),
+            Certificado(
+                id=str(uuid.uuid4()),
+                equipamento_id=equipamento.id,
+                tipo='CALIBRACAO',
+                data_emissao=date.today() - timedelta(days=400),
+                data_validade=date.today() - timedelta(days=35),
+                emissor='Laboratório Teste'
+            ),
+            Notificacao(
+                id=str(uuid.uuid4()),
+                usuario_id=usuario.id,
+                titulo='Notificação',
+                mensagem='Mensagem de teste',
+                tipo='INFO'
+            ),
+        ])
+        db.session.commit()
+
+        self.usuario_id = usuario.id
+        self.departamento_id = departamento.id
+        self.tecnico_id = tecnico.id
+        self.equipamento_id = equipamento.id
+
+        # Obter token de autenticação
+        response = self.client.post('/api/auth/login', json={
+            'email': 'teste@example.com',
+            'senha': 'senha123'
+        })
+        data = json.loads(response.data)
+        self.token = data['access_token']
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def varreduras(self, url):
+        """Executa a rota e retorna as consultas cujo plano lê alguma tabela inteira."""
+        with capturar_consultas() as consultas:
+            response = self.client.get(url, headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 200, url)
+
+        tabelas = set(db.metadata.tables)
+        encontradas = []
+        with db.engine.connect() as conn:
+            for statement, parameters in consultas:
+                if not statement.lstrip().upper().startswith('SELECT'):
+                    continue
+                for linha in conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters):
+                    varredura = VARREDURA.match(linha[-1])
+                    if varredura and varredura.group(1) in tabelas:
+                        encontradas.append(f'{linha[-1]}: {statement}')
+        return encontradas
+
+    def assert_sem_varreduras(self, urls):
+        for url in urls:
+            with self.subTest(url=url):
+                varreduras = self.varreduras(url)
+                self.assertFalse(varreduras, f'{url} lê tabelas inteiras:\n' + '\n'.join(varreduras))
+
+    def test_listagens_filtradas_usam_indices(self):
+        """Teste para as listagens por equipamento, técnico, departamento, solicitante, status e período"""
+        self.assert_sem_varreduras([
+            f'/api/equipamentos/por-departamento/{self.departamento_id}',
+            '/api/equipamentos/por-status/ativo',
+            f'/api/equipamentos/{self.equipamento_id}/historico',
+            '/api/equipamentos?cursor=',
+            f'/api/manutencoes/por-equipamento/{self.equipamento_id}',
+            f'/api/manutencoes/por-tecnico/{self.tecnico_id}',
+            '/api/manutencoes/por-periodo?inicio=2024-01-01&fim=2024-12-31',
+            f'/api/ordens-servico/por-solicitante/{self.usuario_id}',
+            f'/api/ordens-servico/por-departamento/{self.departamento_id}',
+            f'/api/ordens-servico/por-equipamento/{self.equipamento_id}',
+            '/api/ordens-servico/por-status/aberta',
+            '/api/notificacoes?nao_lidas=true',
+        ])
+
+    def test_relatorios_usam_indices(self):
+        """Teste para os relatórios de certificados, preventivas, criticidade e período"""
+        self.assert_sem_varreduras([
+            '/api/relatorios/certificados-vencidos',
+            '/api/relatorios/manutencoes-preventivas-pendentes',
+            '/api/relatorios/equipamentos-criticos',
+            '/api/relatorios/manutencoes?inicio=2024-01-01',
+            '/api/relatorios/custos-manutencao?inicio=2024-01-01',
+            '/api/relatorios/tempo-medio-atendimento?inicio=2024-01-01',
+            '/api/relatorios/disponibilidade-equipamentos?inicio=2024-01-01',
+            '/api/relatorios/desempenho-tecnicos?inicio=2024-01-01',
+            '/api/relatorios/satisfacao-usuarios?inicio=2024-01-01',
+        ])
+
+    def test_dashboards_usam_indices(self):
+        """Teste para os dashboards, com e sem filtro de departamento"""
+        self.assert_sem_varreduras([
+            '/api/dashboards/visao-geral',
+            f'/api/dashboards/visao-geral?departamento_id={self.departamento_id}',
+            f'/api/dashboards/manutencoes-por-status?departamento_id={self.departamento_id}',
+            f'/api/dashboards/equipamentos-por-status?departamento_id={self.departamento_id}',
+            f'/api/dashboards/ordens-servico-por-prioridade?departamento_id={self.departamento_id}',
+            '/api/dashboards/custos-mensais',
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
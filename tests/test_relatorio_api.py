@@ -0,0 +1,212 @@
+import unittest
+from app import create_app, db
+from app.models import (Manutencao, OrdemServico, Equipamento, Departamento, Usuario, Tecnico,
+                        ResumoManutencao, ResumoOrdemServico)
+from app.utils.aggregates import rebuild_summaries
+from werkzeug.security import generate_password_hash
+from decimal import Decimal
+import json
+import uuid
+from datetime import datetime, timedelta
+
+class TestRelatorioAPI(unittest.TestCase):
+    """Testes para a API de Relatórios"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app('testing')
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        # Criar usuário de teste
+        usuario_id = str(uuid.uuid4())
+        usuario = Usuario(
+            id=usuario_id,
+            nome='Usuário Teste',
+            email='teste@example.com',
+            senha_hash=generate_password_hash('senha123'),
+            perfil='ADMIN',
+            ativo=True
+        )
+
+        # Criar departamento de teste
+        departamento_id = str(uuid.uuid4())
+        departamento = Departamento(
+            id=departamento_id,
+            nome='Departamento Teste',
+            descricao='Departamento para testes'
+        )
+
+        # Criar técnico de teste
+        tecnico_id = str(uuid.uuid4())
+        tecnico = Tecnico(
+            id=tecnico_id,
+            nome='Técnico Teste',
+            email='tecnico@example.com',
+            interno=True,
+            disponivel=True
+        )
+
+        # Criar equipamento de teste
+        equipamento_id = str(uuid.uuid4())
+        equipamento = Equipamento(
+            id=equipamento_id,
+            codigo='EQ-TEST',
+            nome='Equipamento Teste',
+            modelo='Modelo Teste',
+            fabricante='Fabricante Teste',
+            numero_serie='SN12345',
+            data_aquisicao=datetime.now().date(),
+            departamento_id=departamento_id,
+            status='ATIVO',
+            criticidade='ALTA'
+        )
+
+        db.session.add(usuario)
+        db.session.add(departamento)
+        db.session.add(tecnico)
+        db.session.add(equipamento)
+        db.session.commit()
+
+        self.usuario_id = usuario_id
+        self.departamento_id = departamento_id
+        self.tecnico_id = tecnico_id
+        self.equipamento_id = equipamento_id
+
+        # Obter token de autenticação
+        response = self.client.post('/api/auth/login', json={
+            'email': 'teste@example.com',
+            'senha': 'senha123'
+        })
+        data = json.loads(response.data)
+        self.token = data['access_token']
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def criar_manutencao(self, data_agendamento, status='CONCLUIDA', custo_total=None, tempo_parada=None):
+        manutencao = Manutencao(
+            id=str(uuid.uuid4()),
+            equipamento_id=self.equipamento_id,
+            tipo_manutencao='CORRETIVA',
+            status=status,
+            prioridade='NORMAL',
+            descricao='Manutenção de teste',
+            data_agendamento=data_agendamento,
+            data_inicio=data_agendamento,
+            data_fim=data_agendamento + timedelta(hours=2),
+            tecnico_id=self.tecnico_id,
+            custo_total=custo_total,
+            tempo_parada=tempo_parada
+        )
+        db.session.add(manutencao)
+        db.session.commit()
+        return manutencao
+
+    def test_resumos_atualizados_incrementalmente(self):
+        """Teste para a manutenção incremental das tabelas de resumo"""
+        manutencao = self.criar_manutencao(datetime(2025, 3, 10), custo_total=Decimal('150.00'), tempo_parada=120)
+        self.criar_manutencao(datetime(2025, 3, 20), custo_total=Decimal('50.00'), tempo_parada=60)
+
+        resumo = ResumoManutencao.query.filter_by(equipamento_id=self.equipamento_id).one()
+        self.assertEqual(resumo.mes.isoformat(), '2025-03-01')
+        self.assertEqual(resumo.quantidade, 2)
+        self.assertEqual(resumo.custo_total, Decimal('200.00'))
+        self.assertEqual(resumo.duracao, 240)
+
+        # Alterar status e mês de uma manutenção move o registro entre os resumos
+        manutencao.status = 'CANCELADA'
+        manutencao.data_agendamento = datetime(2025, 4, 5)
+        db.session.commit()
+
+        resumos = {(r.mes.isoformat(), r.status): r.quantidade for r in ResumoManutencao.query.all()}
+        self.assertEqual(resumos, {('2025-03-01', 'CONCLUIDA'): 1, ('2025-04-01', 'CANCELADA'): 1})
+
+        # Exclusões também atualizam os resumos
+        db.session.delete(manutencao)
+        db.session.commit()
+        self.assertEqual(ResumoManutencao.query.count(), 1)
+
+        # A reconstrução completa produz o mesmo resultado
+        antes = sorted((r.mes, r.status, r.quantidade, r.custo_total) for r in ResumoManutencao.query.all())
+        rebuild_summaries()
+        depois = sorted((r.mes, r.status, r.quantidade, r.custo_total) for r in ResumoManutencao.query.all())
+        self.assertEqual(antes, depois)
+
+    def test_relatorio_custos_manutencao(self):
+        """Teste para o relatório de custos de manutenção"""
+        self.criar_manutencao(datetime(2025, 1, 15), custo_total=Decimal('100.00'))
+        self.criar_manutencao(datetime(2025, 2, 15), custo_total=Decimal('300.00'))
+        self.criar_manutencao(datetime(2025, 2, 20), status='CANCELADA', custo_total=Decimal('999.00'))
+        self.criar_manutencao(datetime(2025, 7, 1), custo_total=Decimal('500.00'))
+
+        response = self.client.get(
+            '/api/relatorios/custos-manutencao?inicio=2025-01-01&fim=2025-05-31',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['total']['custo_total'], 400.0)
+        self.assertEqual([m['mes'] for m in data['por_mes']], ['2025-01-01', '2025-02-01'])
+        self.assertEqual(data['por_departamento'][0]['departamento'], 'Departamento Teste')
+        self.assertEqual(data['por_departamento'][0]['custo_total'], 400.0)
+
+        # Data de início é obrigatória
+        response = self.client.get(
+            '/api/relatorios/custos-manutencao',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_relatorio_tempo_medio_atendimento(self):
+        """Teste para o relatório de tempo médio de atendimento"""
+        abertura = datetime(2025, 5, 2, 8, 0)
+        ordem_servico = OrdemServico(
+            id=str(uuid.uuid4()),
+            codigo='OS-000001',
+            equipamento_id=self.equipamento_id,
+            solicitante_id=self.usuario_id,
+            departamento_id=self.departamento_id,
+            tipo_servico='MANUTENCAO_CORRETIVA',
+            descricao_problema='Equipamento não liga',
+            prioridade='ALTA',
+            status='ABERTA',
+            data_abertura=abertura
+        )
+        db.session.add(ordem_servico)
+        db.session.commit()
+
+        # Atualizações de status são refletidas no resumo
+        ordem_servico.status = 'CONCLUIDA'
+        ordem_servico.data_inicio = abertura + timedelta(minutes=30)
+        ordem_servico.data_fim = abertura + timedelta(hours=3)
+        ordem_servico.avaliacao_satisfacao = 4
+        db.session.commit()
+
+        self.assertEqual(ResumoOrdemServico.query.count(), 1)
+
+        response = self.client.get(
+            '/api/relatorios/tempo-medio-atendimento?inicio=2025-05-01&fim=2025-05-31',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.data)
+        self.assertEqual(data['geral']['tempo_medio_atendimento'], 30)
+        self.assertEqual(data['por_prioridade']['ALTA']['tempo_medio_resolucao'], 180)
+
+        response = self.client.get(
+            '/api/relatorios/satisfacao-usuarios?inicio=2025-05-01',
+            headers={'Authorization': f'Bearer {self.token}'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.data)['media'], 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+from app import create_app, db
+from app.models import Equipamento, Departamento, Usuario, Certificado, Notificacao
+from app.utils.certificate_expiry import scan_certificate_expiry
+from werkzeug.security import generate_password_hash
+import uuid
+from datetime import date, timedelta
+
+class TestVencimentoCertificadosAPI(unittest.TestCase):
+    """Testes para a verificação periódica de vencimento de certificados (agendador e comando flask)"""
+
+    def setUp(self):
+        """Configuração inicial para cada teste"""
+        self.app = create_app('testing')
+        self.runner = self.app.test_cli_runner()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        # Usuário responsável pelo departamento do equipamento
+        usuario_id = str(uuid.uuid4())
+        db.session.add(Usuario(
+            id=usuario_id,
+            nome='Usuário Teste',
+            email='teste@example.com',
+            senha_hash=generate_password_hash('senha123'),
+            perfil='ADMIN',
+            ativo=True
+        ))
+
+        departamento_id = str(uuid.uuid4())
+        db.session.add(Departamento(
+            id=departamento_id,
+            nome='Departamento Teste',
+            descricao='Departamento para testes'
+        ))
+
+        equipamento_id = str(uuid.uuid4())
+        db.session.add(Equipamento(
+            id=equipamento_id,
+            codigo='EQ-TEST',
+            nome='Equipamento Teste',
+            modelo='Modelo Teste',
+            fabricante='Fabricante Teste',
+            numero_serie='SN12345',
+            data_aquisicao=date.today(),
+            departamento_id=departamento_id,
+            status='ATIVO',
+            criticidade='ALTA'
+        ))
+        db.session.commit()
+
+        self.usuario_id = usuario_id
+        self.departamento_id = departamento_id
+        self.equipamento_id = equipamento_id
+
+    def tearDown(self):
+        """Limpeza após cada teste"""
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_verificar_vencimento_certificados(self):
+        """Teste para a verificação de vencimento de certificados"""
+        hoje = date(2025, 6, 10)
+        departamento = db.session.get(Departamento, self.departamento_id)
+        departamento.responsavel_id = self.usuario_id
+
+        def criar_certificado(numero, data_validade, status='VALIDO'):
+            certificado = Certificado(
+                id=str(uuid.uuid4()),
+                equipamento_id=self.equipamento_id,
+                tipo='CALIBRACAO',
+                numero=numero,
+                data_emissao=date(2024, 1, 1),
+                data_validade=data_validade,
+                emissor='Laboratório Teste',
+                status=status
+            )
+            db.session.add(certificado)
+            return certificado
+
+        vencido = criar_certificado('C-1', date(2025, 6, 1))
+        a_vencer = criar_certificado('C-2', date(2025, 6, 25))
+        valido = criar_certificado('C-3', date(2025, 12, 31))
+        criar_certificado('C-4', date(2025, 1, 1), status='SUSPENSO')
+        db.session.commit()
+
+        resultado = scan_certificate_expiry(hoje=hoje, dias_aviso=30, batch_size=1)
+        self.assertEqual(resultado, {'vencidos': 1, 'a_vencer': 1, 'notificacoes': 2})
+
+        db.session.expire_all()
+        self.assertEqual(vencido.status, 'VENCIDO')
+        self.assertEqual(a_vencer.status, 'VALIDO')
+        self.assertEqual(a_vencer.aviso_vencimento, a_vencer.data_validade)
+        self.assertEqual(valido.status, 'VALIDO')
+
+        notificacoes = {n.tipo: n for n in Notificacao.query.filter_by(usuario_id=self.usuario_id)}
+        self.assertEqual(set(notificacoes), {'CERTIFICADO_VENCIDO', 'CERTIFICADO_A_VENCER'})
+        self.assertEqual(notificacoes['CERTIFICADO_VENCIDO'].link, f'/api/certificados/{vencido.id}')
+
+        # Uma nova execução não repete os avisos
+        self.assertEqual(scan_certificate_expiry(hoje=hoje, dias_aviso=30),
+                         {'vencidos': 0, 'a_vencer': 0, 'notificacoes': 0})
+
+        # Uma renovação volta a ser avisada quando se aproximar do novo vencimento
+        a_vencer.data_validade = date(2025, 7, 5)
+        db.session.commit()
+        self.assertEqual(scan_certificate_expiry(hoje=hoje, dias_aviso=30)['a_vencer'], 1)
+
+    def test_comandos_vencimento_certificados(self):
+        """Teste para o comando flask scan-certificate-expiry e a tarefa do agendador"""
+        hoje = date.today()
+        departamento = db.session.get(Departamento, self.departamento_id)
+        departamento.responsavel_id = self.usuario_id
+        for numero, data_validade in [('C-1', hoje - timedelta(days=1)), ('C-2', hoje + timedelta(days=10))]:
+            db.session.add(Certificado(
+                id=str(uuid.uuid4()),
+                equipamento_id=self.equipamento_id,
+                tipo='CALIBRACAO',
+                numero=numero,
+                data_emissao=hoje - timedelta(days=365),
+                data_validade=data_validade,
+                emissor='Laboratório Teste',
+                status='VALIDO'
+            ))
+        db.session.commit()
+
+        resultado = self.runner.invoke(args=['scan-certificate-expiry', '--dias-aviso', '30'])
+        self.assertEqual(resultado.exit_code, 0, resultado.output)
+        self.assertIn('1 certificados vencidos, 1 a vencer, 2 notificações criadas', resultado.output)
+
+        # A tarefa do agendador é idempotente: nada a avisar novamente
+        resultado = self.runner.invoke(args=['run-scheduler', '--once'])
+        self.assertEqual(resultado.exit_code, 0, resultado.output)
+        self.assertEqual(Notificacao.query.filter_by(usuario_id=self.usuario_id).count(), 2)
+        self.assertEqual(Certificado.query.filter_by(status='VENCIDO').count(), 1)
+
+if __name__ == '__main__':
+    unittest.main()